@@ -28,6 +28,7 @@ from airflow import models
 from airflow.exceptions import AirflowException, DagNotFound
 from airflow.models import DagModel, DagRun
 from airflow.models.errors import ParseImportError
+from airflow.models.serialized_dag import SerializedDagModel
 from airflow.models.taskinstance import TaskInstance
 from airflow.utils.db import get_sqla_model_classes
 from airflow.utils.session import NEW_SESSION, provide_session
@@ -80,6 +81,9 @@ def delete_dag(dag_id: str, keep_records_in_log: bool = True, session: Session =
             cursor_result = cast("CursorResult", result)
             count += cursor_result.rowcount
 
+    # The tasks the serialized DAGs shared are only deleted once no other DAG uses them
+    SerializedDagModel.delete_orphaned_tasks(session=session)
+
     # Delete entries in Import Errors table for a deleted DAG
     # This handles the case when the dag_id is changed in the file
     session.execute(
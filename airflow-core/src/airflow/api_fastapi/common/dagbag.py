@@ -21,7 +21,8 @@ from typing import TYPE_CHECKING, Annotated
 from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
-from airflow.models.dagbag import DBDagBag
+from airflow.configuration import conf
+from airflow.models.dagbag import DBDagBag, SharedDagCache
 
 if TYPE_CHECKING:
     from airflow.models.dagrun import DagRun
@@ -30,6 +31,9 @@ if TYPE_CHECKING:
 
 def create_dag_bag() -> DBDagBag:
     """Create DagBag to retrieve DAGs from the database."""
+    if shared_dag_cache_dir := conf.get("api", "shared_dag_cache_dir", fallback=""):
+        max_bytes = conf.getint("api", "shared_dag_cache_max_bytes", fallback=0)
+        return DBDagBag(shared_cache=SharedDagCache(shared_dag_cache_dir, max_bytes=max_bytes))
     return DBDagBag()
 
 
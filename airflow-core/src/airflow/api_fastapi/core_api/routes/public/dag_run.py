@@ -86,6 +86,7 @@ from airflow.listeners.listener import get_listener_manager
 from airflow.models import DagModel, DagRun
 from airflow.models.asset import AssetEvent
 from airflow.models.dag_version import DagVersion
+from airflow.utils.scheduler_wakeup import notify_scheduler
 from airflow.utils.state import DagRunState
 from airflow.utils.types import DagRunTriggeredByType, DagRunType
 
@@ -497,6 +498,7 @@ def trigger_dag_run(
         if dag_run_note:
             current_user_id = user.get_id()
             dag_run.note = (dag_run_note, current_user_id)
+        notify_scheduler(session, dag_id=dag_id)
         return dag_run
     except ValueError as e:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, str(e))
@@ -18,7 +18,6 @@
 from __future__ import annotations
 
 import json
-import time
 from contextlib import AsyncExitStack
 from functools import cached_property
 from typing import TYPE_CHECKING, Any
@@ -129,7 +128,7 @@ class CorrelationIdMiddleware(BaseHTTPMiddleware):
 
 class JWTReissueMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
-        from airflow.configuration import conf
+        from airflow.api_fastapi.execution_api.security import reissue_token_if_expiring
 
         response: Response = await call_next(request)
 
@@ -141,14 +140,8 @@ class JWTReissueMiddleware(BaseHTTPMiddleware):
                 async with svcs.Container(request.app.state.svcs_registry) as services:
                     validator: JWTValidator = await services.aget(JWTValidator)
                     claims = await validator.avalidated_claims(token, {})
-
-                    now = int(time.time())
-                    validity = conf.getint("execution_api", "jwt_expiration_time")
-                    refresh_when_less_than = max(int(validity * 0.20), 30)
-                    valid_left = int(claims.get("exp", 0)) - now
-                    if valid_left <= refresh_when_less_than:
-                        generator: JWTGenerator = await services.aget(JWTGenerator)
-                        refreshed_token = generator.generate(claims)
+                    generator: JWTGenerator = await services.aget(JWTGenerator)
+                    refreshed_token = reissue_token_if_expiring(claims, generator)
             except Exception as err:
                 # Do not block the response if refreshing fails; log a warning for visibility
                 logger.warning(
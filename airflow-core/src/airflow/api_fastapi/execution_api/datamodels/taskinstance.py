@@ -239,6 +239,39 @@ class TIHeartbeatInfo(StrictBaseModel):
     pid: int
 
 
+class TIBatchHeartbeatInfo(TIHeartbeatInfo):
+    """Heartbeat of one TaskInstance in a batch, with the token of that TaskInstance."""
+
+    id: uuid.UUID
+    token: str
+
+
+class TIBatchHeartbeatPayload(StrictBaseModel):
+    """Schema for the batch TaskInstance heartbeat endpoint."""
+
+    heartbeats: list[TIBatchHeartbeatInfo]
+
+
+class TIBatchHeartbeatResult(BaseModel):
+    """
+    Result of the heartbeat of one TaskInstance in a batch.
+
+    ``status_code`` and ``detail`` are what the heartbeat endpoint of the TaskInstance would have answered.
+    """
+
+    id: uuid.UUID
+    status_code: int
+    detail: dict[str, Any] | None = None
+    refreshed_token: str | None = None
+    """A new token for the TaskInstance, if its token is about to expire"""
+
+
+class TIBatchHeartbeatResponse(BaseModel):
+    """Schema for the response of the batch TaskInstance heartbeat endpoint."""
+
+    results: list[TIBatchHeartbeatResult]
+
+
 # This model is not used in the API, but it is included in generated OpenAPI schema
 # for use in the client SDKs.
 class TaskInstance(BaseModel):
@@ -35,6 +35,7 @@ from airflow.api_fastapi.execution_api.datamodels.taskinstance import DagRun
 from airflow.exceptions import DagRunAlreadyExists
 from airflow.models.dag import DagModel
 from airflow.models.dagrun import DagRun as DagRunModel
+from airflow.utils.scheduler_wakeup import notify_scheduler
 from airflow.utils.state import DagRunState
 from airflow.utils.types import DagRunTriggeredByType, DagRunType
 
@@ -135,6 +136,7 @@ def trigger_dag_run(
             note=payload.note,
             session=session,
         )
+        notify_scheduler(session, dag_id=dag_id)
     except DagRunAlreadyExists:
         raise HTTPException(
             status.HTTP_409_CONFLICT,
@@ -38,6 +38,7 @@ from sqlalchemy.sql import select
 from structlog.contextvars import bind_contextvars
 
 from airflow._shared.timezones import timezone
+from airflow.api_fastapi.auth.tokens import JWTGenerator, JWTValidator
 from airflow.api_fastapi.common.dagbag import DagBagDep, get_latest_version_of_dag
 from airflow.api_fastapi.common.db.common import SessionDep
 from airflow.api_fastapi.common.types import UtcDateTime
@@ -48,6 +49,10 @@ from airflow.api_fastapi.execution_api.datamodels.taskinstance import (
     PrevSuccessfulDagRunResponse,
     TaskBreadcrumbsResponse,
     TaskStatesResponse,
+    TIBatchHeartbeatInfo,
+    TIBatchHeartbeatPayload,
+    TIBatchHeartbeatResponse,
+    TIBatchHeartbeatResult,
     TIDeferredStatePayload,
     TIEnterRunningPayload,
     TIHeartbeatInfo,
@@ -59,7 +64,12 @@ from airflow.api_fastapi.execution_api.datamodels.taskinstance import (
     TISuccessStatePayload,
     TITerminalStatePayload,
 )
-from airflow.api_fastapi.execution_api.security import ExecutionAPIRoute, require_auth
+from airflow.api_fastapi.execution_api.deps import DepContainer
+from airflow.api_fastapi.execution_api.security import (
+    ExecutionAPIRoute,
+    reissue_token_if_expiring,
+    require_auth,
+)
 from airflow.exceptions import TaskNotFound
 from airflow.models.asset import AssetActive
 from airflow.models.dag import DagModel
@@ -70,10 +80,12 @@ from airflow.models.taskreschedule import TaskReschedule
 from airflow.models.trigger import Trigger
 from airflow.models.xcom import XComModel
 from airflow.serialization.definitions.assets import SerializedAsset, SerializedAssetUniqueKey
+from airflow.utils.scheduler_wakeup import notify_scheduler
 from airflow.utils.sqlalchemy import get_dialect_name
-from airflow.utils.state import DagRunState, TaskInstanceState, TerminalTIState
+from airflow.utils.state import DagRunState, State, TaskInstanceState, TerminalTIState
 
 if TYPE_CHECKING:
+    from sqlalchemy.engine import Row
     from sqlalchemy.sql.dml import Update
 
 router = VersionedAPIRouter()
@@ -111,6 +123,104 @@ def ti_run(
     This endpoint is used to start a TaskInstance that is in the QUEUED state.
     """
     bind_contextvars(ti_id=str(task_instance_id))
+    ti = _mark_ti_running(task_instance_id, ti_run_payload, session)
+
+    try:
+        dr = (
+            session.scalars(
+                select(DR)
+                .filter_by(dag_id=ti.dag_id, run_id=ti.run_id)
+                .options(joinedload(DR.consumed_asset_events))
+            )
+            .unique()
+            .one_or_none()
+        )
+
+        if not dr:
+            log.error("DagRun not found", dag_id=ti.dag_id, run_id=ti.run_id)
+            raise ValueError(f"DagRun with dag_id={ti.dag_id} and run_id={ti.run_id} not found.")
+
+        # Send the keys to the SDK so that the client requests to clear those XComs from the server.
+        # The reason we cannot do this here in the server is because we need to issue a purge on custom XCom backends
+        # too. With the current assumption, the workers ONLY have access to the custom XCom backends directly and they
+        # can issue the purge.
+
+        # However, do not clear it for deferral
+        xcom_keys = []
+        if not ti.next_method:
+            map_index = None if ti.map_index < 0 else ti.map_index
+            xcom_query = select(XComModel.key).where(
+                XComModel.dag_id == ti.dag_id,
+                XComModel.task_id == ti.task_id,
+                XComModel.run_id == ti.run_id,
+            )
+            if map_index is not None:
+                xcom_query = xcom_query.where(XComModel.map_index == map_index)
+
+            xcom_keys = list(session.scalars(xcom_query))
+        task_reschedule_count = (
+            session.scalar(
+                select(func.count(TaskReschedule.id)).where(TaskReschedule.ti_id == task_instance_id)
+            )
+            or 0
+        )
+
+        context = TIRunContext(
+            dag_run=dr,
+            task_reschedule_count=task_reschedule_count,
+            max_tries=ti.max_tries,
+            # TODO: Add variables and connections that are needed (and has perms) for the task
+            variables=[],
+            connections=[],
+            xcom_keys_to_clear=xcom_keys,
+            should_retry=_is_eligible_to_retry(ti.state, ti.try_number, ti.max_tries),
+        )
+
+        # Only set if they are non-null
+        if ti.next_method:
+            context.next_method = ti.next_method
+            context.next_kwargs = ti.next_kwargs
+
+        return context
+    except SQLAlchemyError:
+        log.exception("Error marking Task Instance state as running")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Database error occurred"
+        )
+
+
+@ti_id_router.patch(
+    "/{task_instance_id}/claim",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={
+        status.HTTP_404_NOT_FOUND: {"description": "Task Instance not found"},
+        status.HTTP_409_CONFLICT: {"description": "The TI is already in the requested state"},
+        HTTP_422_UNPROCESSABLE_CONTENT: {"description": "Invalid payload for the state transition"},
+    },
+)
+def ti_claim(
+    task_instance_id: UUID,
+    ti_run_payload: Annotated[TIEnterRunningPayload, Body()],
+    session: SessionDep,
+) -> None:
+    """
+    Claim a TaskInstance in the QUEUED state for running it, like ``run`` does.
+
+    This endpoint is used instead of ``run`` by workers which got the run context of the TaskInstance from the
+    scheduler along with the task, so it does not look it up.
+    """
+    bind_contextvars(ti_id=str(task_instance_id))
+    _mark_ti_running(task_instance_id, ti_run_payload, session)
+
+
+def _mark_ti_running(
+    task_instance_id: UUID, ti_run_payload: TIEnterRunningPayload, session: SessionDep
+) -> Row:
+    """
+    Mark a TaskInstance in the QUEUED or RESTARTING state as running.
+
+    Returns the row of the TaskInstance as it was before, with the fields needed for its run context.
+    """
     log.debug(
         "Starting task instance run",
         hostname=ti_run_payload.hostname,
@@ -226,68 +336,12 @@ def ti_run(
     try:
         result = session.execute(query)
         log.info("Task instance state updated", rows_affected=getattr(result, "rowcount", 0))
-
-        dr = (
-            session.scalars(
-                select(DR)
-                .filter_by(dag_id=ti.dag_id, run_id=ti.run_id)
-                .options(joinedload(DR.consumed_asset_events))
-            )
-            .unique()
-            .one_or_none()
-        )
-
-        if not dr:
-            log.error("DagRun not found", dag_id=ti.dag_id, run_id=ti.run_id)
-            raise ValueError(f"DagRun with dag_id={ti.dag_id} and run_id={ti.run_id} not found.")
-
-        # Send the keys to the SDK so that the client requests to clear those XComs from the server.
-        # The reason we cannot do this here in the server is because we need to issue a purge on custom XCom backends
-        # too. With the current assumption, the workers ONLY have access to the custom XCom backends directly and they
-        # can issue the purge.
-
-        # However, do not clear it for deferral
-        xcom_keys = []
-        if not ti.next_method:
-            map_index = None if ti.map_index < 0 else ti.map_index
-            xcom_query = select(XComModel.key).where(
-                XComModel.dag_id == ti.dag_id,
-                XComModel.task_id == ti.task_id,
-                XComModel.run_id == ti.run_id,
-            )
-            if map_index is not None:
-                xcom_query = xcom_query.where(XComModel.map_index == map_index)
-
-            xcom_keys = list(session.scalars(xcom_query))
-        task_reschedule_count = (
-            session.scalar(
-                select(func.count(TaskReschedule.id)).where(TaskReschedule.ti_id == task_instance_id)
-            )
-            or 0
-        )
-
-        context = TIRunContext(
-            dag_run=dr,
-            task_reschedule_count=task_reschedule_count,
-            max_tries=ti.max_tries,
-            # TODO: Add variables and connections that are needed (and has perms) for the task
-            variables=[],
-            connections=[],
-            xcom_keys_to_clear=xcom_keys,
-            should_retry=_is_eligible_to_retry(previous_state, ti.try_number, ti.max_tries),
-        )
-
-        # Only set if they are non-null
-        if ti.next_method:
-            context.next_method = ti.next_method
-            context.next_kwargs = ti.next_kwargs
-
-        return context
     except SQLAlchemyError:
         log.exception("Error marking Task Instance state as running")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Database error occurred"
         )
+    return ti
 
 
 @ti_id_router.patch(
@@ -424,6 +478,9 @@ def ti_update_state(
                 extra=json.dumps({"host_name": hostname}) if hostname else None,
             )
         )
+        if updated_state in State.finished:
+            # Downstream tasks can now be scheduled.
+            notify_scheduler(session, dag_id=dag_id, run_id=run_id)
     except SQLAlchemyError as e:
         log.error("Error updating Task Instance state", error=str(e))
         raise HTTPException(
@@ -607,6 +664,35 @@ def ti_skip_downstream(
     log.info("Downstream tasks skipped", tasks_skipped=getattr(result, "rowcount", 0))
 
 
+def _heartbeat_conflict(
+    previous_state: str | None, hostname: str | None, pid: int | None, ti_payload: TIHeartbeatInfo
+) -> dict[str, Any] | None:
+    """Return why the TI sending the heartbeat should terminate, if it should."""
+    if hostname != ti_payload.hostname or pid != ti_payload.pid:
+        log.warning(
+            "Task running elsewhere",
+            current_hostname=hostname,
+            current_pid=pid,
+            requested_hostname=ti_payload.hostname,
+            requested_pid=ti_payload.pid,
+        )
+        return {
+            "reason": "running_elsewhere",
+            "message": "TI is already running elsewhere",
+            "current_hostname": hostname,
+            "current_pid": pid,
+        }
+
+    if previous_state != TaskInstanceState.RUNNING:
+        log.warning("Task not in running state", current_state=previous_state)
+        return {
+            "reason": "not_running",
+            "message": "TI is no longer in the running state and task should terminate",
+            "current_state": previous_state,
+        }
+    return None
+
+
 @ti_id_router.put(
     "/{task_instance_id}/heartbeat",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -647,34 +733,8 @@ def ti_heartbeat(
             },
         )
 
-    if hostname != ti_payload.hostname or pid != ti_payload.pid:
-        log.warning(
-            "Task running elsewhere",
-            current_hostname=hostname,
-            current_pid=pid,
-            requested_hostname=ti_payload.hostname,
-            requested_pid=ti_payload.pid,
-        )
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail={
-                "reason": "running_elsewhere",
-                "message": "TI is already running elsewhere",
-                "current_hostname": hostname,
-                "current_pid": pid,
-            },
-        )
-
-    if previous_state != TaskInstanceState.RUNNING:
-        log.warning("Task not in running state", current_state=previous_state)
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail={
-                "reason": "not_running",
-                "message": "TI is no longer in the running state and task should terminate",
-                "current_state": previous_state,
-            },
-        )
+    if conflict := _heartbeat_conflict(previous_state, hostname, pid, ti_payload):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=conflict)
 
     # Update the last heartbeat time!
     session.execute(update(TI).where(TI.id == task_instance_id).values(last_heartbeat_at=timezone.utcnow()))
@@ -800,6 +860,76 @@ def get_previous_successful_dagrun(
     return PrevSuccessfulDagRunResponse.model_validate(dag_run)
 
 
+@router.put("/heartbeats", status_code=status.HTTP_200_OK)
+def ti_heartbeat_batch(
+    payload: TIBatchHeartbeatPayload,
+    session: SessionDep,
+    services=DepContainer,
+) -> TIBatchHeartbeatResponse:
+    """
+    Update the heartbeats of several TaskInstances at once, e.g. of all the tasks running on a host.
+
+    Each heartbeat carries the token of its TaskInstance, and gets the status code and detail the heartbeat
+    endpoint of that TaskInstance would have answered, along with a refreshed token when it expires soon.
+    The heartbeats of all the TaskInstances which may go on running are updated in a single statement.
+    """
+    validator: JWTValidator = services.get(JWTValidator)
+    generator: JWTGenerator = services.get(JWTGenerator)
+
+    results: dict[UUID, TIBatchHeartbeatResult] = {}
+    heartbeats: dict[UUID, TIBatchHeartbeatInfo] = {}
+    for heartbeat in payload.heartbeats:
+        try:
+            claims = validator.validated_claims(heartbeat.token, {})
+        except Exception as err:
+            detail = {"reason": "invalid_token", "message": f"Invalid auth token: {err}"}
+        else:
+            if claims.get("scope", "execution") == "execution" and str(claims["sub"]) == str(heartbeat.id):
+                heartbeats[heartbeat.id] = heartbeat
+                results[heartbeat.id] = TIBatchHeartbeatResult(
+                    id=heartbeat.id,
+                    status_code=status.HTTP_204_NO_CONTENT,
+                    refreshed_token=reissue_token_if_expiring(claims, generator),
+                )
+                continue
+            detail = {"reason": "invalid_token", "message": "Token subject does not match task instance ID"}
+        results[heartbeat.id] = TIBatchHeartbeatResult(
+            id=heartbeat.id, status_code=status.HTTP_403_FORBIDDEN, detail=detail
+        )
+
+    if heartbeats:
+        # Lock the rows in a consistent order, so that concurrent batches do not deadlock
+        rows = session.execute(
+            select(TI.id, TI.state, TI.hostname, TI.pid)
+            .where(TI.id.in_(heartbeats))
+            .order_by(TI.id)
+            .with_for_update()
+        ).all()
+        current = {ti_id: (state, hostname, pid) for ti_id, state, hostname, pid in rows}
+        alive = []
+        for ti_id, heartbeat in heartbeats.items():
+            result = results[ti_id]
+            if ti_id not in current:
+                log.error("Task Instance not found", ti_id=str(ti_id))
+                result.status_code = status.HTTP_404_NOT_FOUND
+                result.detail = {"reason": "not_found", "message": "Task Instance not found"}
+            elif conflict := _heartbeat_conflict(*current[ti_id], heartbeat):
+                result.status_code = status.HTTP_409_CONFLICT
+                result.detail = conflict
+            else:
+                alive.append(ti_id)
+        if alive:
+            session.execute(
+                update(TI)
+                .where(TI.id.in_(alive))
+                .values(last_heartbeat_at=timezone.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+        log.debug("Heartbeats updated", num_heartbeats=len(payload.heartbeats), num_alive=len(alive))
+
+    return TIBatchHeartbeatResponse(results=list(results.values()))
+
+
 @router.get("/count", status_code=status.HTTP_200_OK)
 def get_task_instance_count(
     dag_id: str,
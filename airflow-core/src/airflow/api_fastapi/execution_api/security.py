@@ -67,6 +67,7 @@ Why ``ExecutionAPIRoute`` is needed:
 # Disable future annotations in this file to work around https://github.com/fastapi/fastapi/issues/13056
 # ruff: noqa: I002
 
+import time
 from typing import Any, Literal, get_args
 
 import structlog
@@ -76,7 +77,7 @@ from fastapi.routing import APIRoute
 from fastapi.security import HTTPBearer, SecurityScopes
 from sqlalchemy import select
 
-from airflow.api_fastapi.auth.tokens import JWTValidator
+from airflow.api_fastapi.auth.tokens import JWTGenerator, JWTValidator
 from airflow.api_fastapi.common.db.common import AsyncSessionDep
 from airflow.api_fastapi.execution_api.datamodels.token import TIToken
 from airflow.api_fastapi.execution_api.deps import DepContainer
@@ -139,6 +140,18 @@ class JWTBearer(HTTPBearer):
 _jwt_bearer = JWTBearer()
 
 
+def reissue_token_if_expiring(claims: dict[str, Any], generator: JWTGenerator) -> str | None:
+    """Return a new token with the same ``claims`` if the token they were validated from expires soon."""
+    from airflow.configuration import conf
+
+    validity = conf.getint("execution_api", "jwt_expiration_time")
+    refresh_when_less_than = max(int(validity * 0.20), 30)
+    valid_left = int(claims.get("exp", 0)) - int(time.time())
+    if valid_left <= refresh_when_less_than:
+        return generator.generate(claims)
+    return None
+
+
 async def require_auth(
     security_scopes: SecurityScopes,
     request: Request,
@@ -34,7 +34,9 @@ from airflow.api_fastapi.execution_api.versions.v2025_12_08 import (
     MovePreviousRunEndpoint,
 )
 from airflow.api_fastapi.execution_api.versions.v2026_03_31 import (
+    AddBatchHeartbeatEndpoint,
     AddNoteField,
+    AddTaskInstanceClaimEndpoint,
     MakeDagRunStartDateNullable,
     ModifyDeferredTaskKwargsToJsonValue,
     RemoveUpstreamMapIndexesField,
@@ -48,6 +50,8 @@ bundle = VersionBundle(
         ModifyDeferredTaskKwargsToJsonValue,
         RemoveUpstreamMapIndexesField,
         AddNoteField,
+        AddBatchHeartbeatEndpoint,
+        AddTaskInstanceClaimEndpoint,
     ),
     Version("2025-12-08", MovePreviousRunEndpoint, AddDagRunDetailEndpoint),
     Version("2025-11-07", AddPartitionKeyField),
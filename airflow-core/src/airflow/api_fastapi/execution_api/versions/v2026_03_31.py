@@ -19,7 +19,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from cadwyn import ResponseInfo, VersionChange, convert_response_to_previous_version_for, schema
+from cadwyn import ResponseInfo, VersionChange, convert_response_to_previous_version_for, endpoint, schema
 
 from airflow.api_fastapi.common.types import UtcDateTime
 from airflow.api_fastapi.execution_api.datamodels.taskinstance import (
@@ -95,3 +95,23 @@ class MakeDagRunStartDateNullable(VersionChange):
         """Ensure start_date is never None in direct DagRun responses for previous API versions."""
         if response.body.get("start_date") is None:
             response.body["start_date"] = response.body.get("run_after")
+
+
+class AddBatchHeartbeatEndpoint(VersionChange):
+    """Add endpoint to heartbeat several task instances at once."""
+
+    description = __doc__
+
+    instructions_to_migrate_to_previous_version = (
+        endpoint("/task-instances/heartbeats", ["PUT"]).didnt_exist,
+    )
+
+
+class AddTaskInstanceClaimEndpoint(VersionChange):
+    """Add endpoint to mark a task instance as running without returning its run context."""
+
+    description = __doc__
+
+    instructions_to_migrate_to_previous_version = (
+        endpoint("/task-instances/{task_instance_id}/claim", ["PATCH"]).didnt_exist,
+    )
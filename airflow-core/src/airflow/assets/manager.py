@@ -43,6 +43,7 @@ from airflow.models.asset import (
 )
 from airflow.utils.helpers import is_container
 from airflow.utils.log.logging_mixin import LoggingMixin
+from airflow.utils.scheduler_wakeup import notify_scheduler
 from airflow.utils.sqlalchemy import get_dialect_name, with_row_locks
 
 if TYPE_CHECKING:
@@ -299,6 +300,8 @@ class AssetManager(LoggingMixin):
             event=asset_event,
             session=session,
         )
+        if dags_to_queue:
+            notify_scheduler(session)
         return asset_event
 
     @staticmethod
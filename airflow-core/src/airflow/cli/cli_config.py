@@ -251,6 +251,22 @@ ARG_LIST_LOCAL = Arg(
     action="store_true",
     help="Shows local parsed DAGs and their import errors, ignores content serialized in DB",
 )
+ARG_REPORT_PROFILE = Arg(
+    ("--profile",),
+    action="store_true",
+    help=(
+        "Show the time spent in each phase of parsing the DAG files, from the latest profiles the DAG "
+        "processor wrote with [dag_processor] parse_profiling enabled, instead of parsing the files"
+    ),
+)
+ARG_REPORT_PROFILE_DIR = Arg(
+    ("--profile-dir",),
+    help=(
+        "The log directory of the DAG processor to read the profiles of --profile from, e.g. the one of an "
+        "earlier day. Defaults to the 'latest' directory in "
+        "[logging] dag_processor_child_process_log_directory"
+    ),
+)
 
 # list_dag_runs
 ARG_NO_BACKFILL = Arg(
@@ -739,6 +755,17 @@ ARG_NUM_RUNS = Arg(
     help="Set the number of runs to execute before exiting",
 )
 
+ARG_PROFILE_LOOPS = Arg(
+    ("--profile-loops",),
+    default=0,
+    type=positive_int(allow_zero=True),
+    metavar="N",
+    help=(
+        "Run N scheduling loops, then exit and print how long each phase of the loop took, and how many "
+        "SQL statements and rows it used"
+    ),
+)
+
 ARG_ONLY_IDLE = Arg(
     ("-i", "--only-idle"),
     default=conf.getboolean("scheduler", "only_idle", fallback=False),
@@ -1100,7 +1127,7 @@ DAGS_COMMANDS = (
         name="report",
         help="Show DagBag loading report",
         func=lazy_load_command("airflow.cli.commands.dag_command.dag_report"),
-        args=(ARG_BUNDLE_NAME, ARG_OUTPUT, ARG_VERBOSE),
+        args=(ARG_BUNDLE_NAME, ARG_OUTPUT, ARG_VERBOSE, ARG_REPORT_PROFILE, ARG_REPORT_PROFILE_DIR),
     ),
     ActionCommand(
         name="list-runs",
@@ -2017,6 +2044,7 @@ core_commands: list[CLICommand] = [
         args=(
             ARG_NUM_RUNS,
             ARG_ONLY_IDLE,
+            ARG_PROFILE_LOOPS,
             ARG_PID,
             ARG_DAEMON,
             ARG_STDOUT,
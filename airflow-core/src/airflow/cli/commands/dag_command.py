@@ -28,6 +28,7 @@ import operator
 import re
 import subprocess
 import sys
+from pathlib import Path
 from typing import TYPE_CHECKING, cast
 
 from sqlalchemy import func, select
@@ -37,8 +38,10 @@ from airflow.api.client import get_current_api_client
 from airflow.api_fastapi.core_api.datamodels.dags import DAGResponse
 from airflow.cli.simple_table import AirflowConsole
 from airflow.cli.utils import fetch_dag_run_from_run_id_or_logical_date_string
+from airflow.configuration import conf
 from airflow.dag_processing.bundles.manager import DagBundlesManager
 from airflow.dag_processing.dagbag import BundleDagBag, DagBag, sync_bag_to_db
+from airflow.dag_processing.parse_profiling import PROFILE_SUFFIX, ParseProfile
 from airflow.exceptions import AirflowConfigException, AirflowException
 from airflow.jobs.job import Job
 from airflow.models import DagModel, DagRun, TaskInstance
@@ -566,6 +569,10 @@ def dag_report(args) -> None:
     else:
         bundles_to_reserialize = {b.name for b in all_bundles}
 
+    if args.profile:
+        _print_parse_profiles(bundles_to_reserialize, output=args.output, log_dir=args.profile_dir)
+        return
+
     all_dagbag_stats = []
     for bundle in all_bundles:
         if bundle.name not in bundles_to_reserialize:
@@ -587,6 +594,43 @@ def dag_report(args) -> None:
     )
 
 
+def _print_parse_profiles(bundle_names: set[str], output: str, log_dir: str | None = None) -> None:
+    """
+    Print the parse profiles the DAG processor wrote next to the logs of the files, slowest first.
+
+    :param log_dir: The log directory of the DAG processor with the profiles. The processor writes to a
+        directory per day, so by default only the profiles of the files parsed on the latest day are read.
+    """
+    profile_dir = (
+        Path(log_dir)
+        if log_dir is not None
+        else Path(conf.get("logging", "dag_processor_child_process_log_directory"), "latest")
+    )
+    profiles = []
+    for bundle_name in bundle_names:
+        bundle_log_dir = profile_dir / bundle_name
+        for path in bundle_log_dir.rglob(f"*{PROFILE_SUFFIX}"):
+            file = str(path.relative_to(bundle_log_dir))[: -len(PROFILE_SUFFIX)]
+            profiles.append((bundle_name, file, ParseProfile.model_validate_json(path.read_text())))
+    profiles.sort(key=lambda item: item[2].total, reverse=True)
+
+    AirflowConsole().print_as(
+        data=profiles,
+        output=output,
+        mapper=lambda x: {
+            "bundle_name": x[0],
+            "file": x[1],
+            "total": round(x[2].total, 3),
+            "stability_check": round(x[2].stability_check, 3),
+            "imports": round(x[2].imports, 3),
+            "runtime_state_requests": round(x[2].runtime_state_requests, 3),
+            "dag_construction": round(x[2].dag_construction, 3),
+            "serialization": round(x[2].serialization, 3),
+            "slowest_imports": [f"{name} ({duration:.3f}s)" for name, duration in x[2].slowest_imports],
+        },
+    )
+
+
 @cli_utils.action_cli
 @suppress_logs_and_warning
 @providers_configuration_loaded
@@ -38,14 +38,18 @@ log = logging.getLogger(__name__)
 
 @enable_memray_trace(component=MemrayTraceComponents.scheduler)
 def _run_scheduler_job(args) -> None:
+    profile_loops = args.profile_loops
     job_runner = SchedulerJobRunner(
         job=Job(),
-        num_runs=args.num_runs,
+        num_runs=profile_loops or args.num_runs,
         only_idle=args.only_idle,
+        profile_loops=bool(profile_loops),
     )
     enable_health_check = conf.getboolean("scheduler", "ENABLE_HEALTH_CHECK")
     with _serve_logs(args.skip_serve_logs), _serve_health_check(enable_health_check):
         run_job(job=job_runner.job, execute_callable=job_runner._execute)
+    if profile_loops and job_runner.loop_profiler is not None:
+        print(job_runner.loop_profiler.format_summary())
 
 
 @cli_utils.action_cli
@@ -301,6 +301,7 @@ class AirflowConfigParser(_SharedAirflowConfigParser):
             "modified_time",
             "random_seeded_by_host",
             "alphabetical",
+            "cost_aware",
         ],
         ("logging", "logging_level"): _available_logging_levels,
         ("logging", "fab_logging_level"): _available_logging_levels,
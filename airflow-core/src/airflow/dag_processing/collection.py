@@ -27,14 +27,17 @@ This should generally only be called by internal methods such as
 
 from __future__ import annotations
 
+import os
+import time
 import traceback
 from typing import TYPE_CHECKING, Any, NamedTuple, TypeVar
 
 import structlog
-from sqlalchemy import delete, func, insert, select, tuple_, update
+from sqlalchemy import delete, event, func, insert, select, tuple_, update
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import joinedload, load_only
 
+from airflow._shared.observability.metrics.stats import Stats
 from airflow._shared.timezones.timezone import utcnow
 from airflow.assets.manager import asset_manager
 from airflow.configuration import conf
@@ -418,6 +421,144 @@ def _update_import_errors(
         )
 
 
+class _DagWriteManifest(NamedTuple):
+    """Everything about the parsing result of a Dag file which is written to the DB."""
+
+    bundle_version: str | None
+    dag_hashes: frozenset[tuple[str, str]]
+    file_mtimes: frozenset[tuple[str, int | None]]
+    warnings: frozenset[DagWarning]
+
+    @classmethod
+    def build(
+        cls, bundle_version: str | None, dags: Collection[LazyDeserializedDAG], warnings: set[DagWarning]
+    ) -> Self:
+        file_mtimes = {}
+        for fileloc in {dag.fileloc for dag in dags}:
+            try:
+                # The source code of the Dags (DagCode) is not part of their hash
+                file_mtimes[fileloc] = os.stat(fileloc).st_mtime_ns
+            except OSError:
+                file_mtimes[fileloc] = None
+        return cls(
+            bundle_version=bundle_version,
+            dag_hashes=frozenset((dag.dag_id, dag.hash) for dag in dags),
+            file_mtimes=frozenset(file_mtimes.items()),
+            warnings=frozenset(warnings),
+        )
+
+
+class DagWriteManifests:
+    """
+    Remember, per Dag file, the parsing result last fully written to the DB.
+
+    When a file is parsed again with the same result, :func:`update_dag_parsing_results_in_db` only
+    updates the ``last_parsed_time`` of its Dags, instead of upserting the Dags, their tags, owner links,
+    assets, serialized Dags, import errors and warnings again.
+
+    :param full_write_interval: Write unchanged parsing results in full at least once every this many
+        seconds, so that fields computed from the DB such as ``next_dagrun`` do not drift. 0 disables
+        the fast path.
+    """
+
+    def __init__(self, full_write_interval: float):
+        self.full_write_interval = full_write_interval
+        self._manifests: dict[tuple[str, str], tuple[_DagWriteManifest, float]] = {}
+
+    def is_unchanged(self, key: tuple[str, str], manifest: _DagWriteManifest) -> bool:
+        if (last := self._manifests.get(key)) is None:
+            return False
+        last_manifest, written_at = last
+        return last_manifest == manifest and time.monotonic() - written_at < self.full_write_interval
+
+    def record(self, key: tuple[str, str], manifest: _DagWriteManifest, *, session: Session) -> None:
+        """
+        Remember that ``manifest`` was written for ``key``, once the current transaction is committed.
+
+        Until then the result may still be rolled back, e.g. for the whole batch to be retried, and must
+        then be written in full again.
+        """
+        if not self.full_write_interval:
+            return
+        if not event.contains(session, "after_commit", _apply_pending_manifests):
+            event.listen(session, "after_commit", _apply_pending_manifests)
+            event.listen(session, "after_soft_rollback", _drop_pending_manifests)
+        session.info.setdefault(_PENDING_MANIFESTS_KEY, []).append((self, key, manifest))
+
+    def discard(self, key: tuple[str, str]) -> None:
+        self._manifests.pop(key, None)
+
+
+_PENDING_MANIFESTS_KEY = "pending_dag_write_manifests"
+
+
+def _apply_pending_manifests(session: Session) -> None:
+    for manifests, key, manifest in session.info.pop(_PENDING_MANIFESTS_KEY, ()):
+        manifests._manifests[key] = (manifest, time.monotonic())
+
+
+def _drop_pending_manifests(session: Session, previous_transaction: Any) -> None:
+    session.info.pop(_PENDING_MANIFESTS_KEY, None)
+
+
+def _touch_parsed_dags(
+    bundle_name: str,
+    bundle_version: str | None,
+    relative_fileloc: str,
+    dag_ids: Collection[str],
+    parse_duration: float | None,
+    session: Session,
+) -> bool:
+    """
+    Update the ``last_parsed_time`` of Dags whose parsing result did not change.
+
+    :return: Whether all the Dags are still in the state they were last written in; if not, e.g. they
+        were deactivated in the meantime, they must be written in full.
+    """
+    if not dag_ids:
+        return True
+    result = session.execute(
+        update(DagModel)
+        .where(
+            DagModel.dag_id.in_(dag_ids),
+            DagModel.bundle_name == bundle_name,
+            DagModel.bundle_version.is_(None)
+            if bundle_version is None
+            else DagModel.bundle_version == bundle_version,
+            DagModel.relative_fileloc == relative_fileloc,
+            ~DagModel.is_stale,
+            ~DagModel.has_import_errors,
+        )
+        .values(last_parsed_time=utcnow(), last_parse_duration=parse_duration)
+        .execution_options(synchronize_session=False)
+    )
+    return getattr(result, "rowcount", 0) == len(dag_ids)
+
+
+def _write_dags(
+    bundle_name: str,
+    bundle_version: str | None,
+    dags: Collection[LazyDeserializedDAG],
+    parse_duration: float | None,
+    session: Session,
+) -> list[tuple[tuple[str, str], str]]:
+    """Write the Dags and serialized Dags to the DB, and return the serialization errors."""
+    log.debug("Calling the DAG.bulk_sync_to_db method")
+    SerializedDAG.bulk_write_to_db(bundle_name, bundle_version, dags, parse_duration, session=session)
+    # Write Serialized DAGs to DB, capturing errors
+    serialize_errors = []
+    for dag in dags:
+        serialize_errors.extend(
+            _serialize_dag_capturing_errors(
+                dag=dag,
+                bundle_name=bundle_name,
+                bundle_version=bundle_version,
+                session=session,
+            )
+        )
+    return serialize_errors
+
+
 def update_dag_parsing_results_in_db(
     bundle_name: str,
     bundle_version: str | None,
@@ -432,6 +573,8 @@ def update_dag_parsing_results_in_db(
         DagWarningType.RUNTIME_VARYING_VALUE,
     ),
     files_parsed: set[tuple[str, str]] | None = None,
+    manifests: DagWriteManifests | None = None,
+    retry_db_errors: bool = True,
 ):
     """
     Update everything to do with DAG parsing in the DB.
@@ -453,39 +596,49 @@ def update_dag_parsing_results_in_db(
     :param files_parsed: Set of (bundle_name, relative_fileloc) tuples for all files that were parsed.
         If None, will be inferred from dags and import_errors. Passing this explicitly ensures that
         import errors are cleared for files that were parsed but no longer contain DAGs.
+    :param manifests: If passed, skip writing the results of a file parsed without errors when they did
+        not change since they were last written, and only update the ``last_parsed_time`` of its Dags.
+    :param retry_db_errors: Roll back the session and retry on DB errors. Pass False when the session
+        holds other writes, e.g. of other files, and retry the whole transaction instead.
     """
-    # Retry 'DAG.bulk_write_to_db' & 'SerializedDagModel.bulk_sync_to_db' in case
-    # of any Operational Errors
-    # In case of failures, provide_session handles rollback
-    for attempt in run_with_db_retries(logger=log):
-        with attempt:
-            serialize_errors = []
-            log.debug(
-                "Running dagbag.bulk_write_to_db with retries. Try %d of %d",
-                attempt.retry_state.attempt_number,
-                MAX_DB_RETRIES,
-            )
-            log.debug("Calling the DAG.bulk_sync_to_db method")
-            try:
-                SerializedDAG.bulk_write_to_db(
-                    bundle_name, bundle_version, dags, parse_duration, session=session
+    manifest_key: tuple[str, str] | None = None
+    manifest: _DagWriteManifest | None = None
+    if manifests is not None and files_parsed is not None and len(files_parsed) == 1 and not import_errors:
+        (manifest_key,) = files_parsed
+        manifest = _DagWriteManifest.build(bundle_version, dags, warnings)
+        if manifests.is_unchanged(manifest_key, manifest) and _touch_parsed_dags(
+            bundle_name=bundle_name,
+            bundle_version=bundle_version,
+            relative_fileloc=manifest_key[1],
+            dag_ids=[dag.dag_id for dag in dags],
+            parse_duration=parse_duration,
+            session=session,
+        ):
+            Stats.incr("dag_processing.unchanged_result_count")
+            session.flush()
+            return
+
+    if retry_db_errors:
+        # Retry 'DAG.bulk_write_to_db' & 'SerializedDagModel.bulk_sync_to_db' in case
+        # of any Operational Errors
+        # In case of failures, provide_session handles rollback
+        for attempt in run_with_db_retries(logger=log):
+            with attempt:
+                log.debug(
+                    "Running dagbag.bulk_write_to_db with retries. Try %d of %d",
+                    attempt.retry_state.attempt_number,
+                    MAX_DB_RETRIES,
                 )
-                # Write Serialized DAGs to DB, capturing errors
-                for dag in dags:
-                    serialize_errors.extend(
-                        _serialize_dag_capturing_errors(
-                            dag=dag,
-                            bundle_name=bundle_name,
-                            bundle_version=bundle_version,
-                            session=session,
-                        )
-                    )
-            except OperationalError:
-                session.rollback()
-                raise
-            # Only now we are "complete" do we update import_errors - don't want to record errors from
-            # previous failed attempts
-            import_errors.update(serialize_errors)
+                try:
+                    serialize_errors = _write_dags(bundle_name, bundle_version, dags, parse_duration, session)
+                except OperationalError:
+                    session.rollback()
+                    raise
+    else:
+        serialize_errors = _write_dags(bundle_name, bundle_version, dags, parse_duration, session)
+    # Only now we are "complete" do we update import_errors - don't want to record errors from
+    # previous failed attempts
+    import_errors.update(serialize_errors)
     # Record import errors into the ORM - we don't retry on this one as it's not as critical that it works
     try:
         _update_import_errors(
@@ -505,6 +658,12 @@ def update_dag_parsing_results_in_db(
 
     session.flush()
 
+    if manifests is not None:
+        for key in files_parsed or ():
+            manifests.discard(key)
+        if manifest_key is not None and manifest is not None and not import_errors:
+            manifests.record(manifest_key, manifest, session=session)
+
 
 class DagModelOperation(NamedTuple):
     """Collect DAG objects and perform database operations for them."""
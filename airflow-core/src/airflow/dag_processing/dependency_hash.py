@@ -0,0 +1,180 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Content hashes of Dag files, including the local modules they import.
+
+With ``[dag_processor] unchanged_file_process_interval`` the Dag processor manager records the hash of
+a Dag file when it parses it, and re-parses the file at that (lower) cadence while the hash does not
+change. The hash covers the file itself and, recursively, every module it imports from its bundle, so
+editing a shared helper module re-parses the Dag files using it.
+"""
+
+from __future__ import annotations
+
+import ast
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from airflow.utils.dag_version_inflation_checker import RuntimeVaryingValueAnalyzer
+from airflow.utils.hashlib_wrapper import md5
+
+
+@dataclass(frozen=True)
+class DependencyHash:
+    """Hash of a Dag file and the local modules it imports."""
+
+    digest: str
+    is_time_based: bool
+    """Whether top-level code of the file or its local modules calls e.g. ``datetime.now()``"""
+
+
+@dataclass(frozen=True)
+class _ModuleScan:
+    mtime_ns: int
+    size: int
+    digest: str
+    imports: tuple[tuple[int, str], ...]
+    """``(level, module name)`` of every import; level is > 0 for relative imports"""
+    is_time_based: bool
+
+
+def _iter_imports(tree: ast.Module):
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                yield 0, alias.name
+        elif isinstance(node, ast.ImportFrom):
+            prefix = f"{node.module}." if node.module else ""
+            if node.module:
+                yield node.level, node.module
+            # ``from package import module`` imports a module too
+            for alias in node.names:
+                yield node.level, f"{prefix}{alias.name}"
+
+
+def _iter_top_level_calls(node: ast.AST):
+    """Yield the calls run when the module is imported, i.e. not those in function bodies."""
+    for child in ast.iter_child_nodes(node):
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            for expr in (*child.decorator_list, *child.args.defaults, *child.args.kw_defaults):
+                if expr is not None:
+                    yield from _iter_top_level_calls(expr)
+            continue
+        if isinstance(child, ast.Lambda):
+            continue
+        if isinstance(child, ast.Call):
+            yield child
+        yield from _iter_top_level_calls(child)
+
+
+def _is_time_based(tree: ast.Module) -> bool:
+    imports: dict[str, str] = {}
+    from_imports: dict[str, tuple[str, str]] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports[alias.asname or alias.name] = alias.name
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            for alias in node.names:
+                from_imports[alias.asname or alias.name] = (node.module, alias.name)
+    analyzer = RuntimeVaryingValueAnalyzer(varying_vars={}, imports=imports, from_imports=from_imports)
+    return any(analyzer.is_runtime_varying_call(call) for call in _iter_top_level_calls(tree))
+
+
+class DagFileDependencyHasher:
+    """
+    Compute :class:`DependencyHash` of Dag files.
+
+    Files are only read and parsed again when their modification time or size changed.
+    """
+
+    def __init__(self) -> None:
+        self._scans: dict[Path, _ModuleScan] = {}
+
+    def _scan(self, path: Path) -> _ModuleScan | None:
+        try:
+            st = path.stat()
+            if (scan := self._scans.get(path)) and (scan.mtime_ns, scan.size) == (st.st_mtime_ns, st.st_size):
+                return scan
+            content = path.read_bytes()
+        except OSError:
+            self._scans.pop(path, None)
+            return None
+        try:
+            tree = ast.parse(content)
+        except (SyntaxError, ValueError):
+            imports: tuple[tuple[int, str], ...] = ()
+            is_time_based = False
+        else:
+            imports = tuple(dict.fromkeys(_iter_imports(tree)))
+            is_time_based = _is_time_based(tree)
+        scan = _ModuleScan(
+            mtime_ns=st.st_mtime_ns,
+            size=st.st_size,
+            digest=md5(content).hexdigest(),
+            imports=imports,
+            is_time_based=is_time_based,
+        )
+        self._scans[path] = scan
+        return scan
+
+    @staticmethod
+    def _resolve(module_path: Path, level: int, name: str, bundle_path: Path):
+        """Yield the files in the bundle that importing ``name`` from ``module_path`` executes."""
+        if level:
+            base = module_path.parent
+            for _ in range(level - 1):
+                base = base.parent
+            yield base / "__init__.py"
+        else:
+            base = bundle_path
+        for part in name.split("."):
+            base = base / part
+            yield base / "__init__.py"
+            yield base.with_name(f"{part}.py")
+
+    def hash(self, path: Path, bundle_path: Path) -> DependencyHash | None:
+        """Hash the Dag file at ``path`` and the modules of ``bundle_path`` it imports, if readable."""
+        bundle_path = bundle_path.resolve()
+        to_visit = [path.resolve()]
+        digests: dict[Path, str] = {}
+        is_time_based = False
+        while to_visit:
+            module_path = to_visit.pop()
+            if module_path in digests:
+                continue
+            if (scan := self._scan(module_path)) is None:
+                continue
+            digests[module_path] = scan.digest
+            is_time_based |= scan.is_time_based
+            for level, name in scan.imports:
+                for candidate in self._resolve(module_path, level, name, bundle_path):
+                    if (
+                        candidate not in digests
+                        and candidate.is_relative_to(bundle_path)
+                        and os.path.isfile(candidate)
+                    ):
+                        to_visit.append(candidate)
+        if path.resolve() not in digests:
+            return None
+
+        hasher = md5()
+        for module_path in sorted(digests):
+            hasher.update(f"{os.path.relpath(module_path, bundle_path)}:{digests[module_path]}\n".encode())
+        return DependencyHash(digest=hasher.hexdigest(), is_time_based=is_time_based)
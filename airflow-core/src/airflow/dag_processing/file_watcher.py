@@ -0,0 +1,310 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Watch the directories of local Dag bundles for changes.
+
+By default the Dag processor manager walks every bundle, reading the files and the ``.airflowignore``
+files in it, each time the bundle is refreshed, and stats every Dag file whenever it sorts its queue
+by modification time. With ``[dag_processor] watch_local_bundles`` the manager watches the directories
+of its local bundles instead -- with inotify on Linux, and by polling their directory entries
+elsewhere or when inotify watches cannot be added -- and
+
+* only walks a bundle again once files were added, removed or renamed in it,
+* queues the Dag files which were modified for parsing right away,
+* caches the modification times of the Dag files until they change.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import os
+import struct
+import sys
+import threading
+import time
+import zipfile
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+import structlog
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+log = structlog.get_logger(__name__)
+
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = os.O_CLOEXEC
+
+_WATCH_MASK = (
+    _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+)
+_EVENT = struct.Struct("iIII")
+_READ_SIZE = 65536
+
+_IGNORE_FILE_NAME = ".airflowignore"
+
+
+class _Changes(NamedTuple):
+    paths: set[Path]
+    """Files which were created, modified, removed or renamed"""
+    directories_changed: bool = False
+    """Whether directories were created, removed or renamed, or changes may have been missed"""
+
+
+class _Inotify:
+    """Watch a directory tree with inotify."""
+
+    def __init__(self, root: Path):
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 failed: {os.strerror(errno)}")
+        self._fd = fd
+        self._directories: dict[int, Path] = {}
+        try:
+            self._watch_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch(self, path: Path) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_add_watch failed for {path}: {os.strerror(errno)}")
+        self._directories[wd] = path
+
+    def _watch_tree(self, root: Path) -> None:
+        self._watch(root)
+        seen = {os.path.realpath(root)}
+        for dirpath, dirnames, _ in os.walk(root, followlinks=True):
+            for dirname in list(dirnames):
+                path = Path(dirpath, dirname)
+                if (real_path := os.path.realpath(path)) in seen:
+                    # Do not follow symlink loops
+                    dirnames.remove(dirname)
+                    continue
+                seen.add(real_path)
+                self._watch(path)
+
+    def read(self) -> _Changes:
+        paths: set[Path] = set()
+        directories_changed = False
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                name = data[offset + _EVENT.size : offset + _EVENT.size + length].rstrip(b"\0")
+                offset += _EVENT.size + length
+                if mask & _IN_Q_OVERFLOW:
+                    directories_changed = True
+                    continue
+                if mask & _IN_IGNORED:
+                    self._directories.pop(wd, None)
+                    continue
+                if (directory := self._directories.get(wd)) is None:
+                    continue
+                if not name or mask & _IN_ISDIR:
+                    directories_changed = True
+                    if name and mask & (_IN_CREATE | _IN_MOVED_TO):
+                        try:
+                            self._watch_tree(directory / os.fsdecode(name))
+                        except OSError:
+                            log.warning("Could not watch new directory", path=directory, exc_info=True)
+                    continue
+                paths.add(directory / os.fsdecode(name))
+        return _Changes(paths, directories_changed)
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _Poller:
+    """Watch a directory tree by comparing the stats of its directory entries, at most every interval."""
+
+    def __init__(self, root: Path, interval: float):
+        self._root = root
+        self._interval = interval
+        self._last_poll = time.monotonic()
+        self._directories, self._files = self._scan()
+
+    def _scan(self) -> tuple[set[str], dict[str, tuple[int, int]]]:
+        directories: set[str] = set()
+        files: dict[str, tuple[int, int]] = {}
+        for dirpath, dirnames, filenames in os.walk(self._root, followlinks=True):
+            directories.update(os.path.join(dirpath, dirname) for dirname in dirnames)
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                files[path] = (st.st_mtime_ns, st.st_size)
+        return directories, files
+
+    def read(self) -> _Changes:
+        now = time.monotonic()
+        if now - self._last_poll < self._interval:
+            return _Changes(set())
+        self._last_poll = now
+        directories, files = self._scan()
+        paths = {
+            Path(path)
+            for path in files.keys() | self._files.keys()
+            if files.get(path) != self._files.get(path)
+        }
+        directories_changed = directories != self._directories
+        self._directories, self._files = directories, files
+        return _Changes(paths, directories_changed)
+
+    def close(self) -> None:
+        pass
+
+
+class WatchedChanges(NamedTuple):
+    """Changes of a watched bundle since it was last polled."""
+
+    modified: list[Path]
+    """Relative paths of the Dag files which were modified"""
+    relist: bool
+    """Whether Dag files may have been added or removed, so the bundle must be walked again"""
+
+
+class BundleFileWatcher:
+    """
+    Watch the directory of a local Dag bundle.
+
+    :param path: Path of the bundle.
+    :param poll_interval: How often to poll the directory when it cannot be watched with inotify.
+    """
+
+    def __init__(self, path: Path, poll_interval: float):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._backend: _Inotify | _Poller | None = None
+        self._mtimes: dict[Path, float] = {}
+        self._lock = threading.Lock()
+        self._dag_files: list[Path] | None = None
+        self._generation = 0
+
+    @staticmethod
+    def is_inotify_supported() -> bool:
+        return sys.platform == "linux"
+
+    def start(self) -> None:
+        if self.is_inotify_supported():
+            try:
+                self._backend = _Inotify(self.path)
+                return
+            except OSError:
+                log.warning("Could not watch bundle with inotify, polling it", path=self.path, exc_info=True)
+        self._backend = _Poller(self.path, self.poll_interval)
+
+    def stop(self) -> None:
+        if self._backend is not None:
+            self._backend.close()
+            self._backend = None
+
+    def _invalidate_dag_files(self) -> None:
+        with self._lock:
+            self._dag_files = None
+            self._generation += 1
+
+    def list_dag_files(self, list_files: Callable[[], list[Path]]) -> list[Path]:
+        """
+        Return the relative paths of the Dag files of the bundle.
+
+        They are only listed with ``list_files`` when they were not listed yet, or files may have been
+        added or removed since. This may be called from another thread than :meth:`poll`.
+        """
+        with self._lock:
+            if self._dag_files is not None:
+                return self._dag_files
+            generation = self._generation
+        dag_files = list_files()
+        with self._lock:
+            # Do not keep the list if the bundle changed while it was walked
+            if generation == self._generation:
+                self._dag_files = dag_files
+        return dag_files
+
+    def getmtime(self, path: Path) -> float:
+        """Return the modification time of the file at ``path``, like :func:`os.path.getmtime`."""
+        if (mtime := self._mtimes.get(path)) is None:
+            mtime = self._mtimes[path] = os.path.getmtime(path)
+        return mtime
+
+    def poll(self) -> WatchedChanges:
+        if self._backend is None:
+            return WatchedChanges(modified=[], relist=False)
+        changes = self._backend.read()
+        if changes.directories_changed:
+            self._mtimes.clear()
+        for path in changes.paths:
+            self._mtimes.pop(path, None)
+
+        with self._lock:
+            dag_files = set(self._dag_files) if self._dag_files is not None else None
+        relist = changes.directories_changed
+        modified = []
+        for path in changes.paths:
+            rel_path = path.relative_to(self.path)
+            if dag_files is None:
+                # The Dag files were not listed yet, or will be listed again already
+                relist = True
+            elif rel_path in dag_files:
+                if os.path.isfile(path):
+                    modified.append(rel_path)
+                else:
+                    relist = True
+            elif path.name == _IGNORE_FILE_NAME or _might_be_dag_file(path):
+                relist = True
+        if relist:
+            self._invalidate_dag_files()
+        return WatchedChanges(modified=sorted(modified), relist=relist)
+
+
+def _might_be_dag_file(path: Path) -> bool:
+    try:
+        return path.is_file() and (path.suffix == ".py" or zipfile.is_zipfile(path))
+    except OSError:
+        return False
@@ -0,0 +1,277 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+A clean process that Dag file processors are forked from.
+
+By default every Dag file processor is forked from the Dag processor manager itself. It inherits the
+manager's heap, which keeps growing and changing as the manager runs, so copy-on-write pages are
+quickly copied, and it imports the third-party libraries used by the Dag file from scratch. With
+``[dag_processor] parsing_fork_template`` the manager instead starts a fresh interpreter, the
+template, which imports ``[dag_processor] parsing_preload_modules``, freezes its heap with
+``gc.freeze()`` and then forks the processors on behalf of the manager.
+
+Processors are double-forked from the template, so that they are re-parented to the manager -- which
+is a child subreaper only while it waits for the template to fork one -- and the manager supervises them
+exactly like the processors it forks itself. Other orphaned descendants are still re-parented to init,
+which reaps them. This is only supported on Linux; elsewhere, and while the template is not ready,
+processors are forked from the manager.
+"""
+
+from __future__ import annotations
+
+import gc
+import importlib
+import json
+import os
+import select
+import socket
+import subprocess
+import sys
+from typing import TYPE_CHECKING, Any, NoReturn
+
+import psutil
+import structlog
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+log = structlog.get_logger(__name__)
+
+_PR_SET_CHILD_SUBREAPER = 36
+_MAX_MESSAGE_SIZE = 65536
+_NUM_SOCKETS = 4
+_SPAWN_TIMEOUT = 10.0
+
+
+def _set_child_subreaper(enabled: bool) -> None:
+    """Start or stop becoming the parent of orphaned descendants, such as processors forked by the template."""
+    import ctypes
+
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.prctl(_PR_SET_CHILD_SUBREAPER, int(enabled), 0, 0, 0) != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, f"prctl(PR_SET_CHILD_SUBREAPER) failed: {os.strerror(errno)}")
+
+
+def _rss() -> int:
+    return psutil.Process().memory_info().rss
+
+
+class ForkTemplate:
+    """
+    Handle on the fork template process, used by the Dag processor manager.
+
+    :param preload_modules: Modules the template imports before it forks any processor.
+    :param max_memory_growth: Restart the template once its RSS grew by more than this many bytes since
+        it was ready, e.g. from pre-importing the Airflow modules used by Dag files. 0 means never.
+    """
+
+    def __init__(self, preload_modules: Sequence[str] = (), max_memory_growth: int = 0):
+        self.preload_modules = list(preload_modules)
+        self.max_memory_growth = max_memory_growth
+        self._process: subprocess.Popen | None = None
+        self._control: socket.socket | None = None
+        self._ready_rss: int | None = None
+
+    @staticmethod
+    def is_supported() -> bool:
+        return sys.platform == "linux" and hasattr(socket, "send_fds")
+
+    @property
+    def pid(self) -> int | None:
+        return self._process.pid if self._process is not None else None
+
+    def start(self) -> None:
+        """Start the template; it can fork processors once it has imported the preloaded modules."""
+        control, child_control = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        with child_control:
+            self._process = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "airflow.dag_processing.fork_template",
+                    str(child_control.fileno()),
+                    *self.preload_modules,
+                ],
+                pass_fds=(child_control.fileno(),),
+                stdin=subprocess.DEVNULL,
+                # Like the processors forked from it, the template runs user code.
+                env={**os.environ, "_AIRFLOW_PROCESS_CONTEXT": "client"},
+            )
+        self._control = control
+        self._ready_rss = None
+
+    def stop(self) -> None:
+        """Stop the template. Processors already forked from it are not affected."""
+        if self._control is not None:
+            self._control.close()
+            self._control = None
+        if self._process is not None:
+            self._process.kill()
+            self._process.wait()
+            self._process = None
+        self._ready_rss = None
+
+    def restart(self) -> None:
+        self.stop()
+        self.start()
+
+    def _is_ready(self) -> bool:
+        if self._ready_rss is not None:
+            return True
+        if self._control is None:
+            return False
+        try:
+            message = self._control.recv(_MAX_MESSAGE_SIZE, socket.MSG_DONTWAIT)
+        except BlockingIOError:
+            return False
+        except OSError:
+            message = b""
+        if not message:
+            log.warning("Fork template exited before it was ready; restarting it")
+            self.restart()
+            return False
+        self._ready_rss = json.loads(message)["rss"]
+        log.info("Fork template ready", pid=self.pid, rss=self._ready_rss)
+        return True
+
+    def spawn(self, path: str, sockets: Sequence[socket.socket]) -> int | None:
+        """
+        Fork a Dag file processor for the Dag file at ``path`` from the template.
+
+        :param path: Path of the Dag file, whose Airflow imports the template pre-imports.
+        :param sockets: The child ends of the requests, stdout, stderr and logs sockets of the processor.
+        :return: The pid of the processor, or None if the template cannot fork it (yet).
+        """
+        if not self._is_ready():
+            return None
+        if TYPE_CHECKING:
+            assert self._control is not None
+            assert self._ready_rss is not None
+        try:
+            # The template reaps the intermediate process before it answers, so the processor has been
+            # re-parented to the manager by then. Being a subreaper for longer would make the manager the
+            # parent of every orphaned descendant, e.g. of processes started by Dag files, and it does not
+            # reap processes it does not know about.
+            _set_child_subreaper(True)
+            try:
+                socket.send_fds(
+                    self._control,
+                    [json.dumps({"path": path}).encode()],
+                    [sock.fileno() for sock in sockets],
+                )
+                readable, _, _ = select.select([self._control], [], [], _SPAWN_TIMEOUT)
+                if not readable:
+                    raise TimeoutError("Fork template did not answer")
+                if not (message := self._control.recv(_MAX_MESSAGE_SIZE)):
+                    raise ConnectionError("Fork template exited")
+            finally:
+                _set_child_subreaper(False)
+            response: dict[str, Any] = json.loads(message)
+        except (OSError, ValueError):
+            log.warning("Fork template failed; restarting it", exc_info=True)
+            self.restart()
+            return None
+
+        if "error" in response:
+            log.warning("Fork template could not fork a processor", path=path, error=response["error"])
+            return None
+        if self.max_memory_growth and response["rss"] - self._ready_rss > self.max_memory_growth:
+            log.info(
+                "Restarting fork template, its memory grew", rss=response["rss"], ready_rss=self._ready_rss
+            )
+            self.restart()
+        return response["pid"]
+
+
+def _processor_main(control: socket.socket, fds: list[int]) -> NoReturn:
+    from airflow.dag_processing.processor import _parse_file_entrypoint
+    from airflow.sdk.execution_time.supervisor import _fork_main
+
+    control.close()
+    requests, stdout, stderr, logs = (socket.socket(fileno=fd) for fd in fds)
+    try:
+        _fork_main(requests, stdout, stderr, logs.fileno(), _parse_file_entrypoint)
+    finally:
+        os._exit(124)
+
+
+def _fork_processor(control: socket.socket, fds: list[int]) -> int:
+    """Double-fork a processor, so that it is re-parented to the manager, and return its pid."""
+    read_pid, write_pid = os.pipe()
+    intermediate = os.fork()
+    if intermediate == 0:
+        os.close(read_pid)
+        try:
+            pid = os.fork()
+        except BaseException:
+            os._exit(1)
+        if pid == 0:
+            os.close(write_pid)
+            _processor_main(control, fds)
+        os.write(write_pid, str(pid).encode())
+        os._exit(0)
+
+    os.close(write_pid)
+    with os.fdopen(read_pid, "rb") as pipe:
+        pid_bytes = pipe.read()
+    os.waitpid(intermediate, 0)
+    if not pid_bytes:
+        raise RuntimeError("Could not fork a Dag file processor")
+    return int(pid_bytes)
+
+
+def _template_main(control_fd: int, preload_modules: Sequence[str]) -> NoReturn:
+    from airflow.dag_processing.processor import _pre_import_airflow_modules
+
+    control = socket.socket(fileno=control_fd)
+    for module in preload_modules:
+        try:
+            importlib.import_module(module)
+        except Exception:
+            log.warning("Could not preload module", module=module, exc_info=True)
+
+    # Everything allocated so far is shared with the processors; keep the GC from touching it.
+    gc.collect()
+    gc.freeze()
+    control.send(json.dumps({"rss": _rss()}).encode())
+
+    while True:
+        try:
+            message, fds, _, _ = socket.recv_fds(control, _MAX_MESSAGE_SIZE, _NUM_SOCKETS)
+        except OSError:
+            break
+        if not message:
+            # The manager closed its end
+            break
+        try:
+            if len(fds) != _NUM_SOCKETS:
+                raise ValueError(f"Expected {_NUM_SOCKETS} sockets, got {len(fds)}")
+            _pre_import_airflow_modules(json.loads(message)["path"], log)
+            response: dict[str, Any] = {"pid": _fork_processor(control, fds), "rss": _rss()}
+        except Exception as e:
+            response = {"error": str(e)}
+        finally:
+            for fd in fds:
+                os.close(fd)
+        control.send(json.dumps(response).encode())
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    _template_main(int(sys.argv[1]), sys.argv[2:])
@@ -32,6 +32,7 @@ import sys
 import time
 import zipfile
 from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from operator import attrgetter, itemgetter
@@ -40,7 +41,9 @@ from typing import TYPE_CHECKING, Any, Literal, NamedTuple, cast
 
 import attrs
 import structlog
+import tenacity
 from sqlalchemy import select, update
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import load_only
 from tabulate import tabulate
 from uuid6 import uuid7
@@ -50,8 +53,14 @@ from airflow._shared.timezones import timezone
 from airflow.api_fastapi.execution_api.app import InProcessExecutionAPI
 from airflow.configuration import conf
 from airflow.dag_processing.bundles.base import BundleUsageTrackingManager
+from airflow.dag_processing.bundles.local import LocalDagBundle
 from airflow.dag_processing.bundles.manager import DagBundlesManager
-from airflow.dag_processing.collection import update_dag_parsing_results_in_db
+from airflow.dag_processing.collection import DagWriteManifests, update_dag_parsing_results_in_db
+from airflow.dag_processing.dependency_hash import DagFileDependencyHasher, DependencyHash
+from airflow.dag_processing.file_watcher import BundleFileWatcher
+from airflow.dag_processing.fork_template import ForkTemplate
+from airflow.dag_processing.parse_profiling import PROFILE_SUFFIX
+from airflow.dag_processing.parse_scheduling import ParseCostScheduler
 from airflow.dag_processing.processor import DagFileParsingResult, DagFileProcessorProcess
 from airflow.exceptions import AirflowException
 from airflow.models.asset import remove_references_to_deleted_dags
@@ -71,12 +80,13 @@ from airflow.utils.net import get_hostname
 from airflow.utils.process_utils import (
     kill_child_processes_by_pids,
 )
-from airflow.utils.retries import retry_db_transaction
+from airflow.utils.retries import retry_db_transaction, run_with_db_retries
 from airflow.utils.session import NEW_SESSION, create_session, provide_session
 from airflow.utils.sqlalchemy import prohibit_commit, with_row_locks
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Iterable, Iterator, Sequence
+    from concurrent.futures import Future
     from socket import socket
 
     from sqlalchemy.orm import Session
@@ -84,6 +94,7 @@ if TYPE_CHECKING:
 
     from airflow.callbacks.callback_requests import CallbackRequest
     from airflow.dag_processing.bundles.base import BaseDagBundle
+    from airflow.dag_processing.parse_profiling import ParseProfile
     from airflow.sdk.api.client import Client
 
 
@@ -104,6 +115,10 @@ class DagFileStat:
     last_duration: float | None = None
     run_count: int = 0
     last_num_of_db_queries: int = 0
+    content_hash: str | None = None
+    """Hash of the file and the local modules it imports when it was last parsed, if it may be skipped"""
+    last_unchanged_time: datetime | None = None
+    """Last time the file was not re-parsed, because its content hash did not change"""
 
 
 @dataclass(frozen=True)
@@ -122,10 +137,41 @@ class DagFileInfo:
         return self.bundle_path / self.rel_path
 
 
+class _ParsedFile(NamedTuple):
+    """Result of a finished DAG file processor, waiting to be written to the DB."""
+
+    run_duration: float
+    finish_time: datetime
+    bundle_version: str | None
+    parsing_result: DagFileParsingResult | None
+    is_callback_only: bool
+    read_runtime_state: bool
+    content_hash: DependencyHash | None
+    collected_at: float
+
+
+class _BundleRefresh(NamedTuple):
+    """Result of refreshing a DAG bundle, see ``DagFileProcessorManager._refresh_bundle``."""
+
+    refreshed: bool
+    """Whether the bundle was initialized or refreshed"""
+    completed: bool = False
+    """Whether the bundle was refreshed successfully, which fulfills a forced refresh"""
+    version_changed: bool = False
+    """Whether the version of a bundle seen before changed"""
+    version: str | None = None
+    found_files: set[DagFileInfo] | None = None
+    """Files of the bundle, if they need to be updated"""
+
+
 def _config_int_factory(section: str, key: str):
     return functools.partial(conf.getint, section, key)
 
 
+def _config_float_factory(section: str, key: str):
+    return functools.partial(conf.getfloat, section, key)
+
+
 def _config_bool_factory(section: str, key: str):
     return functools.partial(conf.getboolean, section, key)
 
@@ -184,6 +230,9 @@ class DagFileProcessorManager(LoggingMixin):
     _file_process_interval: float = attrs.field(
         factory=_config_int_factory("dag_processor", "min_file_process_interval")
     )
+    _unchanged_file_process_interval: float = attrs.field(
+        factory=_config_int_factory("dag_processor", "unchanged_file_process_interval")
+    )
     stale_dag_threshold: float = attrs.field(
         factory=_config_int_factory("dag_processor", "stale_dag_threshold")
     )
@@ -207,6 +256,14 @@ class DagFileProcessorManager(LoggingMixin):
     _bundle_versions: dict[str, str | None] = attrs.field(factory=dict, init=False)
 
     _processors: dict[DagFileInfo, DagFileProcessorProcess] = attrs.field(factory=dict, init=False)
+    _retiring_processors: list[DagFileProcessorProcess] = attrs.field(factory=list, init=False)
+    """Processors which parsed their last file and are exiting"""
+    _files_per_process: int = attrs.field(
+        factory=_config_int_factory("dag_processor", "parsing_files_per_process")
+    )
+    _processor_max_memory_growth: int = attrs.field(
+        factory=lambda: conf.getint("dag_processor", "parsing_process_max_memory_growth") * 1024 * 1024
+    )
 
     _parsing_start_time: float | None = attrs.field(default=None, init=False)
     _num_run: int = attrs.field(default=0, init=False)
@@ -231,14 +288,65 @@ class DagFileProcessorManager(LoggingMixin):
     """Last time we checked if any bundles are ready to be refreshed"""
     _force_refresh_bundles: set[str] = attrs.field(factory=set, init=False)
     """List of bundles that need to be force refreshed in the next loop"""
+    _bundle_refresh_workers: int = attrs.field(
+        factory=_config_int_factory("dag_processor", "bundle_refresh_workers")
+    )
+    _slow_bundle_refresh_threshold: float = attrs.field(
+        factory=_config_float_factory("dag_processor", "slow_bundle_refresh_threshold")
+    )
+    _bundle_refresh_pool: ThreadPoolExecutor | None = attrs.field(default=None, init=False)
+    """Threads refreshing bundles in the background, if enabled"""
+    _bundle_refreshes: dict[str, tuple[BaseDagBundle, Future[_BundleRefresh], float]] = attrs.field(
+        factory=dict, init=False
+    )
+    """Bundle refreshes running in the background, with the time they started"""
+    _slow_bundle_refreshes: set[str] = attrs.field(factory=set, init=False)
+    _watch_local_bundles: bool = attrs.field(
+        factory=_config_bool_factory("dag_processor", "watch_local_bundles")
+    )
+    _file_watchers: dict[str, BundleFileWatcher] = attrs.field(factory=dict, init=False)
+    """Watchers of the directories of local bundles, if enabled"""
 
     _file_parsing_sort_mode: str = attrs.field(
         factory=_config_get_factory("dag_processor", "file_parsing_sort_mode")
     )
 
+    _parse_cost_scheduler: ParseCostScheduler = attrs.field(
+        factory=lambda: ParseCostScheduler(
+            aging_interval=conf.getint("dag_processor", "min_file_process_interval"),
+            timed_out_file_process_interval=conf.getint("dag_processor", "timed_out_file_process_interval"),
+        ),
+        init=False,
+    )
+    """Parse costs of the files, used to order them with the ``cost_aware`` sort mode"""
+
     _api_server: InProcessExecutionAPI = attrs.field(init=False, factory=InProcessExecutionAPI)
     """API server to interact with Metadata DB"""
 
+    _fork_template: ForkTemplate | None = attrs.field(default=None, init=False)
+    """Clean process the DAG file processors are forked from, if enabled"""
+
+    _dependency_hasher: DagFileDependencyHasher = attrs.field(factory=DagFileDependencyHasher, init=False)
+    _parsing_content_hashes: dict[DagFileInfo, DependencyHash | None] = attrs.field(factory=dict, init=False)
+    """Content hashes of the files being parsed, taken when their processors started"""
+
+    _dag_write_manifests: DagWriteManifests = attrs.field(
+        factory=lambda: DagWriteManifests(
+            full_write_interval=conf.getint("dag_processor", "unchanged_dag_full_write_interval")
+        ),
+        init=False,
+    )
+    """Parsing results last written to the DB, to skip writing unchanged results again"""
+
+    _result_batch_size: int = attrs.field(
+        factory=_config_int_factory("dag_processor", "parsing_result_batch_size")
+    )
+    _result_batch_max_delay: float = attrs.field(
+        factory=_config_float_factory("dag_processor", "parsing_result_batch_max_delay")
+    )
+    _pending_results: dict[DagFileInfo, _ParsedFile] = attrs.field(factory=dict, init=False)
+    """Results of finished processors which are not written to the DB yet"""
+
     def register_exit_signals(self):
         """Register signals that stop child processes."""
         signal.signal(signal.SIGINT, self._exit_gracefully)
@@ -301,11 +409,51 @@ class DagFileProcessorManager(LoggingMixin):
 
         self._symlink_latest_log_directory()
 
+        if self._bundle_refresh_workers > 0:
+            self._bundle_refresh_pool = ThreadPoolExecutor(
+                max_workers=self._bundle_refresh_workers, thread_name_prefix="bundle-refresh"
+            )
+
+        if conf.getboolean("dag_processor", "parsing_fork_template"):
+            self._start_fork_template()
+
+        if self._watch_local_bundles:
+            self._start_file_watchers()
+
         # To prevent COW in forked process parsing dag file
         gc.freeze()
 
         return self._run_parsing_loop()
 
+    def _start_fork_template(self):
+        if not ForkTemplate.is_supported():
+            self.log.warning("[dag_processor] parsing_fork_template is only supported on Linux, ignoring it")
+            return
+        fork_template = ForkTemplate(
+            preload_modules=conf.getlist("dag_processor", "parsing_preload_modules"),
+            max_memory_growth=conf.getint("dag_processor", "fork_template_max_memory_growth") * 1024 * 1024,
+        )
+        try:
+            fork_template.start()
+        except OSError:
+            self.log.exception("Could not start the fork template, forking DAG file processors directly")
+            return
+        self._fork_template = fork_template
+
+    def _start_file_watchers(self):
+        for bundle in self._dag_bundles:
+            if not isinstance(bundle, LocalDagBundle):
+                continue
+            watcher = BundleFileWatcher(bundle.path, poll_interval=self.bundle_refresh_check_interval)
+            try:
+                watcher.start()
+            except OSError:
+                self.log.exception(
+                    "Could not watch bundle %s, listing its files on every refresh", bundle.name
+                )
+                continue
+            self._file_watchers[bundle.name] = watcher
+
     def _scan_stale_dags(self):
         """Scan and deactivate DAGs which are no longer present in files."""
         now = time.monotonic()
@@ -436,6 +584,9 @@ class DagFileProcessorManager(LoggingMixin):
             else:
                 poll_time = 0.0
 
+        # Do not lose the results which are still waiting to be written
+        self._write_results()
+
     def _service_processor_sockets(self, timeout: float | None = 1.0):
         """
         Service subprocess events by polling sockets for activity.
@@ -567,6 +718,12 @@ class DagFileProcessorManager(LoggingMixin):
 
     def _refresh_dag_bundles(self, known_files: dict[str, set[DagFileInfo]]):
         """Refresh DAG bundles, if required."""
+        self._poll_file_watchers()
+
+        any_refreshed = False
+        if self._bundle_refresh_pool is not None:
+            any_refreshed = self._apply_finished_bundle_refreshes(known_files)
+
         now = timezone.utcnow()
 
         # we don't need to check if it's time to refresh every loop - that is way too often
@@ -577,106 +734,181 @@ class DagFileProcessorManager(LoggingMixin):
                 "Not time to check if DAG Bundles need refreshed yet - skipping. Next check in %.2f seconds",
                 next_check - now_seconds,
             )
-            return
+        else:
+            self._bundles_last_refreshed = now_seconds
+            for bundle in self._dag_bundles:
+                if self._bundle_refresh_pool is None:
+                    result = self._refresh_bundle(bundle, now)
+                    any_refreshed |= self._apply_bundle_refresh(bundle, result, known_files)
+                elif bundle.name not in self._bundle_refreshes:
+                    # Refreshed in the background; the next loops apply the result once it is done
+                    future = self._bundle_refresh_pool.submit(self._refresh_bundle, bundle, now)
+                    self._bundle_refreshes[bundle.name] = (bundle, future, now_seconds)
 
-        self._bundles_last_refreshed = now_seconds
+        if any_refreshed:
+            self.handle_removed_files(known_files=known_files)
+            self._resort_file_queue()
+            self._add_new_files_to_queue(known_files=known_files)
 
-        any_refreshed = False
+    def _poll_file_watchers(self):
+        """Queue the modified Dag files of the watched bundles, and refresh those whose files changed."""
         for bundle in self._dag_bundles:
-            # TODO: AIP-66 handle errors in the case of incomplete cloning? And test this.
-            #  What if the cloning/refreshing took too long(longer than the dag processor timeout)
-            if not bundle.is_initialized:
-                try:
-                    bundle.initialize()
-                    any_refreshed = True
-                except AirflowException as e:
-                    self.log.exception("Error initializing bundle %s: %s", bundle.name, e)
-                    continue
-            # TODO: AIP-66 test to make sure we get a fresh record from the db and it's not cached
-            with create_session() as session:
-                bundle_model = session.get(DagBundleModel, bundle.name)
-                if bundle_model is None:
-                    self.log.warning("Bundle model not found for %s", bundle.name)
-                    continue
-                elapsed_time_since_refresh = (
-                    now - (bundle_model.last_refreshed or utc_epoch())
-                ).total_seconds()
-                if bundle.supports_versioning:
-                    # we will also check the version of the bundle to see if another DAG processor has seen
-                    # a new version
-                    pre_refresh_version = (
-                        self._bundle_versions.get(bundle.name) or bundle.get_current_version()
-                    )
-                    current_version_matches_db = pre_refresh_version == bundle_model.version
-                else:
-                    # With no versioning, it always "matches"
-                    current_version_matches_db = True
-
-                previously_seen = bundle.name in self._bundle_versions
-                if self.should_skip_refresh(
-                    bundle=bundle,
-                    elapsed_time_since_refresh=elapsed_time_since_refresh,
-                    current_version_matches_db=current_version_matches_db,
-                    previously_seen=previously_seen,
-                ):
-                    self.log.info("Not time to refresh bundle %s", bundle.name)
-                    continue
+            if (watcher := self._file_watchers.get(bundle.name)) is None:
+                continue
+            changes = watcher.poll()
+            if changes.relist:
+                self._force_refresh_bundles.add(bundle.name)
+            if changes.modified:
+                self.log.info(
+                    "Adding %d modified files of bundle %s to the queue", len(changes.modified), bundle.name
+                )
+                self._add_files_to_queue(
+                    [
+                        DagFileInfo(rel_path=rel_path, bundle_name=bundle.name, bundle_path=bundle.path)
+                        for rel_path in changes.modified
+                    ],
+                    mode="front",
+                )
 
-                self.log.info("Refreshing bundle %s", bundle.name)
+    def _apply_finished_bundle_refreshes(self, known_files: dict[str, set[DagFileInfo]]) -> bool:
+        """Apply the results of the bundle refreshes running in the background which are done."""
+        any_refreshed = False
+        now_seconds = time.monotonic()
+        for name, (bundle, future, started) in list(self._bundle_refreshes.items()):
+            if not future.done():
+                elapsed = now_seconds - started
+                if self._slow_bundle_refresh_threshold and elapsed > self._slow_bundle_refresh_threshold:
+                    if name not in self._slow_bundle_refreshes:
+                        self._slow_bundle_refreshes.add(name)
+                        self.log.warning("Refreshing bundle %s takes longer than %.0f seconds", name, elapsed)
+                        Stats.incr("dag_processing.slow_bundle_refresh", tags={"bundle_name": name})
+                continue
+            del self._bundle_refreshes[name]
+            self._slow_bundle_refreshes.discard(name)
+            try:
+                result = future.result()
+            except Exception:
+                self.log.exception("Error refreshing bundle %s", name)
+                continue
+            any_refreshed |= self._apply_bundle_refresh(bundle, result, known_files)
+        return any_refreshed
 
-                try:
-                    bundle.refresh()
-                    any_refreshed = True
-                except Exception:
-                    self.log.exception("Error refreshing bundle %s", bundle.name)
-                    continue
+    def _apply_bundle_refresh(
+        self, bundle: BaseDagBundle, result: _BundleRefresh, known_files: dict[str, set[DagFileInfo]]
+    ) -> bool:
+        """Apply the result of refreshing a bundle to the state of the parsing loop."""
+        if result.completed:
+            self._force_refresh_bundles.discard(bundle.name)
+        if result.version_changed and self._fork_template is not None:
+            # Modules the template imported may have changed with the bundle
+            self._fork_template.restart()
+        if result.found_files is not None:
+            self._bundle_versions[bundle.name] = result.version
+            known_files[bundle.name] = result.found_files
+        return result.refreshed
+
+    def _refresh_bundle(self, bundle: BaseDagBundle, now: datetime) -> _BundleRefresh:
+        """
+        Refresh a DAG bundle if required, and list its files.
 
-                bundle_model.last_refreshed = now
-                self._force_refresh_bundles.discard(bundle.name)
-
-                if bundle.supports_versioning:
-                    # We can short-circuit the rest of this if (1) bundle was seen before by
-                    # this dag processor and (2) the version of the bundle did not change
-                    # after refreshing it
-                    version_after_refresh = bundle.get_current_version()
-                    if previously_seen and pre_refresh_version == version_after_refresh:
-                        self.log.debug(
-                            "Bundle %s version not changed after refresh: %s",
-                            bundle.name,
-                            version_after_refresh,
-                        )
-                        continue
+        This may run in a worker thread, so it does not change the state of the parsing loop, which
+        :meth:`_apply_bundle_refresh` does with the returned result.
+        """
+        refreshed = False
+        # TODO: AIP-66 handle errors in the case of incomplete cloning? And test this.
+        #  What if the cloning/refreshing took too long(longer than the dag processor timeout)
+        if not bundle.is_initialized:
+            try:
+                bundle.initialize()
+                refreshed = True
+            except AirflowException as e:
+                self.log.exception("Error initializing bundle %s: %s", bundle.name, e)
+                return _BundleRefresh(refreshed=False)
+        # TODO: AIP-66 test to make sure we get a fresh record from the db and it's not cached
+        with create_session() as session:
+            bundle_model = session.get(DagBundleModel, bundle.name)
+            if bundle_model is None:
+                self.log.warning("Bundle model not found for %s", bundle.name)
+                return _BundleRefresh(refreshed=refreshed)
+            elapsed_time_since_refresh = (now - (bundle_model.last_refreshed or utc_epoch())).total_seconds()
+            if bundle.supports_versioning:
+                # we will also check the version of the bundle to see if another DAG processor has seen
+                # a new version
+                pre_refresh_version = self._bundle_versions.get(bundle.name) or bundle.get_current_version()
+                current_version_matches_db = pre_refresh_version == bundle_model.version
+            else:
+                # With no versioning, it always "matches"
+                current_version_matches_db = True
 
-                    bundle_model.version = version_after_refresh
+            previously_seen = bundle.name in self._bundle_versions
+            if self.should_skip_refresh(
+                bundle=bundle,
+                elapsed_time_since_refresh=elapsed_time_since_refresh,
+                current_version_matches_db=current_version_matches_db,
+                previously_seen=previously_seen,
+            ):
+                self.log.info("Not time to refresh bundle %s", bundle.name)
+                return _BundleRefresh(refreshed=refreshed)
 
-                    self.log.info(
-                        "Version changed for %s, new version: %s", bundle.name, version_after_refresh
+            self.log.info("Refreshing bundle %s", bundle.name)
+
+            try:
+                bundle.refresh()
+                refreshed = True
+            except Exception:
+                self.log.exception("Error refreshing bundle %s", bundle.name)
+                return _BundleRefresh(refreshed=refreshed)
+
+            bundle_model.last_refreshed = now
+
+            version_changed = False
+            if bundle.supports_versioning:
+                # We can short-circuit the rest of this if (1) bundle was seen before by
+                # this dag processor and (2) the version of the bundle did not change
+                # after refreshing it
+                version_after_refresh = bundle.get_current_version()
+                if previously_seen and pre_refresh_version == version_after_refresh:
+                    self.log.debug(
+                        "Bundle %s version not changed after refresh: %s",
+                        bundle.name,
+                        version_after_refresh,
                     )
-                else:
-                    version_after_refresh = None
+                    return _BundleRefresh(refreshed=refreshed, completed=True)
 
-            self._bundle_versions[bundle.name] = version_after_refresh
+                bundle_model.version = version_after_refresh
 
-            found_files = {
-                DagFileInfo(rel_path=p, bundle_name=bundle.name, bundle_path=bundle.path)
-                for p in self._find_files_in_bundle(bundle)
-            }
-
-            known_files[bundle.name] = found_files
+                self.log.info("Version changed for %s, new version: %s", bundle.name, version_after_refresh)
+                version_changed = previously_seen
+            else:
+                version_after_refresh = None
 
-            self.deactivate_deleted_dags(bundle_name=bundle.name, present=found_files)
-            self.clear_orphaned_import_errors(
-                bundle_name=bundle.name,
-                observed_filelocs={str(x.rel_path) for x in found_files},  # todo: make relative
-            )
+        found_files = {
+            DagFileInfo(rel_path=p, bundle_name=bundle.name, bundle_path=bundle.path)
+            for p in self._find_files_in_bundle(bundle)
+        }
 
-        if any_refreshed:
-            self.handle_removed_files(known_files=known_files)
-            self._resort_file_queue()
-            self._add_new_files_to_queue(known_files=known_files)
+        self.deactivate_deleted_dags(bundle_name=bundle.name, present=found_files)
+        self.clear_orphaned_import_errors(
+            bundle_name=bundle.name,
+            observed_filelocs={str(x.rel_path) for x in found_files},  # todo: make relative
+        )
+        return _BundleRefresh(
+            refreshed=refreshed,
+            completed=True,
+            version_changed=version_changed,
+            version=version_after_refresh,
+            found_files=found_files,
+        )
 
     def _find_files_in_bundle(self, bundle: BaseDagBundle) -> list[Path]:
         """Get relative paths for dag files from bundle dir."""
+        if (watcher := self._file_watchers.get(bundle.name)) is not None:
+            # Only walk the bundle again if files were added or removed since it was last walked
+            return watcher.list_dag_files(lambda: self._list_files_in_bundle(bundle))
+        return self._list_files_in_bundle(bundle)
+
+    def _list_files_in_bundle(self, bundle: BaseDagBundle) -> list[Path]:
+        """Walk the bundle dir to find the dag files."""
         # Build up a list of Python files that could contain DAGs
         self.log.info("Searching for files in %s at %s", bundle.name, bundle.path)
         rel_paths = [Path(x).relative_to(bundle.path) for x in list_py_file_paths(bundle.path)]
@@ -887,12 +1119,15 @@ class DagFileProcessorManager(LoggingMixin):
         stats_to_remove = set(self._file_stats).difference(present)
         for file in stats_to_remove:
             del self._file_stats[file]
+            self._dag_write_manifests.discard((file.bundle_name, str(file.rel_path)))
+        self._parse_cost_scheduler.retain(present)
 
     def terminate_orphan_processes(self, present: set[DagFileInfo]):
         """Stop processors that are working on deleted files."""
         for file in list(self._processors.keys()):
             if file not in present:
                 processor = self._processors.pop(file, None)
+                self._parsing_content_hashes.pop(file, None)
                 if not processor:
                     continue
                 file_name = str(file.rel_path)
@@ -901,40 +1136,183 @@ class DagFileProcessorManager(LoggingMixin):
                 processor.kill(signal.SIGKILL)
                 processor.logger_filehandle.close()
                 self._file_stats.pop(file, None)
+        for file in set(self._pending_results).difference(present):
+            del self._pending_results[file]
 
-    @provide_session
-    def _collect_results(self, session: Session = NEW_SESSION):
-        # TODO: Use an explicit session in this fn
+    def _collect_results(self):
         finished = []
         for file, proc in self._processors.items():
-            if not proc.is_ready:
+            waiting_for_next_file = self._files_per_process > 1 and proc.is_waiting_for_next_file
+            if not waiting_for_next_file and not proc.is_ready:
                 # This processor hasn't finished yet, or we haven't read all the output from it yet
                 continue
-            finished.append(file)
+            finished.append((file, waiting_for_next_file))
 
             # Detect if this was callback-only processing
             # For such-cases, we don't serialize the dags and hence send parsing_result as None.
             is_callback_only = proc.had_callbacks and proc.parsing_result is None
             if is_callback_only:
                 self.log.debug("Detected callback-only processing for %s", file)
+            if proc.parsing_result is not None and proc.parsing_result.profile is not None:
+                self._write_parse_profile(file, proc.parsing_result.profile)
 
-            # Collect the DAGS and import errors into the DB, emit metrics etc.
-            self._file_stats[file] = process_parse_results(
+            self._pending_results[file] = _ParsedFile(
                 run_duration=time.monotonic() - proc.start_time,
                 finish_time=timezone.utcnow(),
-                run_count=self._file_stats[file].run_count,
-                bundle_name=file.bundle_name,
                 bundle_version=self._bundle_versions[file.bundle_name],
                 parsing_result=proc.parsing_result,
-                session=session,
                 is_callback_only=is_callback_only,
-                relative_fileloc=str(file.rel_path),
+                read_runtime_state=proc.read_runtime_state,
+                content_hash=self._parsing_content_hashes.pop(file, None),
+                collected_at=time.monotonic(),
             )
 
-        for file in finished:
+        for file, waiting_for_next_file in finished:
             processor = self._processors.pop(file)
+            if waiting_for_next_file:
+                self._reuse_processor(processor, file)
+            else:
+                processor.logger_filehandle.close()
+
+        for processor in [p for p in self._retiring_processors if p.is_ready]:
+            self._retiring_processors.remove(processor)
             processor.logger_filehandle.close()
 
+        if self._should_write_results():
+            self._write_results()
+
+    def _reuse_processor(self, processor: DagFileProcessorProcess, file: DagFileInfo) -> None:
+        """
+        Make a processor which parsed ``file`` parse the next file of the queue, or let it exit.
+
+        Processors exit once the version of their bundle changed, since modules they imported from the
+        bundle may have changed too.
+        """
+        next_file = None
+        too_big = self._processor_max_memory_growth and (
+            processor.memory_growth() > self._processor_max_memory_growth
+        )
+        bundle_changed = processor.bundle_version != self._bundle_versions.get(file.bundle_name)
+        if processor.files_parsed < self._files_per_process and not too_big and not bundle_changed:
+            next_file = self._pop_file_for_processor_of(file)
+        if next_file is None:
+            processor.finish()
+            self._retiring_processors.append(processor)
+            return
+
+        if self._unchanged_file_process_interval:
+            self._parsing_content_hashes[next_file] = self._dependency_hash(next_file)
+        processor.parse_next_file(
+            path=next_file.absolute_path,
+            bundle_path=cast("Path", next_file.bundle_path),
+            bundle_name=next_file.bundle_name,
+        )
+        self._processors[next_file] = processor
+        Stats.gauge("dag_processing.file_path_queue_size", len(self._file_queue))
+
+    def _pop_file_for_processor_of(self, file: DagFileInfo) -> DagFileInfo | None:
+        """
+        Pop the first queued file which a processor that parsed ``file`` can parse next.
+
+        That is a file of the same bundle -- modules imported from a bundle stay imported in the
+        processor -- without callbacks to run, which are always run in a processor of their own.
+        """
+        for candidate in self._file_queue:
+            if (
+                candidate.bundle_name == file.bundle_name
+                and candidate.bundle_path == file.bundle_path
+                and candidate not in self._processors
+                and candidate not in self._callback_to_execute
+            ):
+                self._file_queue.remove(candidate)
+                return candidate
+        return None
+
+    def _should_write_results(self) -> bool:
+        if not self._pending_results:
+            return False
+        if self._result_batch_size <= 0 or len(self._pending_results) >= self._result_batch_size:
+            return True
+        if not self._processors and not self._file_queue:
+            # Nothing else to wait for
+            return True
+        oldest = min(result.collected_at for result in self._pending_results.values())
+        return time.monotonic() - oldest >= self._result_batch_max_delay
+
+    def _write_results(self) -> None:
+        """
+        Write the results of finished processors to the DB in one transaction.
+
+        The result of each file is written in a savepoint of its own, so that if writing it fails, only
+        that result is rolled back and the file counts as failing to import. The whole batch is retried
+        on operational DB errors, e.g. lost connections or deadlocks. Results stay pending until the
+        transaction is committed.
+        """
+        for attempt in run_with_db_retries(
+            logger=self.log, retry=tenacity.retry_if_exception_type(OperationalError)
+        ):
+            with attempt, create_session() as session:
+                stats: dict[DagFileInfo, DagFileStat] = {}
+                failed: dict[DagFileInfo, DagFileStat] = {}
+                for file, result in self._pending_results.items():
+                    try:
+                        with session.begin_nested():
+                            stats[file] = self._write_result(file, result, session=session)
+                    except OperationalError:
+                        raise
+                    except Exception:
+                        self.log.exception("Failed to write the parsing result of %s", file)
+                        failed[file] = DagFileStat(
+                            import_errors=1,
+                            last_finish_time=result.finish_time,
+                            last_duration=result.run_duration,
+                            run_count=self._file_stats[file].run_count + 1,
+                        )
+        written = self._pending_results
+        self._pending_results = {}
+        self._file_stats.update(stats)
+        self._file_stats.update(failed)
+        for file, stat in stats.items():
+            if not written[file].is_callback_only:
+                self._record_parse_cost(file, stat)
+
+    def _record_parse_cost(self, file: DagFileInfo, stat: DagFileStat, *, timed_out: bool = False) -> None:
+        if self._file_parsing_sort_mode != "cost_aware" or stat.last_duration is None:
+            return
+        try:
+            mtime = self._get_mtime(file)
+        except OSError:
+            mtime = None
+        self._parse_cost_scheduler.record_parse(
+            file, duration=stat.last_duration, num_dags=stat.num_dags, timed_out=timed_out, mtime=mtime
+        )
+
+    def _write_result(self, file: DagFileInfo, result: _ParsedFile, *, session: Session) -> DagFileStat:
+        # Collect the DAGS and import errors into the DB, emit metrics etc.
+        stat = process_parse_results(
+            run_duration=result.run_duration,
+            finish_time=result.finish_time,
+            run_count=self._file_stats[file].run_count,
+            bundle_name=file.bundle_name,
+            bundle_version=result.bundle_version,
+            parsing_result=result.parsing_result,
+            session=session,
+            is_callback_only=result.is_callback_only,
+            relative_fileloc=str(file.rel_path),
+            dag_write_manifests=self._dag_write_manifests,
+            retry_db_errors=False,
+        )
+        content_hash = result.content_hash
+        if (
+            content_hash is not None
+            and not result.is_callback_only
+            and not stat.import_errors
+            and not content_hash.is_time_based
+            and not result.read_runtime_state
+        ):
+            stat.content_hash = content_hash.digest
+        return stat
+
     def _get_log_dir(self) -> str:
         return os.path.join(self.base_log_dir, timezone.utcnow().strftime("%Y-%m-%d"))
 
@@ -973,6 +1351,15 @@ class DagFileProcessorManager(LoggingMixin):
         relative_path = Path(dag_file.rel_path)
         return os.path.join(self._get_log_dir(), bundle.name, f"{relative_path}.log")
 
+    def _write_parse_profile(self, dag_file: DagFileInfo, profile: ParseProfile) -> None:
+        """Write the parse profile of a file next to its log, for ``airflow dags report --profile``."""
+        path = Path(self._render_log_filename(dag_file)).with_suffix(PROFILE_SUFFIX)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(profile.model_dump_json())
+        except OSError:
+            self.log.warning("Could not write the parse profile of %s", dag_file.rel_path, exc_info=True)
+
     def _get_logger_for_dag_file(self, dag_file: DagFileInfo):
         log_filename = self._render_log_filename(dag_file)
         log_file = init_log_file(log_filename)
@@ -997,6 +1384,8 @@ class DagFileProcessorManager(LoggingMixin):
 
         callback_to_execute_for_file = self._callback_to_execute.pop(dag_file, [])
         logger, logger_filehandle = self._get_logger_for_dag_file(dag_file)
+        # Processors running callbacks exit after them; others may parse more files, see _reuse_processor
+        reusable = self._files_per_process > 1 and not callback_to_execute_for_file
 
         return DagFileProcessorProcess.start(
             id=id,
@@ -1008,6 +1397,9 @@ class DagFileProcessorManager(LoggingMixin):
             logger=logger,
             logger_filehandle=logger_filehandle,
             client=self.client,
+            fork_template=self._fork_template,
+            reusable=reusable,
+            bundle_version=self._bundle_versions.get(dag_file.bundle_name),
         )
 
     def _start_new_processes(self):
@@ -1018,6 +1410,8 @@ class DagFileProcessorManager(LoggingMixin):
             if file in self._processors:
                 continue
 
+            if self._unchanged_file_process_interval:
+                self._parsing_content_hashes[file] = self._dependency_hash(file)
             processor = self._create_process(file)
             Stats.incr("dag_processing.processes", tags={"file_path": str(file.rel_path), "action": "start"})
 
@@ -1034,7 +1428,11 @@ class DagFileProcessorManager(LoggingMixin):
         for files in known_files.values():
             for file in files:
                 # todo: store stats by bundle also?
-                if file not in self._file_stats and file not in self._processors:
+                if (
+                    file not in self._file_stats
+                    and file not in self._processors
+                    and file not in self._pending_results
+                ):
                     new_files.append(file)
 
         if new_files:
@@ -1064,7 +1462,7 @@ class DagFileProcessorManager(LoggingMixin):
         changed_recently = set()
         for file in files:
             try:
-                modified_timestamp = os.path.getmtime(file.absolute_path)
+                modified_timestamp = self._get_mtime(file)
                 modified_datetime = datetime.fromtimestamp(modified_timestamp, tz=timezone.utc)
                 files_with_mtime[file] = modified_timestamp
                 last_time = self._file_stats[file].last_finish_time
@@ -1079,15 +1477,40 @@ class DagFileProcessorManager(LoggingMixin):
         file_infos = [info for info, ts in sorted(files_with_mtime.items(), key=itemgetter(1), reverse=True)]
         return file_infos, changed_recently
 
+    def _get_mtime(self, file: DagFileInfo) -> float:
+        if (watcher := self._file_watchers.get(file.bundle_name)) is not None:
+            return watcher.getmtime(file.absolute_path)
+        return os.path.getmtime(file.absolute_path)
+
     def processed_recently(self, now, file):
-        last_time = self._file_stats[file].last_finish_time
+        stat = self._file_stats[file]
+        last_time = stat.last_finish_time
         if not last_time:
             return False
+        if stat.last_unchanged_time:
+            last_time = max(last_time, stat.last_unchanged_time)
         elapsed_ss = (now - last_time).total_seconds()
         if elapsed_ss < self._file_process_interval:
             return True
         return False
 
+    def _dependency_hash(self, file: DagFileInfo) -> DependencyHash | None:
+        if file.bundle_path is None:
+            return None
+        return self._dependency_hasher.hash(file.absolute_path, file.bundle_path)
+
+    def _is_unchanged(self, now: datetime, file: DagFileInfo) -> bool:
+        """Whether the file and the local modules it imports did not change since it was last parsed."""
+        if not self._unchanged_file_process_interval:
+            return False
+        stat = self._file_stats.get(file)
+        if stat is None or stat.content_hash is None or stat.last_finish_time is None:
+            return False
+        if (now - stat.last_finish_time).total_seconds() >= self._unchanged_file_process_interval:
+            return False
+        content_hash = self._dependency_hash(file)
+        return content_hash is not None and content_hash.digest == stat.content_hash
+
     def prepare_file_queue(self, known_files: dict[str, set[DagFileInfo]]):
         """
         Scan dags dir to generate more file paths to process.
@@ -1105,7 +1528,7 @@ class DagFileProcessorManager(LoggingMixin):
 
         # If the file path is already being processed, or if a file was
         # processed recently, wait until the next batch
-        in_progress = set(self._processors)
+        in_progress = set(self._processors).union(self._pending_results)
         now = timezone.utcnow()
 
         # Sort the file paths by the parsing order mode
@@ -1127,6 +1550,11 @@ class DagFileProcessorManager(LoggingMixin):
             # Shuffle the list seeded by hostname so multiple DAG processors can work on different
             # set of files. Since we set the seed, the sort order will remain same per host
             random.Random(get_hostname()).shuffle(files)
+        elif self._file_parsing_sort_mode == "cost_aware":
+            # Sorting by modified time first finds the files changed since they were last parsed, and
+            # orders the files whose parse cost is not known yet
+            files, changed_recently = self._sort_by_mtime(files=files)
+            files = self._parse_cost_scheduler.sort(files)
 
         at_run_limit = [info for info, stat in self._file_stats.items() if stat.run_count == self.max_runs]
         to_exclude = in_progress.union(at_run_limit)
@@ -1134,6 +1562,21 @@ class DagFileProcessorManager(LoggingMixin):
         # exclude recently processed unless changed recently
         to_exclude |= recently_processed - changed_recently
 
+        if self._file_parsing_sort_mode == "cost_aware":
+            # Files which keep timing out only get a limited share of the parsing capacity
+            to_exclude |= self._parse_cost_scheduler.throttled(files) - changed_recently
+
+        # exclude files which did not change since they were last parsed
+        unchanged = [file for file in files if file not in to_exclude and self._is_unchanged(now, file)]
+        for file in unchanged:
+            stat = self._file_stats[file]
+            stat.last_unchanged_time = now
+            # Count it as a run, so that the manager stops after `max_runs` even if nothing changes
+            stat.run_count += 1
+        if unchanged:
+            to_exclude.update(unchanged)
+            Stats.incr("dag_processing.unchanged_file_skip_count", len(unchanged))
+
         # Do not convert the following list to set as set does not preserve the order
         # and we need to maintain the order of files for `[dag_processor] file_parsing_sort_mode`
         to_queue = [x for x in files if x not in to_exclude]
@@ -1181,6 +1624,7 @@ class DagFileProcessorManager(LoggingMixin):
                     last_num_of_db_queries=0,
                 )
                 self._file_stats[file] = stat
+                self._record_parse_cost(file, stat, timed_out=True)
 
         # Clean up `self._processors` after iterating over it
         for proc in processors_to_remove:
@@ -1234,12 +1678,20 @@ class DagFileProcessorManager(LoggingMixin):
             )
             # SIGTERM, wait 5s, SIGKILL if still alive
             processor.kill(signal.SIGTERM, escalation_delay=5.0)
+        for processor in self._retiring_processors:
+            processor.kill(signal.SIGTERM, escalation_delay=5.0)
 
     def end(self):
         """Kill all child processes on exit since we don't want to leave them as orphaned."""
-        pids_to_kill = [p.pid for p in self._processors.values()]
+        pids_to_kill = [p.pid for p in (*self._processors.values(), *self._retiring_processors)]
         if pids_to_kill:
             kill_child_processes_by_pids(pids_to_kill)
+        if self._fork_template is not None:
+            self._fork_template.stop()
+        if self._bundle_refresh_pool is not None:
+            self._bundle_refresh_pool.shutdown(wait=False, cancel_futures=True)
+        for watcher in self._file_watchers.values():
+            watcher.stop()
 
 
 def emit_metrics(*, parse_time: float, stats: Sequence[DagFileStat]):
@@ -1265,6 +1717,8 @@ def process_parse_results(
     *,
     is_callback_only: bool = False,
     relative_fileloc: str | None = None,
+    dag_write_manifests: DagWriteManifests | None = None,
+    retry_db_errors: bool = True,
 ) -> DagFileStat:
     """Take the parsing result and stats about the parser process and convert it into a DagFileStat."""
     if is_callback_only:
@@ -1327,6 +1781,8 @@ def process_parse_results(
             warnings=set(warnings or []),
             session=session,
             files_parsed=files_parsed,
+            manifests=dag_write_manifests,
+            retry_db_errors=retry_db_errors,
         )
         stat.num_dags = len(parsing_result.serialized_dags)
         if parsing_result.import_errors:
@@ -0,0 +1,162 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Profiles of parsing Dag files.
+
+With ``[dag_processor] parse_profiling`` a Dag file processor times the phases of parsing its file and
+the slowest module imports, and sends the profile along with the parsing result. The Dag processor
+manager writes it next to the log of the file, where ``airflow dags report --profile`` reads it.
+"""
+
+from __future__ import annotations
+
+import builtins
+import contextlib
+import heapq
+import sys
+import time
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel, Field
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+PROFILE_SUFFIX = ".profile.json"
+
+
+class ParseProfile(BaseModel):
+    """Time spent in each phase of parsing a Dag file, in seconds."""
+
+    stability_check: float = 0.0
+    imports: float = 0.0
+    """Importing the modules the Dag file imports, including the modules they import"""
+    runtime_state_requests: float = 0.0
+    """Waiting for Variables, Connections etc. requested from the Dag processor manager"""
+    dag_construction: float = 0.0
+    """The rest of running the top-level code of the Dag file, mostly constructing Dags and tasks"""
+    serialization: float = 0.0
+    slowest_imports: list[tuple[str, float]] = Field(default_factory=list)
+    """Names and import durations of the modules which took the longest to import"""
+
+    @property
+    def total(self) -> float:
+        return (
+            self.stability_check
+            + self.imports
+            + self.runtime_state_requests
+            + self.dag_construction
+            + self.serialization
+        )
+
+
+class _TimedComms:
+    """Wrap the supervisor comms of the processor to time the requests sent through them."""
+
+    def __init__(self, comms: Any, profile: ParseProfile):
+        self._comms = comms
+        self._profile = profile
+
+    def send(self, msg):
+        start = time.perf_counter()
+        try:
+            return self._comms.send(msg)
+        finally:
+            self._profile.runtime_state_requests += time.perf_counter() - start
+
+    def __getattr__(self, name: str):
+        return getattr(self._comms, name)
+
+
+class ParseProfiler:
+    """
+    Build the :class:`ParseProfile` of parsing one Dag file.
+
+    :param top_imports: Number of slowest module imports to keep in the profile.
+    """
+
+    def __init__(self, top_imports: int):
+        self.top_imports = top_imports
+        self.profile = ParseProfile()
+        self._import_durations: dict[str, float] = {}
+        self._import_depth = 0
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        """Add the time spent in the block to the phase ``name`` of the profile."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            setattr(self.profile, name, getattr(self.profile, name) + time.perf_counter() - start)
+
+    @contextlib.contextmanager
+    def loading(self) -> Generator[None, None, None]:
+        """
+        Profile loading the Dag file.
+
+        The time spent in the block is split into imports, runtime state requests and Dag construction.
+        Imports are timed by wrapping ``builtins.__import__``, and runtime state requests by wrapping the
+        supervisor comms of the processor, if any.
+        """
+        from airflow.sdk.execution_time import task_runner
+        from airflow.sdk.execution_time.supervisor import set_supervisor_comms
+
+        original_import = builtins.__import__
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            num_modules = len(sys.modules)
+            self._import_depth += 1
+            start = time.perf_counter()
+            try:
+                return original_import(name, globals, locals, fromlist, level)
+            finally:
+                elapsed = time.perf_counter() - start
+                self._import_depth -= 1
+                # Only imports which loaded modules, rather than finding them in sys.modules, are slow
+                if len(sys.modules) > num_modules:
+                    module_name = "." * level + name
+                    self._import_durations[module_name] = max(
+                        self._import_durations.get(module_name, 0.0), elapsed
+                    )
+                    if not self._import_depth:
+                        self.profile.imports += elapsed
+
+        comms = getattr(task_runner, "SUPERVISOR_COMMS", None)
+        timed_comms = _TimedComms(comms, self.profile) if comms is not None else None
+        requests_before = self.profile.runtime_state_requests
+        imports_before = self.profile.imports
+        start = time.perf_counter()
+        builtins.__import__ = timed_import
+        try:
+            with set_supervisor_comms(timed_comms) if timed_comms else contextlib.nullcontext():
+                yield
+        finally:
+            builtins.__import__ = original_import
+            elapsed = time.perf_counter() - start
+            # Requests made by imported modules are counted as both, so this is approximate
+            other = (self.profile.runtime_state_requests - requests_before) + (
+                self.profile.imports - imports_before
+            )
+            self.profile.dag_construction += max(elapsed - other, 0.0)
+
+    def finish(self) -> ParseProfile:
+        self.profile.slowest_imports = heapq.nlargest(
+            self.top_imports, self._import_durations.items(), key=lambda item: item[1]
+        )
+        return self.profile
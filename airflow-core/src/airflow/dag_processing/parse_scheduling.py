@@ -0,0 +1,142 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Order Dag files by their observed parsing cost.
+
+With ``[dag_processor] file_parsing_sort_mode = cost_aware`` the Dag processor manager keeps, for every
+Dag file, a moving average of how long parsing it takes, of how often it changed between two parses,
+and how many Dags it produced the last time. Each time it fills its queue, it puts first the files
+with the lowest expected parse duration per unit of value -- value being how likely the file changed,
+weighted by the number of Dags it produces -- so cheap, frequently changing files are parsed more
+often under a fixed ``parallelism``. The longer a file waited since it was last parsed, the more its
+priority grows, so expensive files are not starved. Files which timed out in several parses in a row
+are parsed at most once every ``[dag_processor] timed_out_file_process_interval``.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable
+
+    from airflow.dag_processing.manager import DagFileInfo
+
+_SMOOTHING = 0.3
+"""Weight of the latest observation in the moving averages"""
+_MIN_CHANGE_RATE = 0.05
+"""Floor of the change rate, so files which never change still age to the front of the queue"""
+_INITIAL_CHANGE_RATE = 0.5
+_THROTTLE_AFTER_TIMEOUTS = 2
+
+
+def _moving_average(average: float | None, value: float) -> float:
+    if average is None:
+        return value
+    return _SMOOTHING * value + (1 - _SMOOTHING) * average
+
+
+@dataclass
+class _ParseHistory:
+    avg_duration: float | None = None
+    change_rate: float = _INITIAL_CHANGE_RATE
+    """Moving average of whether the file was modified between two parses"""
+    num_dags: int = 0
+    consecutive_timeouts: int = 0
+    last_parsed: float | None = None
+    """``time.monotonic()`` when the last parse finished"""
+    last_mtime: float | None = None
+
+
+class ParseCostScheduler:
+    """
+    Order Dag files by expected parse cost, change frequency and number of Dags, with aging.
+
+    :param aging_interval: Waiting this many seconds since its last parse halves the priority score
+        of a file, i.e. moves it towards the front of the queue.
+    :param timed_out_file_process_interval: Parse files which timed out several times in a row at
+        most once every this many seconds. 0 means no limit.
+    """
+
+    def __init__(self, aging_interval: float, timed_out_file_process_interval: float):
+        self.aging_interval = max(aging_interval, 1.0)
+        self.timed_out_file_process_interval = timed_out_file_process_interval
+        self._history: dict[DagFileInfo, _ParseHistory] = {}
+
+    def record_parse(
+        self,
+        file: DagFileInfo,
+        *,
+        duration: float,
+        num_dags: int,
+        timed_out: bool = False,
+        mtime: float | None = None,
+    ) -> None:
+        """Record a parse of ``file``, and its modification time at the time if known."""
+        history = self._history.setdefault(file, _ParseHistory())
+        history.avg_duration = _moving_average(history.avg_duration, duration)
+        history.last_parsed = time.monotonic()
+        if timed_out:
+            history.consecutive_timeouts += 1
+        else:
+            history.consecutive_timeouts = 0
+            history.num_dags = num_dags
+        if mtime is not None:
+            if history.last_mtime is not None:
+                changed = float(mtime != history.last_mtime)
+                history.change_rate = _moving_average(history.change_rate, changed)
+            history.last_mtime = mtime
+
+    def retain(self, present: Collection[DagFileInfo]) -> None:
+        """Forget the files which are not ``present`` anymore."""
+        for file in set(self._history).difference(present):
+            del self._history[file]
+
+    def throttled(self, files: Iterable[DagFileInfo]) -> set[DagFileInfo]:
+        """Return the ``files`` which keep timing out and were parsed too recently to parse them again."""
+        if not self.timed_out_file_process_interval:
+            return set()
+        now = time.monotonic()
+        throttled = set()
+        for file in files:
+            history = self._history.get(file)
+            if (
+                history is not None
+                and history.last_parsed is not None
+                and history.consecutive_timeouts >= _THROTTLE_AFTER_TIMEOUTS
+                and now - history.last_parsed < self.timed_out_file_process_interval
+            ):
+                throttled.add(file)
+        return throttled
+
+    def _score(self, file: DagFileInfo, now: float) -> float:
+        history = self._history.get(file)
+        if history is None or history.avg_duration is None or history.last_parsed is None:
+            # Parse files whose cost is not known yet first
+            return 0.0
+        value = (_MIN_CHANGE_RATE + history.change_rate) * (1 + math.log1p(history.num_dags))
+        aging = 1 + (now - history.last_parsed) / self.aging_interval
+        return history.avg_duration / (value * aging)
+
+    def sort(self, files: Iterable[DagFileInfo]) -> list[DagFileInfo]:
+        """Sort ``files`` by ascending priority score; the order of files with the same score is kept."""
+        now = time.monotonic()
+        return sorted(files, key=lambda file: self._score(file, now))
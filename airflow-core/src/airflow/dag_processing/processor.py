@@ -19,12 +19,15 @@ from __future__ import annotations
 import contextlib
 import importlib
 import os
+import time
 import traceback
 from collections.abc import Callable, Sequence
 from pathlib import Path
+from socket import socketpair
 from typing import TYPE_CHECKING, Annotated, BinaryIO, ClassVar, Literal
 
 import attrs
+import psutil
 from pydantic import BaseModel, Field, TypeAdapter
 
 from airflow._shared.observability.metrics.stats import Stats
@@ -37,6 +40,7 @@ from airflow.callbacks.callback_requests import (
 from airflow.configuration import conf
 from airflow.dag_processing.bundles.base import BundleVersionLock
 from airflow.dag_processing.dagbag import BundleDagBag, DagBag
+from airflow.dag_processing.parse_profiling import ParseProfile, ParseProfiler
 from airflow.sdk.exceptions import TaskNotFound
 from airflow.sdk.execution_time.comms import (
     ConnectionResult,
@@ -77,6 +81,7 @@ if TYPE_CHECKING:
     from structlog.typing import FilteringBoundLogger
 
     from airflow.api_fastapi.execution_api.app import InProcessExecutionAPI
+    from airflow.dag_processing.fork_template import ForkTemplate
     from airflow.sdk.api.client import Client
     from airflow.sdk.bases.operator import BaseOperator
     from airflow.sdk.definitions.context import Context
@@ -117,6 +122,8 @@ class DagFileParsingResult(BaseModel):
     serialized_dags: list[LazyDeserializedDAG]
     warnings: list | None = None
     import_errors: dict[str, str] | None = None
+    profile: ParseProfile | None = None
+    """Time spent in each phase of parsing, with ``[dag_processor] parse_profiling``"""
     type: Literal["DagFileParsingResult"] = "DagFileParsingResult"
 
 
@@ -199,16 +206,26 @@ def _parse_file_entrypoint():
     task_runner.SUPERVISOR_COMMS = comms_decoder
     log = structlog.get_logger(logger_name="task")
 
-    result = _parse_file(msg, log)
-
-    if result is not None:
-        comms_decoder.send(result)
+    while True:
+        result = _parse_file(msg, log)
+        if result is None:
+            return
+        # The manager answers with the next file to parse if the processor is reused, else lets it exit
+        next_msg = comms_decoder.send(result)
+        if not isinstance(next_msg, DagFileParseRequest):
+            return
+        msg = next_msg
 
 
 def _parse_file(msg: DagFileParseRequest, log: FilteringBoundLogger) -> DagFileParsingResult | None:
     # TODO: Set known_pool names on DagBag!
 
-    stability_check_result = check_dag_file_stability(os.fspath(msg.file))
+    profiler = None
+    if conf.getboolean("dag_processor", "parse_profiling") and not msg.callback_requests:
+        profiler = ParseProfiler(top_imports=conf.getint("dag_processor", "parse_profiling_top_imports"))
+
+    with profiler.phase("stability_check") if profiler else contextlib.nullcontext():
+        stability_check_result = check_dag_file_stability(os.fspath(msg.file))
 
     if stability_check_error_dict := stability_check_result.get_error_format_dict(msg.file, msg.bundle_path):
         # If Dag stability check level is error, we shouldn't parse the Dags and return the result early
@@ -216,27 +233,31 @@ def _parse_file(msg: DagFileParseRequest, log: FilteringBoundLogger) -> DagFileP
             fileloc=msg.file,
             serialized_dags=[],
             import_errors=stability_check_error_dict,
+            profile=profiler.finish() if profiler else None,
         )
 
-    bag = BundleDagBag(
-        dag_folder=msg.file,
-        bundle_path=msg.bundle_path,
-        bundle_name=msg.bundle_name,
-        load_op_links=False,
-    )
+    with profiler.loading() if profiler else contextlib.nullcontext():
+        bag = BundleDagBag(
+            dag_folder=msg.file,
+            bundle_path=msg.bundle_path,
+            bundle_name=msg.bundle_name,
+            load_op_links=False,
+        )
 
     if msg.callback_requests:
         # If the request is for callback, we shouldn't serialize the Dags
         _execute_callbacks(bag, msg.callback_requests, log)
         return None
 
-    serialized_dags, serialization_import_errors = _serialize_dags(bag, log)
+    with profiler.phase("serialization") if profiler else contextlib.nullcontext():
+        serialized_dags, serialization_import_errors = _serialize_dags(bag, log)
     bag.import_errors.update(serialization_import_errors)
     result = DagFileParsingResult(
         fileloc=msg.file,
         serialized_dags=serialized_dags,
         import_errors=bag.import_errors,
         warnings=stability_check_result.get_formatted_warnings(bag.dag_ids),
+        profile=profiler.finish() if profiler else None,
     )
     return result
 
@@ -509,6 +530,15 @@ class DagFileProcessorProcess(WatchedSubprocess):
     parsing_result: DagFileParsingResult | None = None
     decoder: ClassVar[TypeAdapter[ToManager]] = TypeAdapter[ToManager](ToManager)
     had_callbacks: bool = False  # Track if this process was started with callbacks to prevent stale DAG detection false positives
+    read_runtime_state: bool = False
+    """Whether the processor read Variables, Connections, XComs etc., which its Dags may depend on."""
+    reusable: bool = False
+    """Whether the processor waits for another file to parse once it sent the result of a file"""
+    bundle_version: str | None = None
+    """Version of the bundle of the files the processor parses, whose modules it may have imported"""
+    files_parsed: int = 0
+    _result_request_id: int | None = None
+    _baseline_rss: int | None = None
 
     client: Client
     """The HTTP client to use for communication with the API server."""
@@ -523,17 +553,59 @@ class DagFileProcessorProcess(WatchedSubprocess):
         callbacks: list[CallbackRequest],
         target: Callable[[], None] = _parse_file_entrypoint,
         client: Client,
+        fork_template: ForkTemplate | None = None,
         **kwargs,
     ) -> Self:
         logger = kwargs["logger"]
 
-        _pre_import_airflow_modules(os.fspath(path), logger)
-
-        proc: Self = super().start(target=target, client=client, **kwargs)
+        proc: Self | None = None
+        if fork_template is not None and target is _parse_file_entrypoint:
+            proc = cls._start_from_fork_template(fork_template, path=path, client=client, **kwargs)
+        if proc is None:
+            _pre_import_airflow_modules(os.fspath(path), logger)
+            proc = super().start(target=target, client=client, **kwargs)
         proc.had_callbacks = bool(callbacks)  # Track if this process had callbacks
         proc._on_child_started(callbacks, path, bundle_path, bundle_name)
         return proc
 
+    @classmethod
+    def _start_from_fork_template(
+        cls,
+        fork_template: ForkTemplate,
+        *,
+        path: str | os.PathLike[str],
+        logger: FilteringBoundLogger,
+        **constructor_kwargs,
+    ) -> Self | None:
+        """Start the processor as a fork of ``fork_template``, or return None if it cannot fork it."""
+        child_stdout, read_stdout = socketpair()
+        child_stderr, read_stderr = socketpair()
+        child_requests, read_requests = socketpair()
+        child_logs, read_logs = socketpair()
+        try:
+            pid = fork_template.spawn(
+                os.fspath(path), [child_requests, child_stdout, child_stderr, child_logs]
+            )
+        finally:
+            # The processor has its own copies of the child ends now.
+            cls._close_unused_sockets(child_requests, child_stdout, child_stderr, child_logs)
+        if pid is None:
+            cls._close_unused_sockets(read_requests, read_stdout, read_stderr, read_logs)
+            return None
+
+        proc = cls(
+            pid=pid,
+            stdin=read_requests,
+            process=psutil.Process(pid),
+            process_log=logger,
+            start_time=time.monotonic(),
+            **constructor_kwargs,
+        )
+        proc._register_pipe_readers(
+            stdout=read_stdout, stderr=read_stderr, requests=read_requests, logs=read_logs
+        )
+        return proc
+
     def _on_child_started(
         self,
         callbacks: list[CallbackRequest],
@@ -559,8 +631,15 @@ class DagFileProcessorProcess(WatchedSubprocess):
 
         resp: BaseModel | None = None
         dump_opts = {}
+        if not isinstance(msg, (DagFileParsingResult, MaskSecret)):
+            self.read_runtime_state = True
         if isinstance(msg, DagFileParsingResult):
             self.parsing_result = msg
+            self.files_parsed += 1
+            if self.reusable:
+                # Answered by parse_next_file or finish, once the manager collected the result
+                self._result_request_id = req_id
+                return
         elif isinstance(msg, GetConnection):
             conn = self.client.connections.get(msg.conn_id)
             if isinstance(conn, ConnectionResponse):
@@ -669,6 +748,42 @@ class DagFileProcessorProcess(WatchedSubprocess):
 
         self.send_msg(resp, request_id=req_id, error=None, **dump_opts)
 
+    @property
+    def is_waiting_for_next_file(self) -> bool:
+        """Whether the processor sent the result of its file, and waits for another one to parse."""
+        return self._result_request_id is not None and self._check_subprocess_exit() is None
+
+    def parse_next_file(self, *, path: str | os.PathLike[str], bundle_path: Path, bundle_name: str) -> None:
+        """Make the processor, which is waiting for another file, parse the file at ``path``."""
+        if self._result_request_id is None:
+            raise RuntimeError("The processor is not waiting for another file to parse")
+        request_id, self._result_request_id = self._result_request_id, None
+        self.parsing_result = None
+        self.read_runtime_state = False
+        self.start_time = time.monotonic()
+        self.process_log.info("Parsing another file in the same processor", file=os.fspath(path))
+        self.send_msg(
+            DagFileParseRequest(file=os.fspath(path), bundle_path=bundle_path, bundle_name=bundle_name),
+            request_id=request_id,
+        )
+
+    def finish(self) -> None:
+        """Let the processor, which is waiting for another file, exit."""
+        if self._result_request_id is None:
+            return
+        request_id, self._result_request_id = self._result_request_id, None
+        self.send_msg(None, request_id=request_id)
+
+    def memory_growth(self) -> int:
+        """Return how much the RSS of the processor grew since it parsed its first file, in bytes."""
+        try:
+            rss = self._process.memory_info().rss
+        except psutil.Error:
+            return 0
+        if self._baseline_rss is None:
+            self._baseline_rss = rss
+        return rss - self._baseline_rss
+
     @property
     def is_ready(self) -> bool:
         if self._check_subprocess_exit() is None:
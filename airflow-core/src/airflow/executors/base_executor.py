@@ -143,6 +143,7 @@ class BaseExecutor(LoggingMixin):
     supports_ad_hoc_ti_run: bool = False
     supports_callbacks: bool = False
     supports_multi_team: bool = False
+    supports_task_run_context: bool = False
     sentry_integration: str = ""
 
     is_local: bool = False
@@ -26,10 +26,12 @@ LocalExecutor.
 from __future__ import annotations
 
 import ctypes
+import functools
 import multiprocessing
 import multiprocessing.sharedctypes
 import os
 import sys
+import threading
 from multiprocessing import Queue, SimpleQueue
 from typing import TYPE_CHECKING
 
@@ -49,6 +51,8 @@ else:
     setproctitle = lambda title, logger: real_setproctitle(title)
 
 if TYPE_CHECKING:
+    from concurrent.futures import Future
+
     from structlog.typing import FilteringBoundLogger as Logger
 
     from airflow.executors.workloads.types import WorkloadResultType
@@ -70,6 +74,7 @@ def _run_worker(
     output: Queue[WorkloadResultType],
     unread_messages: multiprocessing.sharedctypes.Synchronized[int],
     team_conf,
+    tasks_per_supervisor: int = 1,
 ):
     import signal
 
@@ -79,6 +84,10 @@ def _run_worker(
     log = structlog.get_logger(logger_name)
     log.info("Worker starting up pid=%d", os.getpid())
 
+    if tasks_per_supervisor > 1:
+        _run_multi_task_worker(log, input, output, unread_messages, team_conf, tasks_per_supervisor)
+        return
+
     while True:
         setproctitle(f"{_get_executor_process_title_prefix(team_conf.team_name)} <idle>", log)
         try:
@@ -121,6 +130,99 @@ def _run_worker(
             raise ValueError(f"LocalExecutor does not know how to handle {type(workload)}")
 
 
+def _run_multi_task_worker(
+    log: Logger,
+    input: SimpleQueue[workloads.All | None],
+    output: Queue[WorkloadResultType],
+    unread_messages: multiprocessing.sharedctypes.Synchronized[int],
+    team_conf,
+    max_tasks: int,
+) -> None:
+    """
+    Run up to ``max_tasks`` workloads at once, supervising all their task processes from this process.
+
+    See ``[workers] tasks_per_supervisor``.
+    """
+    from airflow.sdk.execution_time.supervisor import MultiTaskSupervisor
+
+    supervisor = MultiTaskSupervisor(server=_get_execution_api_server(team_conf), max_tasks=max_tasks)
+    # Only take workloads off the queue when there is a slot to run them, so that other workers can take them
+    slots = threading.BoundedSemaphore(max_tasks)
+
+    def on_task_done(key, future: Future[int]) -> None:
+        if (e := future.exception()) is not None:
+            log.error("Task execution failed.", exc_info=e)
+            output.put((key, TaskInstanceState.FAILED, e))
+        else:
+            output.put((key, TaskInstanceState.SUCCESS, None))
+        slots.release()
+
+    setproctitle(f"{_get_executor_process_title_prefix(team_conf.team_name)} <multi-task>", log)
+    try:
+        while True:
+            slots.acquire()
+            try:
+                workload = input.get()
+            except EOFError:
+                log.info(
+                    "Failed to read tasks from the task queue because the other "
+                    "end has closed the connection. Terminating worker %s.",
+                    multiprocessing.current_process().name,
+                )
+                break
+
+            if workload is None:
+                # Received poison pill, no more tasks to run
+                break
+
+            with unread_messages:
+                unread_messages.value -= 1
+
+            if isinstance(workload, workloads.ExecuteTask):
+                try:
+                    future = supervisor.submit(
+                        # This is the "wrong" ti type, but it duck types the same.
+                        ti=workload.ti,  # type: ignore[arg-type]
+                        dag_rel_path=workload.dag_rel_path,
+                        bundle_info=workload.bundle_info,
+                        token=workload.token,
+                        log_path=workload.log_path,
+                        ti_context=workload.ti_context,  # type: ignore[arg-type]
+                    )
+                except Exception as e:
+                    log.exception("Task execution failed.")
+                    output.put((workload.ti.key, TaskInstanceState.FAILED, e))
+                    slots.release()
+                else:
+                    future.add_done_callback(functools.partial(on_task_done, workload.ti.key))
+
+            elif isinstance(workload, workloads.ExecuteCallback):
+                output.put((workload.callback.id, CallbackState.RUNNING, None))
+                try:
+                    _execute_callback(log, workload, team_conf)
+                    output.put((workload.callback.id, CallbackState.SUCCESS, None))
+                except Exception as e:
+                    log.exception("Callback execution failed")
+                    output.put((workload.callback.id, CallbackState.FAILED, e))
+                finally:
+                    slots.release()
+
+            else:
+                raise ValueError(f"LocalExecutor does not know how to handle {type(workload)}")
+    finally:
+        # Let the running tasks finish
+        supervisor.shutdown()
+
+
+def _get_execution_api_server(team_conf) -> str:
+    base_url = team_conf.get("api", "base_url", fallback="/")
+    # If it's a relative URL, use localhost:8080 as the default
+    if base_url.startswith("/"):
+        base_url = f"http://localhost:8080{base_url}"
+    default_execution_api_server = f"{base_url.rstrip('/')}/execution/"
+    return team_conf.get("core", "execution_api_server_url", fallback=default_execution_api_server)
+
+
 def _execute_work(log: Logger, workload: workloads.ExecuteTask, team_conf) -> None:
     """
     Execute command received and stores result state in queue.
@@ -133,12 +235,6 @@ def _execute_work(log: Logger, workload: workloads.ExecuteTask, team_conf) -> No
 
     setproctitle(f"{_get_executor_process_title_prefix(team_conf.team_name)} {workload.ti.id}", log)
 
-    base_url = team_conf.get("api", "base_url", fallback="/")
-    # If it's a relative URL, use localhost:8080 as the default
-    if base_url.startswith("/"):
-        base_url = f"http://localhost:8080{base_url}"
-    default_execution_api_server = f"{base_url.rstrip('/')}/execution/"
-
     # This will return the exit code of the task process, but we don't care about that, just if the
     # _supervisor_ had an error reporting the state back (which will result in an exception.)
     supervise(
@@ -147,8 +243,9 @@ def _execute_work(log: Logger, workload: workloads.ExecuteTask, team_conf) -> No
         dag_rel_path=workload.dag_rel_path,
         bundle_info=workload.bundle_info,
         token=workload.token,
-        server=team_conf.get("core", "execution_api_server_url", fallback=default_execution_api_server),
+        server=_get_execution_api_server(team_conf),
         log_path=workload.log_path,
+        ti_context=workload.ti_context,  # type: ignore[arg-type]
     )
 
 
@@ -174,7 +271,8 @@ class LocalExecutor(BaseExecutor):
 
     It uses the multiprocessing Python library and queues to parallelize the execution of tasks.
 
-    :param parallelism: how many parallel processes are run in the executor, must be > 0
+    :param parallelism: how many tasks are run in parallel by the executor, must be > 0. Each worker process
+        runs ``[workers] tasks_per_supervisor`` of them at once.
     """
 
     is_local: bool = True
@@ -183,6 +281,7 @@ class LocalExecutor(BaseExecutor):
     supports_multi_team: bool = True
     serve_logs: bool = True
     supports_callbacks: bool = True
+    supports_task_run_context: bool = True
 
     activity_queue: SimpleQueue[workloads.All | None]
     result_queue: SimpleQueue[WorkloadResultType]
@@ -202,6 +301,13 @@ class LocalExecutor(BaseExecutor):
 
             self.conf = conf
 
+        self.tasks_per_supervisor = max(1, self.conf.getint("workers", "tasks_per_supervisor", fallback=1))
+
+    @property
+    def max_workers(self) -> int:
+        """The number of worker processes needed to run ``parallelism`` tasks in parallel."""
+        return -(-self.parallelism // self.tasks_per_supervisor)
+
     def start(self) -> None:
         """Start the executor."""
         # We delay opening these queues until the start method mostly for unit tests. ExecutorLoader caches
@@ -216,9 +322,9 @@ class LocalExecutor(BaseExecutor):
         self._unread_messages = multiprocessing.Value(ctypes.c_uint)
 
         if self.is_mp_using_fork:
-            # This creates the maximum number of worker processes (parallelism) at once
+            # This creates the maximum number of worker processes at once
             # to minimize gc freeze/unfreeze cycles when using fork in multiprocessing
-            self._spawn_workers_with_gc_freeze(self.parallelism)
+            self._spawn_workers_with_gc_freeze(self.max_workers)
 
     def _check_workers(self):
         # Reap any dead workers
@@ -242,11 +348,11 @@ class LocalExecutor(BaseExecutor):
         # If we're using spawn in multiprocessing (default on macOS now) to start tasks, this can get called a
         # via `sync()` a few times before the spawned process actually starts picking up messages. Try not to
         # create too much
-        if num_outstanding and len(self.workers) < self.parallelism:
+        if num_outstanding and len(self.workers) < self.max_workers:
             if self.is_mp_using_fork:
                 # This creates the maximum number of worker processes at once
                 # to minimize gc freeze/unfreeze cycles when using fork in multiprocessing
-                self._spawn_workers_with_gc_freeze(self.parallelism - len(self.workers))
+                self._spawn_workers_with_gc_freeze(self.max_workers - len(self.workers))
             else:
                 # This only creates one worker, which is fine as we call this directly after putting a message on
                 # activity_queue in execute_async when using spawn in multiprocessing
@@ -261,6 +367,7 @@ class LocalExecutor(BaseExecutor):
                 "output": self.result_queue,
                 "unread_messages": self._unread_messages,
                 "team_conf": self.conf,
+                "tasks_per_supervisor": self.tasks_per_supervisor,
             },
         )
         p.start()
@@ -24,6 +24,7 @@ from typing import TYPE_CHECKING, Literal
 
 from pydantic import BaseModel, Field
 
+from airflow.api_fastapi.execution_api.datamodels.taskinstance import TIRunContext  # noqa: TC001
 from airflow.executors.workloads.base import BaseDagBundleWorkload, BundleInfo
 
 if TYPE_CHECKING:
@@ -70,6 +71,12 @@ class ExecuteTask(BaseDagBundleWorkload):
 
     ti: TaskInstanceDTO
     sentry_integration: str = ""
+    ti_context: TIRunContext | None = Field(default=None, repr=False)
+    """
+    The run context of the task instance, if the scheduler computed it.
+
+    The worker then only claims the task instance, instead of fetching its run context from the API server.
+    """
 
     type: Literal["ExecuteTask"] = Field(init=False, default="ExecuteTask")
 
@@ -81,6 +88,7 @@ class ExecuteTask(BaseDagBundleWorkload):
         generator: JWTGenerator | None = None,
         bundle_info: BundleInfo | None = None,
         sentry_integration: str = "",
+        ti_context: TIRunContext | None = None,
     ) -> ExecuteTask:
         """Create an ExecuteTask workload from a TaskInstance ORM model."""
         from airflow.utils.helpers import log_filename_template_renderer
@@ -101,4 +109,5 @@ class ExecuteTask(BaseDagBundleWorkload):
             log_path=fname,
             bundle_info=bundle_info,
             sentry_integration=sentry_integration,
+            ti_context=ti_context,
         )
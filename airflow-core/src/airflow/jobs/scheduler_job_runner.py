@@ -25,16 +25,17 @@ import os
 import signal
 import sys
 import time
+import zlib
 from collections import Counter, defaultdict, deque
-from collections.abc import Callable, Collection, Iterable, Iterator
-from contextlib import ExitStack
+from collections.abc import Callable, Collection, Iterable, Iterator, Sequence
+from contextlib import ExitStack, nullcontext
 from datetime import date, datetime, timedelta
 from functools import lru_cache, partial
 from itertools import groupby
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 from sqlalchemy import CTE, and_, delete, exists, func, inspect, or_, select, text, tuple_, update
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import IntegrityError, OperationalError
 from sqlalchemy.orm import joinedload, lazyload, load_only, make_transient, selectinload
 from sqlalchemy.sql import expression
 
@@ -79,20 +80,29 @@ from airflow.models.dagbag import DBDagBag
 from airflow.models.dagbundle import DagBundleModel
 from airflow.models.dagrun import DagRun
 from airflow.models.dagwarning import DagWarning, DagWarningType
-from airflow.models.pool import normalize_pool_name_for_stats
+from airflow.models.pool import PoolStats, normalize_pool_name_for_stats
 from airflow.models.serialized_dag import SerializedDagModel
 from airflow.models.taskinstance import TaskInstance
 from airflow.models.taskinstancekey import TaskInstanceKey
+from airflow.models.taskreschedule import TaskReschedule
 from airflow.models.team import Team
 from airflow.models.trigger import TRIGGER_FAIL_REPR, Trigger, TriggerFailureReason
+from airflow.models.xcom import XComModel
 from airflow.observability.metrics import stats_utils
 from airflow.serialization.definitions.assets import SerializedAssetUniqueKey
-from airflow.serialization.definitions.notset import NOTSET
+from airflow.serialization.definitions.notset import NOTSET, ArgNotSet
 from airflow.ti_deps.dependencies_states import EXECUTION_STATES
 from airflow.timetables.simple import AssetTriggeredTimetable
 from airflow.utils.event_scheduler import EventScheduler
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.retries import MAX_DB_RETRIES, retry_db_transaction, run_with_db_retries
+from airflow.utils.scheduler_loop_profiler import SchedulerLoopProfiler
+from airflow.utils.scheduler_wakeup import (
+    SchedulerWakeupListener,
+    SchedulerWakeupMethod,
+    get_wakeup_method,
+    get_wakeup_socket_path,
+)
 from airflow.utils.session import NEW_SESSION, create_session, provide_session
 from airflow.utils.sqlalchemy import (
     get_dialect_name,
@@ -104,11 +114,14 @@ from airflow.utils.state import CallbackState, DagRunState, State, TaskInstanceS
 from airflow.utils.types import DagRunTriggeredByType, DagRunType
 
 if TYPE_CHECKING:
+    from contextlib import AbstractContextManager
     from types import FrameType
+    from uuid import UUID
 
     from pendulum.datetime import DateTime
     from sqlalchemy.orm import Session
     from sqlalchemy.orm.interfaces import LoaderOption
+    from sqlalchemy.sql import Select
     from sqlalchemy.sql.selectable import Subquery
 
     from airflow._shared.logging.types import Logger
@@ -116,6 +129,7 @@ if TYPE_CHECKING:
     from airflow.executors.executor_utils import ExecutorName
     from airflow.executors.workloads.types import SchedulerWorkload
     from airflow.serialization.definitions.dag import SerializedDAG
+    from airflow.timetables.base import DagRunInfo
     from airflow.utils.sqlalchemy import CommitProhibitorGuard
 
 TI = TaskInstance
@@ -214,6 +228,300 @@ class ConcurrencyMap:
             self.task_concurrency_map[(dag_id, task_id)] += c
             self.task_dagrun_concurrency_map[(dag_id, run_id, task_id)] += c
 
+    def copy(self) -> ConcurrencyMap:
+        """Return a detached copy of the counters, safe to mutate without affecting this map."""
+        new = ConcurrencyMap()
+        new.dag_run_active_tasks_map = self.dag_run_active_tasks_map.copy()
+        new.task_concurrency_map = self.task_concurrency_map.copy()
+        new.task_dagrun_concurrency_map = self.task_dagrun_concurrency_map.copy()
+        return new
+
+
+class _LedgerEntry(NamedTuple):
+    pool: str
+    pool_slots: int
+    state: TaskInstanceState
+
+
+class ConcurrencyLedger(ConcurrencyMap):
+    """
+    Incrementally maintained view of pool, DAG, task and DAG run occupancy.
+
+    Unlike :class:`ConcurrencyMap`, which re-runs the ``GROUP BY`` aggregates on every call to ``load()``,
+    the ledger is loaded once from the database and then kept up to date from the state transitions the
+    scheduler performs itself (queueing task instances) and from executor events. Transitions made by
+    other processes (for example another scheduler, or tasks deferring) are only picked up when the
+    ledger is reconciled against the database, which happens every ``reconcile_interval`` seconds or
+    as soon as :meth:`invalidate` has been called.
+
+    :param reconcile_interval: Maximum number of seconds between two reconciliations with the database.
+    """
+
+    TRACKED_STATES = frozenset(EXECUTION_STATES | {TaskInstanceState.DEFERRED})
+
+    def __init__(self, reconcile_interval: float):
+        super().__init__()
+        self.reconcile_interval = reconcile_interval
+        self.pool_slots_map: defaultdict[str, Counter[TaskInstanceState]] = defaultdict(Counter)
+        self._entries: dict[tuple[str, str, str, int], _LedgerEntry] = {}
+        self._last_reconciled: float | None = None
+        self._invalidated = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def invalidate(self) -> None:
+        """Force a reconciliation with the database the next time the ledger is used."""
+        self._invalidated = True
+
+    def needs_reconcile(self) -> bool:
+        if self._invalidated or self._last_reconciled is None:
+            return True
+        return time.monotonic() - self._last_reconciled >= self.reconcile_interval
+
+    def load(self, session: Session) -> None:
+        """Rebuild the ledger from the task instances currently in a tracked state."""
+        previous = self._occupancy()
+        self._entries = {}
+        self.dag_run_active_tasks_map.clear()
+        self.task_concurrency_map.clear()
+        self.task_dagrun_concurrency_map.clear()
+        self.pool_slots_map.clear()
+        query = session.execute(
+            select(TI.dag_id, TI.task_id, TI.run_id, TI.map_index, TI.pool, TI.pool_slots, TI.state).where(
+                TI.state.in_(self.TRACKED_STATES)
+            )
+        )
+        for dag_id, task_id, run_id, map_index, pool, pool_slots, state in query:
+            entry = _LedgerEntry(pool, pool_slots, TaskInstanceState(state))
+            self._add((dag_id, task_id, run_id, map_index), entry)
+
+        if self._last_reconciled is not None:
+            # Number of pools, Dag runs and tasks whose occupancy the ledger had wrong.
+            current = self._occupancy()
+            drift = sum(
+                1 for key in previous.keys() | current.keys() if previous.get(key) != current.get(key)
+            )
+            Stats.gauge("scheduler.concurrency_ledger.drift", drift)
+        self._last_reconciled = time.monotonic()
+        self._invalidated = False
+
+    def _occupancy(self) -> dict[tuple[str, ...], Any]:
+        """
+        Return the occupancy the scheduler limits, by pool, Dag run and task.
+
+        That is the slots of each pool used by queued or running task instances, and by deferred ones,
+        and the number of queued or running task instances of each Dag run and task, which a task
+        instance moving from queued to running does not change.
+        """
+        occupancy: dict[tuple[str, ...], Any] = {}
+        for pool, states in self.pool_slots_map.items():
+            slots = (
+                states[TaskInstanceState.QUEUED] + states[TaskInstanceState.RUNNING],
+                states[TaskInstanceState.DEFERRED],
+            )
+            if any(slots):
+                occupancy["pool", pool] = slots
+        occupancy.update((("dag_run", *key), count) for key, count in self.dag_run_active_tasks_map.items())
+        occupancy.update((("task", *key), count) for key, count in self.task_concurrency_map.items())
+        return occupancy
+
+    def observe(self, ti: TaskInstance, state: str | None | ArgNotSet = NOTSET) -> None:
+        """
+        Record the current state of a task instance in the ledger.
+
+        :param ti: The task instance whose occupancy changed.
+        :param state: The state to record. Defaults to ``ti.state``; pass it explicitly when the state was
+            changed with a bulk ``UPDATE`` that did not synchronize the ORM object.
+        """
+        if isinstance(state, ArgNotSet):
+            state = ti.state
+        key = (ti.dag_id, ti.task_id, ti.run_id, ti.map_index)
+        self._remove(key)
+        if state in self.TRACKED_STATES:
+            self._add(key, _LedgerEntry(ti.pool, ti.pool_slots, TaskInstanceState(state)))
+
+    def slots_stats(self, *, lock_rows: bool = False, session: Session) -> dict[str, PoolStats]:
+        """
+        Get Pool stats computed from the ledger rather than from an aggregate over ``task_instance``.
+
+        This mirrors :meth:`~airflow.models.pool.Pool.slots_stats`; the pool rows themselves are still read
+        (and locked, if ``lock_rows`` is True) from the database, and the ledger is reconciled after the
+        lock has been obtained if it is due. The ``scheduled`` count is not tracked and is always 0.
+        """
+        from airflow.models.pool import Pool
+
+        query: Select[str, int, bool] = select(Pool.pool, Pool.slots, Pool.include_deferred)  # type: ignore[type-arg]
+        if lock_rows:
+            query = with_row_locks(query, session=session, nowait=True)
+        pool_rows = session.execute(query).all()
+
+        if self.needs_reconcile():
+            self.load(session=session)
+
+        pools: dict[str, PoolStats] = {}
+        for pool_name, total_slots_in, include_deferred in pool_rows:
+            total_slots = float("inf") if total_slots_in == -1 else total_slots_in
+            occupancy = self.pool_slots_map.get(pool_name, Counter())
+            stats = PoolStats(
+                total=total_slots,
+                running=occupancy[TaskInstanceState.RUNNING],
+                queued=occupancy[TaskInstanceState.QUEUED],
+                deferred=occupancy[TaskInstanceState.DEFERRED],
+                scheduled=0,
+                open=0,
+            )
+            stats["open"] = stats["total"] - stats["running"] - stats["queued"]
+            if include_deferred:
+                stats["open"] -= stats["deferred"]
+            pools[pool_name] = stats
+        return pools
+
+    def _add(self, key: tuple[str, str, str, int], entry: _LedgerEntry) -> None:
+        self._entries[key] = entry
+        self.pool_slots_map[entry.pool][entry.state] += entry.pool_slots
+        if entry.state in EXECUTION_STATES:
+            dag_id, task_id, run_id, _ = key
+            self.dag_run_active_tasks_map[dag_id, run_id] += 1
+            self.task_concurrency_map[dag_id, task_id] += 1
+            self.task_dagrun_concurrency_map[dag_id, run_id, task_id] += 1
+
+    def _remove(self, key: tuple[str, str, str, int]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        _decrement(self.pool_slots_map[entry.pool], entry.state, entry.pool_slots)
+        if entry.state in EXECUTION_STATES:
+            dag_id, task_id, run_id, _ = key
+            _decrement(self.dag_run_active_tasks_map, (dag_id, run_id))
+            _decrement(self.task_concurrency_map, (dag_id, task_id))
+            _decrement(self.task_dagrun_concurrency_map, (dag_id, run_id, task_id))
+
+
+def _decrement(counter: Counter, key: Any, amount: int = 1) -> None:
+    counter[key] -= amount
+    if counter[key] <= 0:
+        del counter[key]
+
+
+def dag_shard(dag_id: str, shard_count: int) -> int:
+    """Return the shard a Dag belongs to; stable across processes, unlike ``hash()``."""
+    return zlib.crc32(dag_id.encode()) % shard_count
+
+
+class SchedulerShards:
+    """
+    The shards of Dags owned by a scheduler, when ``[scheduler] shard_count`` is set.
+
+    Dags are split into ``shard_count`` shards by :func:`dag_shard`. The shards are dealt round-robin to
+    the schedulers that are alive according to the ``job`` table -- running, with a heartbeat within
+    ``[scheduler] scheduler_health_check_threshold`` -- in the order of their job ids, so that every
+    scheduler computes the same assignment without further coordination, and the shards of a scheduler
+    that stops heart-beating are taken over by the others on their next refresh. Until all schedulers have
+    refreshed, two of them may both consider a shard their own; the shard critical section lock and the
+    row locks on Dag and Dag run rows keep them from acting on it at the same time.
+
+    Pool limits are enforced without locking the pool rows by giving each shard a quota of every pool.
+
+    :param shard_count: Number of shards.
+    :param refresh_interval: Maximum number of seconds between two refreshes of the owned shards.
+    """
+
+    def __init__(self, shard_count: int, refresh_interval: float):
+        self.shard_count = shard_count
+        self.refresh_interval = refresh_interval
+        self.dag_ids_by_shard: dict[int, set[str]] = {}
+        self._dag_ids: set[str] = set()
+        self._last_refreshed: float | None = None
+
+    @property
+    def owned_shards(self) -> list[int]:
+        return sorted(self.dag_ids_by_shard)
+
+    def dag_ids(self, shards: Iterable[int] | None = None) -> set[str]:
+        """Return the ids of the Dags of ``shards``, by default of all owned shards."""
+        if shards is None:
+            return self._dag_ids
+        return set().union(*(self.dag_ids_by_shard[shard] for shard in shards))
+
+    def needs_refresh(self) -> bool:
+        if self._last_refreshed is None:
+            return True
+        return time.monotonic() - self._last_refreshed >= self.refresh_interval
+
+    def refresh(self, job_id: int, session: Session) -> None:
+        """Recompute the shards owned by the scheduler of job ``job_id``, and the Dags in them."""
+        threshold = conf.getint("scheduler", "scheduler_health_check_threshold")
+        alive = set(
+            session.scalars(
+                select(Job.id).where(
+                    Job.job_type == "SchedulerJob",
+                    Job.state == JobState.RUNNING,
+                    Job.latest_heartbeat >= timezone.utcnow() - timedelta(seconds=threshold),
+                )
+            )
+        )
+        # Our own heartbeat may not be committed yet, but we are alive.
+        schedulers = sorted(alive | {job_id})
+        owned = range(schedulers.index(job_id), self.shard_count, len(schedulers))
+
+        dag_ids_by_shard: dict[int, set[str]] = {shard: set() for shard in owned}
+        for dag_id in session.scalars(select(DagModel.dag_id).where(DagModel.is_stale == expression.false())):
+            if (shard := dag_shard(dag_id, self.shard_count)) in dag_ids_by_shard:
+                dag_ids_by_shard[shard].add(dag_id)
+
+        self.dag_ids_by_shard = dag_ids_by_shard
+        self._dag_ids = set().union(*dag_ids_by_shard.values())
+        self._last_refreshed = time.monotonic()
+        Stats.gauge("scheduler.shards.owned", len(dag_ids_by_shard))
+
+    def pool_rotation(self, session: Session) -> int:
+        """
+        Return the rotation of the pool slots that do not divide evenly between the shards.
+
+        It advances every ``refresh_interval`` seconds of the database clock, which all schedulers read
+        the same, unlike their own clocks.
+        """
+        now = session.scalar(select(func.now()))
+        if now.tzinfo is None:
+            # SQLite returns the UTC time without a time zone
+            now = now.replace(tzinfo=timezone.utc)
+        return int(now.timestamp() // self.refresh_interval)
+
+    def pool_quota(self, total_slots: int, shard: int, rotation: int) -> int:
+        """
+        Return the number of slots of a pool of ``total_slots`` that ``shard`` may use.
+
+        The slots that do not divide evenly go to different shards in each ``rotation``, so that no shard is
+        starved of a small pool.
+        """
+        quota, remainder = divmod(total_slots, self.shard_count)
+        return quota + ((shard - rotation) % self.shard_count < remainder)
+
+    def slots_stats(
+        self, shards: Collection[int], *, lock_rows: bool, session: Session
+    ) -> dict[str, PoolStats]:
+        """
+        Get Pool stats of the task instances of the Dags of ``shards``, out of their quota of each pool.
+
+        This mirrors :meth:`~airflow.models.pool.Pool.slots_stats`. Task instances admitted before the
+        quotas rotated may still occupy more slots than the new quota of their shard, so the slots open to
+        ``shards`` are also capped by the slots open in the whole pool. Two schedulers may still both take
+        the last open slot of a pool that way, until the task instances over the old quota finish.
+        """
+        from airflow.models.pool import Pool
+
+        pools = Pool.slots_stats(lock_rows=lock_rows, dag_ids=self.dag_ids(shards), session=session)
+        all_pools = Pool.slots_stats(session=session)
+        rotation = self.pool_rotation(session)
+        for pool_name, stats in pools.items():
+            if stats["total"] == float("inf"):
+                continue
+            quota = sum(self.pool_quota(int(stats["total"]), shard, rotation) for shard in shards)
+            stats["open"] = min(stats["open"] + quota - stats["total"], all_pools[pool_name]["open"])
+            stats["total"] = quota
+        return pools
+
 
 def _is_parent_process() -> bool:
     """
@@ -253,6 +561,8 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
     :param scheduler_idle_sleep_time: The number of seconds to wait between
         polls of running processors
     :param log: override the default Logger
+    :param profile_loops: Record the cost of each phase of the scheduling loop in ``loop_profiler``,
+        even if ``[scheduler] loop_phase_metrics`` is disabled.
     """
 
     job_type = "SchedulerJob"
@@ -265,6 +575,7 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
         scheduler_idle_sleep_time: float = conf.getfloat("scheduler", "scheduler_idle_sleep_time"),
         log: Logger | None = None,
         executors: list[BaseExecutor] | None = None,
+        profile_loops: bool = False,
     ):
         super().__init__(job)
         self.num_runs = num_runs
@@ -276,6 +587,13 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
         )
         self._task_queued_timeout = conf.getfloat("scheduler", "task_queued_timeout")
         self._enable_tracemalloc = conf.getboolean("scheduler", "enable_tracemalloc")
+        self._create_dag_runs_in_bulk = conf.getboolean("scheduler", "create_dag_runs_in_bulk")
+        self._precompute_task_run_context = conf.getboolean("scheduler", "precompute_task_run_context")
+        self.loop_profiler: SchedulerLoopProfiler | None = (
+            SchedulerLoopProfiler()
+            if profile_loops or conf.getboolean("scheduler", "loop_phase_metrics")
+            else None
+        )
 
         # this param is intentionally undocumented
         self._num_stuck_queued_retries = conf.getint(
@@ -297,6 +615,35 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
 
         self.scheduler_dag_bag = DBDagBag(load_op_links=False)
 
+        # Opt-in notifications from the API server, waited on instead of sleeping when idle.
+        wakeup_method = get_wakeup_method(settings.engine.dialect.name if settings.engine else None)
+        self._wakeup_listener: SchedulerWakeupListener | None = (
+            SchedulerWakeupListener(wakeup_method, socket_path=get_wakeup_socket_path())
+            if wakeup_method != SchedulerWakeupMethod.none
+            else None
+        )
+        # Dag runs the API server asked to be scheduled, as (dag_id, run_id)
+        self._notified_dag_runs: set[tuple[str, str]] = set()
+
+        # Opt-in in-memory view of pool/DAG/task occupancy, used instead of re-aggregating the
+        # task_instance table in every critical section.
+        ledger_reconcile_interval = conf.getfloat("scheduler", "concurrency_ledger_reconcile_interval")
+        self._concurrency_ledger: ConcurrencyLedger | None = (
+            ConcurrencyLedger(reconcile_interval=ledger_reconcile_interval)
+            if ledger_reconcile_interval > 0
+            else None
+        )
+
+        # Opt-in sharding of Dags between schedulers, each only working on the Dags of its shards.
+        shard_count = conf.getint("scheduler", "shard_count")
+        self._shards: SchedulerShards | None = (
+            SchedulerShards(
+                shard_count, refresh_interval=conf.getfloat("scheduler", "shard_refresh_interval")
+            )
+            if shard_count > 0
+            else None
+        )
+
     @provide_session
     def heartbeat_callback(self, session: Session = NEW_SESSION) -> None:
         Stats.incr("scheduler_heartbeat", 1, 1)
@@ -461,6 +808,34 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
             self.log.info("\n\t".join(map(repr, callstack)))
             self.log.info("-" * 80)
 
+    def _lock_shards(self, shards: SchedulerShards, session: Session) -> list[int]:
+        """
+        Take the critical section lock of each shard owned by this scheduler.
+
+        Shards whose lock is held by another scheduler, which has not noticed yet that the shard moved, are
+        left to it for this loop.
+
+        :return: The shards locked, empty if this scheduler owns no shard.
+        """
+        from airflow.utils.db import DBLocks
+
+        owned_shards = shards.owned_shards
+        if not owned_shards or get_dialect_name(session) != "postgresql":
+            return owned_shards
+        locked_shards = [
+            shard
+            for shard in owned_shards
+            if session.execute(
+                text("SELECT pg_try_advisory_xact_lock(:id, :shard)").bindparams(
+                    id=DBLocks.SCHEDULER_CRITICAL_SECTION.value, shard=shard
+                )
+            ).scalar()
+        ]
+        if not locked_shards:
+            # Throw an error like the one that would happen with NOWAIT
+            raise OperationalError("Failed to acquire advisory lock", params=None, orig=RuntimeError("55P03"))
+        return locked_shards
+
     def _executable_task_instances_to_queued(self, max_tis: int, session: Session) -> list[TI]:
         """
         Find TIs that are ready for execution based on conditions.
@@ -481,7 +856,14 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
 
         executable_tis: list[TI] = []
 
-        if get_dialect_name(session) == "postgresql":
+        shards = self._shards
+        locked_shards: list[int] | None = None
+        if shards is not None:
+            locked_shards = self._lock_shards(shards, session)
+            if not locked_shards:
+                self.log.debug("Scheduler owns no shard")
+                return []
+        elif get_dialect_name(session) == "postgresql":
             # Optimization: to avoid littering the DB errors of "ERROR: canceling statement due to lock
             # timeout", try to take out a transactional advisory lock (unlocks automatically on
             # COMMIT/ROLLBACK)
@@ -498,9 +880,23 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                     "Failed to acquire advisory lock", params=None, orig=RuntimeError("55P03")
                 )
 
+        ledger = self._concurrency_ledger
+
         # Get the pool settings. We get a lock on the pool rows, treating this as a "critical section"
         # Throws an exception if lock cannot be obtained, rather than blocking
-        pools = Pool.slots_stats(lock_rows=True, session=session)
+        shard_dag_ids: set[str] | None = None
+        if shards is not None and locked_shards is not None:
+            if ledger is not None and ledger.needs_reconcile():
+                ledger.load(session=session)
+            # The shard locks stand in for the pool row locks, where there are any.
+            pools = shards.slots_stats(
+                locked_shards, lock_rows=get_dialect_name(session) != "postgresql", session=session
+            )
+            shard_dag_ids = shards.dag_ids(locked_shards)
+        elif ledger is not None:
+            pools = ledger.slots_stats(lock_rows=True, session=session)
+        else:
+            pools = Pool.slots_stats(lock_rows=True, session=session)
 
         # If the pools are full, there is no point doing anything!
         # If _somehow_ the pool is overfull, don't let the limit go negative - it breaks SQL
@@ -515,8 +911,22 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
         starved_pools = {pool_name for pool_name, stats in pools.items() if stats["open"] <= 0}
 
         # dag_id to # of running tasks and (dag_id, task_id) to # of running tasks.
-        concurrency_map = ConcurrencyMap()
-        concurrency_map.load(session=session)
+        if ledger is not None:
+            # Work on a copy: the ledger itself is only updated once the TIs are actually queued.
+            concurrency_map = ledger.copy()
+            active_dag_ids = {dag_id for dag_id, _ in concurrency_map.dag_run_active_tasks_map}
+            max_active_tasks_by_dag: dict[str, int] = (
+                dict(
+                    session.execute(
+                        select(DM.dag_id, DM.max_active_tasks).where(DM.dag_id.in_(active_dag_ids))
+                    ).all()
+                )
+                if active_dag_ids
+                else {}
+            )
+        else:
+            concurrency_map = ConcurrencyMap()
+            concurrency_map.load(session=session)
 
         # Number of tasks that cannot be scheduled because of no open slot in pool
         num_starving_tasks_total = 0
@@ -534,13 +944,6 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
             num_starved_tasks = len(starved_tasks)
             num_starved_tasks_task_dagrun_concurrency = len(starved_tasks_task_dagrun_concurrency)
 
-            # This behaves the same as 'concurrency_map.load()' with the difference that
-            # 'load()' executes immediately while '_get_current_dr_task_concurrency' creates a
-            # subquery object that is then executed along with main query.
-            # The results of 'load()' aren't used again here because by the time the main query
-            # executes, there could be a change that will be ignored.
-            dr_task_concurrency_subquery = _get_current_dr_task_concurrency(states=EXECUTION_STATES)
-
             query = (
                 select(TI)
                 .with_hint(TI, "USE INDEX (ti_state)", dialect_name="mysql")
@@ -550,19 +953,38 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                 .where(~DM.is_paused)
                 .where(TI.state == TaskInstanceState.SCHEDULED)
                 .where(DM.bundle_name.is_not(None))
-                .join(
+                .order_by(-TI.priority_weight, DR.logical_date, TI.map_index)
+            )
+
+            if shard_dag_ids is not None:
+                query = query.where(TI.dag_id.in_(shard_dag_ids))
+
+            if ledger is not None:
+                # The ledger already knows how many tasks are active in each DAG run, so only DAG runs
+                # that are at their max_active_tasks limit need to be excluded from the candidate query.
+                if starved_dag_runs := {
+                    dag_run_key
+                    for dag_run_key, active in concurrency_map.dag_run_active_tasks_map.items()
+                    if active >= max_active_tasks_by_dag.get(dag_run_key[0], active + 1)
+                }:
+                    query = query.where(tuple_(TI.dag_id, TI.run_id).not_in(starved_dag_runs))
+            else:
+                # This behaves the same as 'concurrency_map.load()' with the difference that
+                # 'load()' executes immediately while '_get_current_dr_task_concurrency' creates a
+                # subquery object that is then executed along with main query.
+                # The results of 'load()' aren't used again here because by the time the main query
+                # executes, there could be a change that will be ignored.
+                dr_task_concurrency_subquery = _get_current_dr_task_concurrency(states=EXECUTION_STATES)
+                query = query.join(
                     dr_task_concurrency_subquery,
                     and_(
                         TI.dag_id == dr_task_concurrency_subquery.c.dag_id,
                         TI.run_id == dr_task_concurrency_subquery.c.run_id,
                     ),
                     isouter=True,
-                )
-                .where(
+                ).where(
                     func.coalesce(dr_task_concurrency_subquery.c.task_per_dr_count, 0) < DM.max_active_tasks
                 )
-                .order_by(-TI.priority_weight, DR.logical_date, TI.map_index)
-            )
 
             # Starvation filters should be applied before computing the row_num based on the
             # max_active_tasks limit. That way, starved dags and tasks that shouldn't run,
@@ -914,6 +1336,8 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
 
             for ti in executable_tis:
                 ti.emit_state_change_metric(TaskInstanceState.QUEUED)
+                if ledger is not None:
+                    ledger.observe(ti, TaskInstanceState.QUEUED)
 
         for ti in executable_tis:
             make_transient(ti)
@@ -947,10 +1371,16 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                 return ""
             return sentry_integration
 
+        run_contexts: dict[UUID, TIRunContext] = {}
+        if self._precompute_task_run_context and executor.supports_task_run_context:
+            run_contexts = self._get_task_run_contexts(task_instances, session=session)
+
         # actually enqueue them
         for ti in task_instances:
             if ti.dag_run.state in State.finished_dr_states:
                 ti.set_state(None, session=session)
+                if self._concurrency_ledger is not None:
+                    self._concurrency_ledger.observe(ti)
                 continue
             if not ti.dag_version_id:
                 self.log.warning(
@@ -973,9 +1403,75 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                 ti,
                 generator=executor.jwt_generator,
                 sentry_integration=_get_sentry_integration(executor),
+                ti_context=run_contexts.get(ti.id),
             )
             executor.queue_workload(workload, session=session)
 
+    @staticmethod
+    def _get_task_run_contexts(task_instances: list[TI], session: Session) -> dict[UUID, TIRunContext]:
+        """
+        Get the run contexts of queued task instances, as the Execution API returns them to start a task.
+
+        They are looked up for all the task instances at once, so that the workers of the task instances only
+        claim them instead of each fetching its run context. Task instances resuming from deferral fetch it,
+        as their ``next_kwargs`` are only deserialized by the worker.
+        """
+        tis = [ti for ti in task_instances if not ti.next_method]
+        if not tis:
+            return {}
+
+        # Load the asset events of the Dag runs for their datamodels
+        session.scalars(
+            select(DagRun)
+            .where(DagRun.id.in_({ti.dag_run.id for ti in tis}))
+            .options(
+                selectinload(DagRun.consumed_asset_events).selectinload(AssetEvent.asset),
+                selectinload(DagRun.consumed_asset_events).selectinload(AssetEvent.source_aliases),
+            )
+        ).all()
+
+        # The XComs of the previous tries, which the worker clears
+        xcom_keys: dict[tuple[str, str, str], list[tuple[int, str]]] = defaultdict(list)
+        for dag_id, run_id, task_id, map_index, key in session.execute(
+            select(
+                XComModel.dag_id, XComModel.run_id, XComModel.task_id, XComModel.map_index, XComModel.key
+            ).where(
+                tuple_(XComModel.dag_id, XComModel.run_id, XComModel.task_id).in_(
+                    {(ti.dag_id, ti.run_id, ti.task_id) for ti in tis}
+                )
+            )
+        ):
+            xcom_keys[dag_id, run_id, task_id].append((map_index, key))
+
+        task_reschedule_counts: dict[UUID, int] = dict(
+            session.execute(
+                select(TaskReschedule.ti_id, func.count(TaskReschedule.id))
+                .where(TaskReschedule.ti_id.in_([ti.id for ti in tis]))
+                .group_by(TaskReschedule.ti_id)
+            ).all()
+        )
+
+        dag_runs: dict[int, DRDataModel] = {}
+        run_contexts = {}
+        for ti in tis:
+            if ti.dag_run.id not in dag_runs:
+                dag_runs[ti.dag_run.id] = DRDataModel.model_validate(ti.dag_run, from_attributes=True)
+            run_contexts[ti.id] = TIRunContext(
+                dag_run=dag_runs[ti.dag_run.id],
+                task_reschedule_count=task_reschedule_counts.get(ti.id, 0),
+                max_tries=ti.max_tries,
+                variables=[],
+                connections=[],
+                xcom_keys_to_clear=[
+                    key
+                    for map_index, key in xcom_keys[ti.dag_id, ti.run_id, ti.task_id]
+                    if ti.map_index < 0 or map_index == ti.map_index
+                ],
+                # The task instances are QUEUED, see _is_eligible_to_retry of the Execution API
+                should_retry=ti.max_tries != 0 and ti.try_number <= ti.max_tries,
+            )
+        return run_contexts
+
     def _critical_section_enqueue_task_instances(self, session: Session) -> int:
         """
         Enqueues TaskInstances for execution.
@@ -1122,11 +1618,17 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
             job_id=self.job.id,
             scheduler_dag_bag=self.scheduler_dag_bag,
             session=session,
+            concurrency_ledger=self._concurrency_ledger,
         )
 
     @classmethod
     def process_executor_events(
-        cls, executor: BaseExecutor, job_id: int | None, scheduler_dag_bag: DBDagBag, session: Session
+        cls,
+        executor: BaseExecutor,
+        job_id: int | None,
+        scheduler_dag_bag: DBDagBag,
+        session: Session,
+        concurrency_ledger: ConcurrencyLedger | None = None,
     ) -> int:
         """
         Process task completion events from the executor and update task instance states.
@@ -1147,6 +1649,8 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
         :param job_id: The scheduler job ID, used to detect task requeuing by other schedulers
         :param scheduler_dag_bag: Serialized DAG bag for retrieving task definitions
         :param session: Database session for task instance updates
+        :param concurrency_ledger: If given, updated with the resulting state of every task instance
+            an event was received for
 
         :return: Number of events processed from the executor event buffer
 
@@ -1234,7 +1738,7 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
         # row lock this entire set of taskinstances to make sure the scheduler doesn't fail when we have
         # multi-schedulers
         locked_query = with_row_locks(query, of=TI, session=session, skip_locked=True)
-        tis: Iterator[TI] = session.scalars(locked_query)
+        tis: Sequence[TI] = session.scalars(locked_query).all()
         for ti in tis:
             try_number = ti_primary_key_to_try_number_map[ti.key.primary]
             buffer_key = ti.key.with_try_number(try_number)
@@ -1422,6 +1926,10 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                 # Update task state - emails are handled by DAG processor now
                 ti.handle_failure(error=msg, session=session)
 
+        if concurrency_ledger is not None:
+            for ti in tis:
+                concurrency_ledger.observe(ti)
+
         return len(event_buffer)
 
     def _execute(self) -> int | None:
@@ -1465,6 +1973,11 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                 except Exception:
                     self.log.exception("Exception when executing Executor.end on %s", executor)
 
+            if self._wakeup_listener is not None:
+                self._wakeup_listener.close()
+            if self.loop_profiler is not None:
+                self.loop_profiler.stop()
+
             # Under normal execution, this doesn't matter, but by resetting signals it lets us run more things
             # in the same process under testing without leaking global state
             reset_signals.close()
@@ -1514,6 +2027,9 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
         """
         is_unit_test: bool = conf.getboolean("core", "unit_test_mode")
 
+        if self.loop_profiler is not None:
+            self.loop_profiler.start()
+
         timers = EventScheduler()
 
         # Check on start up, then every configured interval
@@ -1597,10 +2113,11 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                 # Heartbeat all executors, even if they're not receiving new tasks this loop. It will be
                 # either a no-op, or they will check-in on currently running tasks and send out new
                 # events to be processed below.
-                for executor in self.executors:
-                    executor.heartbeat()
+                with self._loop_phase("executor_heartbeat"):
+                    for executor in self.executors:
+                        executor.heartbeat()
 
-                with create_session() as session:
+                with self._loop_phase("process_executor_events"), create_session() as session:
                     num_finished_events = 0
                     for executor in self.executors:
                         num_finished_events += self._process_executor_events(
@@ -1614,7 +2131,7 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                     except Exception:
                         self.log.exception("Something went wrong when trying to save task event logs.")
 
-                with create_session() as session:
+                with self._loop_phase("deadlines"), create_session() as session:
                     # Only retrieve expired deadlines that haven't been processed yet.
                     # `missed` is False by default until the handler sets it.
                     for deadline in session.scalars(
@@ -1634,7 +2151,8 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                 )
 
                 # Run any pending timed events
-                next_event = timers.run(blocking=False)
+                with self._loop_phase("timed_events"):
+                    next_event = timers.run(blocking=False)
                 self.log.debug("Next timed event is in %f", next_event)
 
             self.log.debug("Ran scheduling loop in %.2f ms", timer.duration)
@@ -1644,7 +2162,10 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                 # If the scheduler is doing things, don't sleep. This means when there is work to do, the
                 # scheduler will run "as quick as possible", but when it's stopped, it can sleep, dropping CPU
                 # usage when "idle"
-                time.sleep(min(self._scheduler_idle_sleep_time, next_event or 0))
+                self._wait_for_work(min(self._scheduler_idle_sleep_time, next_event or 0))
+            elif self._wakeup_listener is not None:
+                # Pick up the notifications received while busy, without waiting.
+                self._wait_for_work(0)
 
             if idle_in_this_run:
                 idle_count += 1
@@ -1661,6 +2182,52 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                 )
                 break
 
+    def _loop_phase(self, name: str) -> AbstractContextManager[None]:
+        """Record the cost of a phase of the scheduling loop, when profiling is enabled."""
+        if self.loop_profiler is None:
+            return nullcontext()
+        return self.loop_profiler.phase(name)
+
+    def _wait_for_work(self, timeout: float) -> None:
+        """Sleep up to ``timeout`` seconds, waking up early when notified of new work."""
+        if self._wakeup_listener is None:
+            time.sleep(timeout)
+            return
+        notified_dag_runs = self._wakeup_listener.wait(timeout)
+        if notified_dag_runs is not None:
+            Stats.incr("scheduler.wakeups")
+            self._notified_dag_runs |= notified_dag_runs
+
+    def _add_notified_dag_runs(self, dag_runs: Iterable[DagRun], session: Session) -> list[DagRun]:
+        """Add the running dag runs the scheduler was notified about to the dag runs to examine."""
+        dag_runs = list(dag_runs)
+        notified_dag_runs = self._notified_dag_runs.difference((dr.dag_id, dr.run_id) for dr in dag_runs)
+        self._notified_dag_runs = set()
+        if (shard_dag_ids := self._shard_dag_ids()) is not None:
+            notified_dag_runs = {key for key in notified_dag_runs if key[0] in shard_dag_ids}
+        if not notified_dag_runs:
+            return dag_runs
+        dag_runs.extend(DagRun.get_dag_runs_to_examine_by_key(notified_dag_runs, session=session))
+        return dag_runs
+
+    def _refresh_shards(self, session: Session) -> None:
+        """Rebalance the shards between the running schedulers, and pick up the Dags added to them."""
+        if TYPE_CHECKING:
+            assert self._shards is not None
+            assert self.job.id is not None
+        owned_shards = self._shards.owned_shards
+        self._shards.refresh(self.job.id, session=session)
+        if self._shards.owned_shards != owned_shards:
+            self.log.info(
+                "Scheduler now owns shards %s of %d", self._shards.owned_shards, self._shards.shard_count
+            )
+
+    def _shard_dag_ids(self) -> set[str] | None:
+        """Return the ids of the Dags this scheduler works on, or None if schedulers are not sharded."""
+        if self._shards is None:
+            return None
+        return self._shards.dag_ids()
+
     def _do_scheduling(self, session: Session) -> int:
         """
         Make the main scheduling decisions.
@@ -1691,32 +2258,43 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
 
         :return: Number of TIs enqueued in this iteration
         """
+        if self._shards is not None and self._shards.needs_refresh():
+            self._refresh_shards(session)
+
         # Put a check in place to make sure we don't commit unexpectedly
         with prohibit_commit(session) as guard:
             if conf.getboolean("scheduler", "use_job_schedule", fallback=True):
-                self._create_dagruns_for_dags(guard, session)
-
-            self._start_queued_dagruns(session)
-            guard.commit()
-
-            # Bulk fetch the currently active dag runs for the dags we are
-            # examining, rather than making one query per DagRun
-            dag_runs = DagRun.get_running_dag_runs_to_examine(session=session)
+                with self._loop_phase("create_dag_runs"):
+                    self._create_dagruns_for_dags(guard, session)
+
+            with self._loop_phase("start_queued_dag_runs"):
+                self._start_queued_dagruns(session)
+                guard.commit()
+
+            with self._loop_phase("schedule_dag_runs"):
+                # Bulk fetch the currently active dag runs for the dags we are
+                # examining, rather than making one query per DagRun
+                dag_runs: Iterable[DagRun] = DagRun.get_running_dag_runs_to_examine(
+                    session=session, dag_ids=self._shard_dag_ids()
+                )
+                if self._notified_dag_runs:
+                    dag_runs = self._add_notified_dag_runs(dag_runs, session)
 
-            callback_tuples = self._schedule_all_dag_runs(guard, dag_runs, session)
+                callback_tuples = self._schedule_all_dag_runs(guard, dag_runs, session)
 
         # Send the callbacks after we commit to ensure the context is up to date when it gets run
         # cache saves time during scheduling of many dag_runs for same dag
         cached_get_dag: Callable[[DagRun], SerializedDAG | None] = lru_cache()(
             partial(self.scheduler_dag_bag.get_dag_for_run, session=session)
         )
-        for dag_run, callback_to_run in callback_tuples:
-            dag = cached_get_dag(dag_run)
-            if dag:
-                # Sending callbacks to the database, so it must be done outside of prohibit_commit.
-                self._send_dag_callbacks_to_processor(dag, callback_to_run)
-            else:
-                self.log.error("DAG '%s' not found in serialized_dag table", dag_run.dag_id)
+        with self._loop_phase("send_dag_callbacks"):
+            for dag_run, callback_to_run in callback_tuples:
+                dag = cached_get_dag(dag_run)
+                if dag:
+                    # Sending callbacks to the database, so it must be done outside of prohibit_commit.
+                    self._send_dag_callbacks_to_processor(dag, callback_to_run)
+                else:
+                    self.log.error("DAG '%s' not found in serialized_dag table", dag_run.dag_id)
 
         with prohibit_commit(session) as guard:
             # Without this, the session has an invalid view of the DB
@@ -1735,7 +2313,8 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                     timer.start()
 
                     # Find any TIs in state SCHEDULED, try to QUEUE them (send it to the executors)
-                    num_queued_tis = self._critical_section_enqueue_task_instances(session=session)
+                    with self._loop_phase("critical_section"):
+                        num_queued_tis = self._critical_section_enqueue_task_instances(session=session)
 
                     # Make sure we only sent this metric if we obtained the lock, otherwise we'll skew the
                     # metric, way down
@@ -1758,9 +2337,10 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
         partition_dag_ids: set[str] = set()
 
         evaluator = AssetEvaluator(session)
-        for apdr in session.scalars(
-            select(AssetPartitionDagRun).where(AssetPartitionDagRun.created_dag_run_id.is_(None))
-        ):
+        query = select(AssetPartitionDagRun).where(AssetPartitionDagRun.created_dag_run_id.is_(None))
+        if (shard_dag_ids := self._shard_dag_ids()) is not None:
+            query = query.where(AssetPartitionDagRun.target_dag_id.in_(shard_dag_ids))
+        for apdr in session.scalars(query):
             if TYPE_CHECKING:
                 assert apdr.target_dag_id
 
@@ -1824,7 +2404,7 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
         """Find Dag Models needing DagRuns and Create Dag Runs with retries in case of OperationalError."""
         partition_dag_ids: set[str] = self._create_dagruns_for_partitioned_asset_dags(session)
 
-        query, triggered_date_by_dag = DagModel.dags_needing_dagruns(session)
+        query, triggered_date_by_dag = DagModel.dags_needing_dagruns(session, dag_ids=self._shard_dag_ids())
         all_dags_needing_dag_runs = set(query.all())
         asset_triggered_dags = [d for d in all_dags_needing_dag_runs if d.dag_id in triggered_date_by_dag]
         non_asset_dags = {
@@ -1904,6 +2484,8 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
             )
         )
 
+        # With [scheduler] create_dag_runs_in_bulk, the runs are created together after the loop.
+        pending_runs: list[tuple[DagModel, SerializedDAG, DagRunInfo]] = []
         for dag_model in dag_models:
             if dag_model.exceeds_max_non_backfill:
                 self.log.warning(
@@ -1955,6 +2537,17 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                 )
                 continue
 
+            if self._create_dag_runs_in_bulk:
+                try:
+                    next_info = serdag.timetable.next_run_info_from_dag_model(dag_model=dag_model)
+                except Exception:
+                    self.log.exception("Failed creating DagRun", dag_id=dag_model.dag_id)
+                    continue
+                if TYPE_CHECKING:
+                    assert next_info is not None
+                pending_runs.append((dag_model, serdag, next_info))
+                continue
+
             try:
                 next_info = serdag.timetable.next_run_info_from_dag_model(dag_model=dag_model)
                 if TYPE_CHECKING:
@@ -2003,6 +2596,52 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
             # TODO[HA]: Should we do a session.flush() so we don't have to keep lots of state/object in
             #  memory for larger dags? or expunge_all()
 
+        if pending_runs:
+            self._create_pending_dag_runs(pending_runs, active_runs_of_dags, session)
+
+    def _create_pending_dag_runs(
+        self,
+        pending_runs: list[tuple[DagModel, SerializedDAG, DagRunInfo]],
+        active_runs_of_dags: Counter[str],
+        session: Session,
+    ) -> None:
+        """Create the scheduled runs of many dags at once, and update their dag models."""
+        from airflow.serialization.definitions.dag import create_scheduled_dagruns
+
+        def create_runs(runs: list[tuple[DagModel, SerializedDAG, DagRunInfo]]) -> dict[str, DagRun]:
+            # In a savepoint, so that a conflicting run or task instance, e.g. one created by another
+            # scheduler, only rolls back the runs created here and not the scheduling loop's transaction.
+            with session.begin_nested():
+                return create_scheduled_dagruns(
+                    ((serdag, next_info) for _, serdag, next_info in runs),
+                    bundle_versions={dag_model.dag_id: dag_model.bundle_version for dag_model, _, _ in runs},
+                    creating_job_id=self.job.id,
+                    session=session,
+                )
+
+        try:
+            created_runs = create_runs(pending_runs)
+        except IntegrityError:
+            self.log.warning("Could not create the Dag runs at once; creating them one by one", exc_info=True)
+            created_runs = {}
+            for pending_run in pending_runs:
+                try:
+                    created_runs.update(create_runs([pending_run]))
+                except IntegrityError:
+                    self.log.exception("Failed creating DagRun", dag_id=pending_run[0].dag_id)
+
+        for dag_model, serdag, _ in pending_runs:
+            if not (created_run := created_runs.get(dag_model.dag_id)):
+                continue
+            active_runs_of_dags[dag_model.dag_id] += 1
+            # The dag models are updated in memory; the session flushes them with one executemany.
+            dag_model.calculate_dagrun_date_fields(dag=serdag, last_automated_run=created_run)
+            self._set_exceeds_max_active_runs(
+                dag_model=dag_model,
+                session=session,
+                active_non_backfill_runs=active_runs_of_dags[dag_model.dag_id],
+            )
+
     def _create_dag_runs_asset_triggered(
         self,
         dag_models: Collection[DagModel],
@@ -2107,7 +2746,9 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
 
     def _start_queued_dagruns(self, session: Session) -> None:
         """Find DagRuns in queued state and decide moving them to running state."""
-        dag_runs: Collection[DagRun] = list(DagRun.get_queued_dag_runs_to_set_running(session))
+        dag_runs: Collection[DagRun] = list(
+            DagRun.get_queued_dag_runs_to_set_running(session, dag_ids=self._shard_dag_ids())
+        )
 
         # Lock backfills to prevent race conditions with concurrent schedulers
         locked_backfills = self._lock_backfills(dag_runs, session)
@@ -2398,6 +3039,9 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                         executor=executor,
                     )
                     session.commit()
+                    if self._concurrency_ledger is not None:
+                        # Requeued TIs are moved back to scheduled with a bulk UPDATE.
+                        self._concurrency_ledger.invalidate()
             except NotImplementedError:
                 continue
 
@@ -2721,6 +3365,9 @@ class SchedulerJobRunner(BaseJobRunner, LoggingMixin):
                     Stats.incr("scheduler.orphaned_tasks.cleared", len(to_reset))
                     Stats.incr("scheduler.orphaned_tasks.adopted", len(tis_to_adopt_or_reset) - len(to_reset))
 
+                    if to_reset and self._concurrency_ledger is not None:
+                        self._concurrency_ledger.invalidate()
+
                     if to_reset:
                         task_instance_str = "\n\t".join(reset_tis_message)
                         self.log.info(
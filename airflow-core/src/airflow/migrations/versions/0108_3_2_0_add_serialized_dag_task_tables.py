@@ -0,0 +1,147 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Add serialized_dag_task and serialized_dag_task_ref tables.
+
+Revision ID: b87cdbc91bc6
+Revises: 6222ce48e289
+Create Date: 2026-10-16 22:41:07.512309
+
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+
+import sqlalchemy as sa
+from alembic import op
+
+from airflow.utils.sqlalchemy import UtcDateTime
+
+revision = "b87cdbc91bc6"
+down_revision = "6222ce48e289"
+branch_labels = None
+depends_on = None
+airflow_version = "3.2.0"
+
+_BATCH_SIZE = 100
+
+
+def upgrade():
+    """Add serialized_dag_task and serialized_dag_task_ref tables."""
+    op.create_table(
+        "serialized_dag_task",
+        sa.Column("task_hash", sa.String(32), nullable=False),
+        sa.Column("data_compressed", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", UtcDateTime, nullable=False),
+        sa.PrimaryKeyConstraint("task_hash", name=op.f("serialized_dag_task_pkey")),
+    )
+    op.create_table(
+        "serialized_dag_task_ref",
+        sa.Column("serialized_dag_id", sa.Uuid(), nullable=False),
+        sa.Column("task_hash", sa.String(32), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["serialized_dag_id"],
+            ["serialized_dag.id"],
+            name=op.f("serialized_dag_task_ref_serialized_dag_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["task_hash"],
+            ["serialized_dag_task.task_hash"],
+            name=op.f("serialized_dag_task_ref_task_hash_fkey"),
+        ),
+        sa.PrimaryKeyConstraint("serialized_dag_id", "task_hash", name=op.f("serialized_dag_task_ref_pkey")),
+    )
+    with op.batch_alter_table("serialized_dag_task_ref", schema=None) as batch_op:
+        batch_op.create_index("idx_serialized_dag_task_ref_task_hash", ["task_hash"], unique=False)
+
+
+def downgrade():
+    """Copy the shared tasks back into the serialized Dags, and drop the tables they are stored in."""
+    _inline_shared_tasks(op.get_bind())
+    op.drop_table("serialized_dag_task_ref")
+    op.drop_table("serialized_dag_task")
+
+
+def _inline_shared_tasks(conn) -> None:
+    """Replace the task references of serialized Dags with the data of the tasks they reference."""
+    serialized_dag = sa.table(
+        "serialized_dag",
+        sa.column("id"),
+        sa.column("data", sa.JSON(none_as_null=True)),
+        sa.column("data_compressed", sa.LargeBinary),
+    )
+    serialized_dag_task = sa.table(
+        "serialized_dag_task",
+        sa.column("task_hash", sa.String),
+        sa.column("data_compressed", sa.LargeBinary),
+    )
+    serialized_dag_ids = conn.execute(
+        sa.text("SELECT DISTINCT serialized_dag_id FROM serialized_dag_task_ref")
+    ).all()
+    update_dag = (
+        sa.update(serialized_dag)
+        .where(serialized_dag.c.id == sa.bindparam("serialized_dag_id"))
+        .values(data=sa.bindparam("new_data"), data_compressed=sa.bindparam("new_data_compressed"))
+    )
+    for start in range(0, len(serialized_dag_ids), _BATCH_SIZE):
+        batch = [dag_id for (dag_id,) in serialized_dag_ids[start : start + _BATCH_SIZE]]
+        # Data of the serialized Dags with task references, and whether it is compressed
+        dags: dict = {}
+        for serialized_dag_id, data, data_compressed in conn.execute(
+            sa.select(serialized_dag.c.id, serialized_dag.c.data, serialized_dag.c.data_compressed).where(
+                serialized_dag.c.id.in_(batch)
+            )
+        ):
+            dag_data = json.loads(zlib.decompress(data_compressed)) if data_compressed else data
+            task_refs = dag_data["dag"].get("tasks")
+            if isinstance(task_refs, dict) and task_refs.get("__type") == "task_refs":
+                dags[serialized_dag_id] = (dag_data, bool(data_compressed))
+        if not dags:
+            continue
+
+        task_hashes = {
+            task_hash for dag_data, _ in dags.values() for task_hash in dag_data["dag"]["tasks"]["__var"]
+        }
+        tasks = {
+            task_hash: json.loads(zlib.decompress(data_compressed))
+            for task_hash, data_compressed in conn.execute(
+                sa.select(serialized_dag_task.c.task_hash, serialized_dag_task.c.data_compressed).where(
+                    serialized_dag_task.c.task_hash.in_(task_hashes)
+                )
+            )
+        }
+        updates = []
+        for serialized_dag_id, (dag_data, compressed) in dags.items():
+            dag_data["dag"]["tasks"] = [tasks[task_hash] for task_hash in dag_data["dag"]["tasks"]["__var"]]
+            if compressed:
+                new_data = None
+                new_data_compressed = zlib.compress(json.dumps(dag_data, sort_keys=True).encode("utf-8"))
+            else:
+                new_data, new_data_compressed = dag_data, None
+            updates.append(
+                {
+                    "serialized_dag_id": serialized_dag_id,
+                    "new_data": new_data,
+                    "new_data_compressed": new_data_compressed,
+                }
+            )
+        conn.execute(update_dag, updates)
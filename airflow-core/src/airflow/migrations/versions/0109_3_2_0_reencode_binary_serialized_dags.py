@@ -0,0 +1,86 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Re-encode binary serialized Dags as JSON on downgrade.
+
+Revision ID: 4f0e576ecd86
+Revises: b87cdbc91bc6
+Create Date: 2026-10-17 09:12:44.183520
+
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+
+import msgspec
+import sqlalchemy as sa
+from alembic import op
+
+revision = "4f0e576ecd86"
+down_revision = "b87cdbc91bc6"
+branch_labels = None
+depends_on = None
+airflow_version = "3.2.0"
+
+# Header of the binary format of ``[core] serialized_dag_storage_format = msgpack``, followed by the
+# version of the format and its flags.
+_BINARY_HEADER = b"AFSD"
+_BINARY_FLAG_ZLIB = 0x01
+_BATCH_SIZE = 100
+
+
+def upgrade():
+    """Nothing to do, the binary format is only written once enabled in the configuration."""
+
+
+def downgrade():
+    """Re-encode binary serialized Dags and tasks as zlib-compressed JSON, which older versions read."""
+    conn = op.get_bind()
+    _reencode_binary_rows(conn, "serialized_dag", "id")
+    _reencode_binary_rows(conn, "serialized_dag_task", "task_hash")
+
+
+def _decode_binary(data: bytes) -> dict:
+    offset = len(_BINARY_HEADER)
+    version, flags = data[offset], data[offset + 1]
+    if version != 1:
+        raise ValueError(f"Unsupported serialized Dag binary format version: {version}")
+    payload = data[offset + 2 :]
+    if flags & _BINARY_FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+    return msgspec.msgpack.decode(payload, type=dict)
+
+
+def _reencode_binary_rows(conn, table: str, key_column: str) -> None:
+    keys = conn.execute(sa.text(f"SELECT {key_column} FROM {table} WHERE data_compressed IS NOT NULL")).all()
+    select_batch = sa.text(
+        f"SELECT {key_column}, data_compressed FROM {table} WHERE {key_column} IN :keys"
+    ).bindparams(sa.bindparam("keys", expanding=True))
+    update_row = sa.text(f"UPDATE {table} SET data_compressed = :data WHERE {key_column} = :key")
+    for start in range(0, len(keys), _BATCH_SIZE):
+        batch = [key for (key,) in keys[start : start + _BATCH_SIZE]]
+        updates = [
+            {"key": key, "data": zlib.compress(json.dumps(_decode_binary(bytes(data))).encode("utf-8"))}
+            for key, data in conn.execute(select_batch, {"keys": batch})
+            if bytes(data).startswith(_BINARY_HEADER)
+        ]
+        if updates:
+            conn.execute(update_row, updates)
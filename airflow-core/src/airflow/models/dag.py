@@ -622,7 +622,9 @@ class DagModel(Base):
         return any_deactivated
 
     @classmethod
-    def dags_needing_dagruns(cls, session: Session) -> tuple[Any, dict[str, datetime]]:
+    def dags_needing_dagruns(
+        cls, session: Session, dag_ids: Collection[str] | None = None
+    ) -> tuple[Any, dict[str, datetime]]:
         """
         Return (and lock) a list of Dag objects that are due to create a new DagRun.
 
@@ -630,6 +632,8 @@ class DagModel(Base):
         you should ensure that any scheduling decisions are made in a single transaction -- as soon as the
         transaction is committed it will be unlocked.
 
+        :param dag_ids: If given, only consider these Dags.
+
         :meta private:
         """
         from airflow.models.serialized_dag import SerializedDagModel
@@ -651,12 +655,13 @@ class DagModel(Base):
 
         # this loads all the ADRQ records.... may need to limit num dags
         adrq_by_dag: dict[str, list[AssetDagRunQueue]] = defaultdict(list)
-        for adrq in session.scalars(
-            select(AssetDagRunQueue).options(
-                joinedload(AssetDagRunQueue.dag_model),
-                joinedload(AssetDagRunQueue.asset),
-            )
-        ):
+        adrq_query = select(AssetDagRunQueue).options(
+            joinedload(AssetDagRunQueue.dag_model),
+            joinedload(AssetDagRunQueue.asset),
+        )
+        if dag_ids is not None:
+            adrq_query = adrq_query.where(AssetDagRunQueue.target_dag_id.in_(dag_ids))
+        for adrq in session.scalars(adrq_query):
             if adrq.dag_model.asset_expression is None:
                 # The dag referenced does not actually depend on an asset! This
                 # could happen if the dag DID depend on an asset at some point,
@@ -719,6 +724,8 @@ class DagModel(Base):
             .order_by(cls.next_dagrun_create_after)
             .limit(cls.NUM_DAGS_PER_DAGRUN_QUERY)
         )
+        if dag_ids is not None:
+            query = query.where(cls.dag_id.in_(dag_ids))
 
         return (
             session.scalars(with_row_locks(query, of=cls, session=session, skip_locked=True)),
@@ -34,6 +34,8 @@ from airflow.utils.session import NEW_SESSION, provide_session
 from airflow.utils.sqlalchemy import UtcDateTime, with_row_locks
 
 if TYPE_CHECKING:
+    from collections.abc import Collection
+
     from sqlalchemy.orm import Session
     from sqlalchemy.sql import Select
 
@@ -197,6 +199,34 @@ class DagVersion(Base):
             )
         )
 
+    @classmethod
+    @provide_session
+    def get_latest_versions(
+        cls,
+        dag_ids: Collection[str],
+        *,
+        session: Session = NEW_SESSION,
+    ) -> dict[str, DagVersion]:
+        """
+        Get the latest versions of many DAGs with a single query.
+
+        :param dag_ids: The DAG IDs.
+        :param session: The database session.
+        :return: The latest version of each DAG, by DAG ID. DAGs without a version are left out.
+        """
+        if not dag_ids:
+            return {}
+        latest = (
+            select(cls.dag_id, sa.func.max(cls.created_at).label("created_at"))
+            .where(cls.dag_id.in_(dag_ids))
+            .group_by(cls.dag_id)
+            .subquery()
+        )
+        query = select(cls).join(
+            latest, sa.and_(cls.dag_id == latest.c.dag_id, cls.created_at == latest.c.created_at)
+        )
+        return {dag_version.dag_id: dag_version for dag_version in session.scalars(query)}
+
     @classmethod
     @provide_session
     def get_version(
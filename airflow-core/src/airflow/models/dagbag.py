@@ -17,13 +17,26 @@
 # under the License.
 from __future__ import annotations
 
+import contextlib
 import hashlib
+import json
+import logging
+import marshal
+import mmap
+import os
+import stat
+import tempfile
+from collections import Counter, OrderedDict
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
 from sqlalchemy import String, select
-from sqlalchemy.orm import Mapped, joinedload, mapped_column
+from sqlalchemy.orm import Mapped, defer, joinedload, mapped_column
 
+from airflow._shared.observability.metrics.stats import Stats
+from airflow.configuration import conf
+from airflow.exceptions import AirflowConfigException
 from airflow.models.base import Base, StringID
 from airflow.models.dag_version import DagVersion
 
@@ -36,28 +49,230 @@ if TYPE_CHECKING:
     from airflow.models.serialized_dag import SerializedDagModel
     from airflow.serialization.definitions.dag import SerializedDAG
 
+log = logging.getLogger(__name__)
+
+
+class SharedDagCache:
+    """
+    Host-wide cache of decoded serialized dag data, shared by processes through files.
+
+    Entries are keyed by dag version id and dag hash, and are stored with :mod:`marshal`, which loads
+    much faster than decompressing and decoding the JSON stored in the database. Entries are written
+    atomically and never modified afterwards, so any number of processes can read them concurrently.
+    Each process still loads its own copy of the data: the cache saves reading and decoding serialized
+    dags, not memory.
+
+    :param path: Directory holding the entries. It must be owned by the current user, and not writable by
+        other users, since entries are loaded with :mod:`marshal`.
+    :param max_bytes: Maximum total size of the entries, ``0`` for no limit. Beyond it, the entries
+        loaded least recently are deleted.
+
+    :meta private:
+    """
+
+    def __init__(self, path: str | os.PathLike[str], max_bytes: int = 0) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # mkdir leaves an existing directory as it is
+        path_stat = os.stat(self.path)
+        if path_stat.st_uid != os.getuid() or path_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            raise AirflowConfigException(
+                f"The shared dag cache directory {self.path} must be owned by the current user, "
+                "and not writable by other users"
+            )
+
+    def _entry_path(self, version_id: UUID, dag_hash: str) -> Path:
+        return self.path / f"{version_id}-{dag_hash}.marshal"
+
+    def get(self, version_id: UUID, dag_hash: str) -> dict | None:
+        """Return the data of a dag version, or *None* if it is not in the cache."""
+        entry_path = self._entry_path(version_id, dag_hash)
+        try:
+            with (
+                open(entry_path, "rb") as f,
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf,
+            ):
+                data = marshal.loads(buf)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError, TypeError):
+            log.warning("Ignoring unreadable shared dag cache entry for dag version %s", version_id)
+            return None
+        # Entries are pruned by modification time, least recently loaded first
+        with contextlib.suppress(OSError):
+            os.utime(entry_path)
+        return data if isinstance(data, dict) else None
+
+    def put(self, version_id: UUID, dag_hash: str, data: dict) -> None:
+        """Store the data of a dag version, unless another process already did."""
+        entry_path = self._entry_path(version_id, dag_hash)
+        if entry_path.exists():
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                marshal.dump(data, f)
+            os.replace(tmp_path, entry_path)
+        except (OSError, ValueError):
+            log.warning(
+                "Failed to write shared dag cache entry for dag version %s", version_id, exc_info=True
+            )
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            return
+        if self.max_bytes:
+            self._prune()
+
+    def _prune(self) -> None:
+        """Delete the entries loaded least recently, until the entries fit in ``max_bytes``."""
+        entries = []
+        with os.scandir(self.path) as it:
+            for entry in it:
+                if not entry.name.endswith(".marshal"):
+                    continue
+                with contextlib.suppress(FileNotFoundError):
+                    entry_stat = entry.stat()
+                    entries.append((entry_stat.st_mtime, entry_stat.st_size, entry.path))
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                return
+            # Processes which opened the entry already can still read it
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(entry_path)
+            total_bytes -= size
+            Stats.incr("dag_bag.shared_cache.evictions")
+
 
 class DBDagBag:
     """
     Internal class for retrieving and caching dags in the scheduler.
 
+    Dags are cached by dag version, least recently used first. When ``max_size`` or ``max_bytes``
+    is set, the least recently used versions are evicted once either bound is exceeded, except
+    for the latest cached version of each dag, which is never evicted. Old versions that are
+    only needed by historical runs are therefore dropped before the ones new runs are using.
+
+    With ``[core] share_serialized_dag_tasks`` and ``[core] lazy_load_dag_tasks``, the encoded
+    tasks the cached dags keep until their tasks are accessed are shared by the versions they are
+    identical in, and are not read from the database again when another version is loaded.
+
+    :param load_op_links: Whether operator extra links are loaded when deserializing dags.
+    :param max_size: Maximum number of dag versions kept in the cache, ``0`` for no limit.
+        Defaults to ``[core] serialized_dag_cache_size``.
+    :param max_bytes: Maximum total size, in bytes of serialized JSON, of the dag versions kept in
+        the cache, ``0`` for no limit. Defaults to ``[core] serialized_dag_cache_max_bytes``.
+    :param shared_cache: Cache of decoded dag data shared with other processes on the host, used
+        before reading the serialized dag from the database.
+
     :meta private:
     """
 
-    def __init__(self, load_op_links: bool = True) -> None:
-        self._dags: dict[UUID, SerializedDAG] = {}  # dag_version_id to dag
+    def __init__(
+        self,
+        load_op_links: bool = True,
+        *,
+        max_size: int | None = None,
+        max_bytes: int | None = None,
+        shared_cache: SharedDagCache | None = None,
+    ) -> None:
+        self._dags: OrderedDict[UUID, SerializedDAG] = OrderedDict()  # dag_version_id to dag
+        self._dag_sizes: dict[UUID, int] = {}  # dag_version_id to serialized size
+        self._latest_version_ids: dict[str, UUID] = {}  # dag_id to newest cached dag_version_id
+        self._total_bytes = 0
         self.load_op_links = load_op_links
+        if max_size is None:
+            max_size = conf.getint("core", "serialized_dag_cache_size", fallback=0)
+        if max_bytes is None:
+            max_bytes = conf.getint("core", "serialized_dag_cache_max_bytes", fallback=0)
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.shared_cache = shared_cache
+        # Data of the shared tasks of the cached dag versions, by hash, when they keep it
+        self._share_tasks = conf.getboolean("core", "lazy_load_dag_tasks", fallback=False)
+        self._task_data: dict[str, dict] = {}
+        self._task_refcounts: Counter[str] = Counter()
+        self._version_task_hashes: dict[UUID, list[str]] = {}
 
     def _read_dag(self, serdag: SerializedDagModel) -> SerializedDAG | None:
         serdag.load_op_links = self.load_op_links
+        if self._share_tasks:
+            serdag.set_known_tasks(self._task_data)
+        if self.shared_cache is not None:
+            if (data := self.shared_cache.get(serdag.dag_version_id, serdag.dag_hash)) is not None:
+                serdag.set_data_cache(data)
+            elif isinstance(data := serdag.data, dict):
+                self.shared_cache.put(serdag.dag_version_id, serdag.dag_hash, data)
         if dag := serdag.dag:
-            self._dags[serdag.dag_version_id] = dag
+            self._cache_dag(serdag, dag)
         return dag
 
+    def _cache_dag(self, serdag: SerializedDagModel, dag: SerializedDAG) -> None:
+        version_id = serdag.dag_version_id
+        self._total_bytes -= self._dag_sizes.pop(version_id, 0)
+        self._release_tasks(version_id)
+        if self._share_tasks and (task_hashes := serdag.task_hashes):
+            for task_hash, task_data in zip(task_hashes, serdag.data["dag"]["tasks"]):
+                self._task_data.setdefault(task_hash, task_data)
+            self._task_refcounts.update(task_hashes)
+            self._version_task_hashes[version_id] = task_hashes
+        self._dags[version_id] = dag
+        self._dags.move_to_end(version_id)
+        if self.max_bytes:
+            # An approximation of the memory used by the dag, computed only when it is needed.
+            size = len(json.dumps(serdag.data))
+            self._dag_sizes[version_id] = size
+            self._total_bytes += size
+        # Dag version ids are UUID7, so the greatest one is the most recently created version.
+        latest_version_id = self._latest_version_ids.get(dag.dag_id)
+        if latest_version_id is None or latest_version_id < version_id:
+            self._latest_version_ids[dag.dag_id] = version_id
+        self._evict()
+        Stats.gauge("dag_bag.cache.size", len(self._dags))
+        if self.max_bytes:
+            Stats.gauge("dag_bag.cache.bytes", self._total_bytes)
+
+    def _is_over_limit(self) -> bool:
+        if self.max_size and len(self._dags) > self.max_size:
+            return True
+        return bool(self.max_bytes) and self._total_bytes > self.max_bytes
+
+    def _evict(self) -> None:
+        if not self._is_over_limit():
+            return
+        pinned = set(self._latest_version_ids.values())
+        for version_id in [v for v in self._dags if v not in pinned]:
+            del self._dags[version_id]
+            self._total_bytes -= self._dag_sizes.pop(version_id, 0)
+            self._release_tasks(version_id)
+            Stats.incr("dag_bag.cache.evictions")
+            if not self._is_over_limit():
+                return
+
+    def _release_tasks(self, version_id: UUID) -> None:
+        """Forget the shared tasks only the given dag version used."""
+        for task_hash in self._version_task_hashes.pop(version_id, ()):
+            self._task_refcounts[task_hash] -= 1
+            if not self._task_refcounts[task_hash]:
+                del self._task_refcounts[task_hash]
+                del self._task_data[task_hash]
+
     def _get_dag(self, version_id: UUID, session: Session) -> SerializedDAG | None:
         if dag := self._dags.get(version_id):
+            self._dags.move_to_end(version_id)
+            Stats.incr("dag_bag.cache.hits")
             return dag
-        dag_version = session.get(DagVersion, version_id, options=[joinedload(DagVersion.serialized_dag)])
+        Stats.incr("dag_bag.cache.misses")
+        serdag_load = joinedload(DagVersion.serialized_dag)
+        if self.shared_cache is not None:
+            from airflow.models.serialized_dag import SerializedDagModel
+
+            # The data columns are only fetched if the dag version is not in the shared cache.
+            serdag_load = serdag_load.options(
+                defer(SerializedDagModel._data), defer(SerializedDagModel._data_compressed)
+            )
+        dag_version = session.get(DagVersion, version_id, options=[serdag_load])
         if not dag_version:
             return None
         if not (serdag := dag_version.serialized_dag):
@@ -22,7 +22,7 @@ import logging
 import os
 import re
 from collections import defaultdict
-from collections.abc import Callable, Iterable, Iterator, Sequence
+from collections.abc import Callable, Collection, Iterable, Iterator, Sequence
 from datetime import datetime
 from typing import TYPE_CHECKING, Any, NamedTuple, TypeVar, cast, overload
 from uuid import UUID
@@ -49,6 +49,7 @@ from sqlalchemy import (
     not_,
     or_,
     text,
+    tuple_,
     update,
 )
 from sqlalchemy.dialects import postgresql
@@ -102,6 +103,7 @@ if TYPE_CHECKING:
     from pydantic import NonNegativeInt
     from sqlalchemy.engine import ScalarResult
     from sqlalchemy.orm import Session
+    from sqlalchemy.sql import Select
     from sqlalchemy.sql.elements import Case, ColumnElement
 
     from airflow.models.dag_version import DagVersion
@@ -581,7 +583,9 @@ class DagRun(Base, LoggingMixin):
 
     @classmethod
     @retry_db_transaction
-    def get_running_dag_runs_to_examine(cls, session: Session) -> ScalarResult[DagRun]:
+    def get_running_dag_runs_to_examine(
+        cls, session: Session, dag_ids: Collection[str] | None = None
+    ) -> ScalarResult[DagRun]:
         """
         Return the next DagRuns that the scheduler should attempt to schedule.
 
@@ -589,21 +593,16 @@ class DagRun(Base, LoggingMixin):
         query, you should ensure that any scheduling decisions are made in a single transaction -- as soon as
         the transaction is committed it will be unlocked.
 
+        :param dag_ids: If given, only return runs of these Dags.
+
         :meta private:
         """
         from airflow.models.backfill import BackfillDagRun
-        from airflow.models.dag import DagModel
 
         query = (
-            select(cls)
+            cls._running_dag_runs_to_examine_query()
             .with_hint(cls, "USE INDEX (idx_dag_run_running_dags)", dialect_name="mysql")
-            .where(cls.state == DagRunState.RUNNING)
-            .join(DagModel, DagModel.dag_id == cls.dag_id)
             .join(BackfillDagRun, BackfillDagRun.dag_run_id == DagRun.id, isouter=True)
-            .where(
-                DagModel.is_paused == false(),
-                DagModel.is_stale == false(),
-            )
             .order_by(
                 nulls_first(cast("ColumnElement[Any]", BackfillDagRun.sort_ordinal), session=session),
                 nulls_first(cast("ColumnElement[Any]", cls.last_scheduling_decision), session=session),
@@ -611,15 +610,49 @@ class DagRun(Base, LoggingMixin):
             )
             .limit(cls.DEFAULT_DAGRUNS_TO_EXAMINE)
         )
-
-        query = query.where(DagRun.run_after <= func.now())
+        if dag_ids is not None:
+            query = query.where(cls.dag_id.in_(dag_ids))
 
         result = session.scalars(with_row_locks(query, of=cls, session=session, skip_locked=True)).unique()
         return result
 
+    @classmethod
+    def get_dag_runs_to_examine_by_key(
+        cls, dag_run_keys: Collection[tuple[str, str]], session: Session
+    ) -> ScalarResult[DagRun]:
+        """
+        Return the DagRuns with the given ``(dag_id, run_id)`` the scheduler should attempt to schedule.
+
+        Like :meth:`get_running_dag_runs_to_examine`, runs of paused or stale Dags, runs not due yet, and runs
+        locked by another scheduler are skipped.
+
+        :meta private:
+        """
+        query = cls._running_dag_runs_to_examine_query().where(
+            tuple_(cls.dag_id, cls.run_id).in_(dag_run_keys)
+        )
+        return session.scalars(with_row_locks(query, of=cls, session=session, skip_locked=True)).unique()
+
+    @classmethod
+    def _running_dag_runs_to_examine_query(cls) -> Select[tuple[DagRun]]:
+        from airflow.models.dag import DagModel
+
+        return (
+            select(cls)
+            .join(DagModel, DagModel.dag_id == cls.dag_id)
+            .where(
+                cls.state == DagRunState.RUNNING,
+                DagModel.is_paused == false(),
+                DagModel.is_stale == false(),
+                cls.run_after <= func.now(),
+            )
+        )
+
     @classmethod
     @retry_db_transaction
-    def get_queued_dag_runs_to_set_running(cls, session: Session) -> ScalarResult[DagRun]:
+    def get_queued_dag_runs_to_set_running(
+        cls, session: Session, dag_ids: Collection[str] | None = None
+    ) -> ScalarResult[DagRun]:
         """
         Return the next queued DagRuns that the scheduler should attempt to schedule.
 
@@ -627,6 +660,8 @@ class DagRun(Base, LoggingMixin):
         query, you should ensure that any scheduling decisions are made in a single transaction -- as soon as
         the transaction is committed it will be unlocked.
 
+        :param dag_ids: If given, only return runs of these Dags.
+
         :meta private:
         """
         from airflow.models.backfill import Backfill, BackfillDagRun
@@ -699,6 +734,8 @@ class DagRun(Base, LoggingMixin):
         )
 
         query = query.where(DagRun.run_after <= func.now())
+        if dag_ids is not None:
+            query = query.where(cls.dag_id.in_(dag_ids))
 
         return session.scalars(with_row_locks(query, of=cls, session=session, skip_locked=True))
 
@@ -1475,15 +1512,20 @@ class DagRun(Base, LoggingMixin):
                 if new_tis is not None:
                     additional_tis.extend(new_tis)
                     expansion_happened = True
+                    # Upstream counts of the tis evaluated next must include the new tis.
+                    dep_context.invalidate_map_indexes()
             if new_tis is None and schedulable.state in SCHEDULEABLE_STATES:
                 # It's enough to revise map index once per task id,
                 # checking the map index for each mapped task significantly slows down scheduling
                 if schedulable.task.task_id not in revised_map_index_task_ids:
-                    ready_tis.extend(
+                    revised_tis = list(
                         self._revise_map_indexes_if_mapped(
                             schedulable.task, dag_version_id=schedulable.dag_version_id, session=session
                         )
                     )
+                    if revised_tis:
+                        ready_tis.extend(revised_tis)
+                        dep_context.invalidate_map_indexes()
                     revised_map_index_task_ids.add(schedulable.task.task_id)
 
                 # _revise_map_indexes_if_mapped might mark the current task as REMOVED
@@ -1608,17 +1650,6 @@ class DagRun(Base, LoggingMixin):
             dag, task_instance_mutation_hook, session=session
         )
 
-        def task_filter(task: Operator) -> bool:
-            return task.task_id not in task_ids and (
-                self.run_type == DagRunType.BACKFILL_JOB
-                or (
-                    task.start_date is None
-                    or self.logical_date is None
-                    or task.start_date <= self.logical_date
-                )
-                and (task.end_date is None or self.logical_date is None or self.logical_date <= task.end_date)
-            )
-
         created_counts: dict[str, int] = defaultdict(int)
         task_creator = self._get_task_creator(
             created_counts, task_instance_mutation_hook, hook_is_noop, dag_version_id
@@ -1626,12 +1657,75 @@ class DagRun(Base, LoggingMixin):
 
         # Create the missing tasks, including mapped tasks
         tis_to_create = self._create_tasks(
-            (task for task in dag.task_dict.values() if task_filter(task)),
+            (
+                task
+                for task in dag.task_dict.values()
+                if task.task_id not in task_ids and self._is_task_in_run(task)
+            ),
             task_creator,
             session=session,
         )
         self._create_task_instances(self.dag_id, tis_to_create, created_counts, hook_is_noop, session=session)
 
+    @classmethod
+    def create_task_instances_of_new_runs(cls, dag_runs: Sequence[DagRun], *, session: Session) -> None:
+        """
+        Create the task instances of dag runs that were just created, with a single bulk insert.
+
+        This is equivalent to calling :meth:`verify_integrity` on each of the runs, but skips looking
+        for existing task instances, since new runs have none. The runs must have been flushed and
+        have their ``dag`` and ``created_dag_version_id`` set.
+
+        Unlike :meth:`verify_integrity`, this does not roll the session back when a task instance
+        already exists, which would also roll back the transaction the runs were created in; the
+        ``IntegrityError`` is raised, e.g. to roll back a savepoint the runs were created in.
+
+        :param dag_runs: The new dag runs
+        :param session: Sqlalchemy ORM Session
+        """
+        from airflow.settings import task_instance_mutation_hook
+
+        hook_is_noop: Literal[True, False] = getattr(task_instance_mutation_hook, "is_noop", False)
+
+        tis_to_create: list[Any] = []
+        counts_by_run: list[tuple[DagRun, dict[str, int]]] = []
+        for dag_run in dag_runs:
+            created_counts: dict[str, int] = defaultdict(int)
+            task_creator = dag_run._get_task_creator(
+                created_counts, task_instance_mutation_hook, hook_is_noop, dag_run.created_dag_version_id
+            )
+            tis_to_create.extend(
+                dag_run._create_tasks(
+                    (task for task in dag_run.get_dag().task_dict.values() if dag_run._is_task_in_run(task)),
+                    task_creator,
+                    session=session,
+                )
+            )
+            counts_by_run.append((dag_run, created_counts))
+
+        if hook_is_noop:
+            session.bulk_insert_mappings(TI.__mapper__, tis_to_create)
+        else:
+            # The hook was applied to each task instance by the task creator
+            session.bulk_save_objects(tis_to_create)
+        session.flush()
+
+        for dag_run, created_counts in counts_by_run:
+            for task_type, count in created_counts.items():
+                DualStatsManager.incr(
+                    "task_instance_created",
+                    count,
+                    tags=dag_run.stats_tags,
+                    extra_tags={"task_type": task_type},
+                )
+
+    def _is_task_in_run(self, task: Operator) -> bool:
+        """Whether the task should run in this dag run, given its start and end dates."""
+        return self.run_type == DagRunType.BACKFILL_JOB or (
+            (task.start_date is None or self.logical_date is None or task.start_date <= self.logical_date)
+            and (task.end_date is None or self.logical_date is None or self.logical_date <= task.end_date)
+        )
+
     def _check_for_removed_or_restored_tasks(
         self, dag: SerializedDAG, ti_mutation_hook, *, session: Session
     ) -> set[str]:
@@ -18,7 +18,7 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import Sequence
+from collections.abc import Collection, Sequence
 from typing import TYPE_CHECKING, Any, TypedDict
 
 from sqlalchemy import Boolean, ForeignKey, Integer, String, Text, func, select
@@ -167,6 +167,7 @@ class Pool(Base):
     def slots_stats(
         *,
         lock_rows: bool = False,
+        dag_ids: Collection[str] | None = None,
         session: Session = NEW_SESSION,
     ) -> dict[str, PoolStats]:
         """
@@ -177,6 +178,7 @@ class Pool(Base):
         OperationalError.
 
         :param lock_rows: Should we attempt to obtain a row-level lock on all the Pool rows returns
+        :param dag_ids: If given, only count the task instances of these Dags
         :param session: SQLAlchemy ORM Session
         """
         from airflow.models.taskinstance import TaskInstance  # Avoid circular import
@@ -202,11 +204,14 @@ class Pool(Base):
             TaskInstanceState.DEFERRED,
             TaskInstanceState.SCHEDULED,
         }
-        state_count_by_pool = session.execute(
+        state_count_query = (
             select(TaskInstance.pool, TaskInstance.state, func.sum(TaskInstance.pool_slots))
             .filter(TaskInstance.state.in_(allowed_execution_states))
             .group_by(TaskInstance.pool, TaskInstance.state)
         )
+        if dag_ids is not None:
+            state_count_query = state_count_query.filter(TaskInstance.dag_id.in_(dag_ids))
+        state_count_by_pool = session.execute(state_count_query)
 
         # calculate queued and running metrics
         for pool_name, state, decimal_count in state_count_by_pool:
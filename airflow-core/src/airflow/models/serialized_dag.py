@@ -23,13 +23,28 @@ import logging
 import zlib
 from collections.abc import Callable, Iterable, Iterator, Sequence
 from datetime import datetime, timedelta
+from enum import Enum
 from typing import TYPE_CHECKING, Any, Literal
 from uuid import UUID
 
+import msgspec
 import uuid6
-from sqlalchemy import JSON, ForeignKey, LargeBinary, String, Uuid, exists, select, tuple_, update
+from sqlalchemy import (
+    JSON,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    String,
+    Uuid,
+    delete,
+    exists,
+    insert,
+    select,
+    tuple_,
+    update,
+)
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import Mapped, backref, foreign, mapped_column, relationship
+from sqlalchemy.orm import Mapped, backref, foreign, mapped_column, object_session, relationship
 from sqlalchemy.sql.expression import func, literal
 
 from airflow._shared.timezones import timezone
@@ -52,12 +67,13 @@ from airflow.serialization.enums import Encoding
 from airflow.serialization.serialized_objects import DagSerialization
 from airflow.settings import json
 from airflow.utils.hashlib_wrapper import md5
-from airflow.utils.session import NEW_SESSION, provide_session
+from airflow.utils.session import NEW_SESSION, create_session, provide_session
 from airflow.utils.sqlalchemy import UtcDateTime, get_dialect_name
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
     from sqlalchemy.orm import Session
-    from sqlalchemy.orm.attributes import InstrumentedAttribute
     from sqlalchemy.sql.elements import ColumnElement
 
     from airflow.serialization.definitions.dag import SerializedDAG
@@ -66,8 +82,97 @@ if TYPE_CHECKING:
 
 log = logging.getLogger(__name__)
 
+
+class SerializedDagStorageFormat(str, Enum):
+    """Format the data of serialized DAGs is stored in."""
+
+    json = "json"
+    msgpack = "msgpack"
+
+
 # If set to True, serialized DAGs is compressed before writing to DB,
 _COMPRESS_SERIALIZED_DAGS = conf.getboolean("core", "compress_serialized_dags", fallback=False)
+_SERIALIZED_DAG_STORAGE_FORMAT = conf.getenum(
+    "core", "serialized_dag_storage_format", SerializedDagStorageFormat, fallback="json"
+)
+
+# If set to True, tasks are stored in the serialized_dag_task table, once per distinct content
+_SHARE_SERIALIZED_DAG_TASKS = conf.getboolean("core", "share_serialized_dag_tasks", fallback=False)
+
+# ``__type`` of the ``tasks`` of serialized DAG data whose tasks are stored in serialized_dag_task
+_TASK_REFS_TYPE = "task_refs"
+
+# Binary serialized DAGs start with this header, which can never start a zlib stream, followed by the
+# version of the binary format and its flags. Bump the version when the layout of the payload changes,
+# and keep decoding the previous versions so that rows written by older Airflow versions stay readable.
+_BINARY_HEADER = b"AFSD"
+_BINARY_FORMAT_VERSION = 1
+_BINARY_FLAG_ZLIB = 0x01
+
+
+def _encode_binary_dag_data(dag_data: dict, *, compress: bool) -> bytes | None:
+    """
+    Encode serialized DAG data as msgpack, prefixed with the binary header.
+
+    :param dag_data: The serialized DAG data
+    :param compress: Whether to zlib-compress the msgpack payload
+    :return: The encoded data, or *None* if it cannot be represented in msgpack, e.g. integers too
+        large for 64 bits, in which case the DAG should be stored as JSON instead.
+    """
+    try:
+        payload = msgspec.msgpack.encode(dag_data)
+    except (TypeError, OverflowError):
+        return None
+    flags = 0
+    if compress:
+        payload = zlib.compress(payload)
+        flags |= _BINARY_FLAG_ZLIB
+    return _BINARY_HEADER + bytes((_BINARY_FORMAT_VERSION, flags)) + payload
+
+
+def _decode_data_compressed(data_compressed: bytes) -> dict:
+    """Decode the ``data_compressed`` column, holding either zlib-compressed JSON or binary data."""
+    if not data_compressed.startswith(_BINARY_HEADER):
+        return json.loads(zlib.decompress(data_compressed))
+    offset = len(_BINARY_HEADER)
+    version, flags = data_compressed[offset], data_compressed[offset + 1]
+    if version != _BINARY_FORMAT_VERSION:
+        raise ValueError(f"Unsupported serialized DAG binary format version: {version}")
+    payload: bytes | memoryview = memoryview(data_compressed)[offset + 2 :]
+    if flags & _BINARY_FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+    return msgspec.msgpack.decode(payload, type=dict)
+
+
+def _hash_task_data(task_data: dict) -> str:
+    return md5(json.dumps(task_data, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _encode_task_data(task_data: dict) -> bytes:
+    """Encode the data of a shared task like ``data_compressed`` of a serialized DAG."""
+    if _SERIALIZED_DAG_STORAGE_FORMAT is SerializedDagStorageFormat.msgpack:
+        binary_data = _encode_binary_dag_data(task_data, compress=_COMPRESS_SERIALIZED_DAGS)
+        if binary_data is not None:
+            return binary_data
+    return zlib.compress(json.dumps(task_data, sort_keys=True).encode("utf-8"))
+
+
+def _split_shared_tasks(dag_data: dict) -> tuple[dict, dict[str, dict]]:
+    """
+    Replace the tasks of serialized DAG data with references to their hashes.
+
+    :return: The DAG data with task references, and the data of its tasks by hash
+    """
+    tasks = {_hash_task_data(task_data): task_data for task_data in dag_data["dag"]["tasks"]}
+    task_refs = {Encoding.TYPE: _TASK_REFS_TYPE, Encoding.VAR: list(tasks)}
+    return {**dag_data, "dag": {**dag_data["dag"], "tasks": task_refs}}, tasks
+
+
+def _get_task_refs(dag_data: dict) -> list[str] | None:
+    tasks = dag_data.get("dag", {}).get("tasks")
+    if isinstance(tasks, dict) and tasks.get(Encoding.TYPE) == _TASK_REFS_TYPE:
+        return tasks[Encoding.VAR]
+    return None
 
 
 class _DagDependenciesResolver:
@@ -270,6 +375,34 @@ class _DagDependenciesResolver:
             )
 
 
+class SerializedDagTaskModel(Base):
+    """
+    A serialized task, stored once for all the serialized DAGs it is identical in.
+
+    Only written with ``[core] share_serialized_dag_tasks``. Rows are keyed by the hash of the task
+    data, and deleted once no serialized DAG references them anymore.
+    """
+
+    __tablename__ = "serialized_dag_task"
+    task_hash: Mapped[str] = mapped_column(String(32), primary_key=True)
+    data_compressed: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(UtcDateTime, nullable=False, default=timezone.utcnow)
+
+
+class SerializedDagTaskRefModel(Base):
+    """Reference of a serialized DAG to one of its tasks in the ``serialized_dag_task`` table."""
+
+    __tablename__ = "serialized_dag_task_ref"
+    serialized_dag_id: Mapped[UUID] = mapped_column(
+        Uuid(), ForeignKey("serialized_dag.id", ondelete="CASCADE"), primary_key=True
+    )
+    task_hash: Mapped[str] = mapped_column(
+        String(32), ForeignKey("serialized_dag_task.task_hash"), primary_key=True
+    )
+
+    __table_args__ = (Index("idx_serialized_dag_task_ref_task_hash", task_hash),)
+
+
 class SerializedDagModel(Base):
     """
     A table for serialized DAGs.
@@ -285,6 +418,11 @@ class SerializedDagModel(Base):
       to use a smaller interval such as 60
     * ``[core] compress_serialized_dags``:
       whether compressing the dag data to the Database.
+    * ``[core] serialized_dag_storage_format``:
+      whether the dag data is stored as JSON or as binary msgpack.
+    * ``[core] share_serialized_dag_tasks``:
+      whether the tasks are stored in the ``serialized_dag_task`` table, shared by the DAG versions
+      they are identical in.
 
     It is used by webserver to load dags
     because reading from database is lightweight compared to importing from files,
@@ -333,6 +471,12 @@ class SerializedDagModel(Base):
         passive_deletes=True,
     )
 
+    task_refs = relationship(
+        SerializedDagTaskRefModel,
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
     load_op_links = True
 
     def __init__(self, dag: LazyDeserializedDAG) -> None:
@@ -340,14 +484,29 @@ class SerializedDagModel(Base):
         dag_data = dag.data
         self.dag_hash = SerializedDagModel.hash(dag_data)
 
-        # partially ordered json data
-        dag_data_json = json.dumps(dag_data, sort_keys=True).encode("utf-8")
+        stored_data = dag_data
+        # Tasks to store in the serialized_dag_task table, by hash
+        self.shared_tasks: dict[str, dict] = {}
+        if _SHARE_SERIALIZED_DAG_TASKS:
+            stored_data, self.shared_tasks = _split_shared_tasks(dag_data)
+            self.task_refs = [SerializedDagTaskRefModel(task_hash=h) for h in self.shared_tasks]
 
-        if _COMPRESS_SERIALIZED_DAGS:
+        binary_data = None
+        if _SERIALIZED_DAG_STORAGE_FORMAT is SerializedDagStorageFormat.msgpack:
+            binary_data = _encode_binary_dag_data(stored_data, compress=_COMPRESS_SERIALIZED_DAGS)
+            if binary_data is None:
+                log.warning("Dag %s cannot be stored as msgpack, storing it as JSON", self.dag_id)
+
+        if binary_data is not None:
+            self._data = None
+            self._data_compressed = binary_data
+        elif _COMPRESS_SERIALIZED_DAGS:
+            # partially ordered json data
+            dag_data_json = json.dumps(stored_data, sort_keys=True).encode("utf-8")
             self._data = None
             self._data_compressed = zlib.compress(dag_data_json)
         else:
-            self._data = dag_data
+            self._data = stored_data
             self._data_compressed = None
 
         # serve as cache so no need to decompress and load, when accessing data field
@@ -596,6 +755,10 @@ class SerializedDagModel(Base):
             log.debug("Serialized DAG (%s) is unchanged. Skipping writing to DB", dag.dag_id)
             return False
 
+        if new_serialized_dag.shared_tasks:
+            # Before the serialized DAG is added to the session, so that its task refs are flushed after
+            cls._write_shared_tasks(new_serialized_dag.shared_tasks, session=session)
+
         has_task_instances: bool = False
         if dag_version:
             has_task_instances = bool(
@@ -632,6 +795,8 @@ class SerializedDagModel(Base):
                 # No rows updated - serialized DAG doesn't exist
                 return False
 
+            cls._replace_task_refs(dag_version.id, new_serialized_dag.shared_tasks, session=session)
+
             if deadline_uuid_mapping:
                 updated_serialized_dag = session.scalar(
                     select(cls).where(cls.dag_version_id == dag_version.id)
@@ -664,6 +829,87 @@ class SerializedDagModel(Base):
         DagCode.write_code(dagv, dag.fileloc, session=session)
         return True
 
+    @staticmethod
+    def _write_shared_tasks(tasks: dict[str, dict], *, session: Session) -> None:
+        """Insert the ``tasks`` which are not stored yet, by hash, into the serialized_dag_task table."""
+        stored = set(
+            session.scalars(
+                select(SerializedDagTaskModel.task_hash).where(SerializedDagTaskModel.task_hash.in_(tasks))
+            )
+        )
+        values = [
+            {"task_hash": task_hash, "data_compressed": _encode_task_data(task_data)}
+            for task_hash, task_data in tasks.items()
+            if task_hash not in stored
+        ]
+        if not values:
+            return
+        # Another DAG processor may store an identical task concurrently
+        if (dialect_name := get_dialect_name(session)) == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+
+            stmt: Any = postgresql_insert(SerializedDagTaskModel).on_conflict_do_nothing()
+        elif dialect_name == "mysql":
+            from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+            # MySQL does not support "do nothing"; this updates the row in
+            # conflict with its own value to achieve the same idea.
+            stmt = mysql_insert(SerializedDagTaskModel).on_duplicate_key_update(
+                task_hash=SerializedDagTaskModel.task_hash
+            )
+        else:
+            from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+            stmt = sqlite_insert(SerializedDagTaskModel).on_conflict_do_nothing()
+        session.execute(stmt, values)
+
+    @classmethod
+    def _replace_task_refs(cls, dag_version_id: UUID, tasks: dict[str, dict], *, session: Session) -> None:
+        """Replace the task refs of the serialized DAG of a DAG version updated in place."""
+        serialized_dag_id = session.scalar(select(cls.id).where(cls.dag_version_id == dag_version_id))
+        if serialized_dag_id is None:
+            return
+        previous_hashes = set(
+            session.scalars(
+                select(SerializedDagTaskRefModel.task_hash).where(
+                    SerializedDagTaskRefModel.serialized_dag_id == serialized_dag_id
+                )
+            )
+        )
+        if previous_hashes == tasks.keys():
+            return
+        session.execute(
+            delete(SerializedDagTaskRefModel).where(
+                SerializedDagTaskRefModel.serialized_dag_id == serialized_dag_id
+            )
+        )
+        if tasks:
+            session.execute(
+                insert(SerializedDagTaskRefModel),
+                [{"serialized_dag_id": serialized_dag_id, "task_hash": h} for h in tasks],
+            )
+        cls.delete_orphaned_tasks(task_hashes=previous_hashes.difference(tasks), session=session)
+
+    @classmethod
+    @provide_session
+    def delete_orphaned_tasks(
+        cls, task_hashes: Iterable[str] | None = None, session: Session = NEW_SESSION
+    ) -> None:
+        """
+        Delete the shared tasks which no serialized DAG references anymore.
+
+        :param task_hashes: Only consider the tasks with these hashes, instead of all of them.
+        :param session: ORM Session
+        """
+        query = delete(SerializedDagTaskModel).where(
+            ~exists().where(SerializedDagTaskRefModel.task_hash == SerializedDagTaskModel.task_hash)
+        )
+        if task_hashes is not None:
+            if not (task_hashes := list(task_hashes)):
+                return
+            query = query.where(SerializedDagTaskModel.task_hash.in_(task_hashes))
+        session.execute(query.execution_options(synchronize_session=False))
+
     @classmethod
     def latest_item_select_object(cls, dag_id):
         from airflow.settings import engine
@@ -747,12 +993,47 @@ class SerializedDagModel(Base):
         # use __data_cache to avoid decompress and loads
         if not hasattr(self, "_SerializedDagModel__data_cache") or self.__data_cache is None:
             if self._data_compressed:
-                self.__data_cache = json.loads(zlib.decompress(self._data_compressed))
+                data = _decode_data_compressed(self._data_compressed)
             else:
-                self.__data_cache = self._data
+                data = self._data
+            if isinstance(data, dict) and (task_hashes := _get_task_refs(data)) is not None:
+                data = self._resolve_task_refs(data, task_hashes)
+            self.__data_cache = data
 
         return self.__data_cache
 
+    def set_data_cache(self, data: dict) -> None:
+        """Use already decoded ``data``, e.g. from a shared cache, instead of reading the data columns."""
+        self.__data_cache = data
+
+    @property
+    def task_hashes(self) -> list[str] | None:
+        """Hashes of the tasks in ``data``, if they were read from the serialized_dag_task table."""
+        return getattr(self, "_task_hashes", None)
+
+    def set_known_tasks(self, tasks: Mapping[str, dict]) -> None:
+        """Use the already decoded data of shared ``tasks``, by hash, instead of reading it again."""
+        self._known_tasks = tasks
+
+    def _resolve_task_refs(self, data: dict, task_hashes: list[str]) -> dict:
+        """Replace the task refs of ``data`` with the data of the tasks, read from serialized_dag_task."""
+        known_tasks: Mapping[str, dict] = getattr(self, "_known_tasks", {})
+        tasks = {h: known_tasks[h] for h in task_hashes if h in known_tasks}
+        if missing := [h for h in task_hashes if h not in tasks]:
+            query = select(SerializedDagTaskModel.task_hash, SerializedDagTaskModel.data_compressed).where(
+                SerializedDagTaskModel.task_hash.in_(missing)
+            )
+            if (session := object_session(self)) is not None:
+                rows = session.execute(query).all()
+            else:
+                with create_session() as session:
+                    rows = session.execute(query).all()
+            tasks.update((task_hash, _decode_data_compressed(blob)) for task_hash, blob in rows)
+        if len(tasks) != len(task_hashes):
+            raise ValueError(f"Tasks of serialized DAG {self.dag_id} are missing from serialized_dag_task")
+        self._task_hashes = task_hashes
+        return {**data, "dag": {**data["dag"], "tasks": [tasks[h] for h in task_hashes]}}
+
     @property
     def dag(self) -> SerializedDAG:
         """The DAG deserialized from the ``data`` column."""
@@ -803,34 +1084,35 @@ class SerializedDagModel(Base):
 
         :param session: ORM Session
         """
+        # Each row is stored in the format configured when it was written: the dependencies are extracted
+        # in the DB from rows stored as JSON, and decoded here from rows stored in ``data_compressed``.
         load_json: Callable
-        data_col_to_select: ColumnElement[Any] | InstrumentedAttribute[bytes | None]
-        if _COMPRESS_SERIALIZED_DAGS is False:
-            dialect = get_dialect_name(session)
-            if dialect in ["sqlite", "mysql"]:
-                data_col_to_select = func.json_extract(cls._data, "$.dag.dag_dependencies")
-
-                def load_json(deps_data):
-                    return json.loads(deps_data) if deps_data else []
-            elif dialect == "postgresql":
-                # Use #> operator which works for both JSON and JSONB types
-                # Returns the JSON sub-object at the specified path
-                data_col_to_select = cls._data.op("#>")(literal('{"dag","dag_dependencies"}'))
-                load_json = lambda x: x
-            else:
-                data_col_to_select = func.json_extract_path(cls._data, "dag", "dag_dependencies")
-                load_json = lambda x: x
-        else:
-            data_col_to_select = cls._data_compressed
+        json_deps_col: ColumnElement[Any]
+        dialect = get_dialect_name(session)
+        if dialect in ["sqlite", "mysql"]:
+            json_deps_col = func.json_extract(cls._data, "$.dag.dag_dependencies")
 
             def load_json(deps_data):
-                return json.loads(zlib.decompress(deps_data))["dag"]["dag_dependencies"] if deps_data else []
+                return json.loads(deps_data) if deps_data else []
+        elif dialect == "postgresql":
+            # Use #> operator which works for both JSON and JSONB types
+            # Returns the JSON sub-object at the specified path
+            json_deps_col = cls._data.op("#>")(literal('{"dag","dag_dependencies"}'))
+            load_json = lambda x: x or []
+        else:
+            json_deps_col = func.json_extract_path(cls._data, "dag", "dag_dependencies")
+            load_json = lambda x: x or []
+
+        def load_deps(deps_data, data_compressed: bytes | None) -> list:
+            if data_compressed is not None:
+                return _decode_data_compressed(data_compressed)["dag"]["dag_dependencies"]
+            return load_json(deps_data)
 
         latest_sdag_subquery = (
             select(cls.dag_id, func.max(cls.created_at).label("max_created")).group_by(cls.dag_id).subquery()
         )
         query = session.execute(
-            select(cls.dag_id, data_col_to_select)
+            select(cls.dag_id, json_deps_col, cls._data_compressed)
             .join(
                 latest_sdag_subquery,
                 (cls.dag_id == latest_sdag_subquery.c.dag_id)
@@ -839,7 +1121,10 @@ class SerializedDagModel(Base):
             .join(cls.dag_model)
             .where(~DagModel.is_stale)
         )
-        dag_depdendencies = [(str(dag_id), load_json(deps_data)) for dag_id, deps_data in query]
+        dag_depdendencies = [
+            (str(dag_id), load_deps(deps_data, data_compressed))
+            for dag_id, deps_data, data_compressed in query
+        ]
         resolver = _DagDependenciesResolver(dag_id_dependencies=dag_depdendencies, session=session)
         dag_depdendencies_by_dag = resolver.resolve()
         return dag_depdendencies_by_dag
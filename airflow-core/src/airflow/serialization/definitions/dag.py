@@ -48,11 +48,11 @@ from airflow.serialization.enums import DagAttributeTypes as DAT, Encoding
 from airflow.timetables.base import DagRunInfo, DataInterval, TimeRestriction
 from airflow.utils.session import NEW_SESSION, provide_session
 from airflow.utils.state import DagRunState, TaskInstanceState
-from airflow.utils.types import DagRunType
+from airflow.utils.types import DagRunTriggeredByType, DagRunType
 
 if TYPE_CHECKING:
     import datetime
-    from collections.abc import Collection, Iterable, Sequence
+    from collections.abc import Collection, Iterable, Mapping, Sequence
     from typing import Any, Literal
 
     from pendulum.tz.timezone import FixedTimezone, Timezone
@@ -65,7 +65,6 @@ if TYPE_CHECKING:
     from airflow.serialization.definitions.taskgroup import SerializedTaskGroup
     from airflow.serialization.serialized_objects import LazyDeserializedDAG, SerializedOperator
     from airflow.timetables.base import Timetable
-    from airflow.utils.types import DagRunTriggeredByType
 
 log = structlog.get_logger(__name__)
 
@@ -521,8 +520,6 @@ class SerializedDAG:
 
         :meta private:
         """
-        from airflow.models.dagrun import RUN_ID_REGEX
-
         log.info(
             "creating dag run",
             run_after=run_after,
@@ -530,6 +527,54 @@ class SerializedDAG:
             logical_date=logical_date,
             partition_key=partition_key,
         )
+        logical_date, data_interval, run_type = self._validate_dagrun_args(
+            run_id=run_id,
+            logical_date=logical_date,
+            data_interval=data_interval,
+            run_type=run_type,
+            conf=conf,
+        )
+        orm_dagrun = _create_orm_dagrun(
+            dag=self,
+            run_id=run_id,
+            logical_date=logical_date,
+            data_interval=data_interval,
+            run_after=coerce_datetime(run_after),
+            start_date=coerce_datetime(start_date),
+            conf=conf,
+            state=state,
+            run_type=run_type,
+            creating_job_id=creating_job_id,
+            backfill_id=backfill_id,
+            triggered_by=triggered_by,
+            triggering_user_name=triggering_user_name,
+            partition_key=partition_key,
+            partition_date=partition_date,
+            note=note,
+            session=session,
+        )
+
+        if self.deadline:
+            self._process_dagrun_deadline_alerts(orm_dagrun, session)
+
+        return orm_dagrun
+
+    def _validate_dagrun_args(
+        self,
+        *,
+        run_id: str,
+        logical_date: datetime.datetime | None,
+        data_interval: tuple[datetime.datetime, datetime.datetime] | None,
+        run_type: DagRunType,
+        conf: dict | None,
+    ) -> tuple[datetime.datetime | None, DataInterval | None, DagRunType]:
+        """
+        Validate the arguments of a new run of this DAG.
+
+        :return: The logical date, data interval and run type of the run, normalized.
+        """
+        from airflow.models.dagrun import RUN_ID_REGEX
+
         logical_date = coerce_datetime(logical_date)
         # For manual runs where logical_date is None, ensure no data_interval is set.
         if logical_date is None and data_interval is not None:
@@ -569,30 +614,7 @@ class SerializedDAG:
         # todo: AIP-78 add verification that if run type is backfill then we have a backfill id
         copied_params = self.params.deep_merge(conf)
         copied_params.validate()
-        orm_dagrun = _create_orm_dagrun(
-            dag=self,
-            run_id=run_id,
-            logical_date=logical_date,
-            data_interval=data_interval,
-            run_after=coerce_datetime(run_after),
-            start_date=coerce_datetime(start_date),
-            conf=conf,
-            state=state,
-            run_type=run_type,
-            creating_job_id=creating_job_id,
-            backfill_id=backfill_id,
-            triggered_by=triggered_by,
-            triggering_user_name=triggering_user_name,
-            partition_key=partition_key,
-            partition_date=partition_date,
-            note=note,
-            session=session,
-        )
-
-        if self.deadline:
-            self._process_dagrun_deadline_alerts(orm_dagrun, session)
-
-        return orm_dagrun
+        return logical_date, data_interval, run_type
 
     def _process_dagrun_deadline_alerts(
         self,
@@ -1168,8 +1190,11 @@ def _create_orm_dagrun(
     if not dag_version:
         raise AirflowException(f"Cannot create DagRun for DAG {dag.dag_id} because the dag is not serialized")
 
-    run = DagRun(
-        dag_id=dag.dag_id,
+    run = _build_orm_dagrun(
+        dag=dag,
+        dag_version=dag_version,
+        bundle_version=bundle_version,
+        log_template_id=_get_log_template_id(session),
         run_id=run_id,
         logical_date=logical_date,
         start_date=start_date,
@@ -1182,16 +1207,10 @@ def _create_orm_dagrun(
         triggered_by=triggered_by,
         triggering_user_name=triggering_user_name,
         backfill_id=backfill_id,
-        bundle_version=bundle_version,
         partition_key=partition_key,
         partition_date=partition_date,
         note=note,
     )
-    # Load defaults into the following two fields to ensure result can be serialized detached
-    max_log_template_id = session.scalar(select(func.max(LogTemplate.__table__.c.id)))
-    run.log_template_id = int(max_log_template_id) if max_log_template_id is not None else 0
-    run.created_dag_version = dag_version
-    run.consumed_asset_events = []
     session.add(run)
     session.flush()
     run.dag = dag
@@ -1199,3 +1218,115 @@ def _create_orm_dagrun(
     # state is None at the moment of creation
     run.verify_integrity(session=session, dag_version_id=dag_version.id)
     return run
+
+
+def _get_log_template_id(session: Session) -> int:
+    max_log_template_id = session.scalar(select(func.max(LogTemplate.__table__.c.id)))
+    return int(max_log_template_id) if max_log_template_id is not None else 0
+
+
+def _build_orm_dagrun(
+    *,
+    dag: SerializedDAG,
+    dag_version: DagVersion,
+    bundle_version: str | None,
+    log_template_id: int,
+    **kwargs: Any,
+) -> DagRun:
+    run = DagRun(dag_id=dag.dag_id, bundle_version=bundle_version, **kwargs)
+    # Load defaults into the following two fields to ensure result can be serialized detached
+    run.log_template_id = log_template_id
+    run.created_dag_version = dag_version
+    run.consumed_asset_events = []
+    return run
+
+
+def create_scheduled_dagruns(
+    dag_run_infos: Iterable[tuple[SerializedDAG, DagRunInfo]],
+    *,
+    bundle_versions: Mapping[str, str | None],
+    creating_job_id: int | None,
+    session: Session,
+) -> dict[str, DagRun]:
+    """
+    Create the next scheduled runs of many DAGs at once.
+
+    This is equivalent to calling :meth:`SerializedDAG.create_dagrun` for each DAG, but the latest
+    versions of the DAGs are looked up with a single query, and the runs and their task instances
+    are inserted with a single flush each, instead of several queries and flushes per run.
+
+    A DAG whose run cannot be created, e.g. because its params are invalid, is logged and skipped.
+
+    :param dag_run_infos: The DAGs and the info of their next runs
+    :param bundle_versions: The current bundle version of each DAG, by dag_id
+    :param creating_job_id: ID of the job creating the runs
+    :param session: Database session
+    :return: The created runs, by dag_id
+
+    :meta private:
+    """
+    dag_run_infos = list(dag_run_infos)
+    dag_versions = DagVersion.get_latest_versions([dag.dag_id for dag, _ in dag_run_infos], session=session)
+    log_template_id = _get_log_template_id(session)
+
+    runs: dict[str, DagRun] = {}
+    for dag, info in dag_run_infos:
+        try:
+            if not (dag_version := dag_versions.get(dag.dag_id)):
+                raise AirflowException(
+                    f"Cannot create DagRun for DAG {dag.dag_id} because the dag is not serialized"
+                )
+            run_id = dag.timetable.generate_run_id(
+                run_type=DagRunType.SCHEDULED,
+                run_after=info.run_after,
+                data_interval=info.data_interval,
+                partition_key=info.partition_key,
+            )
+            log.info(
+                "creating dag run",
+                run_after=info.run_after,
+                run_id=run_id,
+                logical_date=info.logical_date,
+                partition_key=info.partition_key,
+            )
+            logical_date, data_interval, run_type = dag._validate_dagrun_args(
+                run_id=run_id,
+                logical_date=info.logical_date,
+                data_interval=info.data_interval,
+                run_type=DagRunType.SCHEDULED,
+                conf=None,
+            )
+            runs[dag.dag_id] = _build_orm_dagrun(
+                dag=dag,
+                dag_version=dag_version,
+                bundle_version=None if dag.disable_bundle_versioning else bundle_versions.get(dag.dag_id),
+                log_template_id=log_template_id,
+                run_id=run_id,
+                logical_date=logical_date,
+                start_date=None,
+                run_after=coerce_datetime(info.run_after),
+                conf=None,
+                state=DagRunState.QUEUED,
+                run_type=run_type,
+                creating_job_id=creating_job_id,
+                data_interval=data_interval,
+                triggered_by=DagRunTriggeredByType.TIMETABLE,
+                partition_key=info.partition_key,
+                partition_date=info.partition_date,
+            )
+        except Exception:
+            log.exception("Failed creating DagRun", dag_id=dag.dag_id)
+
+    if not runs:
+        return runs
+    # All the runs are inserted by a single flush, which SQLAlchemy batches into multi-row INSERTs.
+    session.add_all(runs.values())
+    session.flush()
+    dags = {dag.dag_id: dag for dag, _ in dag_run_infos}
+    for dag_id, run in runs.items():
+        run.dag = dags[dag_id]
+    DagRun.create_task_instances_of_new_runs(list(runs.values()), session=session)
+    for dag_id, run in runs.items():
+        if dags[dag_id].deadline:
+            dags[dag_id]._process_dagrun_deadline_alerts(run, session)
+    return runs
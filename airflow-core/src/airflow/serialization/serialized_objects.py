@@ -22,6 +22,7 @@ from __future__ import annotations
 
 import collections.abc
 import contextlib
+import copy
 import datetime
 import enum
 import itertools
@@ -30,7 +31,7 @@ import math
 import sys
 import weakref
 from collections.abc import Collection, Iterable, Mapping
-from functools import cache, cached_property, lru_cache
+from functools import cache, cached_property, lru_cache, partial
 from inspect import signature
 from textwrap import dedent
 from typing import TYPE_CHECKING, Any, ClassVar, NamedTuple, TypeVar, cast, overload
@@ -44,6 +45,7 @@ from pendulum.tz.timezone import FixedTimezone, Timezone
 from airflow._shared.module_loading import import_string, qualname
 from airflow._shared.timezones.timezone import from_timestamp, parse_timezone, utcnow
 from airflow.callbacks.callback_requests import DagCallbackRequest, TaskCallbackRequest
+from airflow.configuration import conf
 from airflow.exceptions import AirflowException, DeserializationError, SerializationError
 from airflow.models.connection import Connection
 from airflow.models.expandinput import SchedulerMappedArgument, create_expand_input
@@ -331,6 +333,121 @@ class _ExpandInputRef(NamedTuple):
         return create_expand_input(self.key, value)
 
 
+class _Deferred:
+    """A value that is only computed the first time it is resolved, by any of its holders."""
+
+    __slots__ = ("_load", "_value")
+
+    def __init__(self, load: collections.abc.Callable[[], Any]) -> None:
+        self._load: collections.abc.Callable[[], Any] | None = load
+        self._value: Any = None
+
+    def resolve(self) -> Any:
+        if self._load is not None:
+            self._value = self._load()
+            self._load = None
+        return self._value
+
+
+class _LazyNodeDict(collections.abc.MutableMapping):
+    """
+    Dict of dag nodes whose values may be ``_Deferred``, resolved when first accessed.
+
+    Membership, iteration over keys and ``len`` never resolve values, so code that only needs
+    task ids does not deserialize any task.
+    """
+
+    __slots__ = ("_nodes",)
+
+    def __init__(self, nodes: dict[str, Any]) -> None:
+        self._nodes = nodes
+
+    def __getitem__(self, key: str) -> Any:
+        node = self._nodes[key]
+        if isinstance(node, _Deferred):
+            node = self._nodes[key] = node.resolve()
+        return node
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._nodes[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._nodes[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._nodes
+
+    def __iter__(self) -> collections.abc.Iterator[str]:
+        return iter(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def __copy__(self) -> _LazyNodeDict:
+        # Copies share the deferred values, so a node is deserialized once whichever copy resolves it.
+        return _LazyNodeDict(self._nodes.copy())
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[str, Any]:
+        result: dict[str, Any] = {}
+        memo[id(self)] = result
+        for key, value in self.items():
+            result[key] = copy.deepcopy(value, memo)
+        return result
+
+    def __reduce__(self):
+        return dict, (dict(self.items()),)
+
+
+class _LazyTaskDict(_LazyNodeDict):
+    """
+    ``SerializedDAG.task_dict`` whose operators are deserialized when first accessed.
+
+    The encoded operators are kept until then. Upstream task ids, which are otherwise filled in
+    from the downstream task ids of every other operator, come from an index built up front from
+    the encoded operators, and task groups register the group of each of their tasks in
+    ``task_groups`` so that it can be set when the task is deserialized.
+    """
+
+    __slots__ = ("_client_defaults", "_dag", "_load_op_links", "_upstream_task_ids", "task_groups")
+
+    def __init__(
+        self,
+        dag: SerializedDAG,
+        encoded_ops: dict[str, dict[str, Any]],
+        client_defaults: dict[str, Any] | None,
+        load_op_links: bool,
+    ) -> None:
+        self._dag = dag
+        self._client_defaults = client_defaults
+        self._load_op_links = load_op_links
+        self._upstream_task_ids: dict[str, set[str]] = collections.defaultdict(set)
+        for task_id, op in encoded_ops.items():
+            for downstream_task_id in op.get("downstream_task_ids", op.get("_downstream_task_ids")) or ():
+                self._upstream_task_ids[downstream_task_id].add(task_id)
+        self.task_groups: dict[str, SerializedTaskGroup] = {}
+        super().__init__(
+            {
+                task_id: _Deferred(partial(self._load_task, task_id, encoded_op))
+                for task_id, encoded_op in encoded_ops.items()
+            }
+        )
+
+    def _load_task(self, task_id: str, encoded_op: dict[str, Any]) -> SerializedOperator:
+        OperatorSerialization._load_operator_extra_links = self._load_op_links
+        try:
+            task = OperatorSerialization.deserialize_operator(encoded_op, self._client_defaults)
+            task.upstream_task_ids.update(self._upstream_task_ids.get(task_id, ()))
+            if (task_group := self.task_groups.get(task_id)) is not None:
+                task.task_group = weakref.proxy(task_group)
+            OperatorSerialization.set_task_dag_references(task, self._dag, set_upstream=False)
+        except Exception as err:
+            raise DeserializationError(self._dag.dag_id) from err
+        return task
+
+
 class BaseSerialization:
     """BaseSerialization provides utils for serialization."""
 
@@ -1212,13 +1329,17 @@ class OperatorSerialization(DAGNode, BaseSerialization):
         setattr(op, "start_from_trigger", bool(encoded_op.get("start_from_trigger", False)))
 
     @staticmethod
-    def set_task_dag_references(task: SerializedOperator | MappedOperator, dag: SerializedDAG) -> None:
+    def set_task_dag_references(
+        task: SerializedOperator | MappedOperator, dag: SerializedDAG, *, set_upstream: bool = True
+    ) -> None:
         """
         Handle DAG references on an operator.
 
         The operator should have been mostly populated earlier by calling
         ``populate_operator``. This function further fixes object references
         that were not possible before the task's containing DAG is hydrated.
+
+        :param set_upstream: Whether to add the task to the upstream task ids of its downstream tasks.
         """
         task.dag = dag
 
@@ -1231,6 +1352,8 @@ class OperatorSerialization(DAGNode, BaseSerialization):
             if isinstance(kwargs_ref := getattr(task, k, None), _ExpandInputRef):
                 setattr(task, k, kwargs_ref.deref(dag))
 
+        if not set_upstream:
+            return
         for task_id in task.downstream_task_ids:
             # Bypass set_upstream etc here - it does more than we want
             dag.task_dict[task_id].upstream_task_ids.add(task.task_id)
@@ -1783,12 +1906,21 @@ class DagSerialization(BaseSerialization):
         dag.last_loaded = utcnow()
 
         # Note: Context is passed explicitly through method parameters, no class attributes needed
+        lazy_load_tasks = conf.getboolean("core", "lazy_load_dag_tasks", fallback=False)
 
         for k_in, v_in in encoded_dag.items():
             k = k_in  # surpass PLW2901
             v = v_in  # surpass PLW2901
             if k == "_downstream_task_ids":
                 v = set(v)
+            elif k == "tasks" and lazy_load_tasks:
+                encoded_ops = {
+                    obj[Encoding.VAR]["task_id"]: obj[Encoding.VAR]
+                    for obj in v
+                    if obj.get(Encoding.TYPE) == DAT.OP
+                }
+                k = "task_dict"
+                v = _LazyTaskDict(dag, encoded_ops, client_defaults, cls._load_operator_extra_links)
             elif k == "tasks":
                 OperatorSerialization._load_operator_extra_links = cls._load_operator_extra_links
                 tasks = {}
@@ -1864,8 +1996,10 @@ class DagSerialization(BaseSerialization):
         for k in keys_to_set_none:
             setattr(dag, k, None)
 
-        for t in dag.task_dict.values():
-            OperatorSerialization.set_task_dag_references(t, dag)
+        # Lazily loaded tasks get their references set when they are deserialized.
+        if not isinstance(dag.task_dict, _LazyTaskDict):
+            for t in dag.task_dict.values():
+                OperatorSerialization.set_task_dag_references(t, dag)
 
         return dag
 
@@ -2122,7 +2256,7 @@ class TaskGroupSerialization(BaseSerialization):
         cls,
         encoded_group: dict[str, Any],
         parent_group: SerializedTaskGroup | None,
-        task_dict: dict[str, SerializedOperator],
+        task_dict: Mapping[str, SerializedOperator],
         dag: SerializedDAG,
     ) -> SerializedTaskGroup:
         """Deserializes a TaskGroup from a JSON object."""
@@ -2149,14 +2283,28 @@ class TaskGroupSerialization(BaseSerialization):
             task.task_group = weakref.proxy(group)
             return task
 
-        group.children = {
-            label: (
-                set_ref(task_dict[val])
-                if _type == DAT.OP
-                else cls.deserialize_task_group(val, group, task_dict, dag=dag)
-            )
-            for label, (_type, val) in sorted(encoded_group["children"].items())
-        }
+        if isinstance(task_dict, _LazyTaskDict):
+            children: dict[str, Any] = {}
+            for label, (_type, val) in sorted(encoded_group["children"].items()):
+                if _type != DAT.OP:
+                    children[label] = cls.deserialize_task_group(val, group, task_dict, dag=dag)
+                elif isinstance(node := task_dict._nodes[val], _Deferred):
+                    # Share the deferred task, which gets its task group when it is deserialized.
+                    task_dict.task_groups[val] = group
+                    children[label] = node
+                else:
+                    # Already deserialized, e.g. to resolve the expand input of a mapped task group.
+                    children[label] = set_ref(node)
+            group.children = _LazyNodeDict(children)
+        else:
+            group.children = {
+                label: (
+                    set_ref(task_dict[val])
+                    if _type == DAT.OP
+                    else cls.deserialize_task_group(val, group, task_dict, dag=dag)
+                )
+                for label, (_type, val) in sorted(encoded_group["children"].items())
+            }
         group.upstream_group_ids.update(cls.deserialize(encoded_group["upstream_group_ids"]))
         group.downstream_group_ids.update(cls.deserialize(encoded_group["downstream_group_ids"]))
         group.upstream_task_ids.update(cls.deserialize(encoded_group["upstream_task_ids"]))
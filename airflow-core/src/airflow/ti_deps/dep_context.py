@@ -18,11 +18,12 @@
 from __future__ import annotations
 
 import contextlib
+from collections import defaultdict
 from typing import TYPE_CHECKING
 
 import attr
 
-from airflow.exceptions import TaskNotFound
+from airflow.exceptions import NotMapped, TaskNotFound
 from airflow.utils.state import State
 
 if TYPE_CHECKING:
@@ -30,6 +31,7 @@ if TYPE_CHECKING:
 
     from airflow.models.dagrun import DagRun
     from airflow.models.taskinstance import TaskInstance
+    from airflow.serialization.definitions.mappedoperator import Operator
 
 
 @attr.define
@@ -85,6 +87,12 @@ class DepContext:
     have_changed_ti_states: bool = False
     """Have any of the TIs state's been changed as a result of evaluating dependencies"""
 
+    _finished_tis_by_task_id: dict[str, list[TaskInstance]] | None = attr.ib(
+        default=None, init=False, repr=False
+    )
+    _map_indexes_by_task_id: dict[str, list[int]] | None = attr.ib(default=None, init=False, repr=False)
+    _expanded_ti_counts: dict[tuple[str, str], int | None] = attr.ib(factory=dict, init=False, repr=False)
+
     def ensure_finished_tis(self, dag_run: DagRun, session: Session) -> list[TaskInstance]:
         """
         Ensure finished_tis is populated if it's currently None, which allows running tasks without dag_run.
@@ -103,3 +111,75 @@ class DepContext:
         else:
             finished_tis = self.finished_tis
         return finished_tis
+
+    def ensure_finished_tis_by_task_id(
+        self, dag_run: DagRun, session: Session
+    ) -> dict[str, list[TaskInstance]]:
+        """
+        Return the finished task instances of the run grouped by task id.
+
+        The grouping is built once from :meth:`ensure_finished_tis`, so dependencies evaluated for
+        every task instance of a run only look at the upstreams they care about instead of scanning
+        all finished task instances each time.
+
+        :param dag_run: The DagRun for which to find finished tasks
+        :return: A mapping of task id to the finished task instances of that task
+        """
+        if self._finished_tis_by_task_id is None:
+            finished_tis_by_task_id: dict[str, list[TaskInstance]] = defaultdict(list)
+            for ti in self.ensure_finished_tis(dag_run, session):
+                finished_tis_by_task_id[ti.task_id].append(ti)
+            self._finished_tis_by_task_id = dict(finished_tis_by_task_id)
+        return self._finished_tis_by_task_id
+
+    def ensure_map_indexes_by_task_id(self, dag_run: DagRun, session: Session) -> dict[str, list[int]]:
+        """
+        Return the map indexes of all task instances of the run, regardless of state, grouped by task id.
+
+        This is loaded with a single query per run and is used to count the upstream task instances of
+        mapped tasks without querying the database for every task instance being evaluated. Call
+        :meth:`invalidate_map_indexes` when task instances are created or removed afterwards.
+
+        :param dag_run: The DagRun whose task instances should be loaded
+        :return: A mapping of task id to the map indexes of the task instances of that task
+        """
+        if self._map_indexes_by_task_id is None:
+            from sqlalchemy import select
+
+            from airflow.models.taskinstance import TaskInstance
+
+            map_indexes_by_task_id: dict[str, list[int]] = defaultdict(list)
+            rows = session.execute(
+                select(TaskInstance.task_id, TaskInstance.map_index).where(
+                    TaskInstance.dag_id == dag_run.dag_id, TaskInstance.run_id == dag_run.run_id
+                )
+            )
+            for task_id, map_index in rows:
+                map_indexes_by_task_id[task_id].append(map_index)
+            self._map_indexes_by_task_id = dict(map_indexes_by_task_id)
+        return self._map_indexes_by_task_id
+
+    def invalidate_map_indexes(self) -> None:
+        """Forget the map indexes loaded by :meth:`ensure_map_indexes_by_task_id`, e.g. after a task was expanded."""
+        self._map_indexes_by_task_id = None
+        self._expanded_ti_counts.clear()
+
+    def get_expanded_ti_count(self, task: Operator, run_id: str, session: Session) -> int | None:
+        """
+        Return how many task instances ``task`` is supposed to be expanded into, cached per task.
+
+        :param task: The task to get the expanded task instance count of
+        :param run_id: The run the task instances belong to
+        :return: The count, or *None* if the task is not mapped or cannot be expanded yet
+        """
+        from airflow.models.expandinput import NotFullyPopulated
+        from airflow.serialization.definitions.mappedoperator import get_mapped_ti_count
+
+        key = (task.task_id, run_id)
+        if key not in self._expanded_ti_counts:
+            try:
+                count: int | None = get_mapped_ti_count(task, run_id, session=session)
+            except (NotFullyPopulated, NotMapped):
+                count = None
+            self._expanded_ti_counts[key] = count
+        return self._expanded_ti_counts[key]
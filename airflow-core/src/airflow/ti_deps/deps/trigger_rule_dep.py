@@ -20,27 +20,22 @@ from __future__ import annotations
 import collections.abc
 import functools
 from collections import Counter
-from collections.abc import Iterator, KeysView, Mapping, Sequence
+from collections.abc import Collection, Iterator, Mapping
 from typing import TYPE_CHECKING, NamedTuple
 
-from sqlalchemy import and_, func, or_, select
-
 from airflow.models.taskinstance import PAST_DEPENDS_MET
 from airflow.task.trigger_rule import TriggerRule as TR
 from airflow.ti_deps.deps.base_ti_dep import BaseTIDep
 from airflow.utils.state import TaskInstanceState
 
 if TYPE_CHECKING:
-    from sqlalchemy.engine import Row
     from sqlalchemy.orm import Session
-    from sqlalchemy.sql import ColumnElement
 
     from airflow.models.taskinstance import TaskInstance
     from airflow.serialization.definitions.mappedoperator import Operator
     from airflow.serialization.definitions.taskgroup import SerializedMappedTaskGroup
     from airflow.ti_deps.dep_context import DepContext
     from airflow.ti_deps.deps.base_ti_dep import TIDepStatus
-    from airflow.typing_compat import Unpack
 
 
 class _UpstreamTIStates(NamedTuple):
@@ -130,27 +125,12 @@ class TriggerRuleDep(BaseTIDep):
         :param dep_context: The current dependency context.
         :param session: Database session.
         """
-        from airflow.exceptions import NotMapped
-        from airflow.models.expandinput import NotFullyPopulated
-        from airflow.models.taskinstance import TaskInstance
         from airflow.serialization.definitions.mappedoperator import is_mapped
 
         task = ti.task
         if TYPE_CHECKING:
             assert task
 
-        @functools.lru_cache
-        def _get_expanded_ti_count() -> int:
-            """
-            Get how many tis the current task is supposed to be expanded into.
-
-            This extra closure allows us to query the database only when needed,
-            and at most once.
-            """
-            from airflow.serialization.definitions.mappedoperator import get_mapped_ti_count
-
-            return get_mapped_ti_count(task, ti.run_id, session=session)
-
         def _iter_expansion_dependencies(task_group: SerializedMappedTaskGroup | None) -> Iterator[str]:
             if is_mapped(task):
                 for op in task.iter_mapped_dependencies():
@@ -182,9 +162,8 @@ class TriggerRuleDep(BaseTIDep):
                 ):
                     return None
 
-            try:
-                expanded_ti_count = _get_expanded_ti_count()
-            except (NotFullyPopulated, NotMapped):
+            expanded_ti_count = dep_context.get_expanded_ti_count(task, ti.run_id, session)
+            if expanded_ti_count is None:
                 return None
             return ti.get_relevant_upstream_map_indexes(
                 upstream=task.dag.task_dict[upstream_id],
@@ -192,68 +171,64 @@ class TriggerRuleDep(BaseTIDep):
                 session=session,
             )
 
-        def _is_relevant_upstream(upstream: TaskInstance, relevant_ids: set[str] | KeysView[str]) -> bool:
+        def _is_relevant_map_index(upstream_id: str, map_index: int) -> bool:
             """
-            Whether a task instance is a "relevant upstream" of the current task.
+            Whether the ``map_index`` ti of upstream ``upstream_id`` is a "relevant upstream" of the current task.
 
-            This will return false if upstream.task_id is not in relevant_ids,
-            or if both of the following are true:
-                1. upstream.task_id in relevant_ids is True
-                2. ti is in a mapped task group and upstream has a map index
-                  that ti does not depend on.
+            This will return false only if ti is in a mapped task group and the
+            upstream ti has a map index that ti does not depend on.
             """
-            # Not actually an upstream task.
-            if upstream.task_id not in relevant_ids:
-                return False
             # The current task is not in a mapped task group. All tis from an
             # upstream task are relevant.
             if task.get_closest_mapped_task_group() is None:
                 return True
             # The upstream ti is not expanded. The upstream may be mapped or
-            # not, but the ti is relevant either way.
-            if upstream.map_index < 0:
+            # not, but the ti is relevant either way. Since the upstream may not
+            # have been expanded yet, this also ensures at least one ti is
+            # included for the task.
+            if map_index < 0:
                 return True
             # Now we need to perform fine-grained check on whether this specific
             # upstream ti's map index is relevant.
-            relevant = _get_relevant_upstream_map_indexes(upstream_id=upstream.task_id)
+            relevant = _get_relevant_upstream_map_indexes(upstream_id=upstream_id)
             if relevant is None:
                 return True
-            if relevant == upstream.map_index:
+            if relevant == map_index:
                 return True
-            if isinstance(relevant, collections.abc.Container) and upstream.map_index in relevant:
+            if isinstance(relevant, collections.abc.Container) and map_index in relevant:
                 return True
             return False
 
-        def _iter_upstream_conditions(relevant_tasks: dict) -> Iterator[ColumnElement]:
-            # Optimization: If the current task is not in a mapped task group,
-            # it depends on all upstream task instances.
-            from airflow.models.taskinstance import TaskInstance
+        def _iter_finished_upstream_tis(relevant_ids: Collection[str]) -> Iterator[TaskInstance]:
+            """Iterate through the finished tis of the run that are relevant upstreams of the current ti."""
+            finished_tis_by_task_id = dep_context.ensure_finished_tis_by_task_id(
+                ti.get_dagrun(session), session
+            )
+            for upstream_id in relevant_ids:
+                for finished_ti in finished_tis_by_task_id.get(upstream_id, ()):
+                    if _is_relevant_map_index(upstream_id, finished_ti.map_index):
+                        yield finished_ti
 
-            if task.get_closest_mapped_task_group() is None:
-                yield TaskInstance.task_id.in_(relevant_tasks.keys())
-                return
-            # Otherwise we need to figure out which map indexes are depended on
-            # for each upstream by the current task instance.
+        def _count_upstream_tis(relevant_tasks: Mapping[str, Operator]) -> dict[str, int]:
+            """
+            Count the relevant tis of each upstream task, whatever their state.
+
+            The map indexes of the whole run are loaded once per dependency
+            context, instead of counting with a query for each ti.
+            """
+            map_indexes_by_task_id = dep_context.ensure_map_indexes_by_task_id(
+                ti.get_dagrun(session), session
+            )
+            task_id_counts: dict[str, int] = {}
             for upstream_id in relevant_tasks:
-                map_indexes = _get_relevant_upstream_map_indexes(upstream_id)
-                if map_indexes is None:  # All tis of this upstream are dependencies.
-                    yield TaskInstance.task_id == upstream_id
-                    continue
-                # At this point we know we want to depend on only selected tis
-                # of this upstream task. Since the upstream may not have been
-                # expanded at this point, we also depend on the non-expanded ti
-                # to ensure at least one ti is included for the task.
-                yield and_(TaskInstance.task_id == upstream_id, TaskInstance.map_index < 0)
-                if isinstance(map_indexes, range) and map_indexes.step == 1:
-                    yield and_(
-                        TaskInstance.task_id == upstream_id,
-                        TaskInstance.map_index >= map_indexes.start,
-                        TaskInstance.map_index < map_indexes.stop,
-                    )
-                elif isinstance(map_indexes, collections.abc.Container):
-                    yield and_(TaskInstance.task_id == upstream_id, TaskInstance.map_index.in_(map_indexes))
-                else:
-                    yield and_(TaskInstance.task_id == upstream_id, TaskInstance.map_index == map_indexes)
+                count = sum(
+                    1
+                    for map_index in map_indexes_by_task_id.get(upstream_id, ())
+                    if _is_relevant_map_index(upstream_id, map_index)
+                )
+                if count:
+                    task_id_counts[upstream_id] = count
+            return task_id_counts
 
         def _evaluate_setup_constraint(
             *, relevant_setups: Mapping[str, Operator]
@@ -267,12 +242,7 @@ class TriggerRuleDep(BaseTIDep):
                 return
 
             indirect_setups = {k: v for k, v in relevant_setups.items() if k not in task.upstream_task_ids}
-            finished_upstream_tis = (
-                x
-                for x in dep_context.ensure_finished_tis(ti.get_dagrun(session), session)
-                if _is_relevant_upstream(upstream=x, relevant_ids=indirect_setups.keys())
-            )
-            upstream_states = _UpstreamTIStates.calculate(finished_upstream_tis)
+            upstream_states = _UpstreamTIStates.calculate(_iter_finished_upstream_tis(indirect_setups.keys()))
 
             # all of these counts reflect indirect setups which are relevant for this ti
             success = upstream_states.success
@@ -286,13 +256,7 @@ class TriggerRuleDep(BaseTIDep):
             if not any(t.get_needs_expansion() for t in indirect_setups.values()):
                 upstream = len(indirect_setups)
             else:
-                task_id_counts = session.execute(
-                    select(TaskInstance.task_id, func.count(TaskInstance.task_id))
-                    .where(TaskInstance.dag_id == ti.dag_id, TaskInstance.run_id == ti.run_id)
-                    .where(or_(*_iter_upstream_conditions(relevant_tasks=indirect_setups)))
-                    .group_by(TaskInstance.task_id)
-                ).all()
-                upstream = sum(count for _, count in task_id_counts)
+                upstream = sum(_count_upstream_tis(relevant_tasks=indirect_setups).values())
 
             new_state = None
             changed = False
@@ -350,12 +314,7 @@ class TriggerRuleDep(BaseTIDep):
             trigger_rule = task.trigger_rule
             trigger_rule_str = getattr(trigger_rule, "value", trigger_rule)
 
-            finished_upstream_tis = (
-                finished_ti
-                for finished_ti in dep_context.ensure_finished_tis(ti.get_dagrun(session), session)
-                if _is_relevant_upstream(upstream=finished_ti, relevant_ids=task.upstream_task_ids)
-            )
-            upstream_states = _UpstreamTIStates.calculate(finished_upstream_tis)
+            upstream_states = _UpstreamTIStates.calculate(_iter_finished_upstream_tis(task.upstream_task_ids))
 
             success = upstream_states.success
             skipped = upstream_states.skipped
@@ -372,15 +331,9 @@ class TriggerRuleDep(BaseTIDep):
                 upstream = len(upstream_tasks)
                 upstream_setup = sum(1 for x in upstream_tasks.values() if x.is_setup)
             else:
-                # The below type annotation is acceptable on SQLA2.1, but not on 2.0
-                task_id_counts: Sequence[Row[Unpack[tuple[str, int]]]] = session.execute(  # type: ignore[type-arg]
-                    select(TaskInstance.task_id, func.count(TaskInstance.task_id))
-                    .where(TaskInstance.dag_id == ti.dag_id, TaskInstance.run_id == ti.run_id)
-                    .where(or_(*_iter_upstream_conditions(relevant_tasks=upstream_tasks)))
-                    .group_by(TaskInstance.task_id)
-                ).all()
-                upstream = sum(count for _, count in task_id_counts)
-                upstream_setup = sum(c for t, c in task_id_counts if upstream_tasks[t].is_setup)
+                task_id_counts = _count_upstream_tis(relevant_tasks=upstream_tasks)
+                upstream = sum(task_id_counts.values())
+                upstream_setup = sum(c for t, c in task_id_counts.items() if upstream_tasks[t].is_setup)
 
             upstream_done = done >= upstream
 
@@ -616,6 +616,15 @@ def run_cleanup(
         else:
             logger.warning("Table %s not found.  Skipping.", table_name)
 
+    # Serialized DAGs are deleted along with their dag versions, but the tasks they shared are not
+    cleans_dag_versions = bool({"dag", "dag_version"}.intersection(effective_table_names))
+    if not dry_run and cleans_dag_versions and "serialized_dag_task" in existing_tables:
+        from airflow.models.serialized_dag import SerializedDagModel
+
+        with _suppress_with_logging("serialized_dag_task", session):
+            SerializedDagModel.delete_orphaned_tasks(session=session)
+            session.commit()
+
 
 @provide_session
 def export_archived_records(
@@ -38,14 +38,14 @@ def run_with_db_retries(max_retries: int = MAX_DB_RETRIES, logger: Logger | None
     """Return Tenacity Retrying object with project specific default."""
     import tenacity
 
-    # Default kwargs
-    retry_kwargs = dict(
-        retry=tenacity.retry_if_exception_type(exception_types=(DBAPIError)),
-        wait=tenacity.wait_random_exponential(multiplier=0.5, max=5),
-        stop=tenacity.stop_after_attempt(max_retries),
-        reraise=True,
+    # Default kwargs, which the given ones override
+    retry_kwargs = {
+        "retry": tenacity.retry_if_exception_type(exception_types=(DBAPIError)),
+        "wait": tenacity.wait_random_exponential(multiplier=0.5, max=5),
+        "stop": tenacity.stop_after_attempt(max_retries),
+        "reraise": True,
         **kwargs,
-    )
+    }
     if logger is not None:
         retry_kwargs["before_sleep"] = tenacity.before_sleep_log(logger, logging.DEBUG, True)  # type: ignore[arg-type]
 
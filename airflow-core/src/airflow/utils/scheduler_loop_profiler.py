@@ -0,0 +1,147 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Breakdown of where the time of each scheduler loop goes."""
+
+from __future__ import annotations
+
+import statistics
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from airflow._shared.observability.metrics.stats import Stats
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+
+class PhaseSample(NamedTuple):
+    """What one run of a scheduler loop phase cost."""
+
+    duration: float
+    """Wall time, in seconds."""
+    statements: int
+    """Number of SQL statements executed."""
+    rows: int
+    """Number of rows returned or affected, as reported by the database driver."""
+
+
+class SchedulerLoopProfiler:
+    """
+    Records the wall time, SQL statements and rows of each phase of the scheduler loop.
+
+    Every phase run is sent to Stats, tagged with the phase name, and the last ``window`` runs of each
+    phase are kept to summarize them with :meth:`format_summary`. SQL statements are counted with
+    SQLAlchemy engine events, so statements run by anything else in the process during a phase are
+    counted too; the scheduler loop is single threaded, so in practice these are the phase's own.
+
+    :param window: Number of runs of each phase kept for the summary.
+
+    :meta private:
+    """
+
+    def __init__(self, window: int = 1000) -> None:
+        self.window = window
+        self.samples: dict[str, deque[PhaseSample]] = defaultdict(lambda: deque(maxlen=self.window))
+        self._statements = 0
+        self._rows = 0
+        self._listening = False
+
+    def start(self) -> None:
+        """Start counting SQL statements."""
+        if not self._listening:
+            event.listen(Engine, "after_cursor_execute", self._after_cursor_execute)
+            self._listening = True
+
+    def stop(self) -> None:
+        """Stop counting SQL statements."""
+        if self._listening:
+            event.remove(Engine, "after_cursor_execute", self._after_cursor_execute)
+            self._listening = False
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self._statements += 1
+        # Drivers report -1 when the number of rows is not known (yet), e.g. for unbuffered SELECTs.
+        if (rowcount := getattr(cursor, "rowcount", -1)) > 0:
+            self._rows += rowcount
+
+    @contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        """Record the cost of the code run in the context as a run of phase ``name``."""
+        statements, rows = self._statements, self._rows
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            sample = PhaseSample(
+                duration=time.perf_counter() - start,
+                statements=self._statements - statements,
+                rows=self._rows - rows,
+            )
+            self.samples[name].append(sample)
+            tags = {"phase": name}
+            Stats.timing("scheduler.loop_phase.duration", timedelta(seconds=sample.duration), tags=tags)
+            Stats.incr("scheduler.loop_phase.statements", sample.statements, tags=tags)
+            Stats.incr("scheduler.loop_phase.rows", sample.rows, tags=tags)
+
+    def summary(self) -> list[dict[str, Any]]:
+        """Summarize the recorded runs of each phase, in the order the phases were first run."""
+        result = []
+        for name, samples in self.samples.items():
+            if not samples:
+                continue
+            durations = sorted(sample.duration * 1000 for sample in samples)
+            result.append(
+                {
+                    "phase": name,
+                    "runs": len(samples),
+                    "total_ms": sum(durations),
+                    "mean_ms": statistics.fmean(durations),
+                    "p50_ms": _percentile(durations, 50),
+                    "p95_ms": _percentile(durations, 95),
+                    "max_ms": durations[-1],
+                    "mean_statements": statistics.fmean(sample.statements for sample in samples),
+                    "mean_rows": statistics.fmean(sample.rows for sample in samples),
+                }
+            )
+        return result
+
+    def format_summary(self) -> str:
+        """Format :meth:`summary` as a table, the most expensive phase first."""
+        summary = sorted(self.summary(), key=lambda phase: phase["total_ms"], reverse=True)
+        header = (
+            f"{'phase':<26}{'runs':>8}{'total ms':>12}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}"
+            f"{'max ms':>10}{'statements':>12}{'rows':>10}"
+        )
+        lines = [header, "-" * len(header)]
+        for phase in summary:
+            lines.append(
+                f"{phase['phase']:<26}{phase['runs']:>8}{phase['total_ms']:>12.1f}{phase['mean_ms']:>10.2f}"
+                f"{phase['p50_ms']:>10.2f}{phase['p95_ms']:>10.2f}{phase['max_ms']:>10.2f}"
+                f"{phase['mean_statements']:>12.1f}{phase['mean_rows']:>10.1f}"
+            )
+        return "\n".join(lines)
+
+
+def _percentile(sorted_values: list[float], percent: int) -> float:
+    index = min(len(sorted_values) - 1, round(percent / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
@@ -0,0 +1,250 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Notifications that wake the scheduler up when there is new work for it.
+
+Without them, the scheduler only notices that e.g. a task instance finished the next time it polls
+the database, up to ``[scheduler] scheduler_idle_sleep_time`` later. With
+``[scheduler] wakeup_notifications`` set, the API server notifies the scheduler when a task instance
+finishes, a Dag run is triggered or an asset event is registered, and the scheduler schedules the
+affected Dag run right away. Polling is kept as the fallback, so a lost notification only delays
+scheduling as it would have without notifications.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import json
+import logging
+import os
+import select
+import socket
+import time
+from enum import Enum
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import event, func, select as sql_select
+
+from airflow.configuration import conf
+from airflow.utils.sqlalchemy import get_dialect_name
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+log = logging.getLogger(__name__)
+
+CHANNEL = "airflow_scheduler_wakeup"
+_PENDING_KEY = "scheduler_wakeups"
+_RECONNECT_INTERVAL = 30.0
+
+
+class SchedulerWakeupMethod(str, Enum):
+    """How the scheduler is notified of new work."""
+
+    none = "none"
+    postgres = "postgres"
+    socket = "socket"
+
+
+def get_wakeup_method(dialect_name: str | None = None) -> SchedulerWakeupMethod:
+    """
+    Return how the scheduler is notified of new work.
+
+    :param dialect_name: Dialect of the metadata database. ``postgres`` notifications fall back to ``none``
+        on any other database than PostgreSQL, instead of failing every write that notifies the scheduler.
+    """
+    method = conf.getenum("scheduler", "wakeup_notifications", SchedulerWakeupMethod)
+    if method == SchedulerWakeupMethod.postgres and dialect_name not in (None, "postgresql"):
+        _warn_postgres_unavailable(dialect_name)
+        return SchedulerWakeupMethod.none
+    return method
+
+
+@functools.cache
+def _warn_postgres_unavailable(dialect_name: str) -> None:
+    log.warning(
+        "[scheduler] wakeup_notifications = postgres needs a PostgreSQL metadata database, not %s; "
+        "the scheduler is not notified of new work",
+        dialect_name,
+    )
+
+
+def get_wakeup_socket_path() -> str:
+    return conf.get("scheduler", "wakeup_socket_path")
+
+
+def notify_scheduler(session: Session, *, dag_id: str | None = None, run_id: str | None = None) -> None:
+    """
+    Wake the scheduler up once the current transaction of ``session`` is committed.
+
+    When ``run_id`` is given, the scheduler schedules that Dag run (of ``dag_id``) immediately, rather
+    than waiting for its turn. Notifications are sent after the commit, so the scheduler sees the
+    changes that caused them, and are dropped if the transaction is rolled back.
+    """
+    method = get_wakeup_method()
+    if method == SchedulerWakeupMethod.postgres:
+        method = get_wakeup_method(get_dialect_name(session))
+    if method == SchedulerWakeupMethod.none:
+        return
+    payload = json.dumps({"dag_id": dag_id, "run_id": run_id})
+    if method == SchedulerWakeupMethod.postgres:
+        # Postgres itself delivers notifications on commit, and drops them on rollback.
+        session.execute(sql_select(func.pg_notify(CHANNEL, payload)))
+        return
+
+    if not event.contains(session, "after_commit", _send_pending_wakeups):
+        event.listen(session, "after_commit", _send_pending_wakeups)
+        event.listen(session, "after_soft_rollback", _drop_pending_wakeups)
+    session.info.setdefault(_PENDING_KEY, []).append(payload)
+
+
+def _send_pending_wakeups(session: Session) -> None:
+    if not (pending := session.info.pop(_PENDING_KEY, None)):
+        return
+    path = get_wakeup_socket_path()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+        sock.setblocking(False)
+        for payload in dict.fromkeys(pending):
+            try:
+                sock.sendto(payload.encode(), path)
+            except OSError:
+                # No scheduler is listening, or it is too busy to read its socket; it will poll.
+                log.debug("Could not send scheduler wakeup to %s", path, exc_info=True)
+                return
+
+
+def _drop_pending_wakeups(session: Session, previous_transaction: Any) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+class SchedulerWakeupListener:
+    """
+    Receives the notifications sent by :func:`notify_scheduler`, in the scheduler.
+
+    If the notifications cannot be received, e.g. because the database connection was lost,
+    :meth:`wait` just sleeps, and the listener tries to reconnect at most every 30 seconds.
+
+    :param method: How notifications are sent.
+    :param socket_path: Path of the socket notifications are sent to, for the ``socket`` method.
+    """
+
+    def __init__(self, method: SchedulerWakeupMethod, socket_path: str | None = None) -> None:
+        self.method = method
+        self.socket_path = socket_path
+        self._sock: socket.socket | None = None
+        self._dbapi_connection: Any = None
+        self._retry_at = 0.0
+
+    def _connect(self) -> None:
+        if self.method == SchedulerWakeupMethod.socket:
+            if TYPE_CHECKING:
+                assert self.socket_path
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.socket_path)
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            try:
+                sock.bind(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            sock.setblocking(False)
+            self._sock = sock
+        else:
+            from airflow import settings
+
+            if TYPE_CHECKING:
+                assert settings.engine
+            # A connection of its own, outside of the pool, since it stays subscribed.
+            pooled_connection = settings.engine.raw_connection()
+            pooled_connection.detach()
+            connection = pooled_connection.driver_connection
+            connection.autocommit = True
+            with contextlib.closing(connection.cursor()) as cursor:
+                cursor.execute(f'LISTEN "{CHANNEL}"')
+            self._dbapi_connection = connection
+
+    def _fileno(self) -> int | None:
+        if self._sock is None and self._dbapi_connection is None:
+            if time.monotonic() < self._retry_at:
+                return None
+            try:
+                self._connect()
+            except Exception:
+                log.warning("Could not listen for scheduler wakeups; polling only", exc_info=True)
+                self._retry_at = time.monotonic() + _RECONNECT_INTERVAL
+                return None
+        if self._sock is not None:
+            return self._sock.fileno()
+        return self._dbapi_connection.fileno()
+
+    def _read_payloads(self) -> list[str]:
+        if self._sock is not None:
+            payloads = []
+            while True:
+                try:
+                    payloads.append(self._sock.recv(4096).decode())
+                except BlockingIOError:
+                    return payloads
+        connection = self._dbapi_connection
+        if hasattr(connection, "poll"):  # psycopg2
+            connection.poll()
+            payloads = [notify.payload for notify in connection.notifies]
+            connection.notifies.clear()
+            return payloads
+        return [notify.payload for notify in connection.notifies(timeout=0)]  # psycopg 3
+
+    def wait(self, timeout: float) -> set[tuple[str, str]] | None:
+        """
+        Wait up to ``timeout`` seconds for notifications.
+
+        :return: ``None`` if no notification was received, otherwise the ``(dag_id, run_id)`` of the
+            Dag runs to schedule, which may be empty for notifications not about a particular run.
+        """
+        fileno = self._fileno()
+        if fileno is None:
+            time.sleep(timeout)
+            return None
+        try:
+            readable, _, _ = select.select([fileno], [], [], timeout)
+            if not readable:
+                return None
+            payloads = self._read_payloads()
+        except Exception:
+            log.warning("Lost the scheduler wakeup listener; polling only", exc_info=True)
+            self.close()
+            self._retry_at = time.monotonic() + _RECONNECT_INTERVAL
+            return None
+
+        dag_runs: set[tuple[str, str]] = set()
+        for payload in payloads:
+            try:
+                notification = json.loads(payload)
+            except ValueError:
+                continue
+            if notification.get("dag_id") and notification.get("run_id"):
+                dag_runs.add((notification["dag_id"], notification["run_id"]))
+        return dag_runs
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        if self._dbapi_connection is not None:
+            with contextlib.suppress(Exception):
+                self._dbapi_connection.close()
+            self._dbapi_connection = None
@@ -29,7 +29,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from airflow._shared.timezones import timezone
-from airflow.api_fastapi.auth.tokens import JWTValidator
+from airflow.api_fastapi.auth.tokens import JWTGenerator, JWTValidator
 from airflow.api_fastapi.execution_api.app import lifespan
 from airflow.exceptions import AirflowSkipException
 from airflow.models import RenderedTaskInstanceFields, TaskReschedule, Trigger
@@ -833,6 +833,66 @@ class TestTIRunState:
         assert logs[0].extra == '{"host_name": "random-hostname"}'
 
 
+class TestTIClaim:
+    def setup_method(self):
+        clear_db_logs()
+        clear_db_runs()
+
+    def teardown_method(self):
+        clear_db_logs()
+        clear_db_runs()
+
+    @staticmethod
+    def _claim(client, ti, pid=100):
+        return client.patch(
+            f"/execution/task-instances/{ti.id}/claim",
+            json={
+                "state": "running",
+                "hostname": "random-hostname",
+                "unixname": "random-unixname",
+                "pid": pid,
+                "start_date": "2024-10-31T12:00:00Z",
+            },
+        )
+
+    def test_ti_claim(self, client, session, create_task_instance):
+        ti = create_task_instance(task_id="test_ti_claim", state=State.QUEUED, session=session)
+        session.commit()
+
+        response = self._claim(client, ti)
+
+        assert response.status_code == 204
+        assert response.content == b""
+        session.expire_all()
+        ti = session.get(TaskInstance, ti.id)
+        assert ti.state == State.RUNNING
+        assert (ti.hostname, ti.unixname, ti.pid) == ("random-hostname", "random-unixname", 100)
+        assert ti.start_date == timezone.parse("2024-10-31T12:00:00Z")
+        logs = session.scalars(select(Log).where(Log.dag_id == ti.dag_id)).all()
+        assert [log.event for log in logs] == [TaskInstanceState.RUNNING.value]
+
+    def test_ti_claim_is_idempotent(self, client, session, create_task_instance):
+        ti = create_task_instance(task_id="test_ti_claim_is_idempotent", state=State.QUEUED, session=session)
+        session.commit()
+
+        assert self._claim(client, ti).status_code == 204
+        assert self._claim(client, ti).status_code == 204
+        # Another process cannot claim it
+        assert self._claim(client, ti, pid=101).status_code == 409
+
+    def test_ti_claim_conflict_if_not_queued(self, client, session, create_task_instance):
+        ti = create_task_instance(
+            task_id="test_ti_claim_conflict_if_not_queued", state=State.SUCCESS, session=session
+        )
+        session.commit()
+
+        response = self._claim(client, ti)
+
+        assert response.status_code == 409
+        assert response.json()["detail"]["reason"] == "invalid_state"
+        assert session.scalar(select(TaskInstance.state).where(TaskInstance.id == ti.id)) == State.SUCCESS
+
+
 class TestTIUpdateState:
     def setup_method(self):
         clear_db_assets()
@@ -1799,6 +1859,102 @@ class TestTIHealthEndpoint:
         assert ti.last_heartbeat_at == time_now.add(minutes=10)
 
 
+class TestTIBatchHeartbeat:
+    def setup_method(self):
+        clear_db_runs()
+
+    def teardown_method(self):
+        clear_db_runs()
+
+    @pytest.fixture
+    def generator(self):
+        generator = mock.MagicMock(spec=JWTGenerator)
+        generator.generate.return_value = "refreshed-token"
+        lifespan.registry.register_value(JWTGenerator, generator)
+        return generator
+
+    @staticmethod
+    def _register_validator(exp: int = 9999999999):
+        validator = mock.MagicMock(spec=JWTValidator)
+        validator.validated_claims.side_effect = lambda token, required_claims: {
+            "sub": token.removeprefix("token-for-"),
+            "scope": "execution",
+            "exp": exp,
+            "iat": 1000000000,
+        }
+        lifespan.registry.register_value(JWTValidator, validator)
+
+    def test_ti_heartbeat_batch(self, client, session, dag_maker, generator, time_machine):
+        """Test that each heartbeat of a batch gets what the heartbeat endpoint of its TI would answer."""
+        time_now = timezone.parse("2024-10-31T12:00:00Z")
+        time_machine.move_to(time_now, tick=False)
+        self._register_validator()
+
+        with dag_maker("test_ti_heartbeat_batch", session=session):
+            for task_id in ("running", "elsewhere", "finished"):
+                EmptyOperator(task_id=task_id)
+        dr = dag_maker.create_dagrun(session=session)
+        tis = {ti.task_id: ti for ti in dr.get_task_instances(session=session)}
+        for task_id, state, pid in [
+            ("running", State.RUNNING, 1789),
+            ("elsewhere", State.RUNNING, 1054),
+            ("finished", State.SUCCESS, 1789),
+        ]:
+            tis[task_id].state = state
+            tis[task_id].hostname = "random-hostname"
+            tis[task_id].pid = pid
+        session.commit()
+        missing_id = UUID("0182e924-0f1e-77e6-ab50-e977118bc139")
+
+        heartbeats = [
+            {"id": str(ti_id), "hostname": "random-hostname", "pid": 1789, "token": f"token-for-{ti_id}"}
+            for ti_id in (tis["running"].id, tis["elsewhere"].id, tis["finished"].id, missing_id)
+        ]
+        # The token of another TI
+        heartbeats.append({**heartbeats[-1], "id": str(uuid4())})
+        response = client.put("/execution/task-instances/heartbeats", json={"heartbeats": heartbeats})
+
+        assert response.status_code == 200
+        results = {result["id"]: result for result in response.json()["results"]}
+        statuses = [results[heartbeat["id"]]["status_code"] for heartbeat in heartbeats]
+        assert statuses == [204, 409, 409, 404, 403]
+        assert results[str(tis["elsewhere"].id)]["detail"]["reason"] == "running_elsewhere"
+        assert results[str(tis["finished"].id)]["detail"] == {
+            "reason": "not_running",
+            "message": "TI is no longer in the running state and task should terminate",
+            "current_state": State.SUCCESS,
+        }
+        assert results[str(missing_id)]["detail"]["reason"] == "not_found"
+        assert results[str(tis["running"].id)]["refreshed_token"] is None
+        generator.generate.assert_not_called()
+
+        session.expire_all()
+        assert session.get(TaskInstance, tis["running"].id).last_heartbeat_at == time_now
+        assert session.get(TaskInstance, tis["elsewhere"].id).last_heartbeat_at is None
+
+    def test_ti_heartbeat_batch_refreshes_expiring_tokens(
+        self, client, session, create_task_instance, generator
+    ):
+        ti = create_task_instance(
+            task_id="test_ti_heartbeat_batch_refreshes_expiring_tokens",
+            state=State.RUNNING,
+            hostname="random-hostname",
+            pid=1789,
+            session=session,
+        )
+        session.commit()
+        self._register_validator(exp=int(timezone.utcnow().timestamp()) + 10)
+
+        heartbeat = {"id": str(ti.id), "hostname": "random-hostname", "pid": 1789}
+        heartbeat["token"] = f"token-for-{ti.id}"
+        response = client.put("/execution/task-instances/heartbeats", json={"heartbeats": [heartbeat]})
+
+        assert response.status_code == 200
+        [result] = response.json()["results"]
+        assert result["status_code"] == 204
+        assert result["refreshed_token"] == "refreshed-token"
+
+
 class TestTIPutRTIF:
     def setup_method(self):
         clear_db_runs()
@@ -35,6 +35,7 @@ from airflow._shared.timezones import timezone
 from airflow.cli import cli_parser
 from airflow.cli.commands import dag_command
 from airflow.dag_processing.dagbag import DagBag, sync_bag_to_db
+from airflow.dag_processing.parse_profiling import ParseProfile
 from airflow.exceptions import AirflowException
 from airflow.models import DagModel, DagRun
 from airflow.models.dagbag import DBDagBag
@@ -279,6 +280,38 @@ class TestCliDags:
         assert any(item["file"].endswith("example_complex.py") for item in data)
         assert any("example_complex" in item["dags"] for item in data)
 
+    def test_cli_report_profile(self, stdout_capture, tmp_path):
+        bundle_log_dir = tmp_path / "latest" / "dags-folder"
+        (bundle_log_dir / "subdir").mkdir(parents=True)
+        (bundle_log_dir / "fast.py.profile.json").write_text(ParseProfile(imports=0.5).model_dump_json())
+        slow_profile = ParseProfile(imports=2.0, dag_construction=1.0, slowest_imports=[("pandas", 1.5)])
+        (bundle_log_dir / "subdir" / "slow.py.profile.json").write_text(slow_profile.model_dump_json())
+
+        args = self.parser.parse_args(["dags", "report", "--profile", "--output", "json"])
+        with conf_vars({("logging", "dag_processor_child_process_log_directory"): str(tmp_path)}):
+            with stdout_capture as temp_stdout:
+                dag_command.dag_report(args)
+                out = temp_stdout.getvalue()
+
+        data = json.loads(out)
+        assert [item["file"] for item in data] == ["subdir/slow.py", "fast.py"]
+        assert data[0]["total"] == 3.0
+        assert data[0]["slowest_imports"] == ["pandas (1.500s)"]
+
+    def test_cli_report_profile_dir(self, stdout_capture, tmp_path):
+        bundle_log_dir = tmp_path / "2026-01-01" / "dags-folder"
+        bundle_log_dir.mkdir(parents=True)
+        (bundle_log_dir / "old.py.profile.json").write_text(ParseProfile(imports=0.5).model_dump_json())
+
+        args = self.parser.parse_args(
+            ["dags", "report", "--profile", "--profile-dir", str(tmp_path / "2026-01-01"), "--output", "json"]
+        )
+        with stdout_capture as temp_stdout:
+            dag_command.dag_report(args)
+            out = temp_stdout.getvalue()
+
+        assert [item["file"] for item in json.loads(out)] == ["old.py"]
+
     @conf_vars({("core", "load_examples"): "true"})
     def test_cli_get_dag_details(self, stdout_capture):
         args = self.parser.parse_args(["dags", "details", "example_complex", "--output", "yaml"])
@@ -192,3 +192,17 @@ class TestSchedulerCommand:
         call_kwargs = mock_scheduler_job.call_args[1]
         assert call_kwargs["only_idle"] is True
         assert call_kwargs["num_runs"] == 5
+
+    @mock.patch("airflow.cli.commands.scheduler_command.run_job")
+    @mock.patch("airflow.cli.commands.scheduler_command.SchedulerJobRunner")
+    @mock.patch("airflow.cli.commands.scheduler_command.Process")
+    def test_profile_loops(self, mock_process, mock_scheduler_job, mock_run_job, capsys):
+        """--profile-loops N runs N profiled loops, then prints the profile."""
+        mock_scheduler_job.return_value.job_type = "SchedulerJob"
+        mock_scheduler_job.return_value.loop_profiler.format_summary.return_value = "phase summary"
+        args = self.parser.parse_args(["scheduler", "--profile-loops", "3"])
+        scheduler_command.scheduler(args)
+        call_kwargs = mock_scheduler_job.call_args[1]
+        assert call_kwargs["num_runs"] == 3
+        assert call_kwargs["profile_loops"] is True
+        assert "phase summary" in capsys.readouterr().out
@@ -27,7 +27,7 @@ from unittest import mock
 from unittest.mock import patch
 
 import pytest
-from sqlalchemy import delete, func, select
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.exc import OperationalError, SAWarning
 
 import airflow.dag_processing.collection
@@ -36,6 +36,7 @@ from airflow.configuration import conf
 from airflow.dag_processing.collection import (
     AssetModelOperation,
     DagModelOperation,
+    DagWriteManifests,
     _get_latest_runs_stmt,
     _update_dag_tags,
     update_dag_parsing_results_in_db,
@@ -56,6 +57,7 @@ from airflow.providers.standard.operators.empty import EmptyOperator
 from airflow.providers.standard.triggers.file import FileDeleteTrigger
 from airflow.sdk import DAG, Asset, AssetAlias, AssetWatcher
 from airflow.serialization.definitions.assets import SerializedAsset
+from airflow.serialization.definitions.dag import SerializedDAG
 from airflow.serialization.encoders import ensure_serialized_asset
 from airflow.serialization.serialized_objects import LazyDeserializedDAG
 
@@ -455,6 +457,79 @@ class TestUpdateDagParsingResults:
         dag_model: DagModel = session.get(DagModel, (dag.dag_id,))
         assert dag_model.last_parse_duration == parse_duration
 
+    def test_unchanged_parsing_result_only_updates_parse_time(self, testing_dag_bundle, session):
+        dag = DAG(dag_id="test")
+        dag.fileloc = dag.relative_fileloc = "abc.py"
+        manifests = DagWriteManifests(full_write_interval=600)
+
+        def write_results(parse_duration):
+            update_dag_parsing_results_in_db(
+                bundle_name="testing",
+                bundle_version=None,
+                dags=[LazyDeserializedDAG.from_dag(dag)],
+                import_errors={},
+                parse_duration=parse_duration,
+                warnings=set(),
+                session=session,
+                files_parsed={("testing", "abc.py")},
+                manifests=manifests,
+            )
+            session.commit()
+
+        write_results(1.0)
+        with mock.patch.object(SerializedDAG, "bulk_write_to_db") as mock_bulk_write:
+            write_results(2.0)
+        mock_bulk_write.assert_not_called()
+        assert session.scalar(select(DagModel.last_parse_duration).where(DagModel.dag_id == "test")) == 2.0
+
+        # A stale Dag is written in full, even if it did not change
+        session.execute(update(DagModel).values(is_stale=True))
+        with mock.patch.object(SerializedDAG, "bulk_write_to_db") as mock_bulk_write:
+            write_results(3.0)
+        mock_bulk_write.assert_called_once()
+
+        # So is a Dag which changed
+        write_results(4.0)
+        dag.description = "changed"
+        with mock.patch.object(SerializedDAG, "bulk_write_to_db") as mock_bulk_write:
+            write_results(5.0)
+        mock_bulk_write.assert_called_once()
+
+    def test_parsing_result_rolled_back_is_written_again(self, testing_dag_bundle, session):
+        dag = DAG(dag_id="test")
+        dag.fileloc = dag.relative_fileloc = "abc.py"
+        manifests = DagWriteManifests(full_write_interval=600)
+
+        def write_results():
+            update_dag_parsing_results_in_db(
+                bundle_name="testing",
+                bundle_version=None,
+                dags=[LazyDeserializedDAG.from_dag(dag)],
+                import_errors={},
+                parse_duration=None,
+                warnings=set(),
+                session=session,
+                files_parsed={("testing", "abc.py")},
+                manifests=manifests,
+                retry_db_errors=False,
+            )
+
+        write_results()
+        session.commit()
+
+        # The batch the changed result is written in fails, and is retried
+        dag.description = "changed"
+        write_results()
+        session.rollback()
+        with mock.patch.object(
+            SerializedDAG, "bulk_write_to_db", wraps=SerializedDAG.bulk_write_to_db
+        ) as mock_bulk_write:
+            write_results()
+        session.commit()
+
+        mock_bulk_write.assert_called_once()
+        assert session.scalar(select(DagModel.description).where(DagModel.dag_id == "test")) == "changed"
+
     @patch.object(ParseImportError, "full_file_path")
     @patch.object(SerializedDagModel, "write_dag")
     @pytest.mark.usefixtures("clean_db")
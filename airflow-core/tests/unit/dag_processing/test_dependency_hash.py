@@ -0,0 +1,75 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import textwrap
+
+import pytest
+
+from airflow.dag_processing.dependency_hash import DagFileDependencyHasher
+
+
+@pytest.fixture
+def bundle(tmp_path):
+    (tmp_path / "common").mkdir()
+    (tmp_path / "common" / "__init__.py").write_text("")
+    (tmp_path / "common" / "schedules.py").write_text("DAILY = '@daily'\n")
+    (tmp_path / "unused.py").write_text("")
+    (tmp_path / "dag.py").write_text(
+        textwrap.dedent(
+            """
+            import json
+            from common.schedules import DAILY
+            """
+        )
+    )
+    return tmp_path
+
+
+def test_hash_changes_with_imported_local_modules(bundle):
+    hasher = DagFileDependencyHasher()
+    content_hash = hasher.hash(bundle / "dag.py", bundle)
+    assert content_hash is not None
+    assert not content_hash.is_time_based
+
+    (bundle / "unused.py").write_text("X = 1\n")
+    assert hasher.hash(bundle / "dag.py", bundle) == content_hash
+
+    (bundle / "common" / "schedules.py").write_text("DAILY = '0 0 * * *'\n")
+    assert hasher.hash(bundle / "dag.py", bundle) != content_hash
+
+
+def test_hash_missing_file(bundle):
+    assert DagFileDependencyHasher().hash(bundle / "missing.py", bundle) is None
+
+
+@pytest.mark.parametrize(
+    ("source", "is_time_based"),
+    [
+        pytest.param("import datetime\nSTART = datetime.datetime.now()\n", True, id="module-level"),
+        pytest.param("from pendulum import now\nSTART = now()\n", True, id="from-import"),
+        pytest.param(
+            "import datetime\n\ndef task():\n    return datetime.datetime.now()\n", False, id="function-body"
+        ),
+    ],
+)
+def test_hash_detects_time_based_files(tmp_path, source, is_time_based):
+    (tmp_path / "dag.py").write_text(source)
+    content_hash = DagFileDependencyHasher().hash(tmp_path / "dag.py", tmp_path)
+    assert content_hash is not None
+    assert content_hash.is_time_based is is_time_based
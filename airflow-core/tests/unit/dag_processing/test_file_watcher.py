@@ -0,0 +1,79 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from airflow.dag_processing.file_watcher import BundleFileWatcher, WatchedChanges
+
+DAG_FILES = [Path("dag.py"), Path("sub/dag.py")]
+
+
+@pytest.fixture(params=["inotify", "poll"])
+def watcher(request, tmp_path):
+    (tmp_path / "dag.py").write_text("# dag\n")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "dag.py").write_text("# dag\n")
+    if request.param == "inotify" and not BundleFileWatcher.is_inotify_supported():
+        pytest.skip("inotify is only supported on Linux")
+    with mock.patch.object(
+        BundleFileWatcher, "is_inotify_supported", return_value=request.param == "inotify"
+    ):
+        watcher = BundleFileWatcher(tmp_path, poll_interval=0)
+        watcher.start()
+    watcher.list_dag_files(lambda: DAG_FILES)
+    yield watcher
+    watcher.stop()
+
+
+def test_modified_dag_files_are_reported(watcher):
+    (watcher.path / "sub" / "dag.py").write_text("# dag, modified\n")
+    (watcher.path / "notes.txt").write_text("not a Dag file\n")
+    assert watcher.poll() == WatchedChanges(modified=[Path("sub/dag.py")], relist=False)
+    assert watcher.list_dag_files(lambda: []) == DAG_FILES
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        pytest.param(lambda path: (path / "new_dag.py").write_text("# dag\n"), id="new-file"),
+        pytest.param(lambda path: (path / "dag.py").unlink(), id="removed-file"),
+        pytest.param(lambda path: (path / "new_dir").mkdir(), id="new-directory"),
+        pytest.param(lambda path: (path / ".airflowignore").write_text("sub\n"), id="ignore-file"),
+    ],
+)
+def test_dag_files_are_listed_again_when_they_may_have_changed(watcher, change):
+    change(watcher.path)
+    assert watcher.poll().relist
+    assert watcher.list_dag_files(lambda: [Path("other.py")]) == [Path("other.py")]
+
+
+def test_mtime_is_cached_until_the_file_changes(watcher):
+    path = watcher.path / "dag.py"
+    mtime = watcher.getmtime(path)
+    with mock.patch("os.path.getmtime") as getmtime:
+        assert watcher.getmtime(path) == mtime
+        getmtime.assert_not_called()
+
+    path.write_text("# dag, modified\n")
+    watcher.poll()
+    with mock.patch("os.path.getmtime", return_value=42.0):
+        assert watcher.getmtime(path) == 42.0
@@ -25,8 +25,10 @@ import re
 import shutil
 import signal
 import textwrap
+import threading
 import time
 from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from socket import socket, socketpair
@@ -37,10 +39,12 @@ import msgspec
 import pytest
 import time_machine
 from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError, OperationalError
 from uuid6 import uuid7
 
 from airflow._shared.timezones import timezone
 from airflow.callbacks.callback_requests import DagCallbackRequest
+from airflow.dag_processing.bundles.local import LocalDagBundle
 from airflow.dag_processing.bundles.manager import DagBundlesManager
 from airflow.dag_processing.dagbag import DagBag
 from airflow.dag_processing.manager import (
@@ -229,6 +233,145 @@ class TestDagFileProcessorManager:
         assert file_2 in manager._processors.keys()
         assert deque([file_3]) == manager._file_queue
 
+    @conf_vars(
+        {
+            ("dag_processor", "parsing_result_batch_size"): "2",
+            ("dag_processor", "parsing_result_batch_max_delay"): "600",
+        }
+    )
+    @mock.patch("airflow.dag_processing.manager.process_parse_results")
+    def test_parsing_results_are_written_in_batches(self, mock_process_parse_results):
+        file_1, file_2, file_3, file_4 = _get_file_infos(["file_1.py", "file_2.py", "file_3.py", "file_4.py"])
+        manager = DagFileProcessorManager(max_runs=1)
+        manager._bundle_versions = {"testing": None}
+
+        def finish(file):
+            manager._processors[file] = MagicMock(
+                is_ready=True, had_callbacks=False, start_time=time.monotonic(), read_runtime_state=False
+            )
+
+        def process_parse_results(*, relative_fileloc, **kwargs):
+            if relative_fileloc == "file_3.py":
+                raise ValueError("Could not write")
+            return DagFileStat(num_dags=1, run_count=1)
+
+        mock_process_parse_results.side_effect = process_parse_results
+        # Keep a processor running, so that results wait for the batch to be full
+        manager._processors[file_4] = MagicMock(is_ready=False)
+
+        finish(file_1)
+        manager._collect_results()
+        assert set(manager._pending_results) == {file_1}
+        mock_process_parse_results.assert_not_called()
+
+        finish(file_2)
+        manager._collect_results()
+        assert manager._pending_results == {}
+        assert mock_process_parse_results.call_count == 2
+        assert manager._file_stats[file_1].num_dags == manager._file_stats[file_2].num_dags == 1
+
+        # The result which cannot be written does not keep the other one from being written
+        mock_process_parse_results.reset_mock()
+        finish(file_3)
+        manager._collect_results()
+        finish(file_1)
+        manager._collect_results()
+        assert [c.kwargs["relative_fileloc"] for c in mock_process_parse_results.call_args_list] == [
+            "file_3.py",
+            "file_1.py",
+        ]
+        assert manager._file_stats[file_3].import_errors == 1
+        assert manager._file_stats[file_1].num_dags == 1
+
+    @mock.patch("airflow.dag_processing.manager.process_parse_results")
+    def test_parsing_results_db_errors(self, mock_process_parse_results):
+        file_1, file_2 = _get_file_infos(["file_1.py", "file_2.py"])
+        manager = DagFileProcessorManager(max_runs=1)
+        manager._bundle_versions = {"testing": None}
+        db_errors = {
+            "file_1.py": [OperationalError("UPDATE", {}, Exception("Deadlock"))],
+            "file_2.py": [IntegrityError("INSERT", {}, Exception("Duplicate"))],
+        }
+
+        def process_parse_results(*, relative_fileloc, **kwargs):
+            if db_errors[relative_fileloc]:
+                raise db_errors[relative_fileloc].pop()
+            return DagFileStat(num_dags=1, run_count=1)
+
+        mock_process_parse_results.side_effect = process_parse_results
+        for file in (file_1, file_2):
+            manager._processors[file] = MagicMock(
+                is_ready=True, had_callbacks=False, start_time=time.monotonic(), read_runtime_state=False
+            )
+        manager._collect_results()
+
+        # The batch is retried on the operational error, while the integrity error only skips its file
+        assert [c.kwargs["relative_fileloc"] for c in mock_process_parse_results.call_args_list] == [
+            "file_1.py",
+            "file_1.py",
+            "file_2.py",
+        ]
+        assert manager._pending_results == {}
+        assert manager._file_stats[file_1].num_dags == 1
+        assert manager._file_stats[file_2].import_errors == 1
+
+    @mock.patch("airflow.dag_processing.manager.process_parse_results")
+    def test_parsing_results_stay_pending_until_written(self, mock_process_parse_results):
+        (file,) = _get_file_infos(["file_1.py"])
+        manager = DagFileProcessorManager(max_runs=1)
+        manager._bundle_versions = {"testing": None}
+        mock_process_parse_results.side_effect = OperationalError("UPDATE", {}, Exception("Gone away"))
+        manager._processors[file] = MagicMock(
+            is_ready=True, had_callbacks=False, start_time=time.monotonic(), read_runtime_state=False
+        )
+
+        with pytest.raises(OperationalError):
+            manager._collect_results()
+        assert set(manager._pending_results) == {file}
+
+    @conf_vars({("dag_processor", "parsing_files_per_process"): "3"})
+    def test_reused_processor_parses_the_next_file_of_its_bundle(self):
+        file, with_callbacks, next_file = _get_file_infos(["file_1.py", "file_2.py", "file_3.py"])
+        other_bundle = DagFileInfo(
+            bundle_name="other", rel_path=Path("file_4.py"), bundle_path=Path("/other")
+        )
+        manager = DagFileProcessorManager(max_runs=1)
+        manager._file_queue = deque([other_bundle, with_callbacks, next_file])
+        manager._callback_to_execute[with_callbacks] = [MagicMock()]
+        processor = MagicMock(files_parsed=1, bundle_version=None)
+        processor.memory_growth.return_value = 0
+
+        manager._reuse_processor(processor, file)
+        processor.parse_next_file.assert_called_once_with(
+            path=next_file.absolute_path, bundle_path=next_file.bundle_path, bundle_name="testing"
+        )
+        assert manager._processors == {next_file: processor}
+        assert manager._file_queue == deque([other_bundle, with_callbacks])
+
+        # Processors exit after `parsing_files_per_process` files
+        del manager._processors[next_file]
+        manager._file_queue.append(file)
+        processor.files_parsed = 3
+        manager._reuse_processor(processor, next_file)
+        processor.finish.assert_called_once()
+        assert manager._retiring_processors == [processor]
+        assert manager._file_queue == deque([other_bundle, with_callbacks, file])
+
+    @conf_vars({("dag_processor", "parsing_files_per_process"): "3"})
+    def test_processor_is_not_reused_once_its_bundle_version_changed(self):
+        file, next_file = _get_file_infos(["file_1.py", "file_2.py"])
+        manager = DagFileProcessorManager(max_runs=1)
+        manager._bundle_versions = {"testing": "v2"}
+        manager._file_queue = deque([next_file])
+        processor = MagicMock(files_parsed=1, bundle_version="v1")
+        processor.memory_growth.return_value = 0
+
+        manager._reuse_processor(processor, file)
+        processor.parse_next_file.assert_not_called()
+        processor.finish.assert_called_once()
+        assert manager._retiring_processors == [processor]
+        assert manager._file_queue == deque([next_file])
+
     def test_handle_removed_files_when_processor_file_path_not_in_new_file_paths(self):
         """Ensure processors and file stats are removed when the file path is not in the new file paths"""
         manager = DagFileProcessorManager(max_runs=1)
@@ -514,6 +657,45 @@ class TestDagFileProcessorManager:
                 > (freezed_base_time - manager._file_stats[dag_file].last_finish_time).total_seconds()
             )
 
+    @conf_vars(
+        {
+            ("dag_processor", "file_parsing_sort_mode"): "alphabetical",
+            ("dag_processor", "min_file_process_interval"): "30",
+            ("dag_processor", "unchanged_file_process_interval"): "600",
+        }
+    )
+    def test_unchanged_file_is_not_parsed(self, tmp_path):
+        (tmp_path / "helpers.py").write_text("SCHEDULE = None\n")
+        (tmp_path / "dag.py").write_text("from helpers import SCHEDULE\n")
+        dag_file = DagFileInfo(bundle_name="testing", rel_path=Path("dag.py"), bundle_path=tmp_path)
+        known_files = {"testing": {dag_file}}
+
+        manager = DagFileProcessorManager(max_runs=-1)
+        content_hash = manager._dependency_hash(dag_file)
+        assert content_hash is not None
+        manager._file_stats[dag_file] = DagFileStat(
+            num_dags=1,
+            last_finish_time=timezone.utcnow() - timedelta(seconds=60),
+            run_count=1,
+            content_hash=content_hash.digest,
+        )
+
+        manager.prepare_file_queue(known_files=known_files)
+        assert manager._file_queue == deque()
+        assert manager._file_stats[dag_file].run_count == 2
+        assert manager._file_stats[dag_file].last_unchanged_time is not None
+
+        # The unchanged file was checked just now, so it counts as processed recently
+        manager.prepare_file_queue(known_files=known_files)
+        assert manager._file_queue == deque()
+        assert manager._file_stats[dag_file].run_count == 2
+
+        # Changing a module imported by the file re-parses it
+        manager._file_stats[dag_file].last_unchanged_time = None
+        (tmp_path / "helpers.py").write_text("SCHEDULE = '@daily'\n")
+        manager.prepare_file_queue(known_files=known_files)
+        assert manager._file_queue == deque([dag_file])
+
     def test_file_paths_in_queue_sorted_by_priority(self):
         from airflow.models.dagbag import DagPriorityParsingRequest
 
@@ -1333,6 +1515,85 @@ class TestDagFileProcessorManager:
                 manager.run()
                 assert bundletwo.refresh.call_count == 2
 
+    def test_bundles_are_refreshed_in_the_background(self):
+        """A slow bundle refresh does not hold up applying the files of the other bundles."""
+        config = [
+            {
+                "name": name,
+                "classpath": "airflow.dag_processing.bundles.local.LocalDagBundle",
+                "kwargs": {"path": "/dev/null", "refresh_interval": 0},
+            }
+            for name in ("slow", "fast")
+        ]
+        with conf_vars({("dag_processor", "dag_bundle_config_list"): json.dumps(config)}):
+            DagBundlesManager().sync_bundles_to_db()
+
+        finish_slow_refresh = threading.Event()
+        bundles = []
+        for name in ("slow", "fast"):
+            bundle = MagicMock(path="/dev/null", refresh_interval=0, supports_versioning=False)
+            bundle.name = name
+            bundles.append(bundle)
+        bundles[0].refresh.side_effect = lambda: finish_slow_refresh.wait(10)
+
+        manager = DagFileProcessorManager(max_runs=1)
+        manager._dag_bundles = bundles
+        manager._bundle_refresh_pool = ThreadPoolExecutor(max_workers=2)
+        known_files: dict[str, set[DagFileInfo]] = {}
+        with (
+            mock.patch.object(
+                DagFileProcessorManager, "_find_files_in_bundle", return_value=[Path("dag.py")]
+            ),
+            mock.patch.object(DagFileProcessorManager, "deactivate_deleted_dags"),
+            mock.patch.object(DagFileProcessorManager, "clear_orphaned_import_errors"),
+        ):
+            manager._refresh_dag_bundles(known_files=known_files)
+            manager._bundle_refreshes["fast"][1].result(timeout=10)
+            manager._refresh_dag_bundles(known_files=known_files)
+            assert set(known_files) == {"fast"}
+            assert set(manager._bundle_refreshes) == {"slow"}
+            assert list(manager._file_queue) == [
+                DagFileInfo(bundle_name="fast", rel_path=Path("dag.py"), bundle_path="/dev/null")
+            ]
+
+            finish_slow_refresh.set()
+            manager._bundle_refreshes["slow"][1].result(timeout=10)
+            manager._refresh_dag_bundles(known_files=known_files)
+            assert set(known_files) == {"fast", "slow"}
+            assert manager._bundle_refreshes == {}
+        manager._bundle_refresh_pool.shutdown()
+
+    def test_watched_bundle_is_only_listed_again_when_files_are_added(self, tmp_path):
+        (tmp_path / "dag.py").write_text("# dag\n")
+        bundle = LocalDagBundle(name="local", path=str(tmp_path))
+        with conf_vars({("dag_processor", "bundle_refresh_check_interval"): "0"}):
+            manager = DagFileProcessorManager(max_runs=1)
+        manager._dag_bundles = [bundle]
+        manager._start_file_watchers()
+        assert set(manager._file_watchers) == {"local"}
+
+        with mock.patch.object(
+            DagFileProcessorManager, "_list_files_in_bundle", return_value=[Path("dag.py")]
+        ) as list_files:
+            assert manager._find_files_in_bundle(bundle) == [Path("dag.py")]
+            assert manager._find_files_in_bundle(bundle) == [Path("dag.py")]
+            assert list_files.call_count == 1
+
+            # A modified Dag file is queued right away, without listing the bundle again
+            (tmp_path / "dag.py").write_text("# dag, modified\n")
+            manager._poll_file_watchers()
+            assert list(manager._file_queue) == [
+                DagFileInfo(bundle_name="local", rel_path=Path("dag.py"), bundle_path=tmp_path)
+            ]
+            assert not manager._force_refresh_bundles
+
+            (tmp_path / "new_dag.py").write_text("# dag\n")
+            manager._poll_file_watchers()
+            assert manager._force_refresh_bundles == {"local"}
+            manager._find_files_in_bundle(bundle)
+            assert list_files.call_count == 2
+        manager.end()
+
     def test_bundle_refresh_check_interval(self):
         """Ensure dag processor doesn't refresh bundles every loop."""
         config = [
@@ -0,0 +1,85 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import builtins
+import sys
+import time
+from unittest import mock
+
+from airflow.dag_processing.parse_profiling import ParseProfile, ParseProfiler
+
+
+def test_loading_times_imports_and_dag_construction(tmp_path, monkeypatch):
+    (tmp_path / "slow_module.py").write_text("import time\ntime.sleep(0.2)\n")
+    (tmp_path / "fast_module.py").write_text("")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "slow_module", raising=False)
+    monkeypatch.delitem(sys.modules, "fast_module", raising=False)
+    original_import = builtins.__import__
+
+    profiler = ParseProfiler(top_imports=1)
+    with profiler.loading():
+        import fast_module  # noqa: F401
+        import slow_module  # noqa: F401
+
+        time.sleep(0.1)
+    profile = profiler.finish()
+
+    assert builtins.__import__ is original_import
+    assert profile.imports >= 0.2
+    assert profile.dag_construction >= 0.1
+    assert [name for name, _ in profile.slowest_imports] == ["slow_module"]
+
+
+def test_loading_times_runtime_state_requests():
+    comms = mock.Mock()
+    comms.send.side_effect = lambda msg: time.sleep(0.1)
+
+    profiler = ParseProfiler(top_imports=10)
+    with mock.patch("airflow.sdk.execution_time.task_runner.SUPERVISOR_COMMS", comms, create=True):
+        with profiler.loading():
+            from airflow.sdk.execution_time import task_runner
+
+            task_runner.SUPERVISOR_COMMS.send("GetVariable")
+        assert task_runner.SUPERVISOR_COMMS is comms
+
+    comms.send.assert_called_once_with("GetVariable")
+    assert profiler.profile.runtime_state_requests >= 0.1
+    assert profiler.profile.dag_construction < 0.1
+
+
+def test_phase_adds_up():
+    profiler = ParseProfiler(top_imports=10)
+    perf_counter = mock.patch(
+        "airflow.dag_processing.parse_profiling.time.perf_counter", side_effect=[1.0, 1.5, 2.0, 2.25]
+    )
+    with perf_counter:
+        with profiler.phase("serialization"):
+            pass
+        with profiler.phase("serialization"):
+            pass
+
+    assert profiler.profile.serialization == 0.75
+    assert profiler.finish().total == 0.75
+
+
+def test_profile_round_trips_through_json():
+    profile = ParseProfile(imports=1.0, slowest_imports=[("pandas", 0.5)])
+
+    assert ParseProfile.model_validate_json(profile.model_dump_json()) == profile
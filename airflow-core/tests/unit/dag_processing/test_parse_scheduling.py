@@ -0,0 +1,70 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from airflow.dag_processing.manager import DagFileInfo
+from airflow.dag_processing.parse_scheduling import ParseCostScheduler
+
+
+def _file(name: str) -> DagFileInfo:
+    return DagFileInfo(rel_path=Path(name), bundle_name="testing", bundle_path=Path("/dags"))
+
+
+@pytest.fixture
+def monotonic():
+    with mock.patch("airflow.dag_processing.parse_scheduling.time.monotonic", return_value=1000.0) as m:
+        yield m
+
+
+def test_cheap_frequently_changing_files_first(monotonic):
+    scheduler = ParseCostScheduler(aging_interval=30, timed_out_file_process_interval=0)
+    expensive, cheap, static, new = (_file(f"{name}.py") for name in ("expensive", "cheap", "static", "new"))
+    for mtime in range(3):
+        scheduler.record_parse(expensive, duration=20.0, num_dags=1, mtime=mtime)
+        scheduler.record_parse(cheap, duration=1.0, num_dags=1, mtime=mtime)
+        scheduler.record_parse(static, duration=1.0, num_dags=1, mtime=0)
+
+    assert scheduler.sort([expensive, static, cheap, new]) == [new, cheap, static, expensive]
+
+
+def test_waiting_files_age_to_the_front(monotonic):
+    scheduler = ParseCostScheduler(aging_interval=30, timed_out_file_process_interval=0)
+    expensive, cheap = _file("expensive.py"), _file("cheap.py")
+    scheduler.record_parse(expensive, duration=10.0, num_dags=1)
+    monotonic.return_value += 600
+    scheduler.record_parse(cheap, duration=1.0, num_dags=1)
+    assert scheduler.sort([cheap, expensive]) == [expensive, cheap]
+
+
+def test_files_which_keep_timing_out_are_throttled(monotonic):
+    scheduler = ParseCostScheduler(aging_interval=30, timed_out_file_process_interval=600)
+    file = _file("slow.py")
+    scheduler.record_parse(file, duration=50.0, num_dags=0, timed_out=True)
+    assert scheduler.throttled([file]) == set()
+    scheduler.record_parse(file, duration=50.0, num_dags=0, timed_out=True)
+    assert scheduler.throttled([file]) == {file}
+    monotonic.return_value += 601
+    assert scheduler.throttled([file]) == set()
+
+    scheduler.record_parse(file, duration=5.0, num_dags=1)
+    assert scheduler.throttled([file]) == set()
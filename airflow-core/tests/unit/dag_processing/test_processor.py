@@ -18,9 +18,11 @@
 from __future__ import annotations
 
 import inspect
+import os
 import pathlib
 import sys
 import textwrap
+import time
 import typing
 import uuid
 from collections.abc import Callable
@@ -28,6 +30,7 @@ from socket import socketpair
 from typing import TYPE_CHECKING, BinaryIO
 from unittest.mock import MagicMock, patch
 
+import psutil
 import pytest
 import structlog
 from pydantic import TypeAdapter
@@ -49,6 +52,7 @@ from airflow.callbacks.callback_requests import (
     TaskCallbackRequest,
 )
 from airflow.dag_processing.dagbag import DagBag
+from airflow.dag_processing.fork_template import ForkTemplate
 from airflow.dag_processing.manager import process_parse_results
 from airflow.dag_processing.processor import (
     DagFileParseRequest,
@@ -178,6 +182,123 @@ class TestDagFileProcessor:
         assert result.import_errors == {}
         assert result.serialized_dags[0].dag_id == "test_abc"
 
+    @pytest.mark.skipif(not ForkTemplate.is_supported(), reason="Linux only")
+    def test_parse_with_fork_template(self, tmp_path: pathlib.Path, inprocess_client):
+        logger = MagicMock(spec=FilteringBoundLogger)
+        logger_filehandle = MagicMock(spec=BinaryIO)
+
+        def dag_in_a_fn():
+            import sys
+
+            from airflow.sdk import DAG
+
+            with DAG(f"test_preloaded_{'wave' in sys.modules}"):
+                ...
+
+        path = write_dag_in_a_fn_to_file(dag_in_a_fn, tmp_path)
+        fork_template = ForkTemplate(preload_modules=["wave"])
+        fork_template.start()
+        try:
+            deadline = time.monotonic() + 60
+            while not fork_template._is_ready():
+                assert time.monotonic() < deadline, "Fork template did not get ready"
+                time.sleep(0.1)
+
+            proc = DagFileProcessorProcess.start(
+                id=1,
+                path=path,
+                bundle_path=tmp_path,
+                bundle_name="testing",
+                callbacks=[],
+                logger=logger,
+                logger_filehandle=logger_filehandle,
+                client=inprocess_client,
+                fork_template=fork_template,
+            )
+            # Forked by the template, but adopted by this process
+            assert proc.pid != fork_template.pid
+            assert psutil.Process(proc.pid).ppid() == os.getpid()
+
+            while not proc.is_ready:
+                proc._service_subprocess(0.1)
+        finally:
+            fork_template.stop()
+
+        assert proc._exit_code == 0
+        result = proc.parsing_result
+        assert result is not None
+        assert result.import_errors == {}
+        assert result.serialized_dags[0].dag_id == "test_preloaded_True"
+
+    @pytest.mark.skipif(not ForkTemplate.is_supported(), reason="Linux only")
+    def test_fork_template_makes_manager_subreaper_only_while_spawning(self):
+        import json
+        import select
+        import socket
+
+        fork_template = ForkTemplate()
+        fork_template._control, template_control = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        fork_template._ready_rss = 0
+        # The answer of the template, once it forked the processor
+        template_control.send(json.dumps({"pid": 1234, "rss": 0}).encode())
+        calls = []
+
+        def set_child_subreaper(enabled):
+            request_sent = bool(select.select([template_control], [], [], 0)[0])
+            calls.append((enabled, request_sent))
+
+        pairs = [socketpair() for _ in range(4)]
+        try:
+            with patch(
+                "airflow.dag_processing.fork_template._set_child_subreaper", side_effect=set_child_subreaper
+            ):
+                assert fork_template.spawn("dag.py", [child for child, _ in pairs]) == 1234
+        finally:
+            fork_template._control.close()
+            template_control.close()
+            for child, parent in pairs:
+                child.close()
+                parent.close()
+
+        assert calls == [(True, False), (False, True)]
+
+    def test_reusable_processor_parses_several_files(self, tmp_path: pathlib.Path, inprocess_client):
+        logger = MagicMock(spec=FilteringBoundLogger)
+        logger_filehandle = MagicMock(spec=BinaryIO)
+        for name in ("first", "second"):
+            (tmp_path / f"{name}.py").write_text(
+                f"from airflow.sdk import DAG\n\nwith DAG('test_{name}'):\n    ...\n"
+            )
+
+        proc = DagFileProcessorProcess.start(
+            id=1,
+            path=tmp_path / "first.py",
+            bundle_path=tmp_path,
+            bundle_name="testing",
+            callbacks=[],
+            logger=logger,
+            logger_filehandle=logger_filehandle,
+            client=inprocess_client,
+            reusable=True,
+        )
+        while not proc.is_waiting_for_next_file:
+            proc._service_subprocess(0.1)
+        assert proc.parsing_result is not None
+        assert proc.parsing_result.serialized_dags[0].dag_id == "test_first"
+
+        proc.parse_next_file(path=tmp_path / "second.py", bundle_path=tmp_path, bundle_name="testing")
+        assert proc.parsing_result is None
+        while not proc.is_waiting_for_next_file:
+            proc._service_subprocess(0.1)
+        assert proc.parsing_result is not None
+        assert proc.parsing_result.serialized_dags[0].dag_id == "test_second"
+        assert proc.files_parsed == 2
+
+        proc.finish()
+        while not proc.is_ready:
+            proc._service_subprocess(0.1)
+        assert proc._exit_code == 0
+
     def test_top_level_variable_access_not_found(
         self,
         spy_agency: SpyAgency,
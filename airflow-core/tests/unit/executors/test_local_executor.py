@@ -162,6 +162,74 @@ class TestLocalExecutor:
             assert executor.event_buffer[ti.key][0] == State.SUCCESS
         assert executor.event_buffer[fail_ti.key][0] == State.FAILED
 
+    @pytest.mark.parametrize(
+        ("parallelism", "tasks_per_supervisor", "expected_workers"),
+        [(5, 1, 5), (5, 2, 3), (4, 4, 1), (2, 8, 1)],
+    )
+    def test_max_workers(self, parallelism, tasks_per_supervisor, expected_workers):
+        with conf_vars({("workers", "tasks_per_supervisor"): str(tasks_per_supervisor)}):
+            executor = LocalExecutor(parallelism=parallelism)
+
+        assert executor.max_workers == expected_workers
+
+    @skip_spawn_mp_start
+    @mock.patch("airflow.sdk.execution_time.supervisor.MultiTaskSupervisor")
+    def test_execution_with_multi_task_supervisor(self, mock_supervisor):
+        from concurrent.futures import Future
+
+        tis = [
+            TaskInstanceDTO(
+                id=uuid7(),
+                dag_version_id=uuid7(),
+                task_id=f"task_{i}",
+                dag_id="mydag",
+                run_id="run1",
+                try_number=1,
+                state="queued",
+                pool_slots=1,
+                queue="default",
+                priority_weight=1,
+                map_index=-1,
+                start_date=timezone.utcnow(),
+            )
+            for i in range(4)
+        ]
+        failing_ti = tis[0]
+
+        def submit(ti, **kwargs):
+            future: Future[int] = Future()
+            if ti.id == failing_ti.id:
+                future.set_exception(RuntimeError("fake failure"))
+            else:
+                future.set_result(0)
+            return future
+
+        mock_supervisor.return_value.submit.side_effect = submit
+
+        with conf_vars({("workers", "tasks_per_supervisor"): "2"}):
+            executor = LocalExecutor(parallelism=4)
+        executor.start()
+        assert len(executor.workers) == 2
+
+        for ti in tis:
+            executor.queue_workload(
+                workloads.ExecuteTask(
+                    token="",
+                    ti=ti,
+                    dag_rel_path="some/path",
+                    log_path=None,
+                    bundle_info=dict(name="hi", version="hi"),
+                ),
+                session=mock.MagicMock(spec=Session),
+            )
+        executor._process_workloads(list(executor.queued_tasks.values()))
+        executor.end()
+
+        assert executor._unread_messages.value == 0
+        assert executor.event_buffer[failing_ti.key][0] == State.FAILED
+        for ti in tis[1:]:
+            assert executor.event_buffer[ti.key][0] == State.SUCCESS
+
     @mock.patch("airflow.executors.local_executor.LocalExecutor.sync")
     @mock.patch("airflow.executors.base_executor.BaseExecutor.trigger_tasks")
     @mock.patch("airflow.executors.base_executor.Stats.gauge")
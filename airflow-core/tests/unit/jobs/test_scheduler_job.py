@@ -55,7 +55,12 @@ from airflow.executors.executor_loader import ExecutorLoader
 from airflow.executors.executor_utils import ExecutorName
 from airflow.executors.local_executor import LocalExecutor
 from airflow.jobs.job import Job, run_job
-from airflow.jobs.scheduler_job_runner import SchedulerJobRunner
+from airflow.jobs.scheduler_job_runner import (
+    ConcurrencyLedger,
+    SchedulerJobRunner,
+    SchedulerShards,
+    dag_shard,
+)
 from airflow.models.asset import (
     AssetActive,
     AssetAliasModel,
@@ -81,6 +86,7 @@ from airflow.models.serialized_dag import SerializedDagModel
 from airflow.models.taskinstance import TaskInstance
 from airflow.models.team import Team
 from airflow.models.trigger import Trigger
+from airflow.models.xcom import XComModel
 from airflow.partition_mappers.base import PartitionMapper as CorePartitionMapper
 from airflow.providers.standard.operators.bash import BashOperator
 from airflow.providers.standard.operators.empty import EmptyOperator
@@ -2034,6 +2040,235 @@ class TestSchedulerJob:
 
         session.rollback()
 
+    @conf_vars({("scheduler", "concurrency_ledger_reconcile_interval"): "3600"})
+    @pytest.mark.parametrize("active_state", [TaskInstanceState.RUNNING, TaskInstanceState.QUEUED])
+    def test_find_executable_task_instances_concurrency_with_ledger(self, dag_maker, active_state, session):
+        """The ledger must enforce max_active_tasks exactly like the aggregate queries do."""
+        with dag_maker(dag_id="check_MAT_dag_ledger", max_active_tasks=2, session=session):
+            EmptyOperator(task_id="task_1")
+            EmptyOperator(task_id="task_2")
+            EmptyOperator(task_id="task_3")
+
+        self.job_runner = SchedulerJobRunner(job=Job())
+        assert self.job_runner._concurrency_ledger is not None
+
+        dr1 = dag_maker.create_dagrun(run_type=DagRunType.SCHEDULED, run_id="run_1", session=session)
+        dr2 = dag_maker.create_dagrun_after(
+            dr1, run_type=DagRunType.SCHEDULED, run_id="run_2", session=session
+        )
+        for dr, num_active in ((dr1, 2), (dr2, 1)):
+            for i, ti in enumerate(dr.get_task_instances(session=session)):
+                ti.state = active_state if i < num_active else State.SCHEDULED
+                session.merge(ti)
+        session.flush()
+
+        queued_tis = self.job_runner._executable_task_instances_to_queued(max_tis=32, session=session)
+        assert Counter(ti.run_id for ti in queued_tis) == {"run_2": 1}
+
+        ledger = self.job_runner._concurrency_ledger
+        assert ledger.dag_run_active_tasks_map == {
+            ("check_MAT_dag_ledger", "run_1"): 2,
+            ("check_MAT_dag_ledger", "run_2"): 2,
+        }
+
+        # The ledger was updated in memory, so nothing more gets queued without querying counts again.
+        with mock.patch.object(ledger, "load") as mock_load:
+            assert self.job_runner._executable_task_instances_to_queued(max_tis=32, session=session) == []
+        mock_load.assert_not_called()
+        session.rollback()
+
+    @conf_vars({("scheduler", "concurrency_ledger_reconcile_interval"): "3600"})
+    def test_find_executable_task_instances_pool_with_ledger(self, dag_maker, session):
+        with dag_maker(dag_id="test_pool_with_ledger", max_active_tasks=16, session=session):
+            EmptyOperator(task_id="dummy", pool="a", pool_slots=2)
+
+        self.job_runner = SchedulerJobRunner(job=Job())
+
+        dr1 = dag_maker.create_dagrun(run_type=DagRunType.SCHEDULED)
+        dr2 = dag_maker.create_dagrun_after(dr1, run_type=DagRunType.SCHEDULED)
+        dr3 = dag_maker.create_dagrun_after(dr2, run_type=DagRunType.SCHEDULED)
+        dr1.get_task_instance("dummy", session=session).state = State.RUNNING
+        for dr in (dr2, dr3):
+            dr.get_task_instance("dummy", session=session).state = State.SCHEDULED
+        session.add(Pool(pool="a", slots=4, description="haha", include_deferred=False))
+        session.flush()
+
+        res = self.job_runner._executable_task_instances_to_queued(max_tis=32, session=session)
+        assert [ti.run_id for ti in res] == [dr2.run_id]
+
+        stats = self.job_runner._concurrency_ledger.slots_stats(session=session)["a"]
+        assert stats["running"] == 2
+        assert stats["queued"] == 2
+        assert stats["open"] == 0
+        session.rollback()
+
+    def test_concurrency_ledger_observe_and_reconcile(self, dag_maker, session):
+        with dag_maker(dag_id="test_concurrency_ledger", session=session):
+            EmptyOperator(task_id="task_1", pool_slots=3)
+            EmptyOperator(task_id="task_2")
+
+        dr = dag_maker.create_dagrun(session=session)
+        ti1 = dr.get_task_instance("task_1", session=session)
+        ti2 = dr.get_task_instance("task_2", session=session)
+        ti1.state = TaskInstanceState.RUNNING
+        ti2.state = TaskInstanceState.DEFERRED
+        session.flush()
+
+        ledger = ConcurrencyLedger(reconcile_interval=3600)
+        assert ledger.needs_reconcile()
+        ledger.load(session=session)
+        assert not ledger.needs_reconcile()
+        assert len(ledger) == 2
+        assert ledger.dag_run_active_tasks_map == {(dr.dag_id, dr.run_id): 1}
+        assert ledger.pool_slots_map[Pool.DEFAULT_POOL_NAME] == {
+            TaskInstanceState.RUNNING: 3,
+            TaskInstanceState.DEFERRED: 1,
+        }
+
+        # A deferred task being queued again counts towards concurrency limits.
+        ledger.observe(ti2, TaskInstanceState.QUEUED)
+        assert ledger.task_concurrency_map == {(dr.dag_id, "task_1"): 1, (dr.dag_id, "task_2"): 1}
+
+        # A finished task is dropped from every counter.
+        ti1.state = TaskInstanceState.SUCCESS
+        ledger.observe(ti1)
+        assert ledger.task_concurrency_map == {(dr.dag_id, "task_2"): 1}
+        assert ledger.pool_slots_map[Pool.DEFAULT_POOL_NAME] == {TaskInstanceState.QUEUED: 1}
+
+        # Reconciling picks up the DB state and reports how far the ledger had drifted.
+        ledger.invalidate()
+        assert ledger.needs_reconcile()
+        with mock.patch("airflow.jobs.scheduler_job_runner.Stats.gauge") as mock_gauge:
+            ledger.load(session=session)
+        # The occupancy of the pool, and of both tasks, was out of date; that of the Dag run was not.
+        mock_gauge.assert_called_once_with("scheduler.concurrency_ledger.drift", 3)
+        assert ledger.task_concurrency_map == {(dr.dag_id, "task_1"): 1}
+
+        # A task instance moving from queued to running does not change the occupancy.
+        ledger.observe(ti1, TaskInstanceState.QUEUED)
+        with mock.patch("airflow.jobs.scheduler_job_runner.Stats.gauge") as mock_gauge:
+            ledger.load(session=session)
+        mock_gauge.assert_called_once_with("scheduler.concurrency_ledger.drift", 0)
+
+    @conf_vars({("scheduler", "concurrency_ledger_reconcile_interval"): "3600"})
+    def test_process_executor_events_updates_concurrency_ledger(self, dag_maker, session):
+        with dag_maker(dag_id="test_process_executor_events_ledger", session=session):
+            EmptyOperator(task_id="dummy_task")
+        ti = dag_maker.create_dagrun(session=session).get_task_instance("dummy_task", session=session)
+        ti.state = State.SUCCESS
+        session.merge(ti)
+        session.commit()
+
+        executor = MockExecutor(do_update=False)
+        self.job_runner = SchedulerJobRunner(job=Job(), executors=[executor])
+        ledger = self.job_runner._concurrency_ledger
+        ledger.observe(ti, TaskInstanceState.QUEUED)
+        assert ledger.task_concurrency_map == {(ti.dag_id, ti.task_id): 1}
+
+        executor.event_buffer[ti.key] = State.SUCCESS, None
+        self.job_runner._process_executor_events(executor=executor, session=session)
+
+        assert len(ledger) == 0
+        assert not ledger.task_concurrency_map
+
+    def test_scheduler_shards_refresh(self, dag_maker, session):
+        for dag_id in ("shard_dag_1", "shard_dag_2", "shard_dag_3", "shard_dag_4"):
+            with dag_maker(dag_id=dag_id, session=session):
+                EmptyOperator(task_id="dummy")
+        stale = Job(job_type=SchedulerJobRunner.job_type, state=State.RUNNING)
+        stale.latest_heartbeat = timezone.utcnow() - timedelta(hours=1)
+        jobs = [Job(job_type=SchedulerJobRunner.job_type, state=State.RUNNING) for _ in range(2)]
+        session.add_all([stale, *jobs])
+        session.flush()
+
+        shards = [SchedulerShards(shard_count=3, refresh_interval=30) for _ in jobs]
+        for job, job_shards in zip(jobs, shards):
+            assert job_shards.needs_refresh()
+            job_shards.refresh(job.id, session=session)
+            assert not job_shards.needs_refresh()
+
+        # The shards are split between the live schedulers, ignoring the one that stopped heart-beating.
+        assert [job_shards.owned_shards for job_shards in shards] == [[0, 2], [1]]
+        assert shards[0].dag_ids().isdisjoint(shards[1].dag_ids())
+        assert shards[0].dag_ids() | shards[1].dag_ids() == {
+            "shard_dag_1",
+            "shard_dag_2",
+            "shard_dag_3",
+            "shard_dag_4",
+        }
+        for dag_id in shards[1].dag_ids():
+            assert dag_shard(dag_id, 3) == 1
+
+        # When a scheduler stops, the others take its shards over.
+        jobs[1].state = State.FAILED
+        session.flush()
+        shards[0].refresh(jobs[0].id, session=session)
+        assert shards[0].owned_shards == [0, 1, 2]
+
+    def test_scheduler_shards_pool_quota(self):
+        shards = SchedulerShards(shard_count=4, refresh_interval=30)
+        quotas = [shards.pool_quota(6, shard, rotation=0) for shard in range(4)]
+        assert sum(quotas) == 6
+        assert sorted(quotas) == [1, 1, 2, 2]
+        # The slots that do not divide evenly move to other shards in the next rotation.
+        assert [shards.pool_quota(6, shard, rotation=1) for shard in range(4)] != quotas
+
+    def test_scheduler_shards_pool_rotation(self, session):
+        shards = SchedulerShards(shard_count=4, refresh_interval=30)
+        now = session.scalar(select(func.now()))
+        if now.tzinfo is None:
+            now = now.replace(tzinfo=timezone.utc)
+        # Based on the database clock, not on the clock of the scheduler
+        with time_machine.travel(now + timedelta(hours=1), tick=False):
+            assert abs(shards.pool_rotation(session) - now.timestamp() // 30) <= 1
+
+    @conf_vars({("scheduler", "shard_count"): "2"})
+    def test_scheduler_shards_slots_stats_capped_by_open_slots_of_pool(self, dag_maker, session):
+        """Task instances admitted under an earlier quota keep the other shards from overfilling the pool."""
+        for dag_id in ("test_quota_owned", "test_quota_not_owned"):
+            with dag_maker(dag_id=dag_id, session=session):
+                EmptyOperator(task_id="dummy", pool="a")
+            dag_maker.create_dagrun(run_type=DagRunType.SCHEDULED)
+        session.execute(
+            update(TaskInstance)
+            .where(TaskInstance.dag_id == "test_quota_not_owned")
+            .values(state=State.RUNNING)
+        )
+        session.add(Pool(pool="a", slots=1, description="", include_deferred=False))
+        session.flush()
+
+        shards = SchedulerShards(shard_count=2, refresh_interval=30)
+        shards.dag_ids_by_shard = {0: {"test_quota_owned"}, 1: {"test_quota_not_owned"}}
+        # The only slot of the pool is now in the quota of shard 0, but a task of shard 1 still runs in it.
+        with mock.patch.object(shards, "pool_rotation", return_value=0):
+            assert shards.pool_quota(1, 0, rotation=0) == 1
+            stats = shards.slots_stats([0], lock_rows=False, session=session)["a"]
+        assert stats["total"] == 1
+        assert stats["open"] == 0
+
+    @conf_vars({("scheduler", "shard_count"): "2"})
+    def test_find_executable_task_instances_sharded(self, dag_maker, session):
+        """Only the task instances of the owned shards are queued, within the shards' pool quota."""
+        for dag_id in ("test_sharded_owned", "test_sharded_not_owned"):
+            with dag_maker(dag_id=dag_id, max_active_tasks=16, session=session):
+                EmptyOperator(task_id="dummy", pool="a")
+            dr = dag_maker.create_dagrun(run_type=DagRunType.SCHEDULED)
+            for _ in range(2):
+                dr = dag_maker.create_dagrun_after(dr, run_type=DagRunType.SCHEDULED)
+        session.execute(update(TaskInstance).values(state=State.SCHEDULED))
+        session.add(Pool(pool="a", slots=4, description="", include_deferred=False))
+        session.flush()
+
+        self.job_runner = SchedulerJobRunner(job=Job(), executors=[self.null_exec])
+        shards = self.job_runner._shards
+        assert shards is not None
+        shards.dag_ids_by_shard = {0: {"test_sharded_owned"}}
+
+        res = self.job_runner._executable_task_instances_to_queued(max_tis=32, session=session)
+        # Each of the two shards gets half of the pool.
+        assert [ti.dag_id for ti in res] == ["test_sharded_owned", "test_sharded_owned"]
+        session.rollback()
+
     # TODO: This is a hack, I think I need to just remove the setting and have it on always
     def test_find_executable_task_instances_max_active_tis_per_dag(self, dag_maker):
         dag_id = "SchedulerJobTest.test_find_executable_task_instances_max_active_tis_per_dag"
@@ -2409,6 +2644,49 @@ class TestSchedulerJob:
         assert mock_queue_workload.called
         session.rollback()
 
+    @conf_vars({("scheduler", "precompute_task_run_context"): "True"})
+    def test_enqueue_task_instances_with_run_context(self, dag_maker, session):
+        with dag_maker(dag_id="test_enqueue_task_instances_with_run_context", session=session):
+            EmptyOperator(task_id="retried", retries=2)
+            EmptyOperator(task_id="other")
+
+        scheduler_job = Job()
+        self.job_runner = SchedulerJobRunner(job=scheduler_job, executors=[self.null_exec])
+
+        dr = dag_maker.create_dagrun(state=DagRunState.RUNNING)
+        retried, other = dr.get_task_instance("retried", session), dr.get_task_instance("other", session)
+        retried.try_number = 1
+        retried.max_tries = 2
+        # An XCom of the previous try
+        XComModel.set(
+            key="return_value",
+            value="x",
+            dag_id=dr.dag_id,
+            task_id="retried",
+            run_id=dr.run_id,
+            session=session,
+        )
+        session.flush()
+
+        with (
+            patch.object(self.null_exec, "supports_task_run_context", True),
+            patch.object(BaseExecutor, "queue_workload") as mock_queue_workload,
+        ):
+            self.job_runner._enqueue_task_instances_with_queued_state(
+                [retried, other], executor=self.null_exec, session=session
+            )
+
+        contexts = {
+            call.args[0].ti.task_id: call.args[0].ti_context for call in mock_queue_workload.call_args_list
+        }
+        assert contexts["retried"].dag_run.run_id == dr.run_id
+        assert contexts["retried"].xcom_keys_to_clear == ["return_value"]
+        assert contexts["retried"].should_retry
+        assert contexts["retried"].task_reschedule_count == 0
+        assert contexts["other"].xcom_keys_to_clear == []
+        assert not contexts["other"].should_retry
+        session.rollback()
+
     @pytest.mark.parametrize("state", [State.FAILED, State.SUCCESS])
     def test_enqueue_task_instances_sets_ti_state_to_None_if_dagrun_in_finish_state(self, state, dag_maker):
         """This tests that task instances whose dagrun is in finished state are not queued"""
@@ -4754,6 +5032,134 @@ class TestSchedulerJob:
         assert dr.start_date is None
         assert dr.creating_job_id == scheduler_job.id
 
+    @conf_vars({("scheduler", "create_dag_runs_in_bulk"): "True"})
+    def test_create_dag_runs_in_bulk(self, dag_maker, session):
+        """Runs of many dags are created together, with their task instances and next dagrun fields."""
+        dag_models = []
+        for i in range(3):
+            with dag_maker(dag_id=f"test_create_dag_runs_in_bulk_{i}", schedule="@daily", session=session):
+                EmptyOperator(task_id="first") >> EmptyOperator(task_id="second")
+            dag_models.append(dag_maker.dag_model)
+        next_dagruns = {dag_model.dag_id: dag_model.next_dagrun for dag_model in dag_models}
+
+        scheduler_job = Job()
+        self.job_runner = SchedulerJobRunner(job=scheduler_job, executors=[self.null_exec])
+        self.job_runner._create_dag_runs(dag_models, session)
+        session.flush()
+
+        drs = session.scalars(select(DagRun).where(DagRun.dag_id.in_(next_dagruns))).all()
+        assert sorted(dr.dag_id for dr in drs) == sorted(next_dagruns)
+        for dr in drs:
+            assert dr.state == State.QUEUED
+            assert dr.creating_job_id == scheduler_job.id
+            assert dr.logical_date == next_dagruns[dr.dag_id]
+            assert dr.created_dag_version_id is not None
+            assert sorted(ti.task_id for ti in dr.get_task_instances(session=session)) == ["first", "second"]
+        for dag_model in dag_models:
+            assert dag_model.next_dagrun > next_dagruns[dag_model.dag_id]
+
+    @conf_vars({("scheduler", "create_dag_runs_in_bulk"): "True"})
+    def test_create_dag_runs_in_bulk_falls_back_to_one_by_one_on_conflict(self, dag_maker, session):
+        """A run that already exists only keeps its own dag from getting a run, not the others."""
+        dag_models = []
+        for i in range(3):
+            with dag_maker(
+                dag_id=f"test_create_dag_runs_in_bulk_conflict_{i}", schedule="@daily", session=session
+            ):
+                EmptyOperator(task_id="dummy")
+            dag_models.append(dag_maker.dag_model)
+            if i == 0:
+                # E.g. created by another scheduler; as its logical date differs, only inserting fails
+                dag_maker.create_dagrun(
+                    run_id=DagRunType.SCHEDULED.generate_run_id(
+                        suffix=dag_maker.dag_model.next_dagrun_create_after.isoformat()
+                    ),
+                    logical_date=dag_maker.dag_model.next_dagrun - timedelta(days=1),
+                    state=DagRunState.SUCCESS,
+                )
+        session.flush()
+        next_dagruns = {dag_model.dag_id: dag_model.next_dagrun for dag_model in dag_models}
+
+        self.job_runner = SchedulerJobRunner(job=Job(), executors=[self.null_exec])
+        self.job_runner._create_dag_runs(dag_models, session)
+        session.flush()
+
+        drs = session.scalars(
+            select(DagRun).where(DagRun.dag_id.in_(next_dagruns), DagRun.state == DagRunState.QUEUED)
+        ).all()
+        assert sorted(dr.dag_id for dr in drs) == sorted(dag_model.dag_id for dag_model in dag_models[1:])
+        for dag_model in dag_models[1:]:
+            assert dag_model.next_dagrun > next_dagruns[dag_model.dag_id]
+
+    @conf_vars({("scheduler", "create_dag_runs_in_bulk"): "True"})
+    def test_create_dag_runs_in_bulk_task_instance_conflict(self, dag_maker, session):
+        """A conflicting task instance rolls back only the bulk insert, not the scheduling loop's transaction."""
+        dag_models = []
+        for i in range(3):
+            with dag_maker(
+                dag_id=f"test_create_dag_runs_in_bulk_ti_conflict_{i}", schedule="@daily", session=session
+            ):
+                EmptyOperator(task_id="dummy")
+            dag_models.append(dag_maker.dag_model)
+        session.flush()
+        # Written earlier in the scheduling loop, it must survive the conflict
+        session.add(Log(event="before_creating_dag_runs"))
+        next_dagruns = {dag_model.dag_id: dag_model.next_dagrun for dag_model in dag_models}
+        create_task_instances = DagRun.create_task_instances_of_new_runs
+
+        def create_conflicting_task_instances(dag_runs, *, session):
+            if len(dag_runs) > 1:
+                # E.g. created by another scheduler between inserting the runs and their task instances
+                dag_run = dag_runs[0]
+                task = dag_run.get_dag().get_task("dummy")
+                session.add(
+                    TaskInstance(task, run_id=dag_run.run_id, dag_version_id=dag_run.created_dag_version_id)
+                )
+                session.flush()
+            create_task_instances(dag_runs, session=session)
+
+        self.job_runner = SchedulerJobRunner(job=Job(), executors=[self.null_exec])
+        with patch.object(
+            DagRun, "create_task_instances_of_new_runs", side_effect=create_conflicting_task_instances
+        ):
+            self.job_runner._create_dag_runs(dag_models, session)
+        session.flush()
+
+        assert session.scalar(select(Log).where(Log.event == "before_creating_dag_runs")) is not None
+        drs = session.scalars(select(DagRun).where(DagRun.dag_id.in_(next_dagruns))).all()
+        assert sorted(dr.dag_id for dr in drs) == sorted(next_dagruns)
+        for dr in drs:
+            assert [ti.task_id for ti in dr.get_task_instances(session=session)] == ["dummy"]
+        for dag_model in dag_models:
+            assert dag_model.next_dagrun > next_dagruns[dag_model.dag_id]
+
+    def test_add_notified_dag_runs(self, dag_maker, session):
+        """Running dag runs the scheduler was notified about are examined even when not selected."""
+        with dag_maker(dag_id="test_add_notified_dag_runs", session=session):
+            EmptyOperator(task_id="dummy")
+        selected = dag_maker.create_dagrun(run_id="selected", state=DagRunState.RUNNING)
+        notified = dag_maker.create_dagrun(
+            run_id="notified", state=DagRunState.RUNNING, logical_date=DEFAULT_DATE + timedelta(days=1)
+        )
+        finished = dag_maker.create_dagrun(
+            run_id="finished", state=DagRunState.SUCCESS, logical_date=DEFAULT_DATE + timedelta(days=2)
+        )
+        session.flush()
+
+        self.job_runner = SchedulerJobRunner(job=Job(), executors=[self.null_exec])
+        self.job_runner._notified_dag_runs = {
+            (run.dag_id, run.run_id) for run in (selected, notified, finished)
+        }
+        dag_runs = self.job_runner._add_notified_dag_runs([selected], session)
+
+        assert [run.run_id for run in dag_runs] == ["selected", "notified"]
+        assert self.job_runner._notified_dag_runs == set()
+
+        # Like the runs selected, runs of paused Dags are not examined
+        session.execute(update(DagModel).where(DagModel.dag_id == notified.dag_id).values(is_paused=True))
+        self.job_runner._notified_dag_runs = {(notified.dag_id, notified.run_id)}
+        assert self.job_runner._add_notified_dag_runs([], session) == []
+
     @pytest.mark.need_serialized_dag
     def test_create_dag_runs_assets(self, session, dag_maker):
         """
@@ -0,0 +1,112 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import importlib
+import json
+import zlib
+
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+from airflow.models.serialized_dag import _split_shared_tasks
+
+migration = importlib.import_module("airflow.migrations.versions.0108_3_2_0_add_serialized_dag_task_tables")
+
+
+def test_downgrade_copies_shared_tasks_into_serialized_dags():
+    dag_data = {
+        "__version": 3,
+        "dag": {
+            "dag_id": "test",
+            "tasks": [
+                {"__type": "operator", "__var": {"task_id": "first"}},
+                {"__type": "operator", "__var": {"task_id": "second"}},
+            ],
+        },
+    }
+    stored_data, tasks = _split_shared_tasks(dag_data)
+    unshared_data = {"__version": 3, "dag": {"dag_id": "unshared", "tasks": []}}
+
+    metadata = sa.MetaData()
+    serialized_dag = sa.Table(
+        "serialized_dag",
+        metadata,
+        sa.Column("id", sa.String(32), primary_key=True),
+        sa.Column("data", sa.JSON(none_as_null=True)),
+        sa.Column("data_compressed", sa.LargeBinary()),
+    )
+    serialized_dag_task = sa.Table(
+        "serialized_dag_task",
+        metadata,
+        sa.Column("task_hash", sa.String(32), primary_key=True),
+        sa.Column("data_compressed", sa.LargeBinary()),
+    )
+    serialized_dag_task_ref = sa.Table(
+        "serialized_dag_task_ref",
+        metadata,
+        sa.Column("serialized_dag_id", sa.String(32), primary_key=True),
+        sa.Column("task_hash", sa.String(32), primary_key=True),
+    )
+    with sa.create_engine("sqlite://").begin() as conn:
+        metadata.create_all(conn)
+        conn.execute(
+            serialized_dag.insert(),
+            [
+                {"id": "json", "data": stored_data, "data_compressed": None},
+                {
+                    "id": "compressed",
+                    "data": None,
+                    "data_compressed": zlib.compress(json.dumps(stored_data).encode("utf-8")),
+                },
+                {"id": "unshared", "data": unshared_data, "data_compressed": None},
+            ],
+        )
+        conn.execute(
+            serialized_dag_task.insert(),
+            [
+                {
+                    "task_hash": task_hash,
+                    "data_compressed": zlib.compress(json.dumps(task_data).encode("utf-8")),
+                }
+                for task_hash, task_data in tasks.items()
+            ],
+        )
+        conn.execute(
+            serialized_dag_task_ref.insert(),
+            [
+                {"serialized_dag_id": serialized_dag_id, "task_hash": task_hash}
+                for serialized_dag_id in ("json", "compressed")
+                for task_hash in tasks
+            ],
+        )
+
+        with Operations.context(MigrationContext.configure(conn)):
+            migration.downgrade()
+
+        rows = {
+            serialized_dag_id: (data, data_compressed)
+            for serialized_dag_id, data, data_compressed in conn.execute(sa.select(serialized_dag))
+        }
+        remaining_tables = sa.inspect(conn).get_table_names()
+
+    assert rows["json"] == (dag_data, None)
+    assert rows["compressed"][0] is None
+    assert json.loads(zlib.decompress(rows["compressed"][1])) == dag_data
+    assert rows["unshared"] == (unshared_data, None)
+    assert remaining_tables == ["serialized_dag"]
@@ -0,0 +1,77 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import importlib
+import json
+import zlib
+
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+from airflow.models.serialized_dag import _encode_binary_dag_data
+
+migration = importlib.import_module("airflow.migrations.versions.0109_3_2_0_reencode_binary_serialized_dags")
+
+
+def test_downgrade_reencodes_binary_serialized_dags_as_json():
+    dag_data = {"__version": 3, "dag": {"dag_id": "test", "tasks": []}}
+    task_data = {"__type": "operator", "__var": {"task_id": "task"}}
+    json_data = zlib.compress(json.dumps(dag_data).encode("utf-8"))
+
+    metadata = sa.MetaData()
+    serialized_dag = sa.Table(
+        "serialized_dag",
+        metadata,
+        sa.Column("id", sa.String(32), primary_key=True),
+        sa.Column("data_compressed", sa.LargeBinary()),
+    )
+    serialized_dag_task = sa.Table(
+        "serialized_dag_task",
+        metadata,
+        sa.Column("task_hash", sa.String(32), primary_key=True),
+        sa.Column("data_compressed", sa.LargeBinary()),
+    )
+    with sa.create_engine("sqlite://").begin() as conn:
+        metadata.create_all(conn)
+        conn.execute(
+            serialized_dag.insert(),
+            [
+                {"id": "msgpack", "data_compressed": _encode_binary_dag_data(dag_data, compress=False)},
+                {"id": "msgpack_zlib", "data_compressed": _encode_binary_dag_data(dag_data, compress=True)},
+                {"id": "json_zlib", "data_compressed": json_data},
+                {"id": "json", "data_compressed": None},
+            ],
+        )
+        conn.execute(
+            serialized_dag_task.insert(),
+            {"task_hash": "task", "data_compressed": _encode_binary_dag_data(task_data, compress=False)},
+        )
+
+        with Operations.context(MigrationContext.configure(conn)):
+            migration.downgrade()
+
+        dag_rows = dict(conn.execute(sa.select(serialized_dag.c.id, serialized_dag.c.data_compressed)).all())
+        task_row = conn.execute(sa.select(serialized_dag_task.c.data_compressed)).scalar_one()
+
+    # Rows are left in the format older versions read: zlib-compressed JSON
+    assert json.loads(zlib.decompress(dag_rows["msgpack"])) == dag_data
+    assert json.loads(zlib.decompress(dag_rows["msgpack_zlib"])) == dag_data
+    assert dag_rows["json_zlib"] == json_data
+    assert dag_rows["json"] is None
+    assert json.loads(zlib.decompress(task_row)) == task_data
@@ -16,7 +16,18 @@
 # under the License.
 from __future__ import annotations
 
+import json
+import marshal
+import os
+from unittest import mock
+
 import pytest
+import uuid6
+
+from airflow.exceptions import AirflowConfigException
+from airflow.models.dagbag import DBDagBag, SharedDagCache
+
+from tests_common.test_utils.config import conf_vars
 
 pytestmark = pytest.mark.db_test
 
@@ -25,4 +36,146 @@ pytestmark = pytest.mark.db_test
 # the source code reorganization where DagBag moved from models to dag_processing.
 #
 # Tests for models-specific functionality (DBDagBag, DagPriorityParsingRequest, etc.)
-# would remain in this file, but currently no such tests exist.
+# remain in this file.
+
+
+def _make_serdag(dag_id, data=None):
+    serdag = mock.MagicMock(
+        dag_version_id=uuid6.uuid7(), dag_hash="hash", data=data or {"dag": {"dag_id": dag_id}}
+    )
+    serdag.dag.dag_id = dag_id
+    return serdag
+
+
+def _make_serdag_with_shared_tasks(dag_id, tasks):
+    serdag = _make_serdag(dag_id, {"dag": {"dag_id": dag_id, "tasks": list(tasks.values())}})
+    serdag.task_hashes = list(tasks)
+    return serdag
+
+
+class TestDBDagBagCache:
+    def test_unbounded_by_default(self):
+        dag_bag = DBDagBag(max_size=0, max_bytes=0)
+        serdags = [_make_serdag("dag") for _ in range(5)]
+        for serdag in serdags:
+            dag_bag._read_dag(serdag)
+        assert list(dag_bag._dags) == [s.dag_version_id for s in serdags]
+
+    @mock.patch("airflow.models.dagbag.Stats")
+    def test_evicts_least_recently_used_old_version(self, mock_stats):
+        dag_bag = DBDagBag(max_size=3, max_bytes=0)
+        v1, v2, other = _make_serdag("dag"), _make_serdag("dag"), _make_serdag("other")
+        for serdag in (v1, v2, other):
+            dag_bag._read_dag(serdag)
+        v3 = _make_serdag("dag")
+        dag_bag._read_dag(v3)
+
+        assert list(dag_bag._dags) == [v2.dag_version_id, other.dag_version_id, v3.dag_version_id]
+        mock_stats.incr.assert_called_once_with("dag_bag.cache.evictions")
+
+    def test_latest_version_of_each_dag_is_pinned(self):
+        dag_bag = DBDagBag(max_size=1, max_bytes=0)
+        first, second = _make_serdag("first"), _make_serdag("second")
+        dag_bag._read_dag(first)
+        dag_bag._read_dag(second)
+        # Both are the latest version of their dag, so neither can be evicted.
+        assert set(dag_bag._dags) == {first.dag_version_id, second.dag_version_id}
+
+        dag_bag._read_dag(newer := _make_serdag("first"))
+        assert set(dag_bag._dags) == {second.dag_version_id, newer.dag_version_id}
+
+    def test_evicts_to_stay_within_max_bytes(self):
+        data = {"dag": {"dag_id": "dag", "tasks": ["x" * 100]}}
+        dag_bag = DBDagBag(max_size=0, max_bytes=300)
+        serdags = [_make_serdag("dag", data) for _ in range(3)]
+        for serdag in serdags:
+            dag_bag._read_dag(serdag)
+        assert list(dag_bag._dags) == [s.dag_version_id for s in serdags[1:]]
+        assert dag_bag._total_bytes == 2 * len(json.dumps(data))
+
+    @mock.patch("airflow.models.dagbag.Stats")
+    def test_hit_moves_version_to_most_recently_used(self, mock_stats):
+        dag_bag = DBDagBag(max_size=3, max_bytes=0)
+        v1, v2, v3 = (_make_serdag("dag") for _ in range(3))
+        for serdag in (v1, v2, v3):
+            dag_bag._read_dag(serdag)
+        session = mock.MagicMock()
+
+        assert dag_bag._get_dag(v1.dag_version_id, session=session) is v1.dag
+        session.get.assert_not_called()
+        mock_stats.incr.assert_called_once_with("dag_bag.cache.hits")
+
+        dag_bag._read_dag(v4 := _make_serdag("dag"))
+        assert list(dag_bag._dags) == [v3.dag_version_id, v1.dag_version_id, v4.dag_version_id]
+
+    @conf_vars({("core", "lazy_load_dag_tasks"): "True"})
+    def test_shared_tasks_are_kept_once_while_a_cached_version_uses_them(self):
+        dag_bag = DBDagBag(max_size=2, max_bytes=0)
+        v1 = _make_serdag_with_shared_tasks("dag", {"a": {"task_id": "t1"}, "b": {"task_id": "t2"}})
+        v2 = _make_serdag_with_shared_tasks("dag", {"a": {"task_id": "t1"}, "c": {"task_id": "t3"}})
+        dag_bag._read_dag(v1)
+        dag_bag._read_dag(v2)
+
+        v2.set_known_tasks.assert_called_once_with(dag_bag._task_data)
+        assert dag_bag._task_data["a"] is v1.data["dag"]["tasks"][0]
+        assert dag_bag._task_refcounts == {"a": 2, "b": 1, "c": 1}
+
+        # Evicts v1, whose task "b" no other cached version uses
+        dag_bag._read_dag(_make_serdag_with_shared_tasks("dag", {"c": {"task_id": "t3"}}))
+        assert set(dag_bag._task_data) == {"a", "c"}
+        assert dag_bag._task_refcounts == {"a": 1, "c": 2}
+
+
+class TestSharedDagCache:
+    def test_round_trip(self, tmp_path):
+        cache = SharedDagCache(tmp_path / "cache")
+        version_id = uuid6.uuid7()
+        data = {"__version": 3, "dag": {"dag_id": "dag", "tasks": [{"task_id": "t", "retries": 1.5}]}}
+
+        assert cache.get(version_id, "hash") is None
+        cache.put(version_id, "hash", data)
+
+        assert cache.get(version_id, "hash") == data
+        assert SharedDagCache(tmp_path / "cache").get(version_id, "hash") == data
+        assert cache.get(version_id, "other_hash") is None
+
+    def test_unreadable_entry_is_ignored(self, tmp_path):
+        cache = SharedDagCache(tmp_path)
+        version_id = uuid6.uuid7()
+        cache._entry_path(version_id, "hash").write_bytes(b"")
+
+        assert cache.get(version_id, "hash") is None
+
+    def test_directory_writable_by_other_users_is_rejected(self, tmp_path):
+        tmp_path.chmod(0o777)
+        with pytest.raises(AirflowConfigException, match="not writable by other users"):
+            SharedDagCache(tmp_path)
+
+    def test_entries_loaded_least_recently_are_pruned(self, tmp_path):
+        data = {"dag": {"dag_id": "dag", "tasks": list(range(100))}}
+        entry_size = len(marshal.dumps(data))
+        cache = SharedDagCache(tmp_path, max_bytes=2 * entry_size)
+        first, second, third = uuid6.uuid7(), uuid6.uuid7(), uuid6.uuid7()
+        cache.put(first, "hash", data)
+        cache.put(second, "hash", data)
+        os.utime(cache._entry_path(first, "hash"), (0, 0))
+        os.utime(cache._entry_path(second, "hash"), (1, 1))
+        # Loading the first entry makes the second one the least recently loaded
+        assert cache.get(first, "hash") == data
+
+        cache.put(third, "hash", data)
+
+        assert cache.get(second, "hash") is None
+        assert cache.get(first, "hash") == data
+        assert cache.get(third, "hash") == data
+
+    def test_dag_bag_reads_through_shared_cache(self, tmp_path):
+        cache = SharedDagCache(tmp_path)
+        first = _make_serdag("dag")
+        DBDagBag(shared_cache=cache)._read_dag(first)
+        assert cache.get(first.dag_version_id, "hash") == first.data
+
+        second = _make_serdag("dag")
+        second.dag_version_id = first.dag_version_id
+        DBDagBag(shared_cache=cache)._read_dag(second)
+        second.set_data_cache.assert_called_once_with(first.data)
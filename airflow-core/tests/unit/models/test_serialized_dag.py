@@ -20,6 +20,7 @@
 from __future__ import annotations
 
 import logging
+import zlib
 from datetime import timedelta
 from unittest import mock
 
@@ -33,7 +34,14 @@ from airflow.models.asset import AssetActive, AssetAliasModel, AssetModel
 from airflow.models.dag import DagModel
 from airflow.models.dag_version import DagVersion
 from airflow.models.deadline_alert import DeadlineAlert as DAM
-from airflow.models.serialized_dag import SerializedDagModel as SDM
+from airflow.models.serialized_dag import (
+    SerializedDagModel as SDM,
+    SerializedDagStorageFormat,
+    SerializedDagTaskModel,
+    SerializedDagTaskRefModel,
+    _decode_data_compressed,
+    _encode_binary_dag_data,
+)
 from airflow.providers.standard.operators.bash import BashOperator
 from airflow.providers.standard.operators.empty import EmptyOperator
 from airflow.providers.standard.operators.python import PythonOperator
@@ -405,6 +413,89 @@ class TestSerializedDagModel:
         dependencies = SDM.get_dag_dependencies(session=session)
         assert dag_id not in dependencies
 
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_write_dag_as_msgpack(self, compress, testing_dag_bundle, session):
+        """DAGs can be written as msgpack, and read back like JSON ones"""
+        with (
+            mock.patch(
+                "airflow.models.serialized_dag._SERIALIZED_DAG_STORAGE_FORMAT",
+                SerializedDagStorageFormat.msgpack,
+            ),
+            mock.patch("airflow.models.serialized_dag._COMPRESS_SERIALIZED_DAGS", compress),
+        ):
+            example_dags = self._write_example_dags()
+            dependencies = SDM.get_dag_dependencies(session=session)
+
+        assert "consumes_asset_decorator" in dependencies
+        for dag in example_dags.values():
+            result = session.scalar(select(SDM).where(SDM.dag_id == dag.dag_id))
+            assert result._data is None
+            assert result._data_compressed.startswith(b"AFSD")
+            DagSerialization.validate_schema(result.data)
+            assert set(result.dag.task_ids) == set(dag.task_ids)
+
+    @pytest.mark.parametrize("storage_format", list(SerializedDagStorageFormat))
+    def test_get_dependencies_of_dags_stored_in_another_format(
+        self, storage_format, testing_dag_bundle, session
+    ):
+        """The dependencies of DAGs written before the storage format changed are still read."""
+        with (
+            mock.patch(
+                "airflow.models.serialized_dag._SERIALIZED_DAG_STORAGE_FORMAT",
+                SerializedDagStorageFormat.msgpack,
+            ),
+            mock.patch("airflow.models.serialized_dag._COMPRESS_SERIALIZED_DAGS", False),
+        ):
+            self._write_example_dags()
+        with (
+            mock.patch("airflow.models.serialized_dag._SERIALIZED_DAG_STORAGE_FORMAT", storage_format),
+            mock.patch("airflow.models.serialized_dag._COMPRESS_SERIALIZED_DAGS", False),
+        ):
+            dependencies = SDM.get_dag_dependencies(session=session)
+
+        assert "consumes_asset_decorator" in dependencies
+
+    @mock.patch("airflow.models.serialized_dag._SHARE_SERIALIZED_DAG_TASKS", True)
+    def test_unchanged_tasks_are_shared_between_dag_versions(self, dag_maker, session):
+        with dag_maker("dag1", session=session) as dag:
+            EmptyOperator(task_id="task1")
+            EmptyOperator(task_id="task2")
+        dag_maker.create_dagrun(run_id="test", logical_date=pendulum.datetime(2025, 1, 2))
+        dag.get_task("task2").retries = 3
+        SDM.write_dag(LazyDeserializedDAG.from_dag(dag), bundle_name="dag_maker", session=session)
+        session.commit()
+        # Read the serialized DAGs back from the database, rather than the data they were created from
+        session.expunge_all()
+
+        assert session.scalar(select(func.count()).select_from(SDM)) == 2
+        assert session.scalar(select(func.count()).select_from(SerializedDagTaskModel)) == 3
+        assert session.scalar(select(func.count()).select_from(SerializedDagTaskRefModel)) == 4
+        old, new = session.scalars(select(SDM).order_by(SDM.created_at)).all()
+        DagSerialization.validate_schema(old.data)
+        DagSerialization.validate_schema(new.data)
+        assert old.task_hashes[0] == new.task_hashes[0]
+        assert old.task_hashes[1] != new.task_hashes[1]
+        assert new.dag.get_task("task2").retries == 3
+        assert old.dag.get_task("task2").retries == 0
+
+    @mock.patch("airflow.models.serialized_dag._SHARE_SERIALIZED_DAG_TASKS", True)
+    def test_shared_tasks_of_dag_updated_in_place_are_deleted_when_unused(self, dag_maker, session):
+        with dag_maker("dag1", session=session) as dag:
+            EmptyOperator(task_id="task1")
+            EmptyOperator(task_id="task2")
+        dag.get_task("task2").retries = 3
+        SDM.write_dag(LazyDeserializedDAG.from_dag(dag), bundle_name="dag_maker", session=session)
+        session.commit()
+        session.expunge_all()
+
+        assert session.scalar(select(func.count()).select_from(SDM)) == 1
+        assert session.scalar(select(func.count()).select_from(SerializedDagTaskModel)) == 2
+        assert SDM.get("dag1", session=session).dag.get_task("task2").retries == 3
+
+        session.execute(delete(SDM))
+        SDM.delete_orphaned_tasks(session=session)
+        assert session.scalar(select(func.count()).select_from(SerializedDagTaskModel)) == 0
+
     def test_get_dependencies_with_asset_ref(self, dag_maker, session):
         asset_name = "name"
         asset_uri = "test://asset1"
@@ -808,3 +899,25 @@ class TestSerializedDagModel:
         assert new_serdag_count == 2
         assert new_serdag.dag_hash != orig_serdag.dag_hash
         assert new_alert.interval == 600.0
+
+
+class TestBinaryDagData:
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_round_trip(self, compress):
+        data = {"__version": 3, "dag": {"dag_id": "dag", "tasks": [{"retries": 1, "weight": 0.5, "x": None}]}}
+        encoded = _encode_binary_dag_data(data, compress=compress)
+
+        assert encoded[:6] == b"AFSD" + bytes((1, int(compress)))
+        assert _decode_data_compressed(encoded) == data
+
+    def test_decode_zlib_json(self):
+        data = {"__version": 3, "dag": {"dag_id": "dag"}}
+
+        assert _decode_data_compressed(zlib.compress(json.dumps(data).encode("utf-8"))) == data
+
+    def test_decode_unknown_version(self):
+        with pytest.raises(ValueError, match="Unsupported serialized DAG binary format version: 99"):
+            _decode_data_compressed(b"AFSD" + bytes((99, 0)) + b"\x80")
+
+    def test_encode_falls_back_for_unsupported_values(self):
+        assert _encode_binary_dag_data({"dag": {"big": 2**70}}, compress=False) is None
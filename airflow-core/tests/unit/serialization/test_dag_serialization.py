@@ -1728,6 +1728,59 @@ class TestStringifiedDAGs:
 
         check_task_group(serialized_dag.task_group)
 
+    def test_lazy_task_deserialization(self):
+        """Tasks are only deserialized when accessed, and match the eagerly deserialized ones."""
+        from airflow.providers.standard.operators.empty import EmptyOperator
+
+        with DAG("test_lazy_task_deserialization", schedule=None, start_date=datetime(2020, 1, 1)) as dag:
+            task1 = EmptyOperator(task_id="task1")
+            with TaskGroup("group23") as group23:
+                task2 = EmptyOperator(task_id="task2")
+                _ = EmptyOperator(task_id="task3")
+            task4 = EmptyOperator(task_id="task4")
+            task1 >> group23 >> task4
+            task1 >> task4
+            task2 >> task4
+
+        serialized = DagSerialization.serialize_dag(dag)
+        eager_dag = DagSerialization.deserialize_dag(serialized)
+        with (
+            conf_vars({("core", "lazy_load_dag_tasks"): "True"}),
+            mock.patch.object(
+                OperatorSerialization,
+                "deserialize_operator",
+                wraps=OperatorSerialization.deserialize_operator,
+            ) as deserialize_operator,
+        ):
+            lazy_dag = DagSerialization.deserialize_dag(serialized)
+            assert lazy_dag.task_ids == eager_dag.task_ids
+            assert lazy_dag.has_task("group23.task3")
+            deserialize_operator.assert_not_called()
+
+            lazy_task4 = lazy_dag.get_task("task4")
+            assert deserialize_operator.call_count == 1
+            assert lazy_task4.upstream_task_ids == eager_dag.get_task("task4").upstream_task_ids
+            assert lazy_task4.dag is lazy_dag
+            assert lazy_task4.start_date == eager_dag.get_task("task4").start_date
+
+            # Task groups share the deferred tasks of the Dag.
+            lazy_task2 = lazy_dag.task_group.children["group23"].children["group23.task2"]
+            assert lazy_task2 is lazy_dag.get_task("group23.task2")
+            assert lazy_task2.task_group.group_id == "group23"
+            assert deserialize_operator.call_count == 2
+
+        for task_id in eager_dag.task_ids:
+            lazy_task, eager_task = lazy_dag.get_task(task_id), eager_dag.get_task(task_id)
+            assert lazy_task.upstream_task_ids == eager_task.upstream_task_ids
+            assert lazy_task.downstream_task_ids == eager_task.downstream_task_ids
+            assert lazy_task.task_group.node_id == eager_task.task_group.node_id
+        assert [t.node_id for t in lazy_dag.task_group.topological_sort()] == [
+            t.node_id for t in eager_dag.task_group.topological_sort()
+        ]
+        assert lazy_dag.partial_subset("task4", include_upstream=True).task_ids == (
+            eager_dag.partial_subset("task4", include_upstream=True).task_ids
+        )
+
     @staticmethod
     def assert_taskgroup_children(se_task_group, dag_task_group, expected_children):
         assert se_task_group.children.keys() == dag_task_group.children.keys() == expected_children
@@ -35,6 +35,8 @@ from airflow.ti_deps.dep_context import DepContext
 from airflow.ti_deps.deps.trigger_rule_dep import TriggerRuleDep, _UpstreamTIStates
 from airflow.utils.state import DagRunState, TaskInstanceState
 
+from tests_common.test_utils.asserts import assert_queries_count, count_queries
+
 pytestmark = pytest.mark.db_test
 
 if TYPE_CHECKING:
@@ -1418,6 +1420,59 @@ def test_upstream_in_mapped_group_when_mapped_tasks_list_is_empty(dag_maker, ses
     assert tis == {}
 
 
+def test_upstream_in_mapped_group_evaluated_once_per_run(dag_maker, session):
+    """Upstream counts and expanded ti counts are loaded once for all tis evaluated with a dep context."""
+    from airflow.serialization.definitions import mappedoperator
+
+    with dag_maker(session=session, serialized=True):
+
+        @task
+        def t(x):
+            return x
+
+        @task_group
+        def tg(x):
+            t1 = t.override(task_id="t1")(x=x)
+            return t.override(task_id="t2")(x=t1)
+
+        tg.expand(x=[1, 2, 3])
+
+    dr: DagRun = dag_maker.create_dagrun()
+    tis = sorted(dr.get_task_instances(session=session), key=lambda ti: (ti.task_id, ti.map_index))
+    for ti in tis:
+        if ti.task_id == "tg.t1":
+            ti.state = TaskInstanceState.SUCCESS
+    session.flush()
+    tis = [ti for ti in tis if ti.task_id == "tg.t2"]
+
+    dep_context = DepContext(flag_upstream_failed=True)
+
+    def evaluate(ti: TaskInstance) -> None:
+        ti.refresh_from_task(dr.dag.get_task(ti.task_id))
+        dep_statuses = tuple(
+            TriggerRuleDep()._evaluate_trigger_rule(ti=ti, dep_context=dep_context, session=session)
+        )
+        assert not dep_statuses
+
+    with mock.patch.object(
+        mappedoperator, "get_mapped_ti_count", wraps=mappedoperator.get_mapped_ti_count
+    ) as get_mapped_ti_count:
+        with count_queries(session=session) as first_ti_queries:
+            evaluate(tis[0])
+        # The map indexes of the run are loaded by the first ti, so the others need fewer queries.
+        for ti in tis[1:]:
+            with assert_queries_count(sum(first_ti_queries.values()) - 1, session=session):
+                evaluate(ti)
+
+    assert [ti.map_index for ti in tis] == [0, 1, 2]
+    # The expanded ti count of the task itself is resolved once, not once per ti.
+    assert [c.args[0].node_id for c in get_mapped_ti_count.call_args_list].count("tg.t2") == 1
+    assert sorted(dep_context._map_indexes_by_task_id["tg.t1"]) == [0, 1, 2]
+
+    dep_context.invalidate_map_indexes()
+    assert dep_context._map_indexes_by_task_id is None
+
+
 @pytest.mark.parametrize("flag_upstream_failed", [True, False])
 @pytest.mark.need_serialized_dag
 def test_mapped_task_check_before_expand(dag_maker, session, flag_upstream_failed):
@@ -22,9 +22,10 @@ from typing import TYPE_CHECKING
 from unittest import mock
 
 import pytest
+import tenacity
 from sqlalchemy.exc import InternalError, OperationalError
 
-from airflow.utils.retries import retry_db_transaction
+from airflow.utils.retries import retry_db_transaction, run_with_db_retries
 
 if TYPE_CHECKING:
     from sqlalchemy.exc import DBAPIError
@@ -98,3 +99,19 @@ class TestRetries:
         error_message = rf"session is a required argument for {test_function.__qualname__}"
         with pytest.raises(TypeError, match=error_message):
             test_function()
+
+    def test_run_with_db_retries_with_custom_retry(self):
+        """Test that the exceptions to retry on can be overridden"""
+        mock_obj = mock.MagicMock()
+        internal_error = InternalError(statement=mock.ANY, params=mock.ANY, orig=mock.ANY)
+
+        def write():
+            for attempt in run_with_db_retries(retry=tenacity.retry_if_exception_type(OperationalError)):
+                with attempt:
+                    mock_obj()
+                    raise internal_error
+
+        with pytest.raises(InternalError):
+            write()
+
+        assert mock_obj.call_count == 1
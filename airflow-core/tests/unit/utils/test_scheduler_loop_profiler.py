@@ -0,0 +1,79 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from unittest import mock
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from airflow.utils.scheduler_loop_profiler import SchedulerLoopProfiler
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER)"))
+    yield engine
+    engine.dispose()
+
+
+class TestSchedulerLoopProfiler:
+    @mock.patch("airflow.utils.scheduler_loop_profiler.Stats")
+    def test_phase_counts_statements_and_rows(self, mock_stats, engine):
+        profiler = SchedulerLoopProfiler()
+        profiler.start()
+        try:
+            with profiler.phase("insert"), engine.begin() as conn:
+                conn.execute(text("INSERT INTO t (x) VALUES (1), (2), (3)"))
+            with profiler.phase("update"), engine.begin() as conn:
+                conn.execute(text("UPDATE t SET x = x + 1"))
+                conn.execute(text("UPDATE t SET x = x + 1 WHERE x > 3"))
+        finally:
+            profiler.stop()
+
+        [insert] = profiler.samples["insert"]
+        assert (insert.statements, insert.rows) == (1, 3)
+        [update] = profiler.samples["update"]
+        assert (update.statements, update.rows) == (2, 4)
+        mock_stats.timing.assert_any_call("scheduler.loop_phase.duration", mock.ANY, tags={"phase": "update"})
+        mock_stats.incr.assert_any_call("scheduler.loop_phase.statements", 2, tags={"phase": "update"})
+        mock_stats.incr.assert_any_call("scheduler.loop_phase.rows", 4, tags={"phase": "update"})
+
+    def test_statements_outside_of_started_profiler_are_not_counted(self, engine):
+        profiler = SchedulerLoopProfiler()
+        with profiler.phase("phase"), engine.begin() as conn:
+            conn.execute(text("INSERT INTO t (x) VALUES (1)"))
+
+        [sample] = profiler.samples["phase"]
+        assert sample.statements == 0
+
+    def test_summary(self):
+        profiler = SchedulerLoopProfiler(window=3)
+        for _ in range(5):
+            with profiler.phase("phase"):
+                pass
+
+        [summary] = profiler.summary()
+        assert summary["phase"] == "phase"
+        assert summary["runs"] == 3
+        assert summary["p50_ms"] <= summary["p95_ms"] <= summary["max_ms"]
+        table = profiler.format_summary()
+        assert table.splitlines()[0].split()[:3] == ["phase", "runs", "total"]
+        assert table.splitlines()[2].startswith("phase ")
@@ -0,0 +1,108 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from unittest import mock
+
+import pytest
+from sqlalchemy import select
+
+from airflow import settings
+from airflow.utils.scheduler_wakeup import (
+    SchedulerWakeupListener,
+    SchedulerWakeupMethod,
+    get_wakeup_method,
+    notify_scheduler,
+)
+from airflow.utils.session import create_session
+
+from tests_common.test_utils.config import conf_vars
+
+pytestmark = pytest.mark.db_test
+
+
+@pytest.fixture
+def socket_listener(tmp_path):
+    path = str(tmp_path / "wakeup.sock")
+    listener = SchedulerWakeupListener(SchedulerWakeupMethod.socket, socket_path=path)
+    with conf_vars(
+        {("scheduler", "wakeup_notifications"): "socket", ("scheduler", "wakeup_socket_path"): path}
+    ):
+        yield listener
+    listener.close()
+
+
+class TestSchedulerWakeup:
+    def test_socket_notifications_sent_on_commit(self, socket_listener):
+        assert socket_listener.wait(0) is None
+
+        with create_session() as session:
+            session.execute(select(1))
+            notify_scheduler(session, dag_id="dag", run_id="run")
+            notify_scheduler(session, dag_id="dag")
+            # Nothing is sent before the commit
+            assert socket_listener.wait(0) is None
+
+        assert socket_listener.wait(1) == {("dag", "run")}
+        assert socket_listener.wait(0) is None
+
+    def test_socket_notifications_dropped_on_rollback(self, socket_listener):
+        with settings.Session() as session:
+            session.execute(select(1))
+            notify_scheduler(session, dag_id="dag", run_id="run")
+            session.rollback()
+
+        assert socket_listener.wait(0) is None
+
+    def test_notifications_disabled(self):
+        with conf_vars({("scheduler", "wakeup_notifications"): "none"}), create_session() as session:
+            notify_scheduler(session, dag_id="dag", run_id="run")
+            assert "scheduler_wakeups" not in session.info
+
+    @pytest.mark.parametrize(
+        ("dialect_name", "expected"),
+        [
+            (None, SchedulerWakeupMethod.postgres),
+            ("postgresql", SchedulerWakeupMethod.postgres),
+            ("mysql", SchedulerWakeupMethod.none),
+            ("sqlite", SchedulerWakeupMethod.none),
+        ],
+    )
+    def test_postgres_notifications_need_postgres(self, dialect_name, expected):
+        with conf_vars({("scheduler", "wakeup_notifications"): "postgres"}):
+            assert get_wakeup_method(dialect_name) == expected
+
+    def test_postgres_notifications_ignored_on_other_databases(self):
+        with (
+            conf_vars({("scheduler", "wakeup_notifications"): "postgres"}),
+            create_session() as session,
+            mock.patch("airflow.utils.scheduler_wakeup.get_dialect_name", return_value="mysql"),
+            mock.patch.object(session, "execute") as mock_execute,
+        ):
+            notify_scheduler(session, dag_id="dag", run_id="run")
+        mock_execute.assert_not_called()
+
+    def test_listener_sleeps_when_it_cannot_listen(self, tmp_path):
+        listener = SchedulerWakeupListener(
+            SchedulerWakeupMethod.socket, socket_path=str(tmp_path / "missing" / "wakeup.sock")
+        )
+        with mock.patch("airflow.utils.scheduler_wakeup.time.sleep") as mock_sleep:
+            assert listener.wait(5) is None
+            # It does not retry before the reconnect interval
+            assert listener.wait(5) is None
+        assert mock_sleep.call_args_list == [mock.call(5), mock.call(5)]
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import os
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+import rich_click as click
+from sqlalchemy import delete, insert
+
+BENCHMARK_DAG_ID = "critical_section_benchmark"
+HISTORY_BATCH_SIZE = 10_000
+
+
+def create_benchmark_dag(num_tasks, session):
+    """
+    Create and sync a flat DAG with ``num_tasks`` tasks that the benchmark fills with task instances.
+    """
+    from airflow.providers.standard.operators.empty import EmptyOperator
+    from airflow.sdk import DAG
+
+    from tests_common.test_utils.dag import sync_dag_to_db
+
+    with DAG(BENCHMARK_DAG_ID, schedule=None, max_active_tasks=num_tasks) as dag:
+        for i in range(num_tasks):
+            EmptyOperator(task_id=f"task_{i}", priority_weight=i)
+    return sync_dag_to_db(dag, session=session)
+
+
+def reset_benchmark_dag(session):
+    """
+    Delete all dag runs and task instances of the benchmark DAG.
+    """
+    from airflow.models.dagrun import DagRun
+    from airflow.models.taskinstance import TaskInstance
+
+    session.execute(delete(TaskInstance).where(TaskInstance.dag_id == BENCHMARK_DAG_ID))
+    session.execute(delete(DagRun).where(DagRun.dag_id == BENCHMARK_DAG_ID))
+
+
+def insert_history(dag, num_tis, session):
+    """
+    Insert finished dag runs and ``num_tis`` successful task instances, the way a busy installation
+    accumulates them over time. These rows never match the critical section query but still have to
+    be aggregated over when pool and concurrency counts are computed from the database.
+    """
+    from airflow._shared.timezones import timezone
+    from airflow.models.dag_version import DagVersion
+    from airflow.models.dagrun import DagRun
+    from airflow.models.taskinstance import TaskInstance
+    from airflow.utils.state import DagRunState, TaskInstanceState
+    from airflow.utils.types import DagRunType
+
+    dag_version = DagVersion.get_latest_version(dag.dag_id, session=session)
+    start = timezone.utcnow() - timedelta(days=365)
+    task_ids = list(dag.task_ids)
+    num_runs = -(-num_tis // len(task_ids))
+
+    run_rows = []
+    ti_rows = []
+    for run_number in range(num_runs):
+        logical_date = start + timedelta(minutes=run_number)
+        run_id = f"history__{run_number}"
+        run_rows.append(
+            {
+                "dag_id": dag.dag_id,
+                "run_id": run_id,
+                "logical_date": logical_date,
+                "run_after": logical_date,
+                "run_type": DagRunType.SCHEDULED,
+                "state": DagRunState.SUCCESS,
+            }
+        )
+        for task_id in task_ids[: num_tis - len(ti_rows) if run_number == num_runs - 1 else None]:
+            ti_rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "dag_id": dag.dag_id,
+                    "task_id": task_id,
+                    "run_id": run_id,
+                    "map_index": -1,
+                    "state": TaskInstanceState.SUCCESS,
+                    "try_number": 1,
+                    "pool": "default_pool",
+                    "pool_slots": 1,
+                    "queue": "default",
+                    "priority_weight": 1,
+                    "hostname": "",
+                    "unixname": "",
+                    "operator": "EmptyOperator",
+                    "custom_operator_name": "",
+                    "executor_config": {},
+                    "dag_version_id": dag_version.id,
+                }
+            )
+
+    session.execute(insert(DagRun.__table__), run_rows)
+    for i in range(0, len(ti_rows), HISTORY_BATCH_SIZE):
+        session.execute(insert(TaskInstance.__table__), ti_rows[i : i + HISTORY_BATCH_SIZE])
+    session.commit()
+
+
+def create_active_runs(dag, num_runs, num_running, session):
+    """
+    Create ``num_runs`` running dag runs whose task instances are scheduled, ``num_running`` of them running.
+    """
+    from airflow._shared.timezones import timezone
+    from airflow.utils.state import DagRunState, TaskInstanceState
+    from airflow.utils.types import DagRunTriggeredByType, DagRunType
+
+    now = timezone.utcnow()
+    running = 0
+    for run_number in range(num_runs):
+        logical_date = now + timedelta(minutes=run_number)
+        dag_run = dag.create_dagrun(
+            run_id=f"active__{run_number}",
+            logical_date=logical_date,
+            data_interval=(logical_date, logical_date),
+            run_after=logical_date,
+            run_type=DagRunType.MANUAL,
+            triggered_by=DagRunTriggeredByType.TEST,
+            state=DagRunState.RUNNING,
+            start_date=now,
+            session=session,
+        )
+        for ti in dag_run.get_task_instances(session=session):
+            if running < num_running:
+                ti.state = TaskInstanceState.RUNNING
+                running += 1
+            else:
+                ti.state = TaskInstanceState.SCHEDULED
+    session.commit()
+
+
+def time_critical_section(job_runner, max_tis, repeat, session):
+    """
+    Time ``_executable_task_instances_to_queued``, rolling back after each call so every repetition
+    sees the same task instances.
+    """
+    ledger = job_runner._concurrency_ledger
+    times = []
+    for _ in range(repeat):
+        if ledger is not None:
+            # Undo what the previous (rolled back) repetition recorded. Loading is the periodic
+            # reconciliation cost, which is reported separately.
+            ledger.load(session=session)
+        start = time.perf_counter()
+        job_runner._executable_task_instances_to_queued(max_tis=max_tis, session=session)
+        times.append(time.perf_counter() - start)
+        session.rollback()
+    return times
+
+
+def format_times(times):
+    if len(times) > 1:
+        return f"{statistics.mean(times) * 1000:9.2f}ms (±{statistics.stdev(times) * 1000:.2f}ms)"
+    return f"{times[0] * 1000:9.2f}ms"
+
+
+@click.command()
+@click.option(
+    "--ti-counts",
+    default="10000,100000,400000",
+    help="Comma-separated sizes of the task instance table (finished TIs) to benchmark against",
+)
+@click.option("--num-tasks", default=100, help="Number of tasks in the benchmark DAG")
+@click.option("--active-runs", default=5, help="Number of running dag runs with scheduled TIs")
+@click.option("--running", default=200, help="Number of TIs in the running state")
+@click.option("--max-tis", default=32, help="Max TIs to queue per critical section, as max_tis_per_query")
+@click.option("--repeat", default=10, help="Number of critical section calls to time per configuration")
+def main(ti_counts, num_tasks, active_runs, running, max_tis, repeat):
+    """
+    Measure the latency of the scheduler critical section against the size of the task instance table.
+
+    For every table size, the critical section is timed with pool and concurrency counts aggregated
+    from the database (the default) and with them read from the in-memory concurrency ledger
+    (``[scheduler] concurrency_ledger_reconcile_interval``). The time a ledger reconciliation takes is
+    reported as well, since it is paid once per reconcile interval rather than once per loop.
+
+    This script deletes and re-creates the runs of a ``critical_section_benchmark`` DAG, so it should
+    be run against a throw-away database (e.g. in Breeze).
+    """
+    os.environ["AIRFLOW__CORE__LOAD_EXAMPLES"] = "False"
+
+    from airflow.jobs.job import Job
+    from airflow.jobs.scheduler_job_runner import ConcurrencyLedger, SchedulerJobRunner
+    from airflow.utils.session import create_session
+
+    from tests_common.test_utils.mock_executor import MockExecutor
+
+    click.echo(f"{'TI table size':>14}  {'aggregate queries':>28}  {'ledger':>28}  {'ledger reconcile':>28}")
+    for ti_count in (int(count) for count in ti_counts.split(",")):
+        with create_session() as session:
+            dag = create_benchmark_dag(num_tasks, session)
+            reset_benchmark_dag(session)
+            session.commit()
+            insert_history(dag, ti_count, session)
+            create_active_runs(dag, active_runs, running, session)
+
+            job_runner = SchedulerJobRunner(job=Job(), executors=[MockExecutor()])
+            job_runner._concurrency_ledger = None
+            aggregate_times = time_critical_section(job_runner, max_tis, repeat, session)
+
+            ledger = job_runner._concurrency_ledger = ConcurrencyLedger(reconcile_interval=3600)
+            ledger_times = time_critical_section(job_runner, max_tis, repeat, session)
+
+            reconcile_times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                ledger.load(session=session)
+                reconcile_times.append(time.perf_counter() - start)
+
+            click.echo(
+                f"{ti_count:>14}  {format_times(aggregate_times):>28}  {format_times(ledger_times):>28}  "
+                f"{format_times(reconcile_times):>28}"
+            )
+            reset_benchmark_dag(session)
+
+
+if __name__ == "__main__":
+    main()
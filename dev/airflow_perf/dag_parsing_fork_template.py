@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import os
+import resource
+import selectors
+import statistics
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+
+import psutil
+import rich_click as click
+
+DAG_FILE_TEMPLATE = """
+{imports}
+from airflow.providers.standard.operators.empty import EmptyOperator
+from airflow.sdk import DAG
+
+with DAG("fork_template_benchmark_{index}", schedule=None):
+    for i in range(10):
+        EmptyOperator(task_id=f"task_{{i}}")
+"""
+
+
+def write_dag_files(directory: Path, num_files: int, modules: list[str]) -> list[Path]:
+    imports = "\n".join(f"import {module}" for module in modules)
+    paths = []
+    for index in range(num_files):
+        path = directory / f"dag_{index}.py"
+        path.write_text(textwrap.dedent(DAG_FILE_TEMPLATE.format(imports=imports, index=index)))
+        paths.append(path)
+    return paths
+
+
+def parse(path: Path, bundle_path: Path, fork_template, client):
+    """Parse one DAG file like the DAG processor manager does, and return the processor's peak USS."""
+    import structlog
+    from uuid6 import uuid7
+
+    from airflow.dag_processing.processor import DagFileProcessorProcess
+
+    with open(os.devnull, "wb") as logger_filehandle:
+        proc = DagFileProcessorProcess.start(
+            id=uuid7(),
+            path=path,
+            bundle_path=bundle_path,
+            bundle_name="benchmark",
+            callbacks=[],
+            selector=selectors.DefaultSelector(),
+            logger=structlog.get_logger(),
+            logger_filehandle=logger_filehandle,
+            client=client,
+            fork_template=fork_template,
+        )
+        peak_uss = 0
+        while not proc.is_ready:
+            try:
+                peak_uss = max(peak_uss, psutil.Process(proc.pid).memory_full_info().uss)
+            except psutil.Error:
+                pass
+            proc._service_subprocess(0.01)
+    if proc.parsing_result is None or proc.parsing_result.import_errors:
+        raise click.ClickException(f"Could not parse the Dag file: {proc.parsing_result}")
+    return peak_uss
+
+
+def run(paths, bundle_path, fork_template, client):
+    usage_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    start = time.perf_counter()
+    peak_uss = [parse(path, bundle_path, fork_template, client) for path in paths]
+    elapsed = time.perf_counter() - start
+    usage_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = (usage_after.ru_utime - usage_before.ru_utime) + (usage_after.ru_stime - usage_before.ru_stime)
+    return elapsed, cpu, peak_uss
+
+
+@click.command()
+@click.option("--num-files", default=50, help="Number of DAG files to parse")
+@click.option(
+    "--modules",
+    default="json,decimal,sqlite3",
+    help="Comma-separated modules every DAG file imports, and the fork template preloads",
+)
+@click.option(
+    "--manager-heap-mb",
+    default=200,
+    help="Memory held by the parent, like a DAG processor manager that has been running for a while",
+)
+def main(num_files, modules, manager_heap_mb):
+    """
+    Compare parsing DAG files in processors forked from the DAG processor vs. from the fork template.
+
+    Reports the wall time, the CPU time of the processors (including their importing the DAG files'
+    libraries) and their peak unique memory (USS): the memory a processor does not share with the
+    process it was forked from.
+    """
+    os.environ["AIRFLOW__CORE__LOAD_EXAMPLES"] = "False"
+    from airflow.api_fastapi.execution_api.app import InProcessExecutionAPI
+    from airflow.dag_processing.fork_template import ForkTemplate
+    from airflow.sdk.api.client import Client
+
+    module_list = [module for module in modules.split(",") if module]
+    api = InProcessExecutionAPI()
+    client = Client(base_url=None, token="", dry_run=True, transport=api.transport)
+    client.base_url = "http://in-process.invalid./"
+
+    heap = [bytearray(1024) for _ in range(manager_heap_mb * 1024)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        bundle_path = Path(directory)
+        paths = write_dag_files(bundle_path, num_files, module_list)
+
+        results = {"manager": run(paths, bundle_path, None, client)}
+
+        fork_template = ForkTemplate(preload_modules=module_list)
+        fork_template.start()
+        try:
+            while not fork_template._is_ready():
+                time.sleep(0.1)
+            results["fork template"] = run(paths, bundle_path, fork_template, client)
+        finally:
+            fork_template.stop()
+    del heap
+
+    click.echo(f"{'forked from':>14}  {'wall':>10}  {'processor CPU':>14}  {'peak USS (mean ± stdev)':>26}")
+    for name, (elapsed, cpu, peak_uss) in results.items():
+        uss_mb = [uss / 1024 / 1024 for uss in peak_uss]
+        uss = f"{statistics.mean(uss_mb):.1f}MB (±{statistics.pstdev(uss_mb):.1f}MB)"
+        click.echo(f"{name:>14}  {elapsed:>9.2f}s  {cpu:>13.2f}s  {uss:>26}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import json
+import marshal
+import os
+import statistics
+import time
+import zlib
+
+import rich_click as click
+
+
+def create_benchmark_dag_data(num_tasks):
+    """
+    Serialize a DAG with ``num_tasks`` tasks chained in groups of ten, the way the DAG processor does.
+    """
+    from airflow.providers.standard.operators.bash import BashOperator
+    from airflow.providers.standard.operators.empty import EmptyOperator
+    from airflow.sdk import DAG
+    from airflow.serialization.serialized_objects import DagSerialization
+
+    with DAG("serialized_dag_format_benchmark", schedule=None) as dag:
+        previous = None
+        for i in range(num_tasks):
+            if i % 2:
+                op = BashOperator(task_id=f"bash_{i}", bash_command=f"echo {i}", retries=i % 3)
+            else:
+                op = EmptyOperator(task_id=f"empty_{i}", priority_weight=i)
+            if previous is not None and i % 10:
+                previous >> op
+            previous = op
+    return DagSerialization.to_dict(dag)
+
+
+def time_decode(decode, encoded, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        decode(encoded)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def format_times(times):
+    if len(times) > 1:
+        return f"{statistics.mean(times) * 1000:9.2f}ms (±{statistics.stdev(times) * 1000:.2f}ms)"
+    return f"{times[0] * 1000:9.2f}ms"
+
+
+@click.command()
+@click.option("--task-counts", default="100,1000,5000", help="Comma-separated numbers of tasks in the DAG")
+@click.option("--repeat", default=10, help="Number of decodes to time per format")
+def main(task_counts, repeat):
+    """
+    Compare the size and decode time of the formats serialized DAGs can be stored in.
+
+    ``json`` is how DAGs are stored by default (the database driver decodes the JSON column),
+    ``json+zlib`` is ``[core] compress_serialized_dags`` and ``msgpack`` / ``msgpack+zlib`` are
+    ``[core] serialized_dag_storage_format = msgpack``, without and with compression. ``shared cache``
+    is how API server workers load DAGs from ``[api] shared_dag_cache_dir``: every worker still decodes
+    its own copy of the data, so the cache only saves the difference in decode time. The time
+    ``DagSerialization.from_dict`` then takes to build the DAG is the same for every format and is
+    reported for reference.
+    """
+    os.environ["AIRFLOW__CORE__LOAD_EXAMPLES"] = "False"
+
+    from airflow.models.serialized_dag import _decode_data_compressed, _encode_binary_dag_data
+    from airflow.serialization.serialized_objects import DagSerialization
+
+    for num_tasks in (int(count) for count in task_counts.split(",")):
+        data = create_benchmark_dag_data(num_tasks)
+        dag_data_json = json.dumps(data, sort_keys=True).encode("utf-8")
+        formats = {
+            "json": (dag_data_json, json.loads),
+            "json+zlib": (zlib.compress(dag_data_json), _decode_data_compressed),
+            "msgpack": (_encode_binary_dag_data(data, compress=False), _decode_data_compressed),
+            "msgpack+zlib": (_encode_binary_dag_data(data, compress=True), _decode_data_compressed),
+            "shared cache": (marshal.dumps(data), marshal.loads),
+        }
+
+        click.echo(f"{num_tasks} tasks")
+        click.echo(f"{'format':>14}  {'size':>12}  {'decode':>28}")
+        for name, (encoded, decode) in formats.items():
+            if decode(encoded) != json.loads(dag_data_json):
+                raise click.ClickException(f"The {name} format does not round-trip the serialized Dag")
+            times = time_decode(decode, encoded, repeat)
+            click.echo(f"{name:>14}  {len(encoded):>12}  {format_times(times):>28}")
+        from_dict_times = time_decode(DagSerialization.from_dict, data, repeat)
+        click.echo(f"{'from_dict':>14}  {'':>12}  {format_times(from_dict_times):>28}")
+        click.echo()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import json
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import rich_click as click
+
+
+def make_lines(num_lines: int, secret_every: int) -> list[bytes]:
+    """Return JSON log lines like the ones task processes send, some of them containing a secret."""
+    lines = []
+    for i in range(num_lines):
+        event = f"Processed record {i} of the batch"
+        if secret_every and i % secret_every == 0:
+            event += " using s3cr3t-benchmark-value"
+        line = {
+            "timestamp": "2025-01-01T00:00:00.000000Z",
+            "level": "info",
+            "event": event,
+            "logger": "airflow.task.operators.benchmark",
+            "record": i,
+        }
+        lines.append(json.dumps(line, separators=(",", ":")).encode() + b"\n")
+    return lines
+
+
+def forward(lines: list[bytes], log_path: Path, passthrough: bool) -> float:
+    """Return the time the supervisor takes to write the lines sent by a task process to the log file."""
+    from airflow.sdk.execution_time.supervisor import (
+        _configure_logging,
+        make_buffered_socket_reader,
+        make_log_passthrough_reader,
+        process_log_messages_from_subprocess,
+    )
+
+    log_path.unlink(missing_ok=True)
+    logger, log_file = _configure_logging(str(log_path), client=None)  # type: ignore[arg-type]
+    gen = process_log_messages_from_subprocess((logger,))
+    if passthrough:
+        handler, _ = make_log_passthrough_reader(
+            log_file,  # type: ignore[arg-type]
+            gen,
+            on_close=lambda sock: None,
+        )
+    else:
+        handler, _ = make_buffered_socket_reader(gen, on_close=lambda sock: None)
+
+    read_end, write_end = socket.socketpair()
+
+    def send():
+        write_end.sendall(b"".join(lines))
+        write_end.close()
+
+    sender = threading.Thread(target=send)
+    begin = time.perf_counter()
+    sender.start()
+    while handler(read_end):
+        pass
+    elapsed = time.perf_counter() - begin
+    sender.join()
+    read_end.close()
+    log_file.close()
+    return elapsed
+
+
+@click.command()
+@click.option("--num-lines", default=200_000, help="Number of log lines the task process sends")
+@click.option("--repeat", default=5, help="Number of times to forward the lines in each mode")
+@click.option("--secret-every", default=100, help="Put a masked secret in every n-th line, 0 for none")
+def main(num_lines, repeat, secret_every):
+    """
+    Compare the throughput of decoding and logging each task log line vs. passing lines through.
+
+    Reports the log lines per second the supervisor writes to the local log file of a task, reading them from
+    the socket of the task process like it does while supervising the task.
+    """
+    from airflow.sdk._shared.secrets_masker import _secrets_masker
+
+    _secrets_masker().add_mask("s3cr3t-benchmark-value")
+    lines = make_lines(num_lines, secret_every)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        log_path = Path(directory, "task.log")
+        for name, passthrough in (("decode", False), ("passthrough", True)):
+            results[name] = [num_lines / forward(lines, log_path, passthrough) for _ in range(repeat)]
+            # Lines with a secret are still decoded, so that it is masked
+            if b"s3cr3t-benchmark-value" in log_path.read_bytes():
+                raise click.ClickException("A secret was not masked")
+
+    click.echo(f"{'mode':>12}  {'mean':>14}  {'median':>14}")
+    for name, rates in results.items():
+        click.echo(
+            f"{name:>12}  {statistics.mean(rates):>8.0f} line/s  {statistics.median(rates):>8.0f} line/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
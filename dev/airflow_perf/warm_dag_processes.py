@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import json
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+
+import rich_click as click
+
+DAG_FILE_TEMPLATE = """
+{imports}
+from airflow.providers.standard.operators.empty import EmptyOperator
+from airflow.sdk import DAG
+
+for d in range({num_dags}):
+    with DAG(f"warm_dag_process_benchmark_{{d}}", schedule=None):
+        for i in range({num_tasks}):
+            EmptyOperator(task_id=f"task_{{i}}")
+"""
+
+DAG_REL_PATH = "dag.py"
+# Warm processes are only used for bundle versions; the local bundle ignores the version
+BUNDLE_VERSION = "benchmark"
+
+
+def load_task():
+    """Find a task of the Dag file like the task runner does, parsing the file unless it was already."""
+    from airflow.sdk.execution_time.warm_dag_process import DagFileKey, _parse_dag_file, get_parsed_dag_file
+
+    key = DagFileKey("benchmark", BUNDLE_VERSION, DAG_REL_PATH)
+    _, dag_bag = get_parsed_dag_file(key) or _parse_dag_file(key)
+    if "task_0" not in dag_bag.dags["warm_dag_process_benchmark_0"].task_dict:
+        raise RuntimeError("The task is not in the Dag file")
+
+
+def start_cold() -> tuple[int, list[socket.socket]]:
+    """Fork a task process from this process, like the supervisor does by default."""
+    from airflow.sdk.execution_time.supervisor import _fork_main
+
+    pairs = [socket.socketpair() for _ in range(4)]
+    pid = os.fork()
+    if pid == 0:
+        requests, stdout, stderr, logs = (child for child, _ in pairs)
+        try:
+            _fork_main(requests, stdout, stderr, logs.fileno(), load_task)
+        finally:
+            os._exit(124)
+    for child, _ in pairs:
+        child.close()
+    return pid, [parent for _, parent in pairs]
+
+
+def start_warm(warm_process) -> tuple[int, list[socket.socket]]:
+    """Fork a task process from the warm process of the Dag file."""
+    pairs = [socket.socketpair() for _ in range(4)]
+    pid = warm_process.spawn([child for child, _ in pairs])
+    for child, _ in pairs:
+        child.close()
+    if pid is None:
+        raise click.ClickException("The warm process could not fork a task process")
+    return pid, [parent for _, parent in pairs]
+
+
+def run(start, num_tasks: int) -> list[float]:
+    """Return the time from starting each task process until it found its task and exited."""
+    latencies = []
+    for _ in range(num_tasks):
+        begin = time.perf_counter()
+        pid, sockets = start()
+        _, status = os.waitpid(pid, 0)
+        latencies.append(time.perf_counter() - begin)
+        for sock in sockets:
+            sock.close()
+        if os.waitstatus_to_exitcode(status) != 0:
+            raise click.ClickException(f"Task process failed: {status}")
+    return latencies
+
+
+@click.command()
+@click.option("--num-tasks", default=50, help="Number of task processes to start")
+@click.option("--num-dags", default=10, help="Number of Dags in the Dag file")
+@click.option("--tasks-per-dag", default=50, help="Number of tasks in each Dag")
+@click.option(
+    "--modules",
+    default="json,decimal,sqlite3",
+    help="Comma-separated modules the Dag file imports",
+)
+def main(num_tasks, num_dags, tasks_per_dag, modules):
+    """
+    Compare the startup latency of task processes forked from the worker vs. from a warm Dag process.
+
+    Reports, per task process, the time from starting it until it found its task in the Dag file -- the
+    part of starting a task which warm Dag processes save -- and exited.
+    """
+    from airflow.sdk.execution_time.warm_dag_process import DagFileKey, WarmDagProcess
+
+    if not WarmDagProcess.is_supported():
+        raise click.ClickException("Warm Dag processes are only supported on Linux")
+
+    imports = "\n".join(f"import {module}" for module in modules.split(",") if module)
+    with tempfile.TemporaryDirectory() as directory:
+        Path(directory, DAG_REL_PATH).write_text(
+            textwrap.dedent(
+                DAG_FILE_TEMPLATE.format(imports=imports, num_dags=num_dags, num_tasks=tasks_per_dag)
+            )
+        )
+        os.environ["AIRFLOW__CORE__LOAD_EXAMPLES"] = "False"
+        os.environ["AIRFLOW__DAG_PROCESSOR__DAG_BUNDLE_CONFIG_LIST"] = json.dumps(
+            [
+                {
+                    "name": "benchmark",
+                    "classpath": "airflow.dag_processing.bundles.local.LocalDagBundle",
+                    "kwargs": {"path": directory, "refresh_interval": 0},
+                }
+            ]
+        )
+        # So that the warm process can import load_task
+        os.environ["PYTHONPATH"] = os.pathsep.join([os.path.dirname(__file__), *sys.path])
+
+        results = {"worker": run(start_cold, num_tasks)}
+
+        warm_process = WarmDagProcess(
+            DagFileKey("benchmark", BUNDLE_VERSION, DAG_REL_PATH), target="warm_dag_processes.load_task"
+        )
+        begin = time.perf_counter()
+        warm_process.start()
+        try:
+            while not warm_process.is_ready():
+                if warm_process.failed:
+                    raise click.ClickException("The warm process could not parse the Dag file")
+                time.sleep(0.01)
+            click.echo(f"Warm Dag process ready after {time.perf_counter() - begin:.2f}s")
+            results["warm process"] = run(lambda: start_warm(warm_process), num_tasks)
+        finally:
+            warm_process.stop()
+
+    click.echo(f"{'forked from':>14}  {'mean':>9}  {'median':>9}  {'p95':>9}")
+    for name, latencies in results.items():
+        p95 = statistics.quantiles(latencies, n=20)[-1]
+        click.echo(
+            f"{name:>14}  {statistics.mean(latencies) * 1000:>7.1f}ms  "
+            f"{statistics.median(latencies) * 1000:>7.1f}ms  {p95 * 1000:>7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
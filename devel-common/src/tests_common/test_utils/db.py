@@ -330,6 +330,10 @@ def drop_tables_with_prefix(prefix):
 def clear_db_serialized_dags():
     with create_session() as session:
         session.execute(delete(SerializedDagModel))
+        if AIRFLOW_V_3_2_PLUS:
+            from airflow.models.serialized_dag import SerializedDagTaskModel
+
+            session.execute(delete(SerializedDagTaskModel))
 
 
 @_retry_db
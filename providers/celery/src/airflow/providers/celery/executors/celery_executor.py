@@ -98,6 +98,7 @@ class CeleryExecutor(BaseExecutor):
     # TODO: Remove this flag once providers depend on Airflow 3.2.
     supports_sentry: bool = True
     supports_multi_team: bool = True
+    supports_task_run_context: bool = True
 
     if TYPE_CHECKING:
         if AIRFLOW_V_3_0_PLUS:
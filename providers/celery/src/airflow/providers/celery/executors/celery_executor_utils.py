@@ -29,6 +29,7 @@ import math
 import os
 import subprocess
 import sys
+import threading
 import traceback
 from collections.abc import Collection, Mapping, MutableMapping, Sequence
 from concurrent.futures import ProcessPoolExecutor
@@ -73,6 +74,7 @@ if TYPE_CHECKING:
     from airflow.executors.base_executor import EventBufferValueType, ExecutorConf
     from airflow.executors.workloads.types import WorkloadKey
     from airflow.models.taskinstance import TaskInstanceKey
+    from airflow.sdk.execution_time.supervisor import MultiTaskSupervisor
 
     # We can't use `if AIRFLOW_V_3_0_PLUS` conditions in type checks, so unfortunately we just have to define
     # the type as the union of both kinds
@@ -185,6 +187,44 @@ def on_celery_worker_ready(*args, **kwargs):
     gc.unfreeze()
 
 
+_multi_task_supervisor: MultiTaskSupervisor | None = None
+_multi_task_supervisor_lock = threading.Lock()
+
+
+def _get_multi_task_supervisor(server: str, max_tasks: int) -> MultiTaskSupervisor:
+    """Return the supervisor of the tasks run by the threads of this worker process."""
+    global _multi_task_supervisor
+
+    from airflow.sdk.execution_time.supervisor import MultiTaskSupervisor
+
+    with _multi_task_supervisor_lock:
+        if _multi_task_supervisor is None:
+            _multi_task_supervisor = MultiTaskSupervisor(server=server, max_tasks=max_tasks)
+        return _multi_task_supervisor
+
+
+@cache
+def _shares_multi_task_supervisor(tasks_per_supervisor: int) -> bool:
+    """
+    Whether the tasks run by this worker process share a supervisor.
+
+    The tasks can only share a supervisor when they are run by the threads of a single worker process,
+    i.e. with ``[celery] pool = threads``; the other pools run the tasks in processes forked from, or
+    independent of, each other, so every task runs its own supervisor.
+    """
+    if not AIRFLOW_V_3_2_PLUS or tasks_per_supervisor <= 1:
+        return False
+    if (pool := conf.get("celery", "pool", fallback="prefork")) != "threads":
+        log.warning(
+            "[workers] tasks_per_supervisor is %d, but tasks can only share a supervisor with "
+            "[celery] pool = threads, not %s; every task runs its own supervisor",
+            tasks_per_supervisor,
+            pool,
+        )
+        return False
+    return True
+
+
 # Once Celery 5.5 is out of beta, we can pass `pydantic=True` to the decorator and it will handle the validation
 # and deserialization for us
 @app.task(name="execute_workload")
@@ -209,14 +249,32 @@ def execute_workload(input: str) -> None:
     default_execution_api_server = f"{base_url.rstrip('/')}/execution/"
 
     if isinstance(workload, workloads.ExecuteTask):
+        server = conf.get("core", "execution_api_server_url", fallback=default_execution_api_server)
+        tasks_per_supervisor = conf.getint("workers", "tasks_per_supervisor", fallback=1)
+        # The run context of the task instance, if the scheduler sent it along with the workload
+        context_kwargs = {"ti_context": workload.ti_context} if AIRFLOW_V_3_2_PLUS else {}
+        if _shares_multi_task_supervisor(tasks_per_supervisor):
+            # The tasks run by the threads of this worker process share a supervisor instead of each
+            # running one
+            supervisor = _get_multi_task_supervisor(server, max_tasks=tasks_per_supervisor)
+            supervisor.submit(
+                ti=workload.ti,  # type: ignore[arg-type]
+                dag_rel_path=workload.dag_rel_path,
+                bundle_info=workload.bundle_info,
+                token=workload.token,
+                log_path=workload.log_path,
+                **context_kwargs,
+            ).result()
+            return
         supervise(
             # This is the "wrong" ti type, but it duck types the same. TODO: Create a protocol for this.
             ti=workload.ti,  # type: ignore[arg-type]
             dag_rel_path=workload.dag_rel_path,
             bundle_info=workload.bundle_info,
             token=workload.token,
-            server=conf.get("core", "execution_api_server_url", fallback=default_execution_api_server),
+            server=server,
             log_path=workload.log_path,
+            **context_kwargs,
         )
     elif isinstance(workload, workloads.ExecuteCallback):
         success, error_msg = execute_callback_workload(workload.callback, log)
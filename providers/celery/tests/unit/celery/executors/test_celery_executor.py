@@ -761,3 +761,22 @@ def test_celery_tasks_registered_on_import():
         assert "execute_command" in registered_tasks, (
             "execute_command must be registered for Airflow 2.x compatibility."
         )
+
+
+@pytest.mark.skipif(not AIRFLOW_V_3_2_PLUS, reason="Tasks share supervisors only in Airflow 3.2+")
+@pytest.mark.parametrize(
+    ("pool", "tasks_per_supervisor", "expected"),
+    [
+        pytest.param("threads", 4, True, id="threads"),
+        pytest.param("threads", 1, False, id="one-task-per-supervisor"),
+        pytest.param("prefork", 4, False, id="prefork"),
+        pytest.param("gevent", 4, False, id="gevent"),
+    ],
+)
+def test_shares_multi_task_supervisor(pool, tasks_per_supervisor, expected):
+    celery_executor_utils._shares_multi_task_supervisor.cache_clear()
+    try:
+        with conf_vars({("celery", "pool"): pool}):
+            assert celery_executor_utils._shares_multi_task_supervisor(tasks_per_supervisor) is expected
+    finally:
+        celery_executor_utils._shares_multi_task_supervisor.cache_clear()
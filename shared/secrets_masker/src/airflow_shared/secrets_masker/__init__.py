@@ -28,6 +28,7 @@ from .secrets_masker import (
     merge,
     redact,
     reset_secrets_masker,
+    scoped_secrets_masker,
     should_hide_value_for_key,
 )
 
@@ -36,6 +37,7 @@ __all__ = [
     "mask_secret",
     "redact",
     "reset_secrets_masker",
+    "scoped_secrets_masker",
     "_is_v1_env_var",
     "RedactedIO",
     "merge",
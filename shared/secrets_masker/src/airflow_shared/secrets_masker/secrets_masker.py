@@ -26,6 +26,7 @@ import logging
 import re
 import sys
 from collections.abc import Generator, Iterable, Iterator
+from contextvars import ContextVar
 from enum import Enum
 from functools import cache, cached_property
 from re import Pattern
@@ -132,19 +133,43 @@ def merge(
     return _secrets_masker().merge(new_value, old_value, name, max_depth)
 
 
-@cache
+_scoped_masker: ContextVar[SecretsMasker | None] = ContextVar("_scoped_masker", default=None)
+
+
 def _secrets_masker() -> SecretsMasker:
     """
-    Get or create the module-level secrets masker instance.
+    Get the secrets masker in use: the one of :func:`scoped_secrets_masker`, or the module-level one.
 
-    This function implements a module level singleton pattern within this specific
-    module. Note that different import paths (e.g., airflow._shared vs
-    airflow.sdk._shared) will have separate global variables and thus separate
-    masker instances.
+    The module-level masker is a singleton within this specific module. Note that
+    different import paths (e.g., airflow._shared vs airflow.sdk._shared) will have
+    separate global variables and thus separate masker instances.
     """
+    if (masker := _scoped_masker.get()) is not None:
+        return masker
+    return _module_secrets_masker()
+
+
+@cache
+def _module_secrets_masker() -> SecretsMasker:
     return SecretsMasker()
 
 
+@contextlib.contextmanager
+def scoped_secrets_masker(masker: SecretsMasker) -> Generator[SecretsMasker, None, None]:
+    """
+    Mask and redact secrets with the given masker, instead of the module-level one, in this context.
+
+    This keeps the secrets of unrelated work done by one process apart, e.g. of the tasks a supervisor
+    runs at once. Use :meth:`SecretsMasker.copy_settings` to create a masker configured like the
+    module-level one.
+    """
+    token = _scoped_masker.set(masker)
+    try:
+        yield masker
+    finally:
+        _scoped_masker.reset(token)
+
+
 def reset_secrets_masker() -> None:
     """
     Reset the secrets masker to clear existing patterns and replacer.
@@ -607,6 +632,15 @@ class SecretsMasker(logging.Filter):
         self.patterns = set()
         self.replacer = None
 
+    def copy_settings(self) -> SecretsMasker:
+        """Return a new masker configured like this one, without any of its secrets."""
+        masker = SecretsMasker()
+        masker.min_length_to_mask = self.min_length_to_mask
+        masker.secret_mask_adapter = self.secret_mask_adapter
+        masker.sensitive_variables_fields = list(self.sensitive_variables_fields)
+        masker.hide_sensitive_var_conn_fields = self.hide_sensitive_var_conn_fields
+        return masker
+
 
 class RedactedIO(TextIO):
     """
@@ -37,6 +37,7 @@ from airflow_shared.secrets_masker.secrets_masker import (
     merge,
     redact,
     reset_secrets_masker,
+    scoped_secrets_masker,
 )
 
 from tests_common.test_utils.config import env_vars
@@ -1137,6 +1138,37 @@ class TestDirectMethodCalls:
         assert all(val == "***" for val in result["nested"]["set"])
 
 
+class TestScopedSecretsMasker:
+    def test_scoped_masker_keeps_secrets_apart(self):
+        secrets_masker = SecretsMasker()
+        configure_secrets_masker_for_test(secrets_masker)
+        first, second = secrets_masker.copy_settings(), secrets_masker.copy_settings()
+
+        with patch(
+            "airflow_shared.secrets_masker.secrets_masker._module_secrets_masker", return_value=secrets_masker
+        ):
+            with scoped_secrets_masker(first):
+                mask_secret("first-secret")
+            with scoped_secrets_masker(second):
+                mask_secret("second-secret")
+                assert redact("first-secret and second-secret") == "first-secret and ***"
+            with scoped_secrets_masker(first):
+                assert redact("first-secret and second-secret") == "*** and second-secret"
+            assert redact("first-secret and second-secret") == "first-secret and second-secret"
+
+    def test_copy_settings(self):
+        secrets_masker = SecretsMasker()
+        configure_secrets_masker_for_test(secrets_masker, min_length=8, sensitive_fields=["api_key"])
+        secrets_masker.add_mask("some-secret-value")
+
+        copy = secrets_masker.copy_settings()
+
+        assert copy.min_length_to_mask == 8
+        assert copy.sensitive_variables_fields == ["api_key"]
+        assert copy.patterns == set()
+        assert copy.replacer is None
+
+
 class TestMixedDataScenarios:
     def test_mixed_structured_unstructured_data(self):
         secrets_masker = SecretsMasker()
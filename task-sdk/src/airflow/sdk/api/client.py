@@ -57,6 +57,9 @@ from airflow.sdk.api.datamodels._generated import (
     TaskInstanceState,
     TaskStatesResponse,
     TerminalStateNonSuccess,
+    TIBatchHeartbeatInfo,
+    TIBatchHeartbeatPayload,
+    TIBatchHeartbeatResponse,
     TIDeferredStatePayload,
     TIEnterRunningPayload,
     TIHeartbeatInfo,
@@ -218,6 +221,12 @@ class TaskInstanceOperations:
         resp = self.client.patch(f"task-instances/{id}/run", content=body.model_dump_json())
         return TIRunContext.model_validate_json(resp.read())
 
+    def claim(self, id: uuid.UUID, pid: int, when: datetime) -> None:
+        """Tell the API server that this TI has started running, when its run context is already known."""
+        body = TIEnterRunningPayload(pid=pid, hostname=get_hostname(), unixname=getuser(), start_date=when)
+
+        self.client.patch(f"task-instances/{id}/claim", content=body.model_dump_json())
+
     def finish(self, id: uuid.UUID, state: TerminalStateNonSuccess, when: datetime, rendered_map_index):
         """Tell the API server that this TI has reached a terminal state."""
         if state == TaskInstanceState.SUCCESS:
@@ -261,6 +270,12 @@ class TaskInstanceOperations:
         body = TIHeartbeatInfo(pid=pid, hostname=get_hostname())
         self.client.put(f"task-instances/{id}/heartbeat", content=body.model_dump_json())
 
+    def heartbeat_batch(self, heartbeats: list[TIBatchHeartbeatInfo]) -> TIBatchHeartbeatResponse:
+        """Heartbeat several TaskInstances, each with its own token, in one request."""
+        body = TIBatchHeartbeatPayload(heartbeats=heartbeats)
+        resp = self.client.put("task-instances/heartbeats", content=body.model_dump_json())
+        return TIBatchHeartbeatResponse.model_validate_json(resp.read())
+
     def skip_downstream_tasks(self, id: uuid.UUID, msg: SkipDownstreamTasks):
         """Tell the API server to skip the downstream tasks of this TI."""
         body = TISkippedDownstreamTasksStatePayload(tasks=msg.tasks)
@@ -190,6 +190,52 @@ class PreviousTIResponse(BaseModel):
     duration: Annotated[float | None, Field(title="Duration")] = None
 
 
+class TIBatchHeartbeatInfo(BaseModel):
+    """
+    Heartbeat of one TaskInstance in a batch, with the token of that TaskInstance.
+    """
+
+    model_config = ConfigDict(
+        extra="forbid",
+    )
+    hostname: Annotated[str, Field(title="Hostname")]
+    pid: Annotated[int, Field(title="Pid")]
+    id: Annotated[UUID, Field(title="Id")]
+    token: Annotated[str, Field(title="Token")]
+
+
+class TIBatchHeartbeatPayload(BaseModel):
+    """
+    Schema for the batch TaskInstance heartbeat endpoint.
+    """
+
+    model_config = ConfigDict(
+        extra="forbid",
+    )
+    heartbeats: Annotated[list[TIBatchHeartbeatInfo], Field(title="Heartbeats")]
+
+
+class TIBatchHeartbeatResult(BaseModel):
+    """
+    Result of the heartbeat of one TaskInstance in a batch.
+
+    ``status_code`` and ``detail`` are what the heartbeat endpoint of the TaskInstance would have answered.
+    """
+
+    id: Annotated[UUID, Field(title="Id")]
+    status_code: Annotated[int, Field(title="Status Code")]
+    detail: Annotated[dict[str, Any] | None, Field(title="Detail")] = None
+    refreshed_token: Annotated[str | None, Field(title="Refreshed Token")] = None
+
+
+class TIBatchHeartbeatResponse(BaseModel):
+    """
+    Schema for the response of the batch TaskInstance heartbeat endpoint.
+    """
+
+    results: Annotated[list[TIBatchHeartbeatResult], Field(title="Results")]
+
+
 class TIDeferredStatePayload(BaseModel):
     """
     Schema for updating TaskInstance to a deferred state.
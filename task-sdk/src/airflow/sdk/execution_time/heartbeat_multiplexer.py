@@ -0,0 +1,280 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Send the heartbeats of all the task instances running on a host to the API server in batches.
+
+By default each task supervisor sends the heartbeats of its task instance itself, so a worker running many
+tasks at once sends as many requests to the Execution API server, which updates as many rows, every
+``[workers] min_heartbeat_interval``. With ``[workers] heartbeat_multiplexer`` the supervisors of a host
+send their heartbeats over a local socket to a heartbeat multiplexer instead. The multiplexer collects them
+for ``[workers] heartbeat_multiplexer_batch_interval`` seconds and sends them in one request to the batch
+heartbeat endpoint, which updates them in one statement, then sends each supervisor the result for its task
+instance. Supervisors handle it like the response to their own heartbeat, e.g. they terminate their task
+when its task instance is not found or should not be running anymore. When the batch could not be sent, or
+the multiplexer did not answer in time, they send their own heartbeat instead.
+
+The multiplexer runs in a thread of the first supervisor process which needs it, and listens on an abstract
+Unix socket named after the user and the URL of the API server; both ends check that the other runs as the
+same user, since the heartbeats carry the tokens of the task instances. When the process running the
+multiplexer exits, the next heartbeat of each other supervisor starts a new multiplexer, or connects to the
+one another supervisor just started. This is only supported on Linux; elsewhere supervisors send their own
+heartbeats.
+"""
+
+from __future__ import annotations
+
+import errno
+import hashlib
+import json
+import os
+import selectors
+import socket
+import struct
+import sys
+import threading
+import time
+from http import HTTPStatus
+
+import structlog
+
+from airflow.sdk.api.datamodels._generated import TIBatchHeartbeatInfo
+
+log = structlog.get_logger(__name__)
+
+MAX_MESSAGE_SIZE = 65536
+_PEER_CREDENTIALS = struct.Struct("3i")
+
+_multiplexer: HeartbeatMultiplexer | None = None
+"""The multiplexer running in this process, if any"""
+_lock = threading.Lock()
+
+
+def is_supported() -> bool:
+    return sys.platform == "linux"
+
+
+def _address(base_url: str) -> str:
+    """Return the abstract socket address of the multiplexer of the current user for the API server."""
+    digest = hashlib.sha256(base_url.encode()).hexdigest()[:16]
+    return f"\0airflow-heartbeat-multiplexer-{os.getuid()}-{digest}"
+
+
+def _same_user(sock: socket.socket) -> bool:
+    credentials = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, _PEER_CREDENTIALS.size)
+    _, uid, _ = _PEER_CREDENTIALS.unpack(credentials)
+    return uid == os.getuid()
+
+
+class HeartbeatMultiplexer:
+    """
+    Collect the heartbeats of the supervisors of a host and send them to the API server in batches.
+
+    :param address: Address of the socket to listen on.
+    :param base_url: URL of the Execution API server.
+    :param batch_interval: How long to collect heartbeats before sending them, in seconds.
+    """
+
+    def __init__(self, address: str, base_url: str, batch_interval: float):
+        from airflow.sdk.api.client import Client
+
+        self.batch_interval = batch_interval
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        try:
+            self._listener.bind(address)
+            self._listener.listen()
+        except OSError:
+            self._listener.close()
+            raise
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._listener, selectors.EVENT_READ)
+        self._wakeup, self._stop_signal = socket.socketpair()
+        self._selector.register(self._wakeup, selectors.EVENT_READ)
+        self._thread: threading.Thread | None = None
+        self._pending: dict[socket.socket, TIBatchHeartbeatInfo] = {}
+        # Each batch is sent with the token of one of its task instances
+        self._client = Client(base_url=base_url, token="")
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="heartbeat-multiplexer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop_signal.send(b"\0")
+            self._thread.join()
+            self._thread = None
+        self.close()
+
+    def close(self) -> None:
+        """Close the sockets of the multiplexer, e.g. in a process forked from the one running it."""
+        for key in list(self._selector.get_map().values()):
+            key.fileobj.close()  # type: ignore[union-attr]
+        self._selector.close()
+        self._stop_signal.close()
+
+    def _run(self) -> None:
+        deadline: float | None = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            for key, _ in self._selector.select(timeout):
+                sock: socket.socket = key.fileobj  # type: ignore[assignment]
+                if sock is self._wakeup:
+                    return
+                if sock is self._listener:
+                    self._accept()
+                else:
+                    self._read(sock)
+            if deadline is None and self._pending:
+                deadline = time.monotonic() + self.batch_interval
+            if deadline is not None and time.monotonic() >= deadline:
+                deadline = None
+                try:
+                    self._flush()
+                except Exception:
+                    log.exception("Failed to send heartbeats")
+
+    def _accept(self) -> None:
+        conn, _ = self._listener.accept()
+        if not _same_user(conn):
+            log.warning("Rejected heartbeat multiplexer connection from another user")
+            conn.close()
+            return
+        self._selector.register(conn, selectors.EVENT_READ)
+
+    def _disconnect(self, conn: socket.socket) -> None:
+        self._pending.pop(conn, None)
+        self._selector.unregister(conn)
+        conn.close()
+
+    def _read(self, conn: socket.socket) -> None:
+        try:
+            message = conn.recv(MAX_MESSAGE_SIZE)
+        except OSError:
+            message = b""
+        if not message:
+            self._disconnect(conn)
+            return
+        try:
+            self._pending[conn] = TIBatchHeartbeatInfo.model_validate_json(message)
+        except ValueError:
+            log.warning("Invalid heartbeat", exc_info=True)
+
+    def _flush(self) -> None:
+        from airflow.sdk.api.client import BearerAuth, ServerResponseError
+
+        pending, self._pending = self._pending, {}
+        messages: dict[socket.socket, bytes] = {}
+        # The batch is sent with the token of its first task instance. If that token is rejected, e.g. as
+        # it expired, the heartbeat of that task instance fails, and the others are sent with the next one.
+        unsent = dict(pending)
+        while unsent:
+            heartbeats = list(unsent.values())
+            try:
+                self._client.auth = BearerAuth(heartbeats[0].token)
+                response = self._client.task_instances.heartbeat_batch(heartbeats)
+            except ServerResponseError as e:
+                if e.response.status_code not in {HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN}:
+                    self._fail(unsent, messages, e)
+                    break
+                rejected = next(iter(unsent))
+                messages[rejected] = json.dumps({"error": str(e)}).encode()
+                del unsent[rejected]
+            except Exception as e:
+                self._fail(unsent, messages, e)
+                break
+            else:
+                results = {str(result.id): result.model_dump_json().encode() for result in response.results}
+                for conn, heartbeat in unsent.items():
+                    messages[conn] = (
+                        results.get(str(heartbeat.id)) or json.dumps({"error": "No result"}).encode()
+                    )
+                break
+        log.debug("Sent heartbeats", num_heartbeats=len(pending))
+
+        for conn, message in messages.items():
+            try:
+                conn.send(message)
+            except OSError:
+                self._disconnect(conn)
+
+    @staticmethod
+    def _fail(
+        unsent: dict[socket.socket, TIBatchHeartbeatInfo],
+        messages: dict[socket.socket, bytes],
+        error: Exception,
+    ) -> None:
+        log.warning("Failed to send heartbeats", num_heartbeats=len(unsent), exc_info=error)
+        message = json.dumps({"error": str(error)}).encode()
+        messages.update(dict.fromkeys(unsent, message))
+
+
+def _start(address: str, base_url: str, batch_interval: float) -> None:
+    global _multiplexer
+
+    with _lock:
+        if _multiplexer is None:
+            multiplexer = HeartbeatMultiplexer(address, base_url, batch_interval)
+            multiplexer.start()
+            _multiplexer = multiplexer
+
+
+def _close_after_fork() -> None:
+    global _multiplexer
+
+    # The thread of the multiplexer does not run in the child, which must not hold its sockets
+    if _multiplexer is not None:
+        _multiplexer.close()
+        _multiplexer = None
+
+
+def connect(base_url: str, batch_interval: float) -> socket.socket | None:
+    """
+    Connect to the heartbeat multiplexer of the host, starting one in this process if there is none.
+
+    :return: A connection to send heartbeats to and receive their results from, or None if there is no
+        multiplexer to connect to.
+    """
+    address = _address(base_url)
+    for _ in range(2):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        try:
+            sock.connect(address)
+        except ConnectionRefusedError:
+            sock.close()
+            try:
+                _start(address, base_url, batch_interval)
+            except OSError as e:
+                # Another process may just have started one
+                if e.errno != errno.EADDRINUSE:
+                    log.warning("Could not start heartbeat multiplexer", exc_info=True)
+                    return None
+            continue
+        except OSError:
+            sock.close()
+            log.warning("Could not connect to heartbeat multiplexer", exc_info=True)
+            return None
+        if not _same_user(sock):
+            log.warning("Heartbeat multiplexer runs as another user, not sending heartbeats to it")
+            sock.close()
+            return None
+        return sock
+    return None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_close_after_fork)
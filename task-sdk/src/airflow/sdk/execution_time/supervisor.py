@@ -22,8 +22,10 @@ from __future__ import annotations
 import atexit
 import contextlib
 import io
+import json
 import logging
 import os
+import re
 import selectors
 import signal
 import sys
@@ -32,10 +34,12 @@ import time
 import weakref
 from collections import deque
 from collections.abc import Callable, Generator
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager, suppress
 from datetime import datetime, timezone
 from http import HTTPStatus
 from socket import socket, socketpair
+from types import MappingProxyType
 from typing import TYPE_CHECKING, BinaryIO, ClassVar, NoReturn, TextIO, cast
 from urllib.parse import urlparse
 from uuid import UUID
@@ -45,16 +49,19 @@ import httpx
 import msgspec
 import psutil
 import structlog
-from pydantic import BaseModel, TypeAdapter
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 from airflow.sdk._shared.logging.structlog import reconfigure_logger
-from airflow.sdk.api.client import Client, ServerResponseError
+from airflow.sdk.api.client import BearerAuth, Client, ServerResponseError, get_hostname
 from airflow.sdk.api.datamodels._generated import (
     AssetResponse,
     ConnectionResponse,
     TaskInstance,
     TaskInstanceState,
     TaskStatesResponse,
+    TIBatchHeartbeatInfo,
+    TIBatchHeartbeatResult,
+    TIRunContext,
     VariableResponse,
     XComSequenceIndexResponse,
 )
@@ -132,12 +139,14 @@ if TYPE_CHECKING:
     from typing_extensions import Self
 
     from airflow.executors.workloads import BundleInfo
+    from airflow.sdk._shared.secrets_masker import SecretsMasker
     from airflow.sdk.bases.secrets_backend import BaseSecretsBackend
     from airflow.sdk.definitions.connection import Connection
+    from airflow.sdk.execution_time.warm_dag_process import WarmDagProcess, WarmDagProcessPool
     from airflow.sdk.types import RuntimeTaskInstanceProtocol as RuntimeTI
 
 
-__all__ = ["ActivitySubprocess", "WatchedSubprocess", "supervise"]
+__all__ = ["ActivitySubprocess", "MultiTaskSupervisor", "WatchedSubprocess", "supervise"]
 
 log: FilteringBoundLogger = structlog.get_logger(logger_name="supervisor")
 
@@ -145,6 +154,10 @@ HEARTBEAT_TIMEOUT: int = conf.getint("scheduler", "task_instance_heartbeat_timeo
 # Don't heartbeat more often than this
 MIN_HEARTBEAT_INTERVAL: int = conf.getint("workers", "min_heartbeat_interval")
 MAX_FAILED_HEARTBEATS: int = conf.getint("workers", "max_failed_heartbeats")
+HEARTBEAT_MULTIPLEXER: bool = conf.getboolean("workers", "heartbeat_multiplexer", fallback=False)
+HEARTBEAT_MULTIPLEXER_BATCH_INTERVAL: float = conf.getfloat(
+    "workers", "heartbeat_multiplexer_batch_interval", fallback=1.0
+)
 
 SOCKET_CLEANUP_TIMEOUT: float = conf.getfloat("workers", "socket_cleanup_timeout")
 
@@ -206,6 +219,27 @@ def _subprocess_main():
     main()
 
 
+_warm_dag_process_pool: WarmDagProcessPool | None = None
+
+
+def _warm_dag_processes_enabled() -> bool:
+    from airflow.sdk.execution_time.warm_dag_process import WarmDagProcess
+
+    return conf.getboolean("workers", "warm_dag_processes", fallback=False) and WarmDagProcess.is_supported()
+
+
+def _get_warm_dag_process_pool() -> WarmDagProcessPool:
+    global _warm_dag_process_pool
+
+    if _warm_dag_process_pool is None:
+        from airflow.sdk.execution_time.warm_dag_process import WarmDagProcessPool
+
+        _warm_dag_process_pool = WarmDagProcessPool(
+            max_size=conf.getint("workers", "max_warm_dag_processes", fallback=4)
+        )
+    return _warm_dag_process_pool
+
+
 def _reset_signals():
     # Uninstall the rich etc. exception handler
     sys.excepthook = sys.__excepthook__
@@ -477,6 +511,14 @@ class WatchedSubprocess:
     subprocess_logs_to_stdout: bool = False
     """Duplicate log messages to stdout, or only send them to ``self.process_log``."""
 
+    log_file: BinaryIO | None = attrs.field(default=None, repr=False)
+    """
+    The file ``self.process_log`` writes JSON lines to, if any.
+
+    JSON log lines from the subprocess which need no processing are appended to it as they are, see
+    ``[logging] task_log_passthrough``.
+    """
+
     start_time: float = attrs.field(factory=time.monotonic)
     """The start time of the child process."""
 
@@ -577,19 +619,20 @@ class WatchedSubprocess:
             selectors.EVENT_READ,
             self._create_log_forwarder(target_loggers, "task.stderr", log_level=logging.ERROR),
         )
-        self.selector.register(
-            logs,
-            selectors.EVENT_READ,
-            make_buffered_socket_reader(
-                process_log_messages_from_subprocess(target_loggers), on_close=self._on_socket_closed
-            ),
-        )
+        self.selector.register(logs, selectors.EVENT_READ, self._create_log_message_reader(target_loggers))
         self.selector.register(
             requests,
             selectors.EVENT_READ,
             length_prefixed_frame_reader(self.handle_requests(log), on_close=self._on_socket_closed),
         )
 
+    def _create_log_message_reader(self, loggers: tuple[FilteringBoundLogger, ...]):
+        """Create a socket handler that logs the JSON log lines of the subprocess."""
+        gen = process_log_messages_from_subprocess(loggers)
+        if self.log_file is not None and loggers == (self.process_log,):
+            return make_log_passthrough_reader(self.log_file, gen, on_close=self._on_socket_closed)
+        return make_buffered_socket_reader(gen, on_close=self._on_socket_closed)
+
     def _create_log_forwarder(self, loggers, name, log_level=logging.INFO) -> Callable[[socket], bool]:
         """Create a socket handler that forwards logs to a logger."""
         loggers = tuple(
@@ -784,31 +827,7 @@ class WatchedSubprocess:
         :param expect_signal: Signal not to log if the task exits with this code.
         :returns: The process exit code, or None if it's still alive
         """
-        # Ensure minimum timeout to prevent CPU spike with tight loop when timeout is 0 or negative
-        timeout = max(0.01, max_wait_time)
-        events = self.selector.select(timeout=timeout)
-        for key, _ in events:
-            # Retrieve the handler responsible for processing this file object (e.g., stdout, stderr)
-            socket_handler, on_close = key.data
-
-            # Example of handler behavior:
-            # If the subprocess writes "Hello, World!" to stdout:
-            # - `socket_handler` reads and processes the message.
-            # - If EOF is reached, the handler returns False to signal no more reads are expected.
-            # - BrokenPipeError should be caught and treated as if the handler returned false, similar
-            # to EOF case
-            try:
-                need_more = socket_handler(key.fileobj)
-            except (BrokenPipeError, ConnectionResetError):
-                need_more = False
-
-            # If the handler signals that the file object is no longer needed (EOF, closed, etc.)
-            # unregister it from the selector to stop monitoring; `wait()` blocks until all selectors
-            # are removed.
-            if not need_more:
-                sock: socket = key.fileobj  # type: ignore[assignment]
-                on_close(sock)
-                sock.close()
+        _service_selector(self.selector, max_wait_time)
 
         # Check if the subprocess has exited
         return self._check_subprocess_exit(raise_on_timeout=raise_on_timeout, expect_signal=expect_signal)
@@ -852,6 +871,35 @@ class WatchedSubprocess:
         return self._exit_code
 
 
+def _service_selector(selector: selectors.BaseSelector, max_wait_time: float) -> None:
+    """Wait for activity on the file objects registered in the selector, and call their handlers."""
+    # Ensure minimum timeout to prevent CPU spike with tight loop when timeout is 0 or negative
+    timeout = max(0.01, max_wait_time)
+    events = selector.select(timeout=timeout)
+    for key, _ in events:
+        # Retrieve the handler responsible for processing this file object (e.g., stdout, stderr)
+        socket_handler, on_close = key.data
+
+        # Example of handler behavior:
+        # If the subprocess writes "Hello, World!" to stdout:
+        # - `socket_handler` reads and processes the message.
+        # - If EOF is reached, the handler returns False to signal no more reads are expected.
+        # - BrokenPipeError should be caught and treated as if the handler returned false, similar
+        # to EOF case
+        try:
+            need_more = socket_handler(key.fileobj)
+        except (BrokenPipeError, ConnectionResetError):
+            need_more = False
+
+        # If the handler signals that the file object is no longer needed (EOF, closed, etc.)
+        # unregister it from the selector to stop monitoring; `wait()` blocks until all selectors
+        # are removed.
+        if not need_more:
+            sock: socket = key.fileobj  # type: ignore[assignment]
+            on_close(sock)
+            sock.close()
+
+
 _REMOTE_LOGGING_CONN_CACHE: dict[str, Connection | None] = {}
 
 
@@ -983,6 +1031,10 @@ class ActivitySubprocess(WatchedSubprocess):
     _task_end_time_monotonic: float | None = attrs.field(default=None, init=False)
     _rendered_map_index: str | None = attrs.field(default=None, init=False)
 
+    _heartbeat_multiplexer: socket | None = attrs.field(default=None, init=False)
+    """Connection to the heartbeat multiplexer of the host, see ``[workers] heartbeat_multiplexer``"""
+    _heartbeat_result_pending: bool = attrs.field(default=False, init=False)
+
     decoder: ClassVar[TypeAdapter[ToSupervisor]] = TypeAdapter(ToSupervisor)
 
     ti: RuntimeTI | None = None
@@ -998,16 +1050,80 @@ class ActivitySubprocess(WatchedSubprocess):
         target: Callable[[], None] = _subprocess_main,
         logger: FilteringBoundLogger | None = None,
         sentry_integration: str = "",
+        ti_context: TIRunContext | None = None,
+        fork_server: WarmDagProcess | None = None,
         **kwargs,
     ) -> Self:
-        """Fork and start a new subprocess to execute the given task."""
-        proc: Self = super().start(id=what.id, client=client, target=target, logger=logger, **kwargs)
+        """
+        Fork and start a new subprocess to execute the given task.
+
+        :param fork_server: Warm process without a Dag file to fork the task process from, rather than
+            forking it from this process, unless the warm process of its Dag file forks it.
+        """
+        ti_context = _run_context_from_scheduler(ti_context)
+        proc: Self | None = None
+        if target is _subprocess_main and _warm_dag_processes_enabled():
+            from airflow.sdk.execution_time.warm_dag_process import DagFileKey
+
+            key = DagFileKey(bundle_info.name, bundle_info.version, os.fspath(dag_rel_path))
+            if (warm_process := _get_warm_dag_process_pool().get(key)) is not None:
+                proc = cls._start_from_warm_dag_process(
+                    warm_process, id=what.id, client=client, logger=logger, **kwargs
+                )
+        if (
+            proc is None
+            and target is _subprocess_main
+            and fork_server is not None
+            and fork_server.is_ready(timeout=_FORK_SERVER_TIMEOUT)
+        ):
+            proc = cls._start_from_warm_dag_process(
+                fork_server, id=what.id, client=client, logger=logger, **kwargs
+            )
+        if proc is None:
+            proc = super().start(id=what.id, client=client, target=target, logger=logger, **kwargs)
         # Tell the task process what it needs to do!
         proc._on_child_started(
             ti=what,
             dag_rel_path=dag_rel_path,
             bundle_info=bundle_info,
             sentry_integration=sentry_integration,
+            ti_context=ti_context,
+        )
+        return proc
+
+    @classmethod
+    def _start_from_warm_dag_process(
+        cls,
+        warm_process: WarmDagProcess,
+        *,
+        logger: FilteringBoundLogger | None = None,
+        **constructor_kwargs,
+    ) -> Self | None:
+        """Start the task process as a fork of the warm process, or return None if it cannot fork it."""
+        child_stdout, read_stdout = socketpair()
+        child_stderr, read_stderr = socketpair()
+        child_requests, read_requests = socketpair()
+        child_logs, read_logs = socketpair()
+        try:
+            pid = warm_process.spawn([child_requests, child_stdout, child_stderr, child_logs])
+        finally:
+            # The task process has its own copies of the child ends now.
+            cls._close_unused_sockets(child_requests, child_stdout, child_stderr, child_logs)
+        if pid is None:
+            cls._close_unused_sockets(read_requests, read_stdout, read_stderr, read_logs)
+            return None
+
+        logger = logger or cast("FilteringBoundLogger", structlog.get_logger(logger_name="task").bind())
+        proc = cls(
+            pid=pid,
+            stdin=read_requests,
+            process=psutil.Process(pid),
+            process_log=logger,
+            start_time=time.monotonic(),
+            **constructor_kwargs,
+        )
+        proc._register_pipe_readers(
+            stdout=read_stdout, stderr=read_stderr, requests=read_requests, logs=read_logs
         )
         return proc
 
@@ -1018,6 +1134,7 @@ class ActivitySubprocess(WatchedSubprocess):
         dag_rel_path: str | os.PathLike[str],
         bundle_info,
         sentry_integration: str,
+        ti_context: TIRunContext | None = None,
     ) -> None:
         """Send startup message to the subprocess."""
         self.ti = ti  # type: ignore[assignment]
@@ -1026,7 +1143,10 @@ class ActivitySubprocess(WatchedSubprocess):
             # We've forked, but the task won't start doing anything until we send it the StartupDetails
             # message. But before we do that, we need to tell the server it's started (so it has the chance to
             # tell us "no, stop!" for any reason)
-            ti_context = self.client.task_instances.start(ti.id, self.pid, start_date)
+            if ti_context is None:
+                ti_context = self.client.task_instances.start(ti.id, self.pid, start_date)
+            else:
+                self.client.task_instances.claim(ti.id, self.pid, start_date)
             self._should_retry = ti_context.should_retry
             self._last_successful_heartbeat = time.monotonic()
         except Exception:
@@ -1059,8 +1179,18 @@ class ActivitySubprocess(WatchedSubprocess):
         try:
             self._monitor_subprocess()
         finally:
-            self.selector.close()
+            self._close()
 
+        return self._finish()
+
+    def _close(self) -> None:
+        self.selector.close()
+        if self._heartbeat_multiplexer is not None:
+            self._heartbeat_multiplexer.close()
+            self._heartbeat_multiplexer = None
+
+    def _finish(self) -> int:
+        """Report the final state of the task instance once its process has exited."""
         # self._monitor_subprocess() will set the exit code when the process has finished
         # If it hasn't, assume it's failed
         self._exit_code = self._exit_code if self._exit_code is not None else 1
@@ -1109,41 +1239,47 @@ class ActivitySubprocess(WatchedSubprocess):
         - Sends heartbeats to ensure the process is alive and checks if the subprocess has exited.
         """
         while self._exit_code is None or self._open_sockets:
-            last_heartbeat_ago = time.monotonic() - self._last_successful_heartbeat
-            # Monitor the task to see if it's done. Wait in a syscall (`select`) for as long as possible
-            # so we notice the subprocess finishing as quick as we can.
-            max_wait_time = max(
-                0,  # Make sure this value is never negative,
-                min(
-                    # Ensure we heartbeat _at most_ 75% through the task instance heartbeat timeout time
-                    HEARTBEAT_TIMEOUT - last_heartbeat_ago * 0.75,
-                    MIN_HEARTBEAT_INTERVAL,
-                ),
-            )
             # Block until events are ready or the timeout is reached
             # This listens for activity (e.g., subprocess output) on registered file objects
-            alive = self._service_subprocess(max_wait_time=max_wait_time) is None
-
-            if self._exit_code is not None and self._open_sockets:
-                if (
-                    self._process_exit_monotonic
-                    and time.monotonic() - self._process_exit_monotonic > SOCKET_CLEANUP_TIMEOUT
-                ):
-                    log.warning(
-                        "Process exited with open sockets; cleaning up after timeout",
-                        pid=self.pid,
-                        exit_code=self._exit_code,
-                        socket_types=list(self._open_sockets.values()),
-                        timeout_seconds=SOCKET_CLEANUP_TIMEOUT,
-                    )
-                    self._cleanup_open_sockets()
-
-            if alive:
-                # We don't need to heartbeat if the process has shutdown, as we are just finishing of reading the
-                # logs
-                self._send_heartbeat_if_needed()
-
-                self._handle_process_overtime_if_needed()
+            alive = self._service_subprocess(max_wait_time=self._max_wait_time()) is None
+            self._after_service(alive)
+
+    def _max_wait_time(self) -> float:
+        """Return how long to wait for activity of the subprocess before heartbeating."""
+        last_heartbeat_ago = time.monotonic() - self._last_successful_heartbeat
+        # Monitor the task to see if it's done. Wait in a syscall (`select`) for as long as possible
+        # so we notice the subprocess finishing as quick as we can.
+        return max(
+            0,  # Make sure this value is never negative,
+            min(
+                # Ensure we heartbeat _at most_ 75% through the task instance heartbeat timeout time
+                HEARTBEAT_TIMEOUT - last_heartbeat_ago * 0.75,
+                MIN_HEARTBEAT_INTERVAL,
+            ),
+        )
+
+    def _after_service(self, alive: bool) -> None:
+        """Clean up the sockets of the exited subprocess, or heartbeat for the running one."""
+        if self._exit_code is not None and self._open_sockets:
+            if (
+                self._process_exit_monotonic
+                and time.monotonic() - self._process_exit_monotonic > SOCKET_CLEANUP_TIMEOUT
+            ):
+                log.warning(
+                    "Process exited with open sockets; cleaning up after timeout",
+                    pid=self.pid,
+                    exit_code=self._exit_code,
+                    socket_types=list(self._open_sockets.values()),
+                    timeout_seconds=SOCKET_CLEANUP_TIMEOUT,
+                )
+                self._cleanup_open_sockets()
+
+        if alive:
+            # We don't need to heartbeat if the process has shutdown, as we are just finishing of reading the
+            # logs
+            self._send_heartbeat_if_needed()
+
+            self._handle_process_overtime_if_needed()
 
     def _handle_process_overtime_if_needed(self):
         """Handle termination of auxiliary processes if the task exceeds the configured overtime."""
@@ -1174,34 +1310,132 @@ class ActivitySubprocess(WatchedSubprocess):
             return
 
         self._last_heartbeat_attempt = time.monotonic()
+        if self._send_heartbeat_to_multiplexer():
+            # Its result is handled by _handle_heartbeat_result once the multiplexer got it
+            return
+        self._send_own_heartbeat()
+
+    def _send_own_heartbeat(self):
+        """Send the heartbeat of the task instance to the API server, rather than through the multiplexer."""
         try:
             self.client.task_instances.heartbeat(self.id, pid=self._process.pid)
-            # Update the last heartbeat time on success
-            self._last_successful_heartbeat = time.monotonic()
-
-            # Reset the counter on success
-            self.failed_heartbeats = 0
+            self._handle_heartbeat_success()
         except ServerResponseError as e:
             if e.response.status_code in {HTTPStatus.NOT_FOUND, HTTPStatus.CONFLICT}:
-                log.error(
-                    "Server indicated the task shouldn't be running anymore",
-                    detail=e.detail,
-                    status_code=e.response.status_code,
-                    ti_id=self.id,
-                )
-                self.process_log.error(
-                    "Server indicated the task shouldn't be running anymore. Terminating process",
-                    detail=e.detail,
-                )
-                self.kill(signal.SIGTERM, force=True)
-                self.process_log.error("Task killed!")
-                self._terminal_state = SERVER_TERMINATED
+                self._handle_heartbeat_rejected(e.response.status_code, e.detail)
             else:
                 # If we get any other error, we'll just log it and try again next time
                 self._handle_heartbeat_failures(e)
         except Exception as e:
             self._handle_heartbeat_failures(e)
 
+    def _handle_heartbeat_success(self):
+        # Update the last heartbeat time on success
+        self._last_successful_heartbeat = time.monotonic()
+
+        # Reset the counter on success
+        self.failed_heartbeats = 0
+
+    def _handle_heartbeat_rejected(self, status_code: int, detail):
+        log.error(
+            "Server indicated the task shouldn't be running anymore",
+            detail=detail,
+            status_code=status_code,
+            ti_id=self.id,
+        )
+        self.process_log.error(
+            "Server indicated the task shouldn't be running anymore. Terminating process",
+            detail=detail,
+        )
+        self.kill(signal.SIGTERM, force=True)
+        self.process_log.error("Task killed!")
+        self._terminal_state = SERVER_TERMINATED
+
+    def _send_heartbeat_to_multiplexer(self) -> bool:
+        """Send the heartbeat to the heartbeat multiplexer of the host, if enabled and there is one."""
+        # Clients with another transport, e.g. in-process or dry-run ones, cannot be multiplexed
+        if not HEARTBEAT_MULTIPLEXER or not isinstance(self.client._transport, httpx.HTTPTransport):
+            return False
+        from airflow.sdk.execution_time import heartbeat_multiplexer
+
+        if not heartbeat_multiplexer.is_supported():
+            return False
+        if self._heartbeat_multiplexer is None:
+            sock = heartbeat_multiplexer.connect(
+                str(self.client.base_url), batch_interval=HEARTBEAT_MULTIPLEXER_BATCH_INTERVAL
+            )
+            if sock is None:
+                return False
+            self._heartbeat_multiplexer = sock
+            self._heartbeat_result_pending = False
+            self.selector.register(
+                sock,
+                selectors.EVENT_READ,
+                (self._handle_heartbeat_result, self._on_heartbeat_multiplexer_closed),
+            )
+
+        if self._heartbeat_result_pending:
+            # The multiplexer did not send the result of the previous heartbeat yet, e.g. as it is stuck
+            log.warning("No heartbeat result from the multiplexer, sending the heartbeat directly")
+            return False
+        heartbeat = TIBatchHeartbeatInfo(
+            id=self.id,
+            hostname=get_hostname(),
+            pid=self._process.pid,
+            token=cast("BearerAuth", self.client.auth).token,
+        )
+        try:
+            self._heartbeat_multiplexer.send(heartbeat.model_dump_json().encode())
+        except OSError:
+            log.warning("Could not send heartbeat to the multiplexer", exc_info=True)
+            sock = self._heartbeat_multiplexer
+            self._on_heartbeat_multiplexer_closed(sock)
+            sock.close()
+            return False
+        self._heartbeat_result_pending = True
+        return True
+
+    def _handle_heartbeat_result(self, sock: socket) -> bool:
+        """Handle the result of a heartbeat sent through the multiplexer, like the response to our own."""
+        from airflow.sdk.execution_time.heartbeat_multiplexer import MAX_MESSAGE_SIZE
+
+        message = sock.recv(MAX_MESSAGE_SIZE)
+        if not message:
+            if self._heartbeat_result_pending:
+                # The process running the multiplexer exited, heartbeat again right away
+                self._last_heartbeat_attempt = 0
+            return False
+        self._heartbeat_result_pending = False
+        if self._terminal_state or self._exit_code is not None:
+            # The task finished since the heartbeat was sent
+            return True
+
+        response = json.loads(message)
+        if "error" in response:
+            log.warning(
+                "Heartbeat multiplexer failed, sending the heartbeat directly", error=response["error"]
+            )
+            self._send_own_heartbeat()
+            return True
+        result = TIBatchHeartbeatResult.model_validate(response)
+        if result.refreshed_token:
+            log.debug("Execution API issued us a refreshed Task token")
+            self.client.auth = BearerAuth(result.refreshed_token)
+        if result.status_code < 300:
+            self._handle_heartbeat_success()
+        elif result.status_code in {HTTPStatus.NOT_FOUND, HTTPStatus.CONFLICT}:
+            self._handle_heartbeat_rejected(result.status_code, result.detail)
+        else:
+            self._handle_heartbeat_failures(
+                RuntimeError(f"Heartbeat failed with status {result.status_code}: {result.detail}")
+            )
+        return True
+
+    def _on_heartbeat_multiplexer_closed(self, sock: socket):
+        with suppress(KeyError):
+            self.selector.unregister(sock)
+        self._heartbeat_multiplexer = None
+
     def _handle_heartbeat_failures(self, exc: Exception):
         """Increment the failed heartbeats counter and kill the process if too many failures."""
         self.failed_heartbeats += 1
@@ -1501,11 +1735,7 @@ class ActivitySubprocess(WatchedSubprocess):
             target_loggers += (log,)
 
         self.selector.register(
-            read_logs,
-            selectors.EVENT_READ,
-            make_buffered_socket_reader(
-                process_log_messages_from_subprocess(target_loggers), on_close=self._on_socket_closed
-            ),
+            read_logs, selectors.EVENT_READ, self._create_log_message_reader(target_loggers)
         )
         # We don't explicitly close the old log socket, that will get handled for us if/when the other end is
         # closed (such as `sudo` would do for us automatically.) This also means that this feature _can_ be
@@ -1821,6 +2051,114 @@ def make_buffered_socket_reader(
     return cb, on_close
 
 
+def make_log_passthrough_reader(
+    log_file: BinaryIO,
+    gen: Generator[None, bytes | bytearray, None],
+    on_close: Callable[[socket], None],
+    buffer_size: int = 65536,
+):
+    """
+    Read JSON log lines like :func:`make_buffered_socket_reader`, appending most to the log file as-is.
+
+    Only the lines which need processing (see :func:`_needs_processing`) are sent to ``gen`` to be decoded and
+    logged; the others are written straight from the read buffer, and the log file is flushed once per read.
+    Both end up in ``log_file``, in the order they were read, as long as ``gen`` logs to it.
+    """
+    buffer = bytearray()
+    read_buffer = bytearray(buffer_size)
+
+    # We need to start up the generator to get it to the point it's at waiting on the yield
+    next(gen)
+
+    def cb(sock: socket):
+        n_received = sock.recv_into(read_buffer)
+
+        if not n_received:
+            # If no data is returned, the connection is closed. Return whatever is left in the buffer
+            if len(buffer):
+                with suppress(StopIteration):
+                    gen.send(buffer)
+            return False
+
+        buffer.extend(memoryview(read_buffer)[:n_received])
+
+        start = 0
+        try:
+            with memoryview(buffer) as view:
+                # We could have read multiple lines in one go, handle them all
+                while end := buffer.find(b"\n", start) + 1:
+                    with view[start:end] as line:
+                        if _needs_processing(line):
+                            gen.send(bytes(line))
+                        else:
+                            log_file.write(line)
+                    start = end
+        except StopIteration:
+            return False
+        finally:
+            del buffer[:start]
+            log_file.flush()
+
+        return True
+
+    return cb, on_close
+
+
+class _LogLineFields(msgspec.Struct):
+    """The fields of a JSON log line from a task process which tell whether it needs processing."""
+
+    level: str
+    logger: str
+
+
+_log_line_decoder = msgspec.json.Decoder(_LogLineFields)
+
+# Levels which processing keeps as they are, e.g. it drops "notset" lines and turns "warn" into "warning"
+_UNPROCESSED_LEVELS = frozenset({"debug", "info", "warning", "error", "critical"})
+
+# By masker, as the tasks of a MultiTaskSupervisor each have their own
+_redaction_pattern_cache: weakref.WeakKeyDictionary[SecretsMasker, tuple[tuple, re.Pattern[bytes]]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _redaction_pattern() -> re.Pattern[bytes]:
+    """
+    Return a pattern matching the raw JSON log lines which processing them might change.
+
+    It errs on the side of matching, i.e. it matches lines with:
+
+    - any escape sequence, as the masker looks for secrets in the unescaped strings,
+    - an exception, as processing renames the field,
+    - something looking like a JWT, which processing redacts,
+    - a sensitive field name anywhere, as the masker hides the values of such fields,
+    - a secret registered with the masker.
+    """
+    from airflow.sdk._shared.secrets_masker import _secrets_masker
+
+    masker = _secrets_masker()
+    state = (masker.replacer, masker.hide_sensitive_var_conn_fields, tuple(masker.sensitive_variables_fields))
+    if (cached := _redaction_pattern_cache.get(masker)) is None or cached[0] != state:
+        alternatives = [rb"\\", rb'"exception":', rb"eyJ"]
+        if masker.hide_sensitive_var_conn_fields:
+            alternatives.extend(re.escape(field.encode()) for field in masker.sensitive_variables_fields)
+        alternatives.extend(pattern.encode() for pattern in masker.patterns)
+        cached = (state, re.compile(b"|".join(alternatives), re.IGNORECASE))
+        _redaction_pattern_cache[masker] = cached
+    return cached[1]
+
+
+def _needs_processing(line: memoryview) -> bool:
+    """Whether a JSON log line from a task process would be changed by logging it, or is not valid."""
+    if _redaction_pattern().search(line):
+        return True
+    try:
+        fields = _log_line_decoder.decode(line)
+    except msgspec.DecodeError:
+        return True
+    return fields.level not in _UNPROCESSED_LEVELS
+
+
 def length_prefixed_frame_reader(
     gen: Generator[None, _RequestFrame, None], on_close: Callable[[socket], None]
 ):
@@ -1968,6 +2306,27 @@ def ensure_secrets_backend_loaded() -> list[BaseSecretsBackend]:
     return ensure_secrets_loaded(default_backends=fallback_backends)
 
 
+def _run_context_from_scheduler(ti_context) -> TIRunContext | None:
+    """Return the run context the scheduler sent along with a task, unless this Task SDK cannot use it."""
+    if ti_context is None or isinstance(ti_context, TIRunContext):
+        return ti_context
+    try:
+        return TIRunContext.model_validate(ti_context, from_attributes=True)
+    except ValidationError:
+        log.warning("Ignoring the run context sent with the task, fetching it from the server", exc_info=True)
+        return None
+
+
+def _task_log_passthrough_enabled() -> bool:
+    from airflow.sdk.log import load_remote_log_handler
+
+    if not conf.getboolean("logging", "task_log_passthrough", fallback=False):
+        return False
+    # The processors of remote log handlers need the log events of each line
+    remote = load_remote_log_handler()
+    return not (remote and getattr(remote, "processors", None))
+
+
 def _configure_logging(log_path: str, client: Client) -> tuple[FilteringBoundLogger, BinaryIO | TextIO]:
     # If we are told to write logs to a file, redirect the task logger to it. Make sure we append to the
     # file though, otherwise when we resume we would lose the logs from the start->deferral segment if it
@@ -1993,6 +2352,32 @@ def _configure_logging(log_path: str, client: Client) -> tuple[FilteringBoundLog
     return logger, log_file_descriptor
 
 
+def _validate_server_url(server: str | None) -> None:
+    if not server:
+        raise ValueError("Invalid execution API server URL. Please ensure that a valid URL is configured.")
+
+    try:
+        parsed_url = urlparse(server)
+    except Exception as e:
+        raise ValueError(
+            f"Invalid execution API server URL '{server}': {e}. Please ensure that a valid URL is configured."
+        ) from e
+
+    if parsed_url.scheme not in ("http", "https"):
+        raise ValueError(
+            f"Invalid execution API server URL '{server}': "
+            "URL must use http:// or https:// scheme. "
+            "Please ensure that a valid URL is configured."
+        )
+
+    if not parsed_url.netloc:
+        raise ValueError(
+            f"Invalid execution API server URL '{server}': "
+            "URL must include a valid host. "
+            "Please ensure that a valid URL is configured."
+        )
+
+
 def supervise(
     *,
     ti: TaskInstance,
@@ -2005,6 +2390,7 @@ def supervise(
     subprocess_logs_to_stdout: bool = False,
     client: Client | None = None,
     sentry_integration: str = "",
+    ti_context: TIRunContext | None = None,
 ) -> int:
     """
     Run a single task execution to completion.
@@ -2020,6 +2406,8 @@ def supervise(
     :param client: Optional preconfigured client for communication with the server (Mostly for tests).
     :param sentry_integration: If the executor has a Sentry integration, import
         path to a callable to initialize it (empty means no integration).
+    :param ti_context: The run context of the task instance, if the scheduler sent it along with the task. The
+        task instance is then only claimed from the API server, instead of fetching its run context.
     :return: Exit code of the process.
     :raises ValueError: If server URL is empty or invalid.
     """
@@ -2032,32 +2420,7 @@ def supervise(
             raise ValueError(f"Can only specify one of {server=} or {dry_run=}")
 
         if not dry_run:
-            if not server:
-                raise ValueError(
-                    "Invalid execution API server URL. Please ensure that a valid URL is configured."
-                )
-
-            try:
-                parsed_url = urlparse(server)
-            except Exception as e:
-                raise ValueError(
-                    f"Invalid execution API server URL '{server}': {e}. "
-                    "Please ensure that a valid URL is configured."
-                ) from e
-
-            if parsed_url.scheme not in ("http", "https"):
-                raise ValueError(
-                    f"Invalid execution API server URL '{server}': "
-                    "URL must use http:// or https:// scheme. "
-                    "Please ensure that a valid URL is configured."
-                )
-
-            if not parsed_url.netloc:
-                raise ValueError(
-                    f"Invalid execution API server URL '{server}': "
-                    "URL must include a valid host. "
-                    "Please ensure that a valid URL is configured."
-                )
+            _validate_server_url(server)
 
     if not dag_rel_path:
         raise ValueError("dag_path is required")
@@ -2086,6 +2449,10 @@ def supervise(
 
     reset_secrets_masker()
 
+    log_file: BinaryIO | None = None
+    if log_file_descriptor and _task_log_passthrough_enabled():
+        log_file = cast("BinaryIO", log_file_descriptor)
+
     try:
         process = ActivitySubprocess.start(
             dag_rel_path=dag_rel_path,
@@ -2095,6 +2462,8 @@ def supervise(
             bundle_info=bundle_info,
             subprocess_logs_to_stdout=subprocess_logs_to_stdout,
             sentry_integration=sentry_integration,
+            log_file=log_file,
+            ti_context=ti_context,
         )
 
         exit_code = process.wait()
@@ -2113,3 +2482,334 @@ def supervise(
         if close_client and client:
             with suppress(Exception):
                 client.close()
+
+
+class _TaskSelector(selectors.BaseSelector):
+    """
+    The file objects of one task in the selector shared by the tasks of a :class:`MultiTaskSupervisor`.
+
+    Their handlers mask the secrets of the task with its own masker. Closing it unregisters the file
+    objects of the task, and leaves the shared selector open.
+    """
+
+    def __init__(self, selector: selectors.BaseSelector, secrets_masker: SecretsMasker):
+        self._selector = selector
+        self._secrets_masker = secrets_masker
+        self._keys: dict = {}
+
+    def _with_secrets_masker(
+        self, callback: Callable[[socket], bool | None]
+    ) -> Callable[[socket], bool | None]:
+        from airflow.sdk._shared.secrets_masker import scoped_secrets_masker
+
+        def handler(sock: socket) -> bool | None:
+            with scoped_secrets_masker(self._secrets_masker):
+                return callback(sock)
+
+        return handler
+
+    def register(self, fileobj, events, data=None):
+        socket_handler, on_close = data
+        data = (self._with_secrets_masker(socket_handler), self._with_secrets_masker(on_close))
+        key = self._selector.register(fileobj, events, data)
+        self._keys[fileobj] = key
+        return key
+
+    def unregister(self, fileobj):
+        key = self._selector.unregister(fileobj)
+        self._keys.pop(fileobj, None)
+        return key
+
+    def select(self, timeout=None):
+        # This handles the events of the other tasks too, e.g. while waiting for a killed task to exit
+        return self._selector.select(timeout)
+
+    def get_map(self):
+        return MappingProxyType(self._keys)
+
+    def close(self):
+        for fileobj in list(self._keys):
+            with suppress(KeyError, ValueError):
+                self._selector.unregister(fileobj)
+        self._keys.clear()
+
+
+@attrs.define(kw_only=True)
+class _SupervisedTask:
+    ti: TaskInstance
+    bundle_info: BundleInfo
+    dag_rel_path: str | os.PathLike[str]
+    token: str
+    log_path: str | None
+    sentry_integration: str
+    ti_context: TIRunContext | None = None
+    future: Future[int] = attrs.field(factory=Future)
+    process: ActivitySubprocess | None = None
+    log_file_descriptor: BinaryIO | TextIO | None = None
+    start_time: float = 0
+    secrets_masker: SecretsMasker | None = None
+
+
+# How long a MultiTaskSupervisor waits for its fork server to start before forking a task process itself
+_FORK_SERVER_TIMEOUT = 30.0
+
+
+# Threads of a MultiTaskSupervisor reporting the final state of finished tasks
+_FINISHER_THREADS = 4
+
+
+class MultiTaskSupervisor:
+    """
+    Supervise the processes of many tasks from a single process.
+
+    Each task runs in a process of its own, with its own log file, token and heartbeats, as with
+    :func:`supervise`, but a single selector loop, in a thread of this process, monitors all of them, and
+    they share the connection pool of one API client and the secrets backends loaded in this process. This
+    saves running a supervisor process per running task. See ``[workers] tasks_per_supervisor``.
+
+    As this process runs threads, which may hold locks while it forks, e.g. of the logging module, the task
+    processes are forked by a fork server: a warm process without a Dag file, which has no other threads.
+    The secrets each task registers are only masked in its own logs, with a masker of its own.
+
+    :param server: Base URL of the API server.
+    :param max_tasks: How many tasks to run at once. Tasks submitted beyond that wait for others to finish.
+    :param subprocess_logs_to_stdout: Should task logs also be sent to stdout via the main logger.
+    """
+
+    def __init__(self, *, server: str, max_tasks: int, subprocess_logs_to_stdout: bool = False):
+        from airflow.sdk._shared.secrets_masker import reset_secrets_masker
+
+        _validate_server_url(server)
+        _make_process_nondumpable()
+
+        self.server = server
+        self.max_tasks = max_tasks
+        self.subprocess_logs_to_stdout = subprocess_logs_to_stdout
+
+        # The tasks authenticate with their own tokens, through clients sharing the transport of this one
+        limits = httpx.Limits(max_keepalive_connections=1, max_connections=10)
+        self._client = Client(base_url=server, limits=limits, token="")
+        log.debug("Connecting to execution API server", server=server)
+
+        backends = ensure_secrets_backend_loaded()
+        log.info(
+            "Secrets backends loaded for worker",
+            count=len(backends),
+            backend_classes=[type(b).__name__ for b in backends],
+        )
+        reset_secrets_masker()
+        # Started before the threads of this supervisor
+        self._fork_server = self._start_fork_server()
+
+        self._selector = selectors.DefaultSelector()
+        self._wakeup, self._wakeup_signal = socketpair()
+        self._selector.register(self._wakeup, selectors.EVENT_READ, (self._on_wakeup, lambda sock: None))
+        self._lock = threading.Lock()
+        self._submitted: deque[_SupervisedTask] = deque()
+        self._running: list[_SupervisedTask] = []
+        self._shutdown = False
+        self._thread: threading.Thread | None = None
+        # Reports the final state of finished tasks and uploads their logs, which would otherwise hold up
+        # the selector loop of the running tasks
+        self._finisher = ThreadPoolExecutor(
+            max_workers=_FINISHER_THREADS, thread_name_prefix="multi-task-supervisor-finish"
+        )
+
+    def submit(
+        self,
+        *,
+        ti: TaskInstance,
+        bundle_info: BundleInfo,
+        dag_rel_path: str | os.PathLike[str],
+        token: str,
+        log_path: str | None = None,
+        sentry_integration: str = "",
+        ti_context: TIRunContext | None = None,
+    ) -> Future[int]:
+        """
+        Run a task instance to completion.
+
+        The parameters are the same as for :func:`supervise`.
+
+        :return: A future of the exit code of the task process.
+        """
+        if not dag_rel_path:
+            raise ValueError("dag_path is required")
+
+        task = _SupervisedTask(
+            ti=ti,
+            bundle_info=bundle_info,
+            dag_rel_path=dag_rel_path,
+            token=token,
+            log_path=log_path,
+            sentry_integration=sentry_integration,
+            ti_context=ti_context,
+        )
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("Cannot submit tasks to a supervisor which was shut down")
+            self._submitted.append(task)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="multi-task-supervisor", daemon=True)
+                self._thread.start()
+        self._wakeup_signal.send(b"\0")
+        return task.future
+
+    def shutdown(self) -> None:
+        """Wait for the submitted tasks to finish, and stop supervising."""
+        with self._lock:
+            self._shutdown = True
+            thread = self._thread
+        if thread is not None:
+            self._wakeup_signal.send(b"\0")
+            thread.join()
+        self._finisher.shutdown(wait=True)
+        if self._fork_server is not None:
+            self._fork_server.stop()
+        self._selector.close()
+        self._wakeup.close()
+        self._wakeup_signal.close()
+        with suppress(Exception):
+            self._client.close()
+
+    @staticmethod
+    def _start_fork_server() -> WarmDagProcess | None:
+        from airflow.sdk.execution_time.warm_dag_process import WarmDagProcess
+
+        if not WarmDagProcess.is_supported():
+            return None
+        fork_server = WarmDagProcess(None)
+        try:
+            fork_server.start()
+        except OSError:
+            log.warning("Could not start the fork server; forking task processes from the supervisor")
+            return None
+        return fork_server
+
+    def _get_fork_server(self) -> WarmDagProcess | None:
+        if self._fork_server is not None and self._fork_server.failed:
+            log.warning("Fork server failed; restarting it")
+            self._fork_server = self._start_fork_server()
+        return self._fork_server
+
+    def _on_wakeup(self, sock: socket) -> bool:
+        sock.recv(BUFFER_SIZE)
+        return True
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if self._shutdown and not self._submitted and not self._running:
+                    return
+            self._start_submitted()
+            timeout = min((task.process._max_wait_time() for task in self._running), default=None)
+            try:
+                # Without running tasks, wait until some are submitted
+                _service_selector(self._selector, MIN_HEARTBEAT_INTERVAL if timeout is None else timeout)
+            except Exception:
+                log.exception("Failed to handle the activity of task processes")
+            for task in list(self._running):
+                self._monitor(task)
+
+    def _start_submitted(self) -> None:
+        while len(self._running) < self.max_tasks:
+            with self._lock:
+                if not self._submitted:
+                    return
+                task = self._submitted.popleft()
+            try:
+                self._start(task)
+            except Exception as e:
+                log.exception("Failed to start task", task_instance_id=str(task.ti.id))
+                self._close_log_file(task)
+                task.future.set_exception(e)
+            else:
+                self._running.append(task)
+
+    def _start(self, task: _SupervisedTask) -> None:
+        from airflow.sdk._shared.secrets_masker import _secrets_masker, scoped_secrets_masker
+
+        # Configured like the masker of this process, which has none of the secrets of the tasks
+        task.secrets_masker = _secrets_masker().copy_settings()
+        with scoped_secrets_masker(task.secrets_masker):
+            self._start_process(task)
+
+    def _start_process(self, task: _SupervisedTask) -> None:
+        # Tasks cannot share a client, as each one authenticates with its own token. Closing them would
+        # close the shared transport, so they are not closed.
+        client = Client(base_url=self.server, token=task.token, transport=self._client._transport)
+        task.start_time = time.monotonic()
+
+        logger: FilteringBoundLogger | None = None
+        log_file: BinaryIO | None = None
+        if task.log_path:
+            logger, task.log_file_descriptor = _configure_logging(task.log_path, client)
+            if _task_log_passthrough_enabled():
+                log_file = cast("BinaryIO", task.log_file_descriptor)
+
+        task.process = ActivitySubprocess.start(
+            dag_rel_path=task.dag_rel_path,
+            what=task.ti,
+            client=client,
+            logger=logger,
+            bundle_info=task.bundle_info,
+            subprocess_logs_to_stdout=self.subprocess_logs_to_stdout,
+            sentry_integration=task.sentry_integration,
+            selector=_TaskSelector(self._selector, task.secrets_masker),
+            log_file=log_file,
+            ti_context=task.ti_context,
+            fork_server=self._get_fork_server(),
+        )
+
+    def _monitor(self, task: _SupervisedTask) -> None:
+        from airflow.sdk._shared.secrets_masker import scoped_secrets_masker
+
+        with scoped_secrets_masker(cast("SecretsMasker", task.secrets_masker)):
+            self._monitor_process(task)
+
+    def _monitor_process(self, task: _SupervisedTask) -> None:
+        process = cast("ActivitySubprocess", task.process)
+        try:
+            alive = process._check_subprocess_exit() is None
+            process._after_service(alive)
+            if process._exit_code is None or process._open_sockets:
+                return
+        except Exception as e:
+            log.exception("Failed to supervise task", task_instance_id=str(task.ti.id))
+            with suppress(Exception):
+                process.kill(signal.SIGKILL)
+            self._running.remove(task)
+            process._close()
+            self._close_log_file(task)
+            task.future.set_exception(e)
+            return
+
+        self._running.remove(task)
+        process._close()
+        self._finisher.submit(self._finish, task, process)
+
+    def _finish(self, task: _SupervisedTask, process: ActivitySubprocess) -> None:
+        from airflow.sdk._shared.secrets_masker import scoped_secrets_masker
+
+        try:
+            with scoped_secrets_masker(cast("SecretsMasker", task.secrets_masker)):
+                exit_code = process._finish()
+        except Exception as e:
+            task.future.set_exception(e)
+            return
+        finally:
+            self._close_log_file(task)
+        log.info(
+            "Task finished",
+            task_instance_id=str(task.ti.id),
+            exit_code=exit_code,
+            duration=time.monotonic() - task.start_time,
+            final_state=process.final_state,
+        )
+        task.future.set_result(exit_code)
+
+    @staticmethod
+    def _close_log_file(task: _SupervisedTask) -> None:
+        if task.log_file_descriptor:
+            task.log_file_descriptor.close()
+            task.log_file_descriptor = None
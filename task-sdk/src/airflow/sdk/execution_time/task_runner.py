@@ -750,23 +750,29 @@ def parse(what: StartupDetails, log: Logger) -> RuntimeTaskInstance:
     # TODO: Task-SDK:
     # Using BundleDagBag here is about 98% wrong, but it'll do for now
     from airflow.dag_processing.dagbag import BundleDagBag
+    from airflow.sdk.execution_time.warm_dag_process import DagFileKey, get_parsed_dag_file
 
     bundle_info = what.bundle_info
-    bundle_instance = DagBundlesManager().get_bundle(
-        name=bundle_info.name,
-        version=bundle_info.version,
-    )
-    bundle_instance.initialize()
-    _verify_bundle_access(bundle_instance, log)
-
-    dag_absolute_path = os.fspath(Path(bundle_instance.path, what.dag_rel_path))
-    bag = BundleDagBag(
-        dag_folder=dag_absolute_path,
-        safe_mode=False,
-        load_op_links=False,
-        bundle_path=bundle_instance.path,
-        bundle_name=bundle_info.name,
-    )
+    # Forked from a warm process which parsed the Dag file already
+    if parsed := get_parsed_dag_file(DagFileKey(bundle_info.name, bundle_info.version, what.dag_rel_path)):
+        bundle_instance, bag = parsed
+        _verify_bundle_access(bundle_instance, log)
+    else:
+        bundle_instance = DagBundlesManager().get_bundle(
+            name=bundle_info.name,
+            version=bundle_info.version,
+        )
+        bundle_instance.initialize()
+        _verify_bundle_access(bundle_instance, log)
+
+        dag_absolute_path = os.fspath(Path(bundle_instance.path, what.dag_rel_path))
+        bag = BundleDagBag(
+            dag_folder=dag_absolute_path,
+            safe_mode=False,
+            load_op_links=False,
+            bundle_path=bundle_instance.path,
+            bundle_name=bundle_info.name,
+        )
     if TYPE_CHECKING:
         assert what.ti.dag_id
 
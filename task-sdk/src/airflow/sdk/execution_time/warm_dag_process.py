@@ -0,0 +1,373 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Warm processes that fork task processes with their Dag file already parsed.
+
+By default the process forked for each task instance parses the whole Dag file of the task, only to
+pick one operator out of it, which for large Dag files with heavy top-level imports dominates the
+startup time of short tasks. With ``[workers] warm_dag_processes`` the supervisor keeps, per Dag
+bundle version and Dag file, a warm process: a fresh interpreter which parses the Dag file once,
+freezes its heap with ``gc.freeze()`` and then forks the task processes on behalf of the supervisor.
+The task processes find their Dag and operator already built, and share the memory of the warm
+process until they write to it.
+
+Task processes are double-forked from the warm process, so that they are re-parented to the
+supervisor -- which is a child subreaper only while it waits for the warm process to fork one -- and
+supervised exactly like the task processes it forks itself. Other orphaned descendants, e.g. processes
+started by tasks, are still re-parented to init, which reaps them.
+
+Warm processes are only used for Dag bundles with versions, whose files do not change: bundles
+without versions are refreshed for each task, which can change the Dag file as well as any module it
+imports. Dag files which the warm process cannot parse without errors, e.g. because their top-level
+code fetches Variables, which needs a supervisor, are parsed by each task process as usual. This is
+only supported on Linux; elsewhere, and while a warm process is parsing its Dag file, task processes
+are forked from the supervisor.
+
+A warm process without a Dag file, which parses nothing, serves as the fork server of a supervisor
+running the tasks of many task instances in threads: forking a process while other threads hold locks,
+e.g. of the logging module, can deadlock the forked process, while the warm process has no other threads.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import os
+import select
+import socket
+import subprocess
+import sys
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, NamedTuple, NoReturn
+
+import structlog
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from airflow.dag_processing.bundles.base import BaseDagBundle
+    from airflow.dag_processing.dagbag import BundleDagBag
+
+log = structlog.get_logger(__name__)
+
+_PR_SET_CHILD_SUBREAPER = 36
+_MAX_MESSAGE_SIZE = 65536
+_NUM_SOCKETS = 4
+_SPAWN_TIMEOUT = 10.0
+_DEFAULT_TARGET = "airflow.sdk.execution_time.supervisor._subprocess_main"
+
+
+class DagFileKey(NamedTuple):
+    """The Dag file a warm process parsed."""
+
+    bundle_name: str
+    bundle_version: str | None
+    dag_rel_path: str
+
+
+class _ParsedDagFile(NamedTuple):
+    key: DagFileKey
+    bundle: BaseDagBundle
+    dag_bag: BundleDagBag
+
+
+_parsed_dag_file: _ParsedDagFile | None = None
+"""The Dag file parsed by the warm process, inherited by the task processes forked from it"""
+
+
+def _set_child_subreaper(enabled: bool) -> None:
+    """Start or stop becoming the parent of orphaned descendants, such as task processes of warm processes."""
+    import ctypes
+
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.prctl(_PR_SET_CHILD_SUBREAPER, int(enabled), 0, 0, 0) != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, f"prctl(PR_SET_CHILD_SUBREAPER) failed: {os.strerror(errno)}")
+
+
+def get_parsed_dag_file(key: DagFileKey) -> tuple[BaseDagBundle, BundleDagBag] | None:
+    """Return the bundle and the Dags of the Dag file, if the warm process this was forked from parsed it."""
+    # Without a bundle version, the bundle must be refreshed, so the Dag file is parsed again
+    if key.bundle_version is not None and _parsed_dag_file is not None and _parsed_dag_file.key == key:
+        return _parsed_dag_file.bundle, _parsed_dag_file.dag_bag
+    return None
+
+
+def _parse_dag_file(key: DagFileKey) -> tuple[BaseDagBundle, BundleDagBag]:
+    from airflow.dag_processing.bundles.manager import DagBundlesManager
+    from airflow.dag_processing.dagbag import BundleDagBag
+
+    bundle = DagBundlesManager().get_bundle(name=key.bundle_name, version=key.bundle_version)
+    bundle.initialize()
+    dag_bag = BundleDagBag(
+        dag_folder=os.fspath(bundle.path / key.dag_rel_path),
+        safe_mode=False,
+        load_op_links=False,
+        bundle_path=bundle.path,
+        bundle_name=key.bundle_name,
+    )
+    return bundle, dag_bag
+
+
+class WarmDagProcess:
+    """
+    Handle on the warm process of a Dag file, used by the supervisor.
+
+    :param key: The Dag file the warm process parses, or None for a fork server, which parses nothing.
+    :param target: Import path of the function the forked processes run, the task runner by default.
+    """
+
+    def __init__(self, key: DagFileKey | None, target: str = _DEFAULT_TARGET):
+        self.key = key
+        self.target = target
+        self._log_fields: dict[str, Any] = key._asdict() if key is not None else {}
+        self._process: subprocess.Popen | None = None
+        self._control: socket.socket | None = None
+        self._ready = False
+        self.failed = False
+        """Whether the warm process could not parse the Dag file, or exited"""
+
+    @staticmethod
+    def is_supported() -> bool:
+        return sys.platform == "linux" and hasattr(socket, "send_fds")
+
+    @property
+    def pid(self) -> int | None:
+        return self._process.pid if self._process is not None else None
+
+    def start(self) -> None:
+        """Start the warm process; it can fork task processes once it has parsed the Dag file."""
+        control, child_control = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        with child_control:
+            self._process = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "airflow.sdk.execution_time.warm_dag_process",
+                    str(child_control.fileno()),
+                    json.dumps({"key": self._log_fields or None, "target": self.target}),
+                ],
+                pass_fds=(child_control.fileno(),),
+                stdin=subprocess.DEVNULL,
+            )
+        self._control = control
+
+    def stop(self) -> None:
+        """Stop the warm process. Task processes already forked from it are not affected."""
+        if self._control is not None:
+            self._control.close()
+            self._control = None
+        if self._process is not None:
+            self._process.kill()
+            self._process.wait()
+            self._process = None
+        self._ready = False
+
+    def _fail(self, reason: str, **kwargs) -> None:
+        log.warning(reason, **self._log_fields, **kwargs)
+        self.failed = True
+        self.stop()
+
+    def is_ready(self, timeout: float = 0) -> bool:
+        """Whether the warm process can fork task processes, waiting up to ``timeout`` seconds for it."""
+        if self._ready:
+            return True
+        if self._control is None:
+            return False
+        if timeout:
+            select.select([self._control], [], [], timeout)
+        try:
+            message = self._control.recv(_MAX_MESSAGE_SIZE, socket.MSG_DONTWAIT)
+        except BlockingIOError:
+            return False
+        except OSError:
+            message = b""
+        if not message:
+            self._fail("Warm Dag process exited before it was ready")
+            return False
+        response: dict[str, Any] = json.loads(message)
+        if "error" in response:
+            self._fail("Warm Dag process could not parse the Dag file", error=response["error"])
+            return False
+        self._ready = True
+        log.info("Warm Dag process ready", pid=self.pid, **self._log_fields)
+        return True
+
+    def spawn(self, sockets: Sequence[socket.socket]) -> int | None:
+        """
+        Fork a task process from the warm process.
+
+        :param sockets: The child ends of the requests, stdout, stderr and logs sockets of the process.
+        :return: The pid of the task process, or None if the warm process cannot fork it.
+        """
+        if not self.is_ready():
+            return None
+        if TYPE_CHECKING:
+            assert self._control is not None
+        try:
+            # The warm process reaps the intermediate process before it answers, so the task process has
+            # been re-parented to the supervisor by then. The supervisor does not reap processes it does
+            # not know about, so it must not adopt the orphans of its task processes.
+            _set_child_subreaper(True)
+            try:
+                socket.send_fds(self._control, [b"{}"], [sock.fileno() for sock in sockets])
+                readable, _, _ = select.select([self._control], [], [], _SPAWN_TIMEOUT)
+                if not readable:
+                    raise TimeoutError("Warm Dag process did not answer")
+                if not (message := self._control.recv(_MAX_MESSAGE_SIZE)):
+                    raise ConnectionError("Warm Dag process exited")
+            finally:
+                _set_child_subreaper(False)
+            response: dict[str, Any] = json.loads(message)
+        except (OSError, ValueError):
+            self._fail("Warm Dag process failed", exc_info=True)
+            return None
+
+        if "error" in response:
+            self._fail("Warm Dag process could not fork a task process", error=response["error"])
+            return None
+        return response["pid"]
+
+
+class WarmDagProcessPool:
+    """
+    The warm processes of the supervisor, by Dag file, least recently used first.
+
+    :param max_size: Maximum number of warm processes; the least recently used one is stopped to start
+        a new one.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max(max_size, 1)
+        self._processes: OrderedDict[DagFileKey, WarmDagProcess] = OrderedDict()
+
+    def get(self, key: DagFileKey) -> WarmDagProcess | None:
+        """Return the warm process of a Dag file, starting it if needed, or None if it cannot be used."""
+        if key.bundle_version is None:
+            # The bundle is refreshed for each task, so the code the warm process parsed may be outdated
+            return None
+        if (process := self._processes.get(key)) is not None:
+            self._processes.move_to_end(key)
+            # The Dag file of a bundle version does not change, so parsing it would fail again
+            return None if process.failed else process
+
+        process = WarmDagProcess(key)
+        try:
+            process.start()
+        except OSError:
+            log.warning("Could not start warm Dag process", **key._asdict(), exc_info=True)
+            return None
+        self._processes[key] = process
+        while len(self._processes) > self.max_size:
+            _, evicted = self._processes.popitem(last=False)
+            evicted.stop()
+        return process
+
+    def stop(self) -> None:
+        for process in self._processes.values():
+            process.stop()
+        self._processes.clear()
+
+
+def _task_process_main(control: socket.socket, fds: list[int], target: str) -> NoReturn:
+    from airflow.sdk.execution_time.supervisor import _fork_main
+    from airflow.sdk.module_loading import import_string
+
+    control.close()
+    requests, stdout, stderr, logs = (socket.socket(fileno=fd) for fd in fds)
+    try:
+        _fork_main(requests, stdout, stderr, logs.fileno(), import_string(target))
+    finally:
+        os._exit(124)
+
+
+def _fork_task_process(control: socket.socket, fds: list[int], target: str) -> int:
+    """Double-fork a task process, so that it is re-parented to the supervisor, and return its pid."""
+    read_pid, write_pid = os.pipe()
+    intermediate = os.fork()
+    if intermediate == 0:
+        os.close(read_pid)
+        try:
+            pid = os.fork()
+        except BaseException:
+            os._exit(1)
+        if pid == 0:
+            os.close(write_pid)
+            _task_process_main(control, fds, target)
+        os.write(write_pid, str(pid).encode())
+        os._exit(0)
+
+    os.close(write_pid)
+    with os.fdopen(read_pid, "rb") as pipe:
+        pid_bytes = pipe.read()
+    os.waitpid(intermediate, 0)
+    if not pid_bytes:
+        raise RuntimeError("Could not fork a task process")
+    return int(pid_bytes)
+
+
+def _warm_process_main(control_fd: int, arguments: dict[str, Any]) -> NoReturn:
+    from airflow.sdk.execution_time.supervisor import block_orm_access
+
+    global _parsed_dag_file
+
+    control = socket.socket(fileno=control_fd)
+    target = arguments["target"]
+    # The Dag file is user code, like in the task processes
+    block_orm_access()
+    if arguments["key"] is not None:
+        key = DagFileKey(**arguments["key"])
+        try:
+            bundle, dag_bag = _parse_dag_file(key)
+            if dag_bag.import_errors:
+                raise RuntimeError(f"Import errors: {sorted(dag_bag.import_errors)}")
+        except Exception as e:
+            control.send(json.dumps({"error": str(e)}).encode())
+            os._exit(1)
+        _parsed_dag_file = _ParsedDagFile(key, bundle, dag_bag)
+
+    # Everything allocated so far is shared with the task processes; keep the GC from touching it.
+    gc.collect()
+    gc.freeze()
+    control.send(b'{"ready": true}')
+
+    while True:
+        try:
+            message, fds, _, _ = socket.recv_fds(control, _MAX_MESSAGE_SIZE, _NUM_SOCKETS)
+        except OSError:
+            break
+        if not message:
+            # The supervisor closed its end
+            break
+        try:
+            if len(fds) != _NUM_SOCKETS:
+                raise ValueError(f"Expected {_NUM_SOCKETS} sockets, got {len(fds)}")
+            response: dict[str, Any] = {"pid": _fork_task_process(control, fds, target)}
+        except Exception as e:
+            response = {"error": str(e)}
+        finally:
+            for fd in fds:
+                os.close(fd)
+        control.send(json.dumps(response).encode())
+        if "error" in response:
+            break
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    _warm_process_main(int(sys.argv[1]), json.loads(sys.argv[2]))
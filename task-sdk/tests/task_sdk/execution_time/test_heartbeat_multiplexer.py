@@ -0,0 +1,154 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import json
+import socket
+from unittest import mock
+
+import httpx
+import pytest
+from uuid6 import uuid7
+
+from airflow.sdk.api.client import ServerResponseError
+from airflow.sdk.api.datamodels._generated import (
+    TIBatchHeartbeatInfo,
+    TIBatchHeartbeatResponse,
+    TIBatchHeartbeatResult,
+)
+from airflow.sdk.execution_time import heartbeat_multiplexer
+
+pytestmark = pytest.mark.skipif(not heartbeat_multiplexer.is_supported(), reason="Linux only")
+
+
+@pytest.fixture
+def base_url() -> str:
+    # A URL of its own, so that each test gets a multiplexer of its own
+    return f"http://{uuid7()}.invalid/execution/"
+
+
+@pytest.fixture
+def multiplexer(base_url):
+    """A multiplexer running in this process, whose batches are answered by a mock client."""
+    address = heartbeat_multiplexer._address(base_url)
+    multiplexer = heartbeat_multiplexer.HeartbeatMultiplexer(address, base_url, batch_interval=0.5)
+    multiplexer._client = mock.Mock()
+    multiplexer._client.task_instances.heartbeat_batch.side_effect = lambda heartbeats: (
+        TIBatchHeartbeatResponse(
+            results=[
+                TIBatchHeartbeatResult(id=heartbeat.id, status_code=204 if heartbeat.pid else 409)
+                for heartbeat in heartbeats
+            ]
+        )
+    )
+    with mock.patch.object(heartbeat_multiplexer, "_multiplexer", multiplexer):
+        multiplexer.start()
+        yield multiplexer
+    multiplexer.stop()
+
+
+def _heartbeat(pid: int, token: str = "token") -> TIBatchHeartbeatInfo:
+    return TIBatchHeartbeatInfo(id=uuid7(), hostname="host", pid=pid, token=token)
+
+
+def _recv(sock: socket.socket) -> dict:
+    sock.settimeout(10)
+    return json.loads(sock.recv(heartbeat_multiplexer.MAX_MESSAGE_SIZE))
+
+
+def test_heartbeats_are_sent_in_one_batch(multiplexer, base_url):
+    first = heartbeat_multiplexer.connect(base_url, batch_interval=0.1)
+    second = heartbeat_multiplexer.connect(base_url, batch_interval=0.1)
+    assert first is not None
+    assert second is not None
+    alive, rejected = _heartbeat(pid=1), _heartbeat(pid=0)
+
+    first.send(alive.model_dump_json().encode())
+    second.send(rejected.model_dump_json().encode())
+
+    assert _recv(first) == {"id": str(alive.id), "status_code": 204, "detail": None, "refreshed_token": None}
+    assert _recv(second)["status_code"] == 409
+    heartbeat_batch = multiplexer._client.task_instances.heartbeat_batch
+    heartbeat_batch.assert_called_once()
+    assert sorted(heartbeat_batch.call_args.args[0], key=lambda heartbeat: heartbeat.pid) == [
+        rejected,
+        alive,
+    ]
+    first.close()
+    second.close()
+
+
+def test_failed_batch_is_reported_to_each_supervisor(multiplexer, base_url):
+    multiplexer._client.task_instances.heartbeat_batch.side_effect = RuntimeError("Server unavailable")
+    sock = heartbeat_multiplexer.connect(base_url, batch_interval=0.1)
+    assert sock is not None
+
+    sock.send(_heartbeat(pid=1).model_dump_json().encode())
+
+    assert _recv(sock) == {"error": "Server unavailable"}
+    sock.close()
+
+
+def test_batch_is_sent_with_next_token_when_one_is_rejected(base_url):
+    multiplexer = heartbeat_multiplexer.HeartbeatMultiplexer(
+        heartbeat_multiplexer._address(base_url), base_url, batch_interval=0.5
+    )
+    forbidden = ServerResponseError(
+        message="Invalid token",
+        request=httpx.Request("PUT", base_url),
+        response=httpx.Response(403, json={"detail": "Invalid token"}),
+    )
+
+    def heartbeat_batch(heartbeats):
+        if multiplexer._client.auth.token == "expired":
+            raise forbidden
+        return TIBatchHeartbeatResponse(
+            results=[TIBatchHeartbeatResult(id=heartbeat.id, status_code=204) for heartbeat in heartbeats]
+        )
+
+    multiplexer._client = mock.Mock()
+    multiplexer._client.task_instances.heartbeat_batch.side_effect = heartbeat_batch
+    expired_conn, expired_supervisor = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+    valid_conn, valid_supervisor = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+    expired, valid = _heartbeat(pid=1, token="expired"), _heartbeat(pid=2, token="valid")
+    multiplexer._pending = {expired_conn: expired, valid_conn: valid}
+
+    multiplexer._flush()
+
+    # The heartbeat whose token was rejected fails, the others are sent again with the next token
+    assert _recv(expired_supervisor) == {"error": "Invalid token"}
+    assert _recv(valid_supervisor)["status_code"] == 204
+    sent_batches = [
+        call.args[0] for call in multiplexer._client.task_instances.heartbeat_batch.call_args_list
+    ]
+    assert sent_batches == [[expired, valid], [valid]]
+    for sock in (expired_conn, expired_supervisor, valid_conn, valid_supervisor):
+        sock.close()
+    multiplexer.close()
+
+
+def test_connect_starts_multiplexer_when_there_is_none(base_url):
+    with (
+        mock.patch.object(heartbeat_multiplexer, "_multiplexer", None),
+        mock.patch.object(heartbeat_multiplexer, "HeartbeatMultiplexer") as mock_multiplexer,
+    ):
+        # The mock does not listen, so connecting fails again after starting it
+        assert heartbeat_multiplexer.connect(base_url, batch_interval=0.1) is None
+
+    mock_multiplexer.assert_called_once_with(heartbeat_multiplexer._address(base_url), base_url, 0.1)
+    mock_multiplexer.return_value.start.assert_called_once()
@@ -27,6 +27,7 @@ import signal
 import socket
 import subprocess
 import sys
+import threading
 import time
 from contextlib import nullcontext
 from dataclasses import dataclass, field
@@ -137,13 +138,17 @@ from airflow.sdk.execution_time.supervisor import (
     ActivitySubprocess,
     InProcessSupervisorComms,
     InProcessTestSupervisor,
+    MultiTaskSupervisor,
     _make_process_nondumpable,
     _remote_logging_conn,
+    _TaskSelector,
+    make_log_passthrough_reader,
     process_log_messages_from_subprocess,
     set_supervisor_comms,
     supervise,
 )
 from airflow.sdk.execution_time.task_runner import run
+from airflow.sdk.execution_time.warm_dag_process import WarmDagProcess
 
 from tests_common.test_utils.config import conf_vars
 
@@ -231,6 +236,137 @@ class TestSupervisor:
                 supervise(**kw)
 
 
+@pytest.mark.usefixtures("disable_capturing")
+class TestMultiTaskSupervisor:
+    @pytest.fixture(autouse=True)
+    def disable_log_upload(self, spy_agency):
+        spy_agency.spy_on(ActivitySubprocess._upload_logs, call_original=False)
+
+    def test_runs_tasks_with_their_own_tokens(self, test_dags_dir, make_ti_context_dict, monkeypatch):
+        monkeypatch.setattr("airflow.sdk.execution_time.supervisor.ensure_secrets_backend_loaded", list)
+        tis = [
+            TaskInstance(
+                id=uuid7(),
+                task_id="hello",
+                dag_id="super_basic_run",
+                run_id=f"run_{i}",
+                try_number=1,
+                dag_version_id=uuid7(),
+            )
+            for i in range(3)
+        ]
+        tokens = {str(ti.id): f"token-{i}" for i, ti in enumerate(tis)}
+        authorizations: dict[str, set[str]] = {}
+        final_states = {}
+        final_state_threads = set()
+
+        def handle_request(request: httpx.Request) -> httpx.Response:
+            ti_id, _, action = request.url.path.partition("/task-instances/")[2].partition("/")
+            authorizations.setdefault(ti_id, set()).add(request.headers["Authorization"])
+            if action == "run":
+                return httpx.Response(200, json=make_ti_context_dict())
+            if action == "state":
+                final_states[ti_id] = json.loads(request.content)["state"]
+                final_state_threads.add(threading.current_thread().name)
+            return httpx.Response(status_code=204)
+
+        bundle_info = BundleInfo(name="my-bundle", version=None)
+        with patch.dict(os.environ, local_dag_bundle_cfg(test_dags_dir, bundle_info.name)):
+            supervisor = MultiTaskSupervisor(server="http://localhost:8080/execution/", max_tasks=2)
+            supervisor._client = make_client(transport=httpx.MockTransport(handle_request))
+            futures = [
+                supervisor.submit(
+                    ti=ti,
+                    bundle_info=bundle_info,
+                    dag_rel_path="super_basic_run.py",
+                    token=tokens[str(ti.id)],
+                )
+                for ti in tis
+            ]
+            supervisor.shutdown()
+
+        assert [future.result(timeout=0) for future in futures] == [0, 0, 0]
+        assert final_states == dict.fromkeys(tokens, "success")
+        assert authorizations == {ti_id: {f"Bearer {token}"} for ti_id, token in tokens.items()}
+        # Final states are reported outside of the thread monitoring the running tasks
+        assert all(name.startswith("multi-task-supervisor-finish") for name in final_state_threads)
+
+    def test_forks_task_processes_from_fork_server(self, test_dags_dir, make_ti_context_dict, monkeypatch):
+        monkeypatch.setattr("airflow.sdk.execution_time.supervisor.ensure_secrets_backend_loaded", list)
+        ti = TaskInstance(
+            id=uuid7(),
+            task_id="hello",
+            dag_id="super_basic_run",
+            run_id="run",
+            try_number=1,
+            dag_version_id=uuid7(),
+        )
+
+        def handle_request(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/run"):
+                return httpx.Response(200, json=make_ti_context_dict())
+            return httpx.Response(status_code=204)
+
+        bundle_info = BundleInfo(name="my-bundle", version=None)
+        with (
+            patch.dict(os.environ, local_dag_bundle_cfg(test_dags_dir, bundle_info.name)),
+            patch.object(
+                ActivitySubprocess,
+                "_start_from_warm_dag_process",
+                wraps=ActivitySubprocess._start_from_warm_dag_process,
+            ) as start_from_warm_dag_process,
+        ):
+            supervisor = MultiTaskSupervisor(server="http://localhost:8080/execution/", max_tasks=2)
+            fork_server = supervisor._fork_server
+            supervisor._client = make_client(transport=httpx.MockTransport(handle_request))
+            future = supervisor.submit(
+                ti=ti, bundle_info=bundle_info, dag_rel_path="super_basic_run.py", token="token"
+            )
+            supervisor.shutdown()
+
+        assert future.result(timeout=0) == 0
+        if WarmDagProcess.is_supported():
+            assert fork_server is not None
+            start_from_warm_dag_process.assert_called_once()
+            assert start_from_warm_dag_process.call_args.args == (fork_server,)
+        else:
+            assert fork_server is None
+            start_from_warm_dag_process.assert_not_called()
+
+    def test_task_selector_runs_handlers_with_task_secrets_masker(self):
+        from airflow.sdk._shared.secrets_masker import SecretsMasker, _secrets_masker
+
+        task_masker = SecretsMasker()
+        maskers = []
+
+        def handler(sock):
+            maskers.append(_secrets_masker())
+            return True
+
+        with selectors.DefaultSelector() as shared_selector:
+            read, write = socket.socketpair()
+            with read, write:
+                task_selector = _TaskSelector(shared_selector, task_masker)
+                task_selector.register(read, selectors.EVENT_READ, (handler, handler))
+                write.send(b"\0")
+                for key, _ in shared_selector.select(timeout=1):
+                    socket_handler, on_close = key.data
+                    socket_handler(key.fileobj)
+                    on_close(key.fileobj)
+                task_selector.close()
+
+        assert maskers == [task_masker, task_masker]
+        assert _secrets_masker() is not task_masker
+
+    def test_submit_after_shutdown(self, monkeypatch):
+        monkeypatch.setattr("airflow.sdk.execution_time.supervisor.ensure_secrets_backend_loaded", list)
+        supervisor = MultiTaskSupervisor(server="http://localhost:8080/execution/", max_tasks=2)
+        supervisor.shutdown()
+
+        with pytest.raises(RuntimeError, match="Cannot submit tasks"):
+            supervisor.submit(ti=mock.Mock(), bundle_info=FAKE_BUNDLE, dag_rel_path="dag.py", token="")
+
+
 @pytest.mark.usefixtures("disable_capturing")
 class TestWatchedSubprocess:
     @pytest.fixture(autouse=True)
@@ -763,6 +899,38 @@ class TestWatchedSubprocess:
             "previous_state": "running",
         }
 
+    def test_supervisor_claims_task_with_run_context(self, make_ti_context):
+        """Test that Supervisor only claims a Task Instance whose run context the scheduler sent."""
+        from airflow.api_fastapi.execution_api.datamodels.taskinstance import TIRunContext
+
+        ti = TaskInstance(
+            id=uuid7(), task_id="b", dag_id="c", run_id="d", try_number=1, dag_version_id=uuid7()
+        )
+        # Executors pass on the run context of the workload, which is a datamodel of the Execution API
+        ti_context = TIRunContext.model_validate(make_ti_context(max_tries=7).model_dump())
+        paths = []
+
+        def handle_request(request: httpx.Request) -> httpx.Response:
+            paths.append(request.url.path)
+            return httpx.Response(status_code=204)
+
+        def subprocess_main():
+            msg = CommsDecoder()._get_response()
+            exit(0 if msg.ti_context.max_tries == 7 else 3)
+
+        proc = ActivitySubprocess.start(
+            dag_rel_path=os.devnull,
+            bundle_info=FAKE_BUNDLE,
+            what=ti,
+            client=make_client(transport=httpx.MockTransport(handle_request)),
+            target=subprocess_main,
+            ti_context=ti_context,  # type: ignore[arg-type]
+        )
+
+        assert proc.wait() == 0
+        assert paths[0] == f"/task-instances/{ti.id}/claim"
+        assert f"/task-instances/{ti.id}/run" not in paths
+
     @pytest.mark.parametrize("captured_logs", [logging.ERROR], indirect=True, ids=["log_level=error"])
     def test_state_conflict_on_heartbeat(self, captured_logs, monkeypatch, mocker, make_ti_context_dict):
         """
@@ -949,6 +1117,74 @@ class TestWatchedSubprocess:
             "loc": mocker.ANY,
         } in captured_logs
 
+    @pytest.mark.skipif(sys.platform != "linux", reason="Linux only")
+    @pytest.mark.parametrize(
+        ("result", "expected_failed_heartbeats", "expected_kill"),
+        [
+            pytest.param({"status_code": 204}, 0, False, id="alive"),
+            pytest.param(
+                {"status_code": 409, "detail": {"reason": "not_running"}}, 0, True, id="not-running"
+            ),
+            pytest.param({"status_code": 404, "detail": {"reason": "not_found"}}, 0, True, id="not-found"),
+            pytest.param(
+                {"status_code": 403, "detail": {"reason": "invalid_token"}}, 1, False, id="forbidden"
+            ),
+            # The supervisor sends its own heartbeat instead, which succeeds
+            pytest.param({"error": "Server error"}, 0, False, id="batch-failed"),
+        ],
+    )
+    def test_heartbeat_through_multiplexer(
+        self, monkeypatch, mocker, result, expected_failed_heartbeats, expected_kill
+    ):
+        """Test that results of heartbeats sent through the multiplexer are handled like responses."""
+        monkeypatch.setattr("airflow.sdk.execution_time.supervisor.HEARTBEAT_MULTIPLEXER", True)
+        mock_kill = mocker.patch("airflow.sdk.execution_time.supervisor.WatchedSubprocess.kill")
+        client = mocker.Mock(_transport=httpx.HTTPTransport(), auth=sdk_client.BearerAuth("token"))
+        proc = ActivitySubprocess(
+            process_log=mocker.MagicMock(),
+            id=TI_ID,
+            pid=12345,
+            stdin=mocker.MagicMock(),
+            client=client,
+            process=mocker.Mock(pid=12345),
+        )
+        multiplexer, proc._heartbeat_multiplexer = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+
+        proc._send_heartbeat_if_needed()
+
+        heartbeat = json.loads(multiplexer.recv(65536))
+        assert heartbeat == {"id": str(TI_ID), "hostname": mocker.ANY, "pid": 12345, "token": "token"}
+        client.task_instances.heartbeat.assert_not_called()
+
+        multiplexer.send(json.dumps({"id": str(TI_ID), **result, "refreshed_token": "new-token"}).encode())
+        assert proc._handle_heartbeat_result(proc._heartbeat_multiplexer)
+
+        assert proc.failed_heartbeats == expected_failed_heartbeats
+        if expected_kill:
+            mock_kill.assert_called_once_with(signal.SIGTERM, force=True)
+            assert proc._terminal_state == "SERVER_TERMINATED"
+        else:
+            mock_kill.assert_not_called()
+        if "error" in result:
+            client.task_instances.heartbeat.assert_called_once_with(TI_ID, pid=12345)
+        else:
+            client.task_instances.heartbeat.assert_not_called()
+            assert client.auth.token == "new-token"
+
+        if not expected_kill:
+            # The multiplexer did not answer the previous heartbeat: heartbeat directly
+            client.task_instances.heartbeat.reset_mock()
+            proc._heartbeat_result_pending = True
+            proc._last_heartbeat_attempt = 0
+            proc._send_heartbeat_if_needed()
+            client.task_instances.heartbeat.assert_called_once_with(TI_ID, pid=12345)
+
+        # The multiplexer went away before answering the next heartbeat: heartbeat again right away
+        proc._heartbeat_result_pending = True
+        multiplexer.close()
+        assert not proc._handle_heartbeat_result(proc._heartbeat_multiplexer)
+        assert proc._last_heartbeat_attempt == 0
+
     @pytest.mark.parametrize(
         ("terminal_state", "task_end_time_monotonic", "overtime_threshold", "expected_kill"),
         [
@@ -3088,6 +3324,86 @@ def test_process_log_messages_from_subprocess(monkeypatch, caplog):
     ]
 
 
+class TestLogPassthroughReader:
+    @pytest.fixture
+    def masker(self):
+        from airflow.sdk._shared.secrets_masker import _secrets_masker
+
+        masker = _secrets_masker()
+        with (
+            patch.object(masker, "sensitive_variables_fields", ["password"]),
+            patch.object(masker, "hide_sensitive_var_conn_fields", True),
+        ):
+            masker.reset_masker()
+            yield masker
+            masker.reset_masker()
+
+    @staticmethod
+    def _read(lines: list[bytes], buffer_size: int = 65536) -> tuple[bytes, list[bytes]]:
+        """Return what the reader wrote to the log file itself, and which lines it sent to be processed."""
+        import io
+
+        processed: list[bytes] = []
+
+        def gen():
+            while True:
+                line = yield
+                processed.append(bytes(line))
+
+        log_file = io.BytesIO()
+        read_end, write_end = socket.socketpair()
+        handler, _ = make_log_passthrough_reader(
+            log_file, gen(), on_close=mock.Mock(), buffer_size=buffer_size
+        )
+        write_end.sendall(b"".join(lines))
+        write_end.close()
+        while handler(read_end):
+            pass
+        read_end.close()
+        return log_file.getvalue(), processed
+
+    def test_plain_lines_are_passed_through(self, masker):
+        lines = [
+            b'{"timestamp":"2025-01-01T00:00:00Z","level":"info","event":"Hello","logger":"task"}\n',
+            b'{"timestamp":"2025-01-01T00:00:01Z","level":"warning","event":"Careful","logger":"task"}\n',
+        ]
+
+        # A small buffer, so that lines are split across reads
+        written, processed = self._read(lines, buffer_size=16)
+
+        assert written == b"".join(lines)
+        assert processed == []
+
+    @pytest.mark.parametrize(
+        "line",
+        [
+            pytest.param(b'{"level":"info","event":"Using s3cr3t-value","logger":"task"}\n', id="secret"),
+            pytest.param(b'{"level":"info","event":"Hi","password":"x","logger":"task"}\n', id="field"),
+            pytest.param(b'{"level":"info","event":"Token eyJhbGciOi","logger":"task"}\n', id="jwt"),
+            pytest.param(b'{"level":"info","event":"Tab\\there","logger":"task"}\n', id="escape"),
+            pytest.param(b'{"level":"error","exception":[],"logger":"task"}\n', id="exception"),
+            pytest.param(b'{"level":"warn","event":"Careful","logger":"task"}\n', id="level"),
+            pytest.param(b'{"level":"info","event":"No logger"}\n', id="no-logger"),
+            pytest.param(b"Not JSON\n", id="invalid"),
+        ],
+    )
+    def test_lines_needing_processing_are_sent_to_be_processed(self, masker, line):
+        masker.add_mask("s3cr3t-value")
+
+        written, processed = self._read([line])
+
+        assert written == b""
+        assert processed == [line]
+
+    def test_unterminated_last_line_is_processed(self, masker):
+        plain = b'{"level":"info","event":"Hello","logger":"task"}\n'
+
+        written, processed = self._read([plain, b'{"level":"info"'])
+
+        assert written == plain
+        assert processed == [b'{"level":"info"']
+
+
 def test_reinit_supervisor_comms(monkeypatch, client_with_ti_start, caplog):
     def subprocess_main():
         # This is run in the subprocess!
@@ -254,6 +254,44 @@ def test_parse_dag_bag(mock_dagbag, test_dags_dir: Path, make_ti_context):
     )
 
 
+@mock.patch("airflow.sdk.execution_time.task_runner.DagBundlesManager")
+def test_parse_uses_dag_file_parsed_by_warm_process(
+    mock_bundles_manager, test_dags_dir: Path, make_ti_context
+):
+    """Test that a task process forked from a warm Dag process does not parse the Dag file again."""
+    from airflow.sdk.execution_time import warm_dag_process
+
+    mock_bundle = mock.Mock(path=test_dags_dir)
+    mock_bag = mock.Mock()
+    mock_task = mock.Mock(spec=BaseOperator)
+    mock_bag.dags = {"super_basic": mock.Mock(spec=DAG, task_dict={"a": mock_task})}
+
+    what = StartupDetails(
+        ti=TaskInstance(
+            id=uuid7(),
+            task_id="a",
+            dag_id="super_basic",
+            run_id="c",
+            try_number=1,
+            dag_version_id=uuid7(),
+        ),
+        dag_rel_path="super_basic.py",
+        bundle_info=BundleInfo(name="my-bundle", version="v1"),
+        ti_context=make_ti_context(),
+        start_date=timezone.utcnow(),
+        sentry_integration="",
+    )
+    parsed = warm_dag_process._ParsedDagFile(
+        warm_dag_process.DagFileKey("my-bundle", "v1", "super_basic.py"), mock_bundle, mock_bag
+    )
+    with patch.object(warm_dag_process, "_parsed_dag_file", parsed):
+        ti = parse(what, mock.Mock())
+
+    assert ti.task is mock_task
+    assert ti.bundle_instance is mock_bundle
+    mock_bundles_manager.assert_not_called()
+
+
 @pytest.mark.parametrize(
     ("dag_id", "task_id", "expected_error"),
     (
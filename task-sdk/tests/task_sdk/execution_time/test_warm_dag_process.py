@@ -0,0 +1,168 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import socket
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from airflow.sdk.execution_time import warm_dag_process
+from airflow.sdk.execution_time.warm_dag_process import DagFileKey, WarmDagProcess, WarmDagProcessPool
+
+
+def _exit_with_parsed_dag_file():
+    """Target of the task processes forked in the tests: exit with 0 if the warm process parsed the Dag."""
+    parsed = warm_dag_process._parsed_dag_file
+    sys.exit(0 if parsed is not None and "super_basic" in parsed.dag_bag.dags else 3)
+
+
+def _wait_until_ready(process: WarmDagProcess, timeout: float = 60.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.is_ready():
+            return True
+        if process.failed:
+            return False
+        time.sleep(0.05)
+    raise TimeoutError("The warm Dag process did not get ready")
+
+
+def _is_child_subreaper() -> bool:
+    import ctypes
+
+    value = ctypes.c_int()
+    ctypes.CDLL(None).prctl(37, ctypes.byref(value), 0, 0, 0)  # PR_GET_CHILD_SUBREAPER
+    return bool(value.value)
+
+
+def _spawn_and_wait(process: WarmDagProcess) -> int | None:
+    pairs = [socket.socketpair() for _ in range(4)]
+    try:
+        pid = process.spawn([child for child, _ in pairs])
+    finally:
+        for child, _ in pairs:
+            child.close()
+    try:
+        if pid is None:
+            return None
+        _, status = os.waitpid(pid, 0)
+        return os.waitstatus_to_exitcode(status)
+    finally:
+        for _, parent in pairs:
+            parent.close()
+
+
+class TestWarmDagProcessPool:
+    @mock.patch.object(warm_dag_process, "WarmDagProcess")
+    def test_least_recently_used_process_is_stopped(self, mock_warm_dag_process):
+        mock_warm_dag_process.side_effect = lambda key: mock.Mock(key=key, failed=False)
+        pool = WarmDagProcessPool(max_size=2)
+        first, second, third = (DagFileKey("bundle", "v1", f"dag_{i}.py") for i in range(3))
+
+        first_process = pool.get(first)
+        second_process = pool.get(second)
+        assert pool.get(first) is first_process
+        pool.get(third)
+
+        second_process.stop.assert_called_once()
+        first_process.stop.assert_not_called()
+        assert pool.get(first) is first_process
+
+    @mock.patch.object(warm_dag_process, "WarmDagProcess")
+    def test_failed_process_is_not_restarted(self, mock_warm_dag_process):
+        mock_warm_dag_process.side_effect = lambda key: mock.Mock(key=key, failed=False)
+        pool = WarmDagProcessPool(max_size=2)
+        key = DagFileKey("bundle", "v1", "dag.py")
+
+        pool.get(key).failed = True
+
+        # The Dag file of a bundle version does not change, so parsing it would fail again
+        assert pool.get(key) is None
+        assert mock_warm_dag_process.call_count == 1
+
+    @mock.patch.object(warm_dag_process, "WarmDagProcess")
+    def test_no_process_for_unversioned_bundle(self, mock_warm_dag_process):
+        pool = WarmDagProcessPool(max_size=2)
+
+        # The bundle is refreshed for each task, which may change the Dag file or the modules it imports
+        assert pool.get(DagFileKey("bundle", None, "dag.py")) is None
+        mock_warm_dag_process.assert_not_called()
+
+
+@pytest.mark.skipif(not WarmDagProcess.is_supported(), reason="Linux only")
+class TestWarmDagProcess:
+    @pytest.fixture
+    def bundle_path(self, tmp_path: Path, test_dags_dir: Path, monkeypatch) -> Path:
+        shutil.copy(test_dags_dir / "super_basic.py", tmp_path / "super_basic.py")
+        monkeypatch.setenv(
+            "AIRFLOW__DAG_PROCESSOR__DAG_BUNDLE_CONFIG_LIST",
+            json.dumps(
+                [
+                    {
+                        "name": "my-bundle",
+                        "classpath": "airflow.dag_processing.bundles.local.LocalDagBundle",
+                        "kwargs": {"path": str(tmp_path), "refresh_interval": 1},
+                    }
+                ]
+            ),
+        )
+        # So that the warm process can import the target of the task processes from this module
+        tests_root = Path(__file__).parents[2]
+        monkeypatch.setenv("PYTHONPATH", os.pathsep.join([str(tests_root), *sys.path]))
+        return tmp_path
+
+    @pytest.fixture
+    def make_process(self, bundle_path):
+        processes = []
+
+        def make_process() -> WarmDagProcess:
+            process = WarmDagProcess(
+                DagFileKey("my-bundle", "v1", "super_basic.py"),
+                target=f"{__name__}.{_exit_with_parsed_dag_file.__name__}",
+            )
+            processes.append(process)
+            process.start()
+            return process
+
+        yield make_process
+        for process in processes:
+            process.stop()
+
+    def test_forks_task_processes_with_parsed_dag_file(self, make_process):
+        process = make_process()
+        assert _wait_until_ready(process)
+
+        assert _spawn_and_wait(process) == 0
+        assert _spawn_and_wait(process) == 0
+        assert not process.failed
+        # Only while it waits for a task process to be forked, so that it adopts no other orphans
+        assert not _is_child_subreaper()
+
+    def test_import_errors_fail_process(self, make_process, bundle_path):
+        (bundle_path / "super_basic.py").write_text("raise RuntimeError('broken')\n")
+        process = make_process()
+
+        assert not _wait_until_ready(process)
+        assert process.failed